@@ -3,9 +3,13 @@ Main Flask Application - Entry Point
 Handles API endpoints and request routing
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from pathlib import Path
+from typing import Dict, Optional
+import atexit
+import contextvars
 import sys
+import time
 from flask_cors import CORS
 
 
@@ -14,7 +18,20 @@ backend_dir = Path(__file__).parent
 sys.path.insert(0, str(backend_dir))
 
 from services.matcher_service import MatcherService
-from utils.file_utils import FileUtils
+from services.incremental_analyzer import IncrementalAnalyzer
+from services.document_store import DocumentStore
+from services.job_profile import JobProfile, JobProfileStore
+from services.talent_pool import TalentPoolIndex
+from services.feature_store import FeatureStore
+from services.scoring_model import ScoringModel
+from services.result_cache import analysis_key
+from services.thread_budget import ThreadBudget
+from services.deadline import Deadline
+from services.admission import AdmissionController, AdmissionError, client_identity
+from services.parser_pool import ParserPool
+from services.request_capture import RequestCapture, current_capture
+from services.analysis_result import AnalysisResult
+from utils.serialization import dumps
 from instance.config import Config
 
 app = Flask(__name__)
@@ -22,8 +39,128 @@ app.config.from_object(Config)
 CORS(app)
 
 # Initialize services
-file_utils = FileUtils()
+# One CPU layout for this worker, applied before any model loads
+thread_budget = ThreadBudget.from_config().apply()
 matcher_service = MatcherService()
+incremental_analyzer = IncrementalAnalyzer(matcher_service)
+document_store = DocumentStore(matcher_service)
+job_profile_store = JobProfileStore(matcher_service)
+talent_pool = TalentPoolIndex(matcher_service)
+atexit.register(talent_pool.close)
+feature_store = FeatureStore()
+parser_pool = ParserPool()
+atexit.register(parser_pool.close)
+admission = AdmissionController(parser_pool)
+request_capture = RequestCapture.from_config(matcher_service.stage_costs)
+
+# Endpoints behind admission control (rate limit, upload size)
+ADMITTED_ENDPOINTS = {
+    'upload_document',
+    'analyze_resume',
+    'analyze_stream',
+    'quick_analyze',
+    'incremental_analyze'
+}
+
+# Endpoints observed by slow-request capture (CAPTURE_SLOW_REQUESTS)
+CAPTURED_ENDPOINTS = {
+    'analyze_resume',
+    'analyze_stream',
+    'quick_analyze',
+    'incremental_analyze'
+}
+
+
+def client_id() -> str:
+    """Client identity for per-client limits"""
+    return client_identity(request.remote_addr, request.headers)
+
+
+def admission_response(e: AdmissionError):
+    response = jsonify(e.to_dict())
+    if e.retry_after is not None:
+        response.headers['Retry-After'] = str(max(1, int(round(e.retry_after))))
+    return response, e.status
+
+
+@app.errorhandler(AdmissionError)
+def handle_admission_error(e):
+    return admission_response(e)
+
+
+@app.before_request
+def admit_request():
+    """Cheap checks before any body is parsed"""
+    if request.endpoint not in ADMITTED_ENDPOINTS:
+        return None
+    
+    if request.content_length and request.content_length > Config.MAX_CONTENT_LENGTH:
+        admission.counters["rejected_too_large"] += 1
+        return jsonify({
+            "error": f"Request body exceeds {Config.MAX_CONTENT_LENGTH} bytes",
+            "reason": "too_large"
+        }), 413
+    
+    try:
+        admission.check_rate(client_id())
+    except AdmissionError as e:
+        return admission_response(e)
+    return None
+
+
+@app.before_request
+def start_capture():
+    """Observe admitted analysis requests (no-op unless capture is enabled)"""
+    if request.endpoint in CAPTURED_ENDPOINTS:
+        g.capture = request_capture.start(request.endpoint)
+
+
+@app.after_request
+def finish_capture(response):
+    """Spool the request if it was slow or failed; streams finish on close"""
+    capture = g.get('capture')
+    if capture is not None and not response.is_streamed:
+        if request_capture.finish(capture, response.status_code) is not None:
+            response.headers['X-Capture-Id'] = capture.id
+    return response
+
+
+@app.teardown_request
+def drop_capture(exc):
+    capture = g.pop('capture', None)
+    if capture is not None and exc is not None:
+        capture.fail(exc)
+    request_capture.finish(capture)
+
+
+def capture_inputs(resume_text: str, jd_text: str, **params):
+    """Record what a captured request analyzed, for replay"""
+    capture = current_capture()
+    if capture is not None:
+        capture.inputs(resume_text, jd_text, **params)
+
+
+def error_response(e: Exception):
+    """500 for an unexpected error, recorded on the request's capture"""
+    body = {
+        "error": str(e),
+        "type": type(e).__name__
+    }
+    capture = current_capture()
+    if capture is not None:
+        capture.fail(e)
+        body["capture_id"] = capture.id
+    return jsonify(body), 500
+
+
+def top_k_param(data: Dict, default: int) -> Optional[int]:
+    """'top_k' from a JSON body: default when omitted, None unless a positive integer"""
+    value = data.get('top_k')
+    if value is None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        return None
+    return value
 
 
 @app.route('/health', methods=['GET'])
@@ -36,66 +173,272 @@ def health_check():
     })
 
 
-@app.route('/analyze', methods=['POST'])
-def analyze_resume():
+def load_request_texts():
     """
-    Main endpoint for resume analysis
+    Extract resume and JD text from the request
     Accepts either file paths or uploaded files
+    
+    Returns:
+        (resume_text, jd_text, None) or (None, None, error_response)
+    """
+    # Option 1: Using file paths from assets/
+    if request.is_json and request.json and 'use_assets' in request.json:
+        # Use default files from assets
+        assets_dir = Path(app.config['ASSETS_DIR'])
+        
+        # Find resume file
+        resume_path = None
+        for ext in ['.pdf', '.txt', '.docx']:
+            candidate = assets_dir / f"resume{ext}"
+            if candidate.exists():
+                resume_path = str(candidate)
+                break
+        
+        jd_path = str(assets_dir / "job.txt")
+        
+        if not resume_path or not Path(jd_path).exists():
+            return None, None, (jsonify({
+                "error": "Resume or job description not found in assets/"
+            }), 404)
+        
+        # Extract text
+        resume_text = admission.extract_path(resume_path)
+        jd_text = admission.extract_path(jd_path)
+    
+    # Option 2: File upload, extracted from memory (the client's filename
+    # only selects the parser; nothing is written to disk)
+    elif 'resume' in request.files and 'job_description' in request.files:
+        resume_file = request.files['resume']
+        jd_file = request.files['job_description']
+        
+        # Page limits and parsing in the parser pool
+        resume_text = admission.extract(resume_file.read(), resume_file.filename)
+        jd_text = admission.extract(jd_file.read(), jd_file.filename)
+    
+    else:
+        return None, None, (jsonify({
+            "error": "Please provide either 'use_assets': true or upload files"
+        }), 400)
+    
+    # Validate text extraction
+    if not resume_text or not jd_text:
+        return None, None, (jsonify({
+            "error": "Failed to extract text from files"
+        }), 400)
+    
+    return resume_text, jd_text, None
+
+
+def cached_analysis_response(resume_text: str, jd_text: str, deadline: Optional[Deadline] = None):
+    """
+    Run (or reuse) an analysis and answer with an ETag
+    The ETag is the content hash of both documents plus the scoring
+    config, so a matching If-None-Match skips the analysis entirely
+    """
+    capture_inputs(resume_text, jd_text, deadline_ms=deadline.budget_ms if deadline else None)
+    cost = admission.estimate(resume_text, jd_text)
+    etag = matcher_service.analysis_key(resume_text, jd_text)
+    return etag_response(etag, lambda: matcher_service.analyze(resume_text, jd_text, deadline), cost)
+
+
+def result_response(results: AnalysisResult) -> Response:
+    """JSON response for an analysis (fast encoder, see utils/serialization.py)"""
+    return Response(results.to_json(), mimetype='application/json')
+
+
+def etag_response(etag: str, run_analysis, cost):
+    """
+    Answer 304 for a matching If-None-Match, else run and tag the analysis
+    The analysis itself runs under admission control
+    """
+    if etag in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    
+    with admission.admit(client_id(), cost):
+        results = run_analysis()
+    
+    # Degraded (deadline-limited) results are not the canonical analysis
+    if results.degraded:
+        return result_response(results), 200
+    
+    response = result_response(results)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response, 200
+
+
+@app.route('/documents', methods=['POST'])
+def upload_document():
+    """
+    Store a document and return its content hash id
+    Accepts a multipart 'file' upload or JSON {"text": ...}
     """
     try:
-        # Option 1: Using file paths from assets/
-        if request.json and 'use_assets' in request.json:
-            # Use default files from assets
-            assets_dir = Path(app.config['ASSETS_DIR'])
-            
-            # Find resume file
-            resume_path = None
-            for ext in ['.pdf', '.txt']:
-                candidate = assets_dir / f"resume{ext}"
-                if candidate.exists():
-                    resume_path = str(candidate)
-                    break
-            
-            jd_path = str(assets_dir / "job.txt")
-            
-            if not resume_path or not Path(jd_path).exists():
+        if 'file' in request.files:
+            upload = request.files['file']
+            document, created = document_store.put_file(upload.read(), upload.filename, admission.extract)
+        else:
+            data = request.get_json(silent=True) or {}
+            if not data.get('text'):
                 return jsonify({
-                    "error": "Resume or job description not found in assets/"
-                }), 404
-            
-            # Extract text
-            resume_text = file_utils.read_file(resume_path)
-            jd_text = file_utils.read_file(jd_path)
-        
-        # Option 2: File upload (for future enhancement)
-        elif 'resume' in request.files and 'job_description' in request.files:
-            resume_file = request.files['resume']
-            jd_file = request.files['job_description']
-            
-            # Save temporarily and read
-            resume_path = Path(app.config['UPLOAD_FOLDER']) / resume_file.filename
-            jd_path = Path(app.config['UPLOAD_FOLDER']) / jd_file.filename
-            
-            resume_file.save(resume_path)
-            jd_file.save(jd_path)
-            
-            resume_text = file_utils.read_file(str(resume_path))
-            jd_text = file_utils.read_file(str(jd_path))
+                    "error": "Please provide a 'file' upload or JSON 'text'"
+                }), 400
+            document, created = document_store.put_text(data['text'], data.get('filename'))
         
-        else:
+        if document is None:
             return jsonify({
-                "error": "Please provide either 'use_assets': true or upload files"
+                "error": "Failed to extract text from document"
             }), 400
         
-        # Validate text extraction
-        if not resume_text or not jd_text:
+        return jsonify(document.summary()), 201 if created else 200
+    
+    except AdmissionError as e:
+        return admission_response(e)
+    except Exception as e:
+        return jsonify({
+            "error": str(e),
+            "type": type(e).__name__
+        }), 500
+
+
+@app.route('/documents/<doc_id>', methods=['GET'])
+def get_document(doc_id):
+    """Stored document metadata"""
+    document = document_store.get(doc_id)
+    if document is None:
+        return jsonify({"error": "Document not found"}), 404
+    return jsonify(document.summary()), 200
+
+
+@app.route('/documents/<doc_id>', methods=['DELETE'])
+def delete_document(doc_id):
+    """Remove a stored document"""
+    if not document_store.delete(doc_id):
+        return jsonify({"error": "Document not found"}), 404
+    return jsonify({"status": "deleted", "id": doc_id}), 200
+
+
+@app.route('/jobs-descriptions', methods=['POST'])
+def register_job_description():
+    """
+    Register a job description and compile its matching profile
+    Accepts JSON {"text": ...} or {"jd_id": <document id>}
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        if data.get('jd_id'):
+            jd_doc = document_store.get(data['jd_id'])
+            if jd_doc is None:
+                return jsonify({"error": "Document not found"}), 404
+            profile = job_profile_store.register(jd_doc.text)
+        elif data.get('text'):
+            profile = job_profile_store.register(data['text'])
+        else:
             return jsonify({
-                "error": "Failed to extract text from files"
+                "error": "Please provide JSON 'text' or 'jd_id'"
             }), 400
         
-        # Run analysis
-        results = matcher_service.analyze(resume_text, jd_text)
+        return jsonify(profile.summary()), 201
+    
+    except Exception as e:
+        return jsonify({
+            "error": str(e),
+            "type": type(e).__name__
+        }), 500
+
+
+@app.route('/jobs-descriptions/<profile_id>', methods=['GET'])
+def get_job_description(profile_id):
+    """Registered job profile metadata"""
+    profile = job_profile_store.get(profile_id)
+    if profile is None:
+        return jsonify({"error": "Job profile not found"}), 404
+    return jsonify(profile.summary()), 200
+
+
+@app.route('/jobs-descriptions/<profile_id>', methods=['DELETE'])
+def delete_job_description(profile_id):
+    """Remove a registered job profile (and its stored candidate features)"""
+    if not job_profile_store.delete(profile_id):
+        return jsonify({"error": "Job profile not found"}), 404
+    feature_store.delete(profile_id)
+    return jsonify({"status": "deleted", "id": profile_id}), 200
+
+
+def analyze_candidate(resume_doc, profile: JobProfile, deadline: Optional[Deadline] = None) -> AnalysisResult:
+    """Analyze a stored resume against a job profile and keep its features"""
+    results = matcher_service.analyze_documents(resume_doc, profile, deadline)
+    feature_store.add(profile.id, resume_doc.id, results.features)
+    return results
+
+
+@app.route('/jobs-descriptions/<profile_id>/candidates', methods=['POST'])
+def score_candidates(profile_id):
+    """
+    Analyze stored resumes against a job profile, storing their features
+    Accepts JSON {"resume_ids": [...]}; rank them with /rescore
+    """
+    try:
+        profile = job_profile_store.get(profile_id)
+        if profile is None:
+            return jsonify({"error": "Job profile not found"}), 404
+        
+        data = request.get_json(silent=True) or {}
+        resume_ids = data.get('resume_ids') or [data.get('resume_id')]
+        
+        scored, missing = [], []
+        for resume_id in resume_ids:
+            document = document_store.get(resume_id)
+            if document is None:
+                missing.append(resume_id)
+                continue
+            cost = admission.estimate(document.cleaned_text, profile.jd_text)
+            with admission.admit(client_id(), cost):
+                analyze_candidate(document, profile)
+            scored.append(resume_id)
+        
+        return jsonify({
+            "scored": scored,
+            "missing": missing,
+            "candidates": feature_store.count(profile_id)
+        }), 200 if scored else 404
+    
+    except AdmissionError as e:
+        return admission_response(e)
+    except Exception as e:
+        return jsonify({
+            "error": str(e),
+            "type": type(e).__name__
+        }), 500
+
+
+@app.route('/jobs-descriptions/<profile_id>/rescore', methods=['POST'])
+def rescore_candidates(profile_id):
+    """
+    Re-rank a job profile's stored candidates under new weights
+    No model calls: stored features are rescored in one numpy pass
+    Accepts JSON {"weights": {...}, "ats_weights": {...},
+    "ats_thresholds": {...}, "top_k": n}; omitted values use the config
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        top_k = top_k_param(data, Config.RESCORE_TOP_K)
+        if top_k is None:
+            return jsonify({"error": "'top_k' must be a positive integer"}), 400
+        try:
+            model = ScoringModel(
+                weights=data.get('weights'),
+                ats_weights=data.get('ats_weights'),
+                ats_thresholds=data.get('ats_thresholds')
+            )
+        except (ValueError, AttributeError) as e:
+            return jsonify({"error": str(e)}), 400
         
+        results = feature_store.rescore(profile_id, model, top_k)
+        if not results["candidates"]:
+            return jsonify({"error": "No scored candidates for this job profile"}), 404
         return jsonify(results), 200
     
     except Exception as e:
@@ -105,14 +448,78 @@ def analyze_resume():
         }), 500
 
 
-@app.route('/analyze/quick', methods=['POST'])
-def quick_analyze():
+@app.route('/talent-pool', methods=['POST'])
+def index_resumes():
     """
-    Quick analysis endpoint for testing
-    Uses files from assets/ directory
+    Add stored resumes to the talent pool index
+    Accepts JSON {"resume_id": ...} or {"resume_ids": [...]}
     """
     try:
-        results = matcher_service.analyze_from_assets()
+        data = request.get_json(silent=True) or {}
+        resume_ids = data.get('resume_ids') or [data.get('resume_id')]
+        
+        indexed, missing = [], []
+        for resume_id in resume_ids:
+            document = document_store.get(resume_id)
+            if document is not None and talent_pool.add_document(document):
+                indexed.append(resume_id)
+            else:
+                missing.append(resume_id)
+        
+        if not indexed:
+            return jsonify({"error": "No indexable resumes", "missing": missing}), 404
+        return jsonify({"indexed": indexed, "missing": missing}), 200
+    
+    except Exception as e:
+        return jsonify({
+            "error": str(e),
+            "type": type(e).__name__
+        }), 500
+
+
+@app.route('/talent-pool', methods=['GET'])
+def talent_pool_stats():
+    """Talent pool index size"""
+    return jsonify(talent_pool.stats()), 200
+
+
+@app.route('/talent-pool/<resume_id>', methods=['DELETE'])
+def remove_from_talent_pool(resume_id):
+    """Remove a resume from the talent pool index"""
+    if not talent_pool.delete(resume_id):
+        return jsonify({"error": "Resume not indexed"}), 404
+    return jsonify({"status": "deleted", "id": resume_id}), 200
+
+
+@app.route('/talent-pool/search', methods=['POST'])
+def search_talent_pool():
+    """
+    Best indexed candidates for a job description
+    Accepts JSON {"job_profile_id"}, {"jd_id"} or {"text"}, plus optional "top_k"
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        top_k = top_k_param(data, Config.TALENT_POOL_TOP_K)
+        if top_k is None:
+            return jsonify({"error": "'top_k' must be a positive integer"}), 400
+        
+        if data.get('job_profile_id'):
+            profile = job_profile_store.get(data['job_profile_id'])
+        elif data.get('jd_id'):
+            jd_doc = document_store.get(data['jd_id'])
+            profile = job_profile_store.register(jd_doc.text) if jd_doc else None
+        elif data.get('text'):
+            profile = job_profile_store.register(data['text'])
+        else:
+            return jsonify({
+                "error": "Please provide JSON 'job_profile_id', 'jd_id' or 'text'"
+            }), 400
+        
+        if profile is None:
+            return jsonify({"error": "Job description not found"}), 404
+        
+        results = talent_pool.search(profile, top_k)
+        results["job_profile_id"] = profile.id
         return jsonify(results), 200
     
     except Exception as e:
@@ -122,10 +529,198 @@ def quick_analyze():
         }), 500
 
 
-if __name__ == '__main__':
-    # Create necessary directories
-    Path(app.config['UPLOAD_FOLDER']).mkdir(parents=True, exist_ok=True)
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Service counters (result cache, request coalescing, admission, parsing)"""
+    stats = matcher_service.stats()
+    stats["admission"] = admission.stats()
+    stats["parser_pool"] = parser_pool.stats()
+    stats["request_capture"] = request_capture.stats()
+    return jsonify(stats)
+
+
+@app.route('/analyze', methods=['POST'])
+def analyze_resume():
+    """
+    Main endpoint for resume analysis
+    Accepts either file paths or uploaded files
+    """
+    try:
+        # Optional latency budget (milliseconds) from X-Deadline-Ms
+        deadline = Deadline.from_value(request.headers.get('X-Deadline-Ms'))
+        
+        # Option 0: Documents already in the store, against a stored JD
+        # document or a registered job profile
+        data = request.get_json(silent=True) or {}
+        if 'resume_id' in data:
+            resume_doc = document_store.get(data.get('resume_id'))
+            if 'job_profile_id' in data:
+                jd = job_profile_store.get(data.get('job_profile_id'))
+            else:
+                jd = document_store.get(data.get('jd_id'))
+            if resume_doc is None or jd is None:
+                return jsonify({
+                    "error": "Unknown resume_id, jd_id or job_profile_id"
+                }), 404
+            
+            jd_text = jd.jd_text if isinstance(jd, JobProfile) else jd.cleaned_text
+            capture_inputs(
+                resume_doc.cleaned_text,
+                jd_text,
+                deadline_ms=deadline.budget_ms if deadline else None
+            )
+            cost = admission.estimate(resume_doc.cleaned_text, jd_text)
+            etag = analysis_key(resume_doc.cleaned_text, jd_text)
+            if isinstance(jd, JobProfile):
+                run = lambda: analyze_candidate(resume_doc, jd, deadline)
+            else:
+                run = lambda: matcher_service.analyze_documents(resume_doc, jd, deadline)
+            return etag_response(etag, run, cost)
+        
+        resume_text, jd_text, error = load_request_texts()
+        if error:
+            return error
+        
+        return cached_analysis_response(resume_text, jd_text, deadline)
+    
+    except AdmissionError as e:
+        return admission_response(e)
+    except Exception as e:
+        return error_response(e)
+
+
+def sse_event(event: str, data) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {dumps(data).decode('utf-8')}\n\n"
+
+
+@app.route('/analyze/stream', methods=['POST'])
+def analyze_stream():
+    """
+    Streaming analysis endpoint (Server-Sent Events)
+    Sends each stage's partial result as soon as it completes,
+    ending with a 'result' event holding the full analysis
+    """
+    try:
+        resume_text, jd_text, error = load_request_texts()
+        if error:
+            return error
+        capture_inputs(resume_text, jd_text)
+        
+        # Admission is held until the stream closes
+        client, cost = client_id(), admission.estimate(resume_text, jd_text)
+        admission.acquire(client, cost)
+    except AdmissionError as e:
+        return admission_response(e)
+    except Exception as e:
+        return error_response(e)
+    
+    # The body is produced after this view returns; stages run in a copy
+    # of the request's context so the capture still sees their timings
+    capture = g.pop('capture', None)
+    context = capture.detach() if capture is not None else contextvars.copy_context()
+    
+    def generate():
+        start = time.perf_counter()
+        stages = matcher_service.analyze_stream(resume_text, jd_text)
+        try:
+            while True:
+                item = context.run(next, stages, None)
+                if item is None:
+                    break
+                stage, payload = item
+                yield sse_event(stage, {
+                    "stage": stage,
+                    "data": payload,
+                    "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+                })
+        except Exception as e:
+            error = {
+                "error": str(e),
+                "type": type(e).__name__
+            }
+            if capture is not None:
+                capture.fail(e)
+                error["capture_id"] = capture.id
+            yield sse_event('error', error)
+        finally:
+            request_capture.finish(capture, 200)
+    
+    response = Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+    response.call_on_close(lambda: admission.release(client, cost))
+    # Streams closed before their first chunk never reach generate's finally
+    response.call_on_close(lambda: request_capture.finish(capture, 200))
+    return response
+
+
+@app.route('/analyze/quick', methods=['POST'])
+def quick_analyze():
+    """
+    Quick analysis endpoint for testing
+    Uses files from assets/ directory
+    """
+    try:
+        deadline = Deadline.from_value(request.headers.get('X-Deadline-Ms'))
+        resume_text, jd_text, error = matcher_service.read_assets()
+        if error:
+            return jsonify({"error": error}), 200
+        
+        return cached_analysis_response(resume_text, jd_text, deadline)
     
+    except AdmissionError as e:
+        return admission_response(e)
+    except Exception as e:
+        return error_response(e)
+
+
+@app.route('/analyze/incremental', methods=['POST'])
+def incremental_analyze():
+    """
+    Incremental analysis for live resume editing
+    Reuses the session's previous state; only edited sentences are re-processed
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        resume_text = data.get('resume_text')
+        jd_text = data.get('job_description')
+        
+        if not resume_text or not jd_text:
+            return jsonify({
+                "error": "Please provide 'resume_text' and 'job_description'"
+            }), 400
+        
+        capture_inputs(resume_text, jd_text, session_id=data.get('session_id'))
+        cost = admission.estimate(resume_text, jd_text)
+        with admission.admit(client_id(), cost):
+            results = incremental_analyzer.analyze(
+                resume_text, 
+                jd_text, 
+                session_id=data.get('session_id')
+            )
+        return result_response(results), 200
+    
+    except AdmissionError as e:
+        return admission_response(e)
+    except Exception as e:
+        return error_response(e)
+
+
+@app.route('/analyze/incremental/<session_id>', methods=['DELETE'])
+def end_incremental_session(session_id):
+    """Discard an incremental analysis session"""
+    if not incremental_analyzer.drop_session(session_id):
+        return jsonify({"error": "Session not found"}), 404
+    return jsonify({"status": "deleted", "session_id": session_id}), 200
+
+
+if __name__ == '__main__':
     app.run(
         host='0.0.0.0',
         port=5000,
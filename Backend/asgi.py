@@ -0,0 +1,387 @@
+"""
+ASGI Application - Async Entry Point
+Async request handling with analysis offloaded to bounded executors
+
+Run:
+    uvicorn asgi:app --workers 2
+    gunicorn asgi:app -k uvicorn.workers.UvicornWorker
+
+Hot endpoints (health, uploads, analysis, streaming) are native async;
+every other route is served by the Flask app through a WSGI bridge.
+"""
+
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.datastructures import UploadFile
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+
+try:
+    from a2wsgi import WSGIMiddleware
+except ImportError:
+    from starlette.middleware.wsgi import WSGIMiddleware
+
+from app import (
+    app as flask_app,
+    admission,
+    capture_inputs,
+    matcher_service,
+    document_store,
+    feature_store,
+    job_profile_store,
+    request_capture,
+    sse_event,
+    thread_budget
+)
+from services.admission import AdmissionError, client_identity
+from services.deadline import Deadline
+from services.job_profile import JobProfile
+from services.request_capture import current_capture
+from services.result_cache import analysis_key
+from instance.config import Config
+
+
+# CPU-bound analysis stages run here, never on the event loop
+analysis_executor = ThreadPoolExecutor(
+    max_workers=thread_budget.analysis_workers,
+    thread_name_prefix='asgi-analysis'
+)
+
+# Bounds analyses admitted to the executor; the rest wait without
+# blocking the loop, so /health always answers
+_analysis_slots = None
+
+
+def analysis_slots() -> asyncio.Semaphore:
+    global _analysis_slots
+    if _analysis_slots is None:
+        _analysis_slots = asyncio.Semaphore(Config.ASGI_MAX_PENDING)
+    return _analysis_slots
+
+
+async def run_blocking(fn, *args, **kwargs):
+    """Run a blocking call (disk I/O, store lookups) on the analysis executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(analysis_executor, partial(fn, *args, **kwargs))
+
+
+async def extract_upload(upload: UploadFile):
+    """Read an upload asynchronously and extract its text off the loop"""
+    data = await upload.read()
+    # Waits on the parser pool's processes, not an analysis thread
+    return await asyncio.to_thread(admission.extract, data, upload.filename)
+
+
+def client_id(request: Request) -> str:
+    """Client identity for per-client limits (see app.client_id)"""
+    return client_identity(request.client.host if request.client else None, request.headers)
+
+
+def admit_request(request: Request):
+    """Size and rate checks before the body is read (raises AdmissionError)"""
+    length = request.headers.get('content-length')
+    if length and length.isdigit() and int(length) > Config.MAX_CONTENT_LENGTH:
+        admission.counters["rejected_too_large"] += 1
+        raise AdmissionError(413, 'too_large', f"Request body exceeds {Config.MAX_CONTENT_LENGTH} bytes")
+    admission.check_rate(client_id(request))
+
+
+def admission_response(e: AdmissionError) -> JSONResponse:
+    headers = {}
+    if e.retry_after is not None:
+        headers['Retry-After'] = str(max(1, int(round(e.retry_after))))
+    return JSONResponse(e.to_dict(), status_code=e.status, headers=headers)
+
+
+def error_response(e: Exception) -> JSONResponse:
+    if isinstance(e, AdmissionError):
+        return admission_response(e)
+    body = {
+        "error": str(e),
+        "type": type(e).__name__
+    }
+    capture = current_capture()
+    if capture is not None:
+        capture.fail(e)
+        body["capture_id"] = capture.id
+    return JSONResponse(body, status_code=500)
+
+
+def captured(endpoint):
+    """
+    Observe an analysis endpoint with slow-request capture (see app.py)
+    Each request runs in its own task context; streams finish their
+    capture when the body ends
+    """
+    async def observe(request: Request) -> Response:
+        capture = request_capture.start(endpoint.__name__)
+        response = await endpoint(request)
+        if capture is not None and not isinstance(response, StreamingResponse):
+            # The spool write happens off the loop
+            if await asyncio.to_thread(request_capture.finish, capture, response.status_code):
+                response.headers['X-Capture-Id'] = capture.id
+        return response
+    return observe
+
+
+async def load_request_texts(request: Request):
+    """
+    Async counterpart of app.load_request_texts
+    Returns: (resume_text, jd_text, None) or (None, None, error_response)
+    """
+    content_type = request.headers.get('content-type', '')
+
+    # Option 1: Default files from assets/
+    if content_type.startswith('application/json'):
+        data = await request.json()
+        if isinstance(data, dict) and 'use_assets' in data:
+            resume_text, jd_text, error = await run_blocking(matcher_service.read_assets)
+            if error:
+                return None, None, JSONResponse({"error": error}, status_code=404)
+            return resume_text, jd_text, None
+
+    # Option 2: File upload
+    elif content_type.startswith('multipart/form-data'):
+        form = await request.form()
+        resume_file = form.get('resume')
+        jd_file = form.get('job_description')
+        if isinstance(resume_file, UploadFile) and isinstance(jd_file, UploadFile):
+            resume_text, jd_text = await asyncio.gather(
+                extract_upload(resume_file),
+                extract_upload(jd_file)
+            )
+            if not resume_text or not jd_text:
+                return None, None, JSONResponse({
+                    "error": "Failed to extract text from files"
+                }, status_code=400)
+            return resume_text, jd_text, None
+
+    return None, None, JSONResponse({
+        "error": "Please provide either 'use_assets': true or upload files"
+    }, status_code=400)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get('if-none-match', '')
+    tags = {t.strip().removeprefix('W/').strip('"') for t in header.split(',')}
+    return etag in tags or '*' in tags
+
+
+async def etag_response(request: Request, etag: str, run_analysis, cost) -> Response:
+    """Answer 304 for a matching If-None-Match, else run and tag the analysis"""
+    headers = {'ETag': f'"{etag}"'}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    # Queueing for the cost budget blocks, so it waits off the loop
+    client = client_id(request)
+    await asyncio.to_thread(admission.acquire, client, cost)
+    try:
+        async with analysis_slots():
+            results = await run_analysis()
+    finally:
+        admission.release(client, cost)
+
+    # Degraded (deadline-limited) results are not the canonical analysis
+    if results.degraded:
+        return Response(results.to_json(), media_type='application/json')
+
+    headers['Cache-Control'] = 'private, no-cache'
+    return Response(results.to_json(), media_type='application/json', headers=headers)
+
+
+async def health_check(request: Request):
+    """Health check endpoint (never waits on analysis)"""
+    return JSONResponse({
+        "status": "healthy",
+        "service": "ATS Resume Matcher API",
+        "version": "1.0.0",
+        "mode": "asgi"
+    })
+
+
+async def upload_document(request: Request):
+    """Store a document - see app.upload_document"""
+    try:
+        admit_request(request)
+        content_type = request.headers.get('content-type', '')
+        if content_type.startswith('multipart/form-data'):
+            form = await request.form()
+            upload = form.get('file')
+            if not isinstance(upload, UploadFile):
+                return JSONResponse({"error": "Please provide a 'file' upload"}, status_code=400)
+            data = await upload.read()
+            document, created = await run_blocking(
+                document_store.put_file, data, upload.filename, admission.extract
+            )
+        else:
+            data = await request.json() if content_type.startswith('application/json') else {}
+            if not data.get('text'):
+                return JSONResponse({
+                    "error": "Please provide a 'file' upload or JSON 'text'"
+                }, status_code=400)
+            document, created = await run_blocking(
+                document_store.put_text, data['text'], data.get('filename')
+            )
+
+        if document is None:
+            return JSONResponse({
+                "error": "Failed to extract text from document"
+            }, status_code=400)
+
+        return JSONResponse(document.summary(), status_code=201 if created else 200)
+
+    except Exception as e:
+        return error_response(e)
+
+
+async def analyze_resume(request: Request):
+    """Main analysis endpoint - see app.analyze_resume"""
+    try:
+        # Budget starts on arrival, so queueing and parsing count against it
+        deadline = Deadline.from_value(request.headers.get('x-deadline-ms'))
+        admit_request(request)
+
+        # Option 0: Stored documents / registered job profile
+        if request.headers.get('content-type', '').startswith('application/json'):
+            data = await request.json()
+            if isinstance(data, dict) and 'resume_id' in data:
+                resume_doc = await run_blocking(document_store.get, data.get('resume_id'))
+                if 'job_profile_id' in data:
+                    jd = await run_blocking(job_profile_store.get, data.get('job_profile_id'))
+                else:
+                    jd = await run_blocking(document_store.get, data.get('jd_id'))
+                if resume_doc is None or jd is None:
+                    return JSONResponse({
+                        "error": "Unknown resume_id, jd_id or job_profile_id"
+                    }, status_code=404)
+
+                jd_text = jd.jd_text if isinstance(jd, JobProfile) else jd.cleaned_text
+                capture_inputs(
+                    resume_doc.cleaned_text,
+                    jd_text,
+                    deadline_ms=deadline.budget_ms if deadline else None
+                )
+                cost = admission.estimate(resume_doc.cleaned_text, jd_text)
+                etag = analysis_key(resume_doc.cleaned_text, jd_text)
+                async def run():
+                    results = await matcher_service.analyze_documents_async(
+                        resume_doc, jd, executor=analysis_executor, deadline=deadline
+                    )
+                    if isinstance(jd, JobProfile):
+                        await run_blocking(feature_store.add, jd.id, resume_doc.id, results.features)
+                    return results
+
+                return await etag_response(request, etag, run, cost)
+
+        resume_text, jd_text, error = await load_request_texts(request)
+        if error:
+            return error
+
+        capture_inputs(resume_text, jd_text, deadline_ms=deadline.budget_ms if deadline else None)
+        cost = admission.estimate(resume_text, jd_text)
+        etag = matcher_service.analysis_key(resume_text, jd_text)
+        return await etag_response(request, etag, lambda: matcher_service.analyze_async(
+            resume_text, jd_text, executor=analysis_executor, deadline=deadline
+        ), cost)
+
+    except Exception as e:
+        return error_response(e)
+
+
+async def analyze_stream(request: Request):
+    """Streaming analysis (Server-Sent Events) - see app.analyze_stream"""
+    try:
+        admit_request(request)
+        resume_text, jd_text, error = await load_request_texts(request)
+        if error:
+            return error
+        capture_inputs(resume_text, jd_text)
+
+        # Admission is held until the stream finishes
+        client, cost = client_id(request), admission.estimate(resume_text, jd_text)
+        await asyncio.to_thread(admission.acquire, client, cost)
+    except Exception as e:
+        return error_response(e)
+
+    # Stages run on executor threads in this request's context, so the
+    # capture still sees their timings
+    capture = current_capture()
+    context = contextvars.copy_context()
+    released = []
+
+    def release():
+        # From the stream's finally or the background task, whichever runs
+        if not released:
+            released.append(True)
+            admission.release(client, cost)
+
+    async def generate():
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            async with analysis_slots():
+                stages = matcher_service.analyze_stream(resume_text, jd_text)
+                while True:
+                    # Each stage is awaited off the loop
+                    item = await loop.run_in_executor(analysis_executor, context.run, next, stages, None)
+                    if item is None:
+                        break
+                    stage, payload = item
+                    yield sse_event(stage, {
+                        "stage": stage,
+                        "data": payload,
+                        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+                    })
+        except Exception as e:
+            error = {
+                "error": str(e),
+                "type": type(e).__name__
+            }
+            if capture is not None:
+                capture.fail(e)
+                error["capture_id"] = capture.id
+            yield sse_event('error', error)
+        finally:
+            release()
+            request_capture.finish(capture, 200)
+
+    return StreamingResponse(
+        generate(),
+        media_type='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        },
+        background=BackgroundTask(release)
+    )
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    analysis_executor.shutdown(wait=False, cancel_futures=True)
+
+
+app = Starlette(
+    routes=[
+        Route('/health', health_check, methods=['GET']),
+        Route('/documents', upload_document, methods=['POST']),
+        Route('/analyze', captured(analyze_resume), methods=['POST']),
+        Route('/analyze/stream', captured(analyze_stream), methods=['POST']),
+        # Everything else: the Flask app
+        Mount('/', WSGIMiddleware(flask_app))
+    ],
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+    lifespan=lifespan
+)
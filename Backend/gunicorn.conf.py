@@ -0,0 +1,17 @@
+"""
+Gunicorn Settings
+Worker layout taken from the CPU thread budget in Config
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from instance.config import Config
+
+workers = Config.WEB_WORKERS
+threads = Config.REQUEST_THREADS
+worker_class = 'gthread' if threads > 1 else 'sync'
@@ -3,6 +3,7 @@ Configuration Settings
 Stores all environment variables and constants
 """
 
+import os
 from pathlib import Path
 
 class Config:
@@ -11,8 +12,8 @@ class Config:
     # Project paths
     BASE_DIR = Path(__file__).parent.parent.parent  # SkillIssue/
     ASSETS_DIR = BASE_DIR / "assets"
-    UPLOAD_FOLDER = BASE_DIR / "backend" / "uploads"
     MODELS_DIR = BASE_DIR / "backend" / "models"
+    BACKEND_DIR = Path(__file__).parent.parent
     
     # API Configuration
     DEBUG = True
@@ -23,9 +24,23 @@ class Config:
     
     # Model Configuration
     SENTENCE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+    # Per-stage encoders (services/stage_models.py); stages left out use
+    # SENTENCE_MODEL. Stages: 'keywords' (term matching and the skill
+    # lexicon), 'highlights', 'sections', 'document' (overall similarity).
+    # Each model loads once per process. Compare combinations with
+    # tools/benchmark_models.py, e.g.
+    # {'keywords': 'sentence-transformers/static-retrieval-mrl-en-v1'}
+    STAGE_MODELS = {}
+    
+    # Skill Lexicon (embeddings built offline by tools/build_skill_lexicon.py)
+    USE_SKILL_LEXICON = True
+    SKILL_LEXICON_PATH = BACKEND_DIR / "models" / "skill_lexicon.json"
+    SKILL_EMBEDDINGS_PATH = BACKEND_DIR / "models" / "skill_embeddings.npy"
     
     # Analysis Parameters
     TOP_KEYWORDS = 100
+    # Collapse stem variants and sub-terms of longer terms before encoding
+    CANONICALIZE_TERMS = True
     SIMILARITY_THRESHOLD = 0.65
     TOP_HIGHLIGHTS = 5
     
@@ -37,6 +52,123 @@ class Config:
         'experience': 0.10
     }
     
+    # Bump when analysis logic changes so cached results are invalidated
+    SCORING_VERSION = "5"
+    
+    # Whole-analysis result cache: 'memory' (per worker), 'sqlite' (shared
+    # by workers on one host) or None to disable
+    RESULT_CACHE_BACKEND = 'memory'
+    RESULT_CACHE_PATH = BACKEND_DIR / "instance" / "result_cache.sqlite3"
+    RESULT_CACHE_TTL = 3600  # seconds
+    RESULT_CACHE_MAX_ENTRIES = 1024
+    
+    # Content-addressed document store (POST /documents)
+    DOCUMENT_STORE_DIR = BACKEND_DIR / "instance" / "documents"
+    DOCUMENT_STORE_MAX_CACHED = 256
+    
+    # Registered job profiles (POST /jobs-descriptions)
+    JOB_PROFILE_DIR = BACKEND_DIR / "instance" / "job_profiles"
+    JOB_PROFILE_MAX_CACHED = 128
+    
+    # Talent pool index (hybrid resume search)
+    TALENT_POOL_DIR = BACKEND_DIR / "instance" / "talent_pool"
+    TALENT_POOL_CHUNK_SENTENCES = 5
+    TALENT_POOL_MAX_CHUNKS = 4
+    TALENT_POOL_VECTOR_WEIGHT = 0.6  # remainder is the lexical score
+    TALENT_POOL_TOP_K = 20
+    
+    # Stored scoring features per job profile (rescoring without inference)
+    FEATURE_STORE_DIR = BACKEND_DIR / "instance" / "features"
+    RESCORE_TOP_K = 100
+    
+    # Sharded talent pool search: local shard processes, or remote nodes
+    # ("host:port", each running tools/search_shard.py) when listed
+    SEARCH_SHARDS = 0  # 0 = score in-process
+    SEARCH_SHARD_ADDRESSES = []
+    SEARCH_SHARD_TIMEOUT = 2.0  # seconds per query
+    # Shared secret for remote shards, from the environment only (never
+    # committed). Local shards get a random per-process key instead
+    SEARCH_SHARD_AUTHKEY = os.environ.get('SEARCH_SHARD_AUTHKEY', '').encode() or None
+    
+    # CPU thread budget (services/thread_budget.py): one layout for
+    # workers, request concurrency, torch intra-op and BLAS threads.
+    # Run tools/autotune_threads.py to pick values for a machine.
+    CPU_CORES = None        # None = cores available to the process
+    WEB_WORKERS = 1         # processes (gunicorn.conf.py reads this)
+    REQUEST_THREADS = 4     # concurrent analyses per worker
+    TORCH_THREADS = None    # None = cores / (workers x request threads)
+    BLAS_THREADS = None     # None = same as TORCH_THREADS
+    
+    # Analysis stage graph (services/stage_graph.py): independent stages
+    # run concurrently; outputs are memoized by input hash
+    STAGE_WORKERS = None  # None = REQUEST_THREADS
+    STAGE_MEMO_MAX_ENTRIES = 256
+    
+    # ASGI serving mode (asgi.py)
+    ASGI_ANALYSIS_WORKERS = None  # analysis threads (None = REQUEST_THREADS)
+    ASGI_MAX_PENDING = 32      # analyses admitted at once; others wait
+    
+    # Admission control (services/admission.py). Cost units: roughly one
+    # per 1k characters plus a share per sentence (highlights scale with
+    # sentences); requests that do not fit the in-flight budget queue
+    MAX_CONTENT_LENGTH = 10 * 1024 * 1024  # upload bytes (Flask answers 413)
+    MAX_PDF_PAGES = 20
+    MAX_RESUME_CHARS = 60000
+    MAX_JD_CHARS = 30000
+    ADMISSION_COST_PER_1K_CHARS = 1.0
+    ADMISSION_COST_PER_SENTENCE = 0.1
+    MAX_REQUEST_COST = 150           # larger requests are rejected (413)
+    ADMISSION_COST_BUDGET = 200      # in-flight cost per worker
+    ADMISSION_MAX_QUEUED = 16        # beyond this: 503
+    ADMISSION_QUEUE_TIMEOUT = 10     # seconds a queued request may wait
+    # Clients are keyed by remote address. A client header (e.g.
+    # 'X-Client-Id') is honoured only from ADMISSION_TRUSTED_PROXIES
+    # (addresses or CIDRs), since any caller can set it
+    ADMISSION_CLIENT_HEADER = None
+    ADMISSION_TRUSTED_PROXIES = []
+    CLIENT_MAX_CONCURRENT = 4
+    CLIENT_RATE_PER_MINUTE = 120     # 0 = no rate limit
+    CLIENT_RATE_BURST = 20
+    
+    # Document parsing (services/parser_pool.py): PDF and DOCX text is
+    # extracted in child processes, so a malformed file cannot bloat or
+    # crash the worker holding the model
+    PARSER_WORKERS = 2               # processes per web worker (0 = parse in-process)
+    PARSER_MAX_TASKS = 50            # documents before a process is replaced
+    PARSER_MAX_RSS_MB = 512          # replaced when a task leaves it above this
+    PARSER_MEMORY_LIMIT_MB = 2048    # address-space cap; a task past it fails
+    PARSER_CPU_SECONDS = 20          # CPU per document
+    PARSER_TIMEOUT = 30              # wall-clock seconds per document
+    PARSER_QUEUE_TIMEOUT = 10        # wait for a free process, then 503
+    
+    # Slow-request capture (services/request_capture.py): opt-in spool of
+    # analysis requests slower than the threshold, and failed ones, for
+    # offline replay with tools/replay_captures.py. Captures hold resume
+    # text; CAPTURE_REDACTOR ('module:function', text -> text) masks it,
+    # e.g. 'services.request_capture:redact_contact_info'
+    CAPTURE_SLOW_REQUESTS = False
+    CAPTURE_THRESHOLD_MS = 5000
+    CAPTURE_ERRORS = True
+    CAPTURE_DIR = BACKEND_DIR / "instance" / "captures"
+    CAPTURE_MAX_FILES = 200
+    CAPTURE_REDACTOR = None
+    
+    # Incremental Analysis Sessions
+    INCREMENTAL_MAX_SESSIONS = 256
+    INCREMENTAL_SESSION_TTL = 1800  # seconds
+    
+    # Latency budgets: default per-request deadline (None = no deadline;
+    # clients can send X-Deadline-Ms) and starting cost estimates for
+    # stages, refined from observed timings
+    ANALYSIS_DEADLINE_MS = None
+    STAGE_COST_ESTIMATES_MS = {
+        'top_resume_keywords': 5,
+        'section_match_analysis': 60,
+        'section_match_analysis:approximate': 1,
+        'relevant_experience_highlights': 150,
+        'relevant_experience_highlights:approximate': 5
+    }
+    
     # ATS Score Thresholds
     ATS_THRESHOLDS = {
         'excellent': 70,
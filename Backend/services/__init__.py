@@ -3,5 +3,6 @@ Service layer for business logic orchestration
 """
 
 from .matcher_service import MatcherService
+from .incremental_analyzer import IncrementalAnalyzer
 
-__all__ = ['MatcherService']
\ No newline at end of file
+__all__ = ['MatcherService', 'IncrementalAnalyzer']
\ No newline at end of file
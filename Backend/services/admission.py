@@ -0,0 +1,254 @@
+"""
+Admission Control
+Estimate request cost up front and keep expensive or abusive traffic out
+"""
+
+import io
+import ipaddress
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+from services.parser_pool import ParseError, ParserPool
+from utils.file_utils import FileUtils
+from instance.config import Config
+
+
+class AdmissionError(Exception):
+    """A request refused by admission control"""
+
+    def __init__(self, status: int, reason: str, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+        self.retry_after = retry_after
+
+    def to_dict(self) -> Dict:
+        return {"error": str(self), "reason": self.reason}
+
+
+def client_identity(remote_addr: Optional[str], headers) -> str:
+    """
+    Client identity for per-client limits: the remote address, or
+    ADMISSION_CLIENT_HEADER when the request comes from a trusted proxy
+    """
+    remote_addr = remote_addr or 'unknown'
+    header = Config.ADMISSION_CLIENT_HEADER
+    if header and headers.get(header) and is_trusted_proxy(remote_addr):
+        return headers.get(header)
+    return remote_addr
+
+
+def is_trusted_proxy(remote_addr: str) -> bool:
+    try:
+        address = ipaddress.ip_address(remote_addr)
+    except ValueError:
+        return False
+    for proxy in Config.ADMISSION_TRUSTED_PROXIES or []:
+        try:
+            if address in ipaddress.ip_network(proxy, strict=False):
+                return True
+        except ValueError:
+            print(f"Ignoring invalid ADMISSION_TRUSTED_PROXIES entry: {proxy}")
+    return False
+
+
+class RequestCost:
+    """Size of one analysis request, measured before the pipeline runs"""
+
+    SENTENCE_PATTERN = re.compile(r'[.!?]+')
+
+    def __init__(self, resume_text: str, jd_text: str):
+        self.resume_chars = len(resume_text or '')
+        self.jd_chars = len(jd_text or '')
+        self.sentences = (
+            len(self.SENTENCE_PATTERN.split(resume_text or '')) +
+            len(self.SENTENCE_PATTERN.split(jd_text or ''))
+        )
+        # Term extraction scales with characters, highlights with sentences
+        self.cost = round(
+            (self.resume_chars + self.jd_chars) / 1000 * Config.ADMISSION_COST_PER_1K_CHARS +
+            self.sentences * Config.ADMISSION_COST_PER_SENTENCE,
+            2
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            "resume_chars": self.resume_chars,
+            "jd_chars": self.jd_chars,
+            "sentences": self.sentences,
+            "cost": self.cost
+        }
+
+
+class AdmissionController:
+    """
+    Admission layer in front of MatcherService
+    - hard limits: PDF pages, characters, estimated cost (413)
+    - per-client token-bucket rate limit and concurrency cap (429)
+    - in-flight cost budget per worker: requests that do not fit wait
+      in a bounded queue, then get 503 with Retry-After
+    - documents are parsed in the sandboxed parser pool when given one;
+      its failures are refused like any other oversized input
+    """
+
+    def __init__(self, parser: Optional[ParserPool] = None):
+        self.parser = parser
+        self._cond = threading.Condition()
+        self._in_flight_cost = 0.0
+        self._in_flight = 0
+        self._queued = 0
+        self._client_active: Dict[str, int] = defaultdict(int)
+        self._buckets: Dict[str, list] = {}
+
+        self.counters = defaultdict(int)
+
+    # ------------------------------------------------------------------
+    # Limits checked before any parsing / analysis
+    # ------------------------------------------------------------------
+
+    def _reject(self, status: int, reason: str, message: str, retry_after: Optional[float] = None):
+        with self._cond:
+            self.counters[f"rejected_{reason}"] += 1
+        raise AdmissionError(status, reason, message, retry_after)
+
+    def check_rate(self, client_id: str):
+        """Token bucket: CLIENT_RATE_PER_MINUTE sustained, CLIENT_RATE_BURST burst"""
+        rate = Config.CLIENT_RATE_PER_MINUTE / 60.0
+        burst = Config.CLIENT_RATE_BURST
+        if not rate:
+            return
+
+        now = time.monotonic()
+        with self._cond:
+            tokens, last = self._buckets.get(client_id, (burst, now))
+            tokens = min(burst, tokens + (now - last) * rate)
+            if tokens >= 1:
+                self._buckets[client_id] = [tokens - 1, now]
+                allowed = True
+            else:
+                self._buckets[client_id] = [tokens, now]
+                allowed = False
+
+            # Forget idle clients (their buckets are full anyway)
+            if len(self._buckets) > 10000:
+                idle = now - burst / rate
+                self._buckets = {c: b for c, b in self._buckets.items() if b[1] > idle}
+
+        if not allowed:
+            self._reject(429, 'rate_limited', "Too many requests", retry_after=round((1 - tokens) / rate, 1))
+
+    def check_pdf(self, data: bytes, filename: Optional[str]):
+        """Refuse PDFs over MAX_PDF_PAGES before extracting any text"""
+        if Path(filename or '').suffix.lower() != '.pdf' or not Config.MAX_PDF_PAGES:
+            return
+        pages = FileUtils.count_pdf_pages(io.BytesIO(data))
+        if pages is not None and pages > Config.MAX_PDF_PAGES:
+            self._reject(413, 'too_large', f"PDF has {pages} pages (limit {Config.MAX_PDF_PAGES})")
+
+    def check_pdf_path(self, path: str):
+        with open(path, 'rb') as f:
+            self.check_pdf(f.read(), path)
+
+    def _parse_error(self, e: ParseError):
+        self._reject(e.status, e.reason, str(e), e.retry_after)
+
+    def extract(self, data: bytes, filename: Optional[str]) -> Optional[str]:
+        """Page-checked text extraction (DocumentStore.put_file extract hook)"""
+        if self.parser is not None and self.parser.handles(filename):
+            # Pages are counted in the same worker trip, before extraction
+            try:
+                return self.parser.extract(data, filename, Config.MAX_PDF_PAGES)
+            except ParseError as e:
+                self._parse_error(e)
+        self.check_pdf(data, filename)
+        return FileUtils.read_bytes(data, filename)
+
+    def extract_path(self, path: str) -> Optional[str]:
+        """Page-checked text extraction of a file on disk"""
+        if self.parser is not None and self.parser.handles(path):
+            try:
+                return self.parser.extract_path(path, Config.MAX_PDF_PAGES)
+            except ParseError as e:
+                self._parse_error(e)
+        self.check_pdf_path(path)
+        return FileUtils.read_file(path)
+
+    def estimate(self, resume_text: str, jd_text: str) -> RequestCost:
+        """Measure a request and refuse it if it exceeds the hard limits"""
+        cost = RequestCost(resume_text, jd_text)
+        if cost.resume_chars > Config.MAX_RESUME_CHARS:
+            self._reject(413, 'too_large', f"Resume has {cost.resume_chars} characters (limit {Config.MAX_RESUME_CHARS})")
+        if cost.jd_chars > Config.MAX_JD_CHARS:
+            self._reject(413, 'too_large', f"Job description has {cost.jd_chars} characters (limit {Config.MAX_JD_CHARS})")
+        if cost.cost > Config.MAX_REQUEST_COST:
+            self._reject(413, 'too_large', f"Estimated cost {cost.cost} exceeds {Config.MAX_REQUEST_COST}")
+        return cost
+
+    # ------------------------------------------------------------------
+    # Concurrency
+    # ------------------------------------------------------------------
+
+    def acquire(self, client_id: str, cost: RequestCost):
+        """Take a client slot and cost budget, queueing while over budget"""
+        with self._cond:
+            if self._client_active[client_id] >= Config.CLIENT_MAX_CONCURRENT:
+                self.counters["rejected_concurrency"] += 1
+                raise AdmissionError(429, 'concurrency', "Too many concurrent requests for this client", 1)
+
+            def fits():
+                # An oversized (but allowed) request runs alone
+                return (
+                    self._in_flight_cost + cost.cost <= Config.ADMISSION_COST_BUDGET
+                    or self._in_flight == 0
+                )
+
+            if not fits():
+                if self._queued >= Config.ADMISSION_MAX_QUEUED:
+                    self.counters["rejected_overloaded"] += 1
+                    raise AdmissionError(503, 'overloaded', "Server is at capacity", Config.ADMISSION_QUEUE_TIMEOUT)
+
+                self._queued += 1
+                self.counters["queued"] += 1
+                admitted = self._cond.wait_for(fits, timeout=Config.ADMISSION_QUEUE_TIMEOUT)
+                self._queued -= 1
+                if not admitted:
+                    self.counters["rejected_queue_timeout"] += 1
+                    raise AdmissionError(503, 'queue_timeout', "Timed out waiting for capacity", Config.ADMISSION_QUEUE_TIMEOUT)
+
+            self._in_flight_cost += cost.cost
+            self._in_flight += 1
+            self._client_active[client_id] += 1
+            self.counters["admitted"] += 1
+
+    def release(self, client_id: str, cost: RequestCost):
+        with self._cond:
+            self._in_flight_cost -= cost.cost
+            self._in_flight -= 1
+            self._client_active[client_id] -= 1
+            if not self._client_active[client_id]:
+                del self._client_active[client_id]
+            self._cond.notify_all()
+
+    @contextmanager
+    def admit(self, client_id: str, cost: RequestCost):
+        """Hold admission for the duration of an analysis"""
+        self.acquire(client_id, cost)
+        try:
+            yield
+        finally:
+            self.release(client_id, cost)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return dict(
+                self.counters,
+                in_flight=self._in_flight,
+                in_flight_cost=round(self._in_flight_cost, 2),
+                queue_depth=self._queued,
+                cost_budget=Config.ADMISSION_COST_BUDGET
+            )
@@ -0,0 +1,122 @@
+"""
+Analysis Result
+Typed result schema shared by every analysis path
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from utils.serialization import dumps, loads, packb, unpackb
+
+
+@dataclass(slots=True)
+class KeywordResult:
+    """Top matched / missing JD keywords"""
+    matched: List[str]
+    missing: List[str]
+
+
+@dataclass(slots=True)
+class ExperienceResult:
+    """Required vs. candidate years, with the candidate's role timeline"""
+    required_years: int
+    candidate_years: int
+    timeline: Optional[Dict] = None
+
+
+@dataclass(slots=True)
+class AtsResult:
+    """ATS compatibility score and label"""
+    score_percent: float
+    label: str
+
+
+@dataclass(slots=True)
+class AnalysisResult:
+    """
+    One resume-vs-JD analysis
+    Built by MatcherService.build_results with plain Python numbers;
+    to_dict() is the API response shape
+    """
+    skill_match_score_percent: float
+    experience_match_score_percent: float
+    keywords: KeywordResult
+    experience: ExperienceResult
+    relevant_experience_highlights: List[str]
+    ats: AtsResult
+    top_resume_keywords: List[str]
+    section_match_analysis: Dict[str, str]
+    overall_match_percent: float
+
+    # Raw scoring features (services/scoring_model.FEATURES)
+    features: Optional[Dict[str, float]] = None
+
+    # Present only for deadline-limited / incremental analyses
+    deadline: Optional[Dict] = None
+    incremental: Optional[Dict] = None
+
+    @property
+    def degraded(self) -> bool:
+        """Whether a deadline approximated or skipped any stage"""
+        return bool(self.deadline and self.deadline.get('degraded'))
+
+    def to_dict(self) -> Dict:
+        results = {
+            "skill_match_score_percent": self.skill_match_score_percent,
+            "experience_match_score_percent": self.experience_match_score_percent,
+            "keywords": {
+                "matched": self.keywords.matched,
+                "missing": self.keywords.missing
+            },
+            "experience": {
+                "required_years": self.experience.required_years,
+                "candidate_years": self.experience.candidate_years,
+                "timeline": self.experience.timeline
+            },
+            "relevant_experience_highlights": self.relevant_experience_highlights,
+            "ats": {
+                "score_percent": self.ats.score_percent,
+                "label": self.ats.label
+            },
+            "top_resume_keywords": self.top_resume_keywords,
+            "section_match_analysis": self.section_match_analysis,
+            "overall_match_percent": self.overall_match_percent
+        }
+        if self.features is not None:
+            results["features"] = self.features
+        if self.deadline is not None:
+            results["deadline"] = self.deadline
+        if self.incremental is not None:
+            results["incremental"] = self.incremental
+        return results
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'AnalysisResult':
+        return cls(
+            skill_match_score_percent=data["skill_match_score_percent"],
+            experience_match_score_percent=data["experience_match_score_percent"],
+            keywords=KeywordResult(**data["keywords"]),
+            experience=ExperienceResult(**data["experience"]),
+            relevant_experience_highlights=data["relevant_experience_highlights"],
+            ats=AtsResult(**data["ats"]),
+            top_resume_keywords=data["top_resume_keywords"],
+            section_match_analysis=data["section_match_analysis"],
+            overall_match_percent=data["overall_match_percent"],
+            features=data.get("features"),
+            deadline=data.get("deadline"),
+            incremental=data.get("incremental")
+        )
+
+    def to_json(self) -> bytes:
+        return dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, data) -> 'AnalysisResult':
+        return cls.from_dict(loads(data))
+
+    def to_msgpack(self) -> bytes:
+        return packb(self.to_dict())
+
+    @classmethod
+    def from_msgpack(cls, data: bytes) -> 'AnalysisResult':
+        return cls.from_dict(unpackb(data))
@@ -0,0 +1,89 @@
+"""
+Deadline
+Per-request latency budgets and learned stage costs
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+from instance.config import Config
+
+
+class Deadline:
+    """
+    Latency budget for one request
+    Optional stages ask allows() before running and record how they
+    were degraded, which ends up in the response
+    """
+
+    def __init__(self, budget_ms: float, start: Optional[float] = None):
+        self.budget_ms = float(budget_ms)
+        self.start = start or time.perf_counter()
+        self.degraded: Dict[str, str] = {}
+
+    @classmethod
+    def from_value(cls, value) -> Optional['Deadline']:
+        """Deadline from a header/field value, else Config.ANALYSIS_DEADLINE_MS"""
+        try:
+            budget_ms = float(value) if value not in (None, '') else Config.ANALYSIS_DEADLINE_MS
+        except (TypeError, ValueError):
+            budget_ms = Config.ANALYSIS_DEADLINE_MS
+        return cls(budget_ms) if budget_ms else None
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start) * 1000
+
+    def remaining_ms(self) -> float:
+        return self.budget_ms - self.elapsed_ms()
+
+    def allows(self, estimated_ms: float) -> bool:
+        """Whether a stage expected to take estimated_ms still fits"""
+        return self.remaining_ms() >= estimated_ms
+
+    def degrade(self, stage: str, how: str):
+        """Record a stage as 'approximate' or 'skipped'"""
+        self.degraded[stage] = how
+
+    def summary(self) -> Dict:
+        return {
+            "budget_ms": self.budget_ms,
+            "elapsed_ms": round(self.elapsed_ms(), 2),
+            "degraded": dict(self.degraded)
+        }
+
+
+class StageCosts:
+    """
+    Moving average of each stage's latency on this machine
+    Seeded from Config.STAGE_COST_ESTIMATES_MS until stages have run
+    """
+
+    ALPHA = 0.2
+
+    def __init__(self, defaults: Optional[Dict[str, float]] = None):
+        self._costs = dict(defaults if defaults is not None else Config.STAGE_COST_ESTIMATES_MS)
+        self._lock = threading.Lock()
+
+    def estimate(self, stage: str) -> float:
+        with self._lock:
+            return self._costs.get(stage, 0.0)
+
+    def observe(self, stage: str, elapsed_ms: float):
+        with self._lock:
+            previous = self._costs.get(stage)
+            if previous is None:
+                self._costs[stage] = elapsed_ms
+            else:
+                self._costs[stage] = (1 - self.ALPHA) * previous + self.ALPHA * elapsed_ms
+
+    def time(self, stage: str, fn, *args, **kwargs):
+        """Run fn and fold its latency into the stage's estimate"""
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.observe(stage, (time.perf_counter() - start) * 1000)
+        return result
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {stage: round(ms, 2) for stage, ms in self._costs.items()}
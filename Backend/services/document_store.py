@@ -0,0 +1,201 @@
+"""
+Document Store
+Content-addressed storage of parsed documents and their artifacts
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.file_utils import FileUtils
+from services.result_cache import config_fingerprint
+from instance.config import Config
+
+
+class Document:
+    """A parsed document with precomputed analysis artifacts"""
+
+    def __init__(
+        self,
+        doc_id: str,
+        text: str,
+        cleaned_text: str,
+        terms: List[str],
+        filename: Optional[str] = None,
+        created: Optional[float] = None,
+        fingerprint: Optional[str] = None
+    ):
+        self.id = doc_id
+        self.text = text
+        self.cleaned_text = cleaned_text
+        self.terms = terms
+        self.filename = filename
+        self.created = created or time.time()
+        # Scoring config the artifacts were computed under
+        self.fingerprint = fingerprint or config_fingerprint()
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "created": self.created,
+            "text": self.text,
+            "cleaned_text": self.cleaned_text,
+            "terms": self.terms,
+            "fingerprint": self.fingerprint
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Document':
+        return cls(
+            data['id'],
+            data['text'],
+            data['cleaned_text'],
+            data['terms'],
+            data.get('filename'),
+            data.get('created'),
+            data.get('fingerprint')
+        )
+
+    def summary(self) -> Dict:
+        """Metadata returned by the API (no full text)"""
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "created": self.created,
+            "characters": len(self.text),
+            "terms": len(self.terms)
+        }
+
+
+class DocumentStore:
+    """
+    Content-addressed document store
+    Ids are SHA-256 hashes of the uploaded bytes, so re-uploading the same
+    file is free and concurrent users never share mutable paths.
+    Documents persist as one JSON file each (shared by all workers) with
+    an in-process LRU in front.
+    """
+
+    ID_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+    def __init__(self, matcher_service, root: Path = None, max_cached: int = None):
+        self.matcher = matcher_service
+        self.root = Path(root or Config.DOCUMENT_STORE_DIR)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_cached = max_cached or Config.DOCUMENT_STORE_MAX_CACHED
+        self._cache: 'OrderedDict[str, Document]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def content_id(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def _path(self, doc_id: str) -> Path:
+        return self.root / doc_id[:2] / f"{doc_id}.json"
+
+    def put_file(
+        self,
+        data: bytes,
+        filename: str,
+        extract: Optional[Callable[[bytes, str], Optional[str]]] = None
+    ) -> Tuple[Optional[Document], bool]:
+        """
+        Store an uploaded file (PDF, TXT, ...)
+        extract overrides text extraction (e.g. to run it in a process pool)
+        Returns: (document or None if no text could be extracted, created)
+        """
+        doc_id = self.content_id(data)
+        existing = self.get(doc_id)
+        if existing is not None:
+            return existing, False
+
+        text = (extract or FileUtils.read_bytes)(data, filename)
+
+        if not text:
+            return None, False
+
+        return self._store(doc_id, text, filename), True
+
+    def put_text(self, text: str, filename: Optional[str] = None) -> Tuple[Optional[Document], bool]:
+        """Store pasted text (e.g. a job description)"""
+        text = text.strip()
+        if not text:
+            return None, False
+
+        doc_id = self.content_id(text.encode('utf-8'))
+        existing = self.get(doc_id)
+        if existing is not None:
+            return existing, False
+
+        return self._store(doc_id, text, filename), True
+
+    def _store(self, doc_id: str, text: str, filename: Optional[str]) -> Document:
+        """Precompute artifacts and persist the document"""
+        cleaned_text = self.matcher.preprocessor.clean_text(text)
+        terms = sorted(self.matcher.keyword_extractor.extract_all_terms(cleaned_text, Config.TOP_KEYWORDS))
+        document = Document(doc_id, text, cleaned_text, terms, filename)
+
+        # Atomic write so concurrent workers never read a partial file
+        path = self._path(doc_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(document.to_dict(), f)
+        os.replace(tmp_path, path)
+
+        self._remember(document)
+        return document
+
+    def get(self, doc_id: str) -> Optional[Document]:
+        """Load a document by id (None if unknown or malformed id)"""
+        if not doc_id or not self.ID_PATTERN.match(doc_id):
+            return None
+
+        with self._lock:
+            document = self._cache.get(doc_id)
+            if document is not None:
+                self._cache.move_to_end(doc_id)
+                return document
+
+        path = self._path(doc_id)
+        if not path.exists():
+            return None
+
+        with open(path, 'r', encoding='utf-8') as f:
+            document = Document.from_dict(json.load(f))
+
+        # Artifacts from an older scoring config are recomputed
+        if document.fingerprint != config_fingerprint():
+            return self._store(doc_id, document.text, document.filename)
+
+        self._remember(document)
+        return document
+
+    def delete(self, doc_id: str) -> bool:
+        """Remove a document from the store"""
+        if not doc_id or not self.ID_PATTERN.match(doc_id):
+            return False
+
+        with self._lock:
+            self._cache.pop(doc_id, None)
+
+        path = self._path(doc_id)
+        if not path.exists():
+            return False
+        path.unlink()
+        return True
+
+    def _remember(self, document: Document):
+        with self._lock:
+            self._cache[document.id] = document
+            self._cache.move_to_end(document.id)
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
@@ -0,0 +1,181 @@
+"""
+Feature Store
+Scoring features of analyzed candidates, per job profile, for rescoring
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from services.scoring_model import FEATURES, ScoringModel
+from services.stage_models import stage_models
+from instance.config import Config
+
+
+def feature_fingerprint() -> str:
+    """
+    Settings that change the features themselves (not their weighting)
+    Rows stored under other settings are ignored on load
+    """
+    settings = {
+        'scoring_version': Config.SCORING_VERSION,
+        'model': Config.SENTENCE_MODEL,
+        'stage_models': stage_models(),
+        'skill_lexicon': Config.USE_SKILL_LEXICON,
+        'canonicalize_terms': Config.CANONICALIZE_TERMS,
+        'top_keywords': Config.TOP_KEYWORDS,
+        'similarity_threshold': Config.SIMILARITY_THRESHOLD,
+        'features': FEATURES
+    }
+    encoded = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:16]
+
+
+class CandidateFeatures:
+    """In-memory feature matrix of one job profile's candidates"""
+
+    def __init__(self):
+        self.resume_ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.matrix = np.zeros((0, len(FEATURES)), dtype=np.float64)
+        self.size = 0
+        self.offset = 0  # bytes of the log already applied
+
+    def put(self, resume_id: str, vector: List[float]):
+        row = self.rows.get(resume_id)
+        if row is None:
+            # Grow by doubling so appends stay amortized O(1)
+            if self.size == len(self.matrix):
+                grown = np.zeros((max(64, 2 * len(self.matrix)), len(FEATURES)), dtype=np.float64)
+                grown[:self.size] = self.matrix[:self.size]
+                self.matrix = grown
+            row = self.size
+            self.size += 1
+            self.rows[resume_id] = row
+            self.resume_ids.append(resume_id)
+        self.matrix[row] = vector
+
+    def view(self) -> np.ndarray:
+        return self.matrix[:self.size]
+
+
+class FeatureStore:
+    """
+    Append-only feature logs (<profile_id>.jsonl), one line per analysis
+    The latest line per resume wins; other workers' appends are picked up
+    by tailing the log on each read
+    """
+
+    ID_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root or Config.FEATURE_STORE_DIR)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.fingerprint = feature_fingerprint()
+        self._profiles: Dict[str, CandidateFeatures] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, profile_id: str) -> Path:
+        return self.root / f"{profile_id}.jsonl"
+
+    def _refresh(self, profile_id: str) -> CandidateFeatures:
+        """Apply log lines appended since the last read (caller holds the lock)"""
+        candidates = self._profiles.get(profile_id)
+        if candidates is None:
+            candidates = self._profiles[profile_id] = CandidateFeatures()
+
+        path = self._path(profile_id)
+        if not path.exists() or path.stat().st_size <= candidates.offset:
+            return candidates
+
+        with open(path, 'rb') as f:
+            f.seek(candidates.offset)
+            data = f.read()
+        # Only complete lines; a concurrent writer may be mid-line
+        end = data.rfind(b'\n') + 1
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get('fp') == self.fingerprint:
+                candidates.put(record['resume_id'], record['features'])
+        candidates.offset += end
+        return candidates
+
+    def add(self, profile_id: str, resume_id: str, features: Optional[Dict[str, float]]):
+        """Record a candidate's features for a job profile"""
+        if not features or not self.ID_PATTERN.match(profile_id or ''):
+            return
+        record = {
+            "resume_id": resume_id,
+            "features": [float(features.get(f, 0.0)) for f in FEATURES],
+            "fp": self.fingerprint,
+            "at": time.time()
+        }
+        line = (json.dumps(record) + '\n').encode('utf-8')
+        with self._lock:
+            # One small O_APPEND write per record, safe across workers
+            with open(self._path(profile_id), 'ab') as f:
+                f.write(line)
+
+    def count(self, profile_id: str) -> int:
+        with self._lock:
+            return self._refresh(profile_id).size
+
+    def rescore(
+        self,
+        profile_id: str,
+        model: Optional[ScoringModel] = None,
+        top_k: Optional[int] = None
+    ) -> Dict:
+        """
+        Score every stored candidate with the given weights in one
+        vectorized pass and return them ranked by overall match
+        """
+        start = time.perf_counter()
+        model = model or ScoringModel()
+        with self._lock:
+            candidates = self._refresh(profile_id)
+            matrix = candidates.view().copy()
+            resume_ids = list(candidates.resume_ids)
+
+        scores = model.score(matrix)
+        order = np.argsort(-scores["overall_match"], kind='stable')
+        if top_k:
+            order = order[:top_k]
+
+        results = [
+            {
+                "resume_id": resume_ids[i],
+                "overall_match_percent": float(scores["overall_match"][i]),
+                "skill_match_score_percent": float(scores["skill_match"][i]),
+                "experience_match_score_percent": float(scores["experience_match"][i]),
+                "ats": {
+                    "score_percent": float(scores["ats_score"][i]),
+                    "label": scores["ats_label"][i]
+                }
+            }
+            for i in order
+        ]
+        return {
+            "candidates": len(resume_ids),
+            "results": results,
+            "scoring": model.summary(),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+        }
+
+    def delete(self, profile_id: str) -> bool:
+        with self._lock:
+            self._profiles.pop(profile_id, None)
+            path = self._path(profile_id)
+            if not self.ID_PATTERN.match(profile_id or '') or not path.exists():
+                return False
+            path.unlink()
+            return True
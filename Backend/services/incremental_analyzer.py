@@ -0,0 +1,323 @@
+"""
+Incremental Analyzer
+Re-analyze an edited resume by reusing state from the previous version
+"""
+
+import hashlib
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.keyword_extraction import KeywordExtractor
+from utils.text_preprocessing import TextPreprocessor
+from utils.ats_score import ATSScoreCalculator
+from instance.config import Config
+
+
+def text_hash(text: str) -> str:
+    """Stable hash used to key cached sentence state"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class SentenceState:
+    """Extraction results for one resume sentence"""
+
+    BULLET_PATTERN = re.compile(r'[•\-\*]')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.words = KeywordExtractor.tokenize(text)
+        self.phrase_terms = TextPreprocessor.extract_phrase_terms(text)
+
+        # Per line of the sentence: its words, and the words after its
+        # first bullet marker (None without one)
+        self.lines = []
+        for line in text.split('\n'):
+            match = self.BULLET_PATTERN.search(line)
+            self.lines.append((
+                TextPreprocessor.bullet_words(line),
+                TextPreprocessor.bullet_words(line[match.end():]) if match else None
+            ))
+
+
+class AnalysisSession:
+    """State carried between analyses of one resume being edited"""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.lock = threading.Lock()
+        self.last_used = time.time()
+
+        # JD side (recompiled when the JD changes)
+        self.jd_hash = None
+        self.profile = None
+
+        # Resume side, keyed by content hash
+        self.sentences: Dict[str, SentenceState] = {}
+        self.sentence_embeddings: Dict[str, np.ndarray] = {}
+        self.section_similarities: Dict[str, float] = {}
+        self.term_embeddings: Dict[str, np.ndarray] = {}
+        self.document_similarity: Tuple[Optional[str], float] = (None, 0.0)
+
+
+class IncrementalAnalyzer:
+    """
+    Session-scoped analyzer for live resume editing
+    Only changed sentences are re-extracted and re-embedded
+    """
+
+    # Extraction units: sentence punctuation followed by whitespace.
+    # No extraction pattern matches across this boundary. The separator
+    # is captured to know whether the next sentence starts a new line.
+    SEGMENT_PATTERN = re.compile(r'((?<=[.!?])\s+)')
+
+    def __init__(self, matcher_service, max_sessions: int = None, session_ttl: int = None):
+        self.matcher = matcher_service
+        self.max_sessions = max_sessions or Config.INCREMENTAL_MAX_SESSIONS
+        self.session_ttl = session_ttl or Config.INCREMENTAL_SESSION_TTL
+        self._sessions: 'OrderedDict[str, AnalysisSession]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_session(self, session_id: Optional[str] = None) -> AnalysisSession:
+        """Return an existing session or start a new one"""
+        with self._lock:
+            self._evict_expired()
+
+            session = self._sessions.get(session_id) if session_id else None
+            if session is None:
+                session = AnalysisSession(session_id or uuid.uuid4().hex)
+                self._sessions[session.session_id] = session
+
+                # LRU eviction
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+
+            self._sessions.move_to_end(session.session_id)
+            session.last_used = time.time()
+            return session
+
+    def drop_session(self, session_id: str) -> bool:
+        """Forget a session's state"""
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def _evict_expired(self):
+        cutoff = time.time() - self.session_ttl
+        expired = [sid for sid, s in self._sessions.items() if s.last_used < cutoff]
+        for sid in expired:
+            del self._sessions[sid]
+
+    def analyze(self, resume_text: str, jd_text: str, session_id: Optional[str] = None) -> Dict:
+        """
+        Analyze a resume, reusing everything unchanged since the
+        session's previous call
+
+        Returns:
+            Same results as MatcherService.analyze plus an 'incremental' block
+        """
+        start = time.perf_counter()
+        session = self.get_session(session_id)
+
+        with session.lock:
+            m = self.matcher
+            resume_text = m.preprocessor.clean_text(resume_text)
+            jd_text = m.preprocessor.clean_text(jd_text)
+
+            # 1. JD side
+            jd_changed = self._update_jd(session, jd_text)
+
+            # 2. Diff resume sentences against the previous version
+            parts = self.SEGMENT_PATTERN.split(resume_text)
+            segments, new_lines = [], []
+            for i in range(0, len(parts), 2):
+                if parts[i]:
+                    segments.append(parts[i])
+                    new_lines.append(i > 0 and '\n' in parts[i - 1])
+            previous = session.sentences
+            session.sentences = {}
+            changed = 0
+            for segment in segments:
+                key = text_hash(segment)
+                state = previous.get(key) or session.sentences.get(key)
+                if state is None:
+                    state = SentenceState(segment)
+                    changed += 1
+                session.sentences[key] = state
+            states = [session.sentences[text_hash(s)] for s in segments]
+
+            # 3. Keywords from cached per-sentence extraction
+            words = [w for state in states for w in state.words]
+            term_freq = m.keyword_extractor.count_terms(words)
+            resume_terms = {t for t, _ in term_freq.most_common(Config.TOP_KEYWORDS)}
+            resume_terms |= self._technical_terms(states, new_lines)
+            all_resume_terms = list(m.keyword_extractor.canonicalize(resume_terms, resume_text))
+            resume_keywords = [t for t, _ in term_freq.most_common(20)]
+
+            # 4. Semantic keyword matching, encoding only unseen terms
+            cached_terms = len(session.term_embeddings)
+            profile = session.profile
+            if all_resume_terms and profile.terms:
+                resume_embeddings = m.keyword_extractor.encode_terms(
+                    all_resume_terms,
+                    cache=session.term_embeddings
+                )
+                matched_keywords, missing_keywords = m.keyword_extractor.match_embeddings(
+                    profile.terms,
+                    profile.term_embeddings,
+                    resume_embeddings,
+                    threshold=Config.SIMILARITY_THRESHOLD
+                )
+            else:
+                matched_keywords, missing_keywords = [], list(profile.terms)
+            terms_encoded = len(session.term_embeddings) - cached_terms
+            self._prune_terms(session, set(all_resume_terms))
+
+            # 5. Document similarity (only when the resume changed)
+            semantic_similarity = self._document_similarity(session, resume_text)
+
+            # 6. Highlights from cached sentence embeddings
+            sentences = m.highlight_calculator.split_sentences(resume_text)
+            sentence_embeddings = self._sentence_embeddings(session, sentences)
+            highlights = m.highlight_calculator.rank_highlights(
+                sentences,
+                sentence_embeddings,
+                m.jd_stage_embedding(profile, 'highlights'),
+                Config.TOP_HIGHLIGHTS
+            )
+
+            # 7. Section analysis from cached section similarities
+            resume_sections = ATSScoreCalculator.identify_sections(resume_text)
+            similarities = {}
+            section_keys = set()
+            for name, section_text in m.section_matcher.present_sections(resume_sections).items():
+                key = text_hash(section_text)
+                if key not in session.section_similarities:
+                    session.section_similarities[key] = m.section_matcher.calculate_semantic_similarity(
+                        section_text,
+                        jd_text
+                    )
+                similarities[name] = session.section_similarities[key]
+                section_keys.add(key)
+            self._prune_sections(session, section_keys)
+            section_analysis = m.section_matcher.label_sections(
+                resume_sections,
+                similarities,
+                profile.required_soft_skills
+            )
+
+            # 8. Experience
+            experience = m.experience_parser.parse(resume_text)
+
+            results = m.build_results(
+                resume_text=resume_text,
+                profile=profile,
+                matched_keywords=matched_keywords,
+                missing_keywords=missing_keywords,
+                semantic_similarity=semantic_similarity,
+                experience=experience,
+                highlights=highlights,
+                section_analysis=section_analysis,
+                resume_keywords=resume_keywords
+            )
+
+            results.incremental = {
+                "session_id": session.session_id,
+                "jd_changed": jd_changed,
+                "sentences_total": len(segments),
+                "sentences_changed": changed,
+                "terms_encoded": terms_encoded,
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+            }
+            return results
+
+    def _update_jd(self, session: AnalysisSession, jd_text: str) -> bool:
+        """Rebuild JD-side state when the JD text changes"""
+        jd_hash = text_hash(jd_text)
+        if session.jd_hash == jd_hash:
+            return False
+
+        session.jd_hash = jd_hash
+        session.profile = self.matcher.compile_job_profile(jd_text)
+
+        # Similarities against the old JD are stale
+        session.section_similarities = {}
+        session.document_similarity = (None, 0.0)
+        return True
+
+    @staticmethod
+    def _technical_terms(states: List[SentenceState], new_lines: List[bool]) -> set:
+        """
+        Combine per-sentence technical terms
+        A bullet runs from the first bullet marker to the end of its
+        line, which may span several sentences
+        """
+        terms = set()
+        in_bullet = False
+        for state, new_line in zip(states, new_lines):
+            terms |= state.phrase_terms
+            for i, (words, tail_words) in enumerate(state.lines):
+                if i or new_line:
+                    in_bullet = False
+                if in_bullet:
+                    terms.update(words)
+                elif tail_words is not None:
+                    terms.update(tail_words)
+                    in_bullet = True
+        return terms
+
+    @staticmethod
+    def _prune_terms(session: AnalysisSession, resume_terms: set):
+        """Keep only embeddings for current (canonical) resume terms"""
+        if len(session.term_embeddings) > 2 * len(resume_terms):
+            session.term_embeddings = {
+                t: e for t, e in session.term_embeddings.items() if t in resume_terms
+            }
+
+    @staticmethod
+    def _prune_sections(session: AnalysisSession, section_keys: set):
+        """Keep only similarities for current section texts"""
+        if len(session.section_similarities) > 2 * len(section_keys):
+            session.section_similarities = {
+                k: s for k, s in session.section_similarities.items() if k in section_keys
+            }
+
+    def _document_similarity(self, session: AnalysisSession, resume_text: str) -> float:
+        """Whole-document similarity, recomputed only when the resume changed"""
+        resume_hash = text_hash(resume_text)
+        cached_hash, similarity = session.document_similarity
+        if cached_hash == resume_hash:
+            return similarity
+
+        if resume_text:
+            embedding = self.matcher.similarity_calculator.model.encode([resume_text])[0]
+            similarity = float(
+                np.dot(embedding, session.profile.embedding) /
+                (np.linalg.norm(embedding) * np.linalg.norm(session.profile.embedding) or 1.0)
+            )
+        else:
+            similarity = 0.0
+
+        session.document_similarity = (resume_hash, similarity)
+        return similarity
+
+    def _sentence_embeddings(self, session: AnalysisSession, sentences: List[str]) -> List[np.ndarray]:
+        """Embeddings for highlight sentences, encoding only new ones"""
+        keys = [text_hash(s) for s in sentences]
+        new = {k: s for k, s in zip(keys, sentences) if k not in session.sentence_embeddings}
+        if new:
+            encoded = self.matcher.highlight_calculator.model.encode(list(new.values()))
+            session.sentence_embeddings.update(zip(new.keys(), encoded))
+
+        # Drop embeddings of sentences no longer in the resume
+        if len(session.sentence_embeddings) > 2 * len(keys):
+            current = set(keys)
+            session.sentence_embeddings = {
+                k: e for k, e in session.sentence_embeddings.items() if k in current
+            }
+
+        return [session.sentence_embeddings[k] for k in keys]
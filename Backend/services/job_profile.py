@@ -0,0 +1,252 @@
+"""
+Job Profile
+JD-side matching artifacts compiled once and reused for every candidate
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from utils.ats_score import ATSScoreCalculator
+from utils.section_matcher import SectionMatcher
+from services.result_cache import config_fingerprint
+from services.stage_models import JD_EMBEDDING_STAGES
+from instance.config import Config
+
+
+class JobProfile:
+    """
+    Precompiled job description
+    Holds everything analysis derives from the JD alone: terms and their
+    embeddings, the full-JD embedding (plus one per stage on its own
+    encoder, see STAGE_MODELS), required years, required soft skills,
+    contextual phrases and term frequencies for prioritization
+    """
+
+    # npz array name of a stage's own JD embedding
+    STAGE_EMBEDDING_PREFIX = 'embedding_'
+
+    def __init__(
+        self,
+        jd_text: str,
+        terms: List[str],
+        term_counts: Dict[str, int],
+        required_years: int,
+        required_soft_skills: List[str],
+        phrases: List[str],
+        term_embeddings: Optional[np.ndarray] = None,
+        embedding: Optional[np.ndarray] = None,
+        fingerprint: Optional[str] = None,
+        stage_embeddings: Optional[Dict[str, np.ndarray]] = None
+    ):
+        self.jd_text = jd_text
+        self.terms = terms
+        self.term_counts = term_counts
+        self.required_years = required_years
+        self.required_soft_skills = required_soft_skills
+        self.phrases = phrases
+        self.term_embeddings = term_embeddings
+        self.embedding = embedding
+        self.stage_embeddings = stage_embeddings or {}
+        self.fingerprint = fingerprint or config_fingerprint()
+
+    @property
+    def id(self) -> str:
+        """Content hash of the cleaned JD"""
+        return hashlib.sha256(self.jd_text.encode('utf-8')).hexdigest()
+
+    @property
+    def cache_key(self) -> str:
+        """Identity for memoized stage outputs (services/stage_graph.py)"""
+        return f"profile:{self.id}:{self.fingerprint}"
+
+    @property
+    def has_embeddings(self) -> bool:
+        return self.term_embeddings is not None and self.embedding is not None
+
+    @classmethod
+    def compile(
+        cls,
+        jd_text: str,
+        matcher_service,
+        jd_terms: Optional[List[str]] = None,
+        embed: bool = True
+    ) -> 'JobProfile':
+        """
+        Compile a profile from cleaned JD text
+        embed=False skips the model calls (lexical artifacts only)
+        """
+        m = matcher_service
+        if jd_terms is None:
+            jd_terms = m.keyword_extractor.extract_all_terms(jd_text, Config.TOP_KEYWORDS)
+        terms = list(jd_terms)
+
+        jd_lower = jd_text.lower()
+        profile = cls(
+            jd_text=jd_text,
+            terms=terms,
+            term_counts={t: jd_lower.count(t.lower()) for t in terms},
+            required_years=m.experience_parser.extract_experience_years(jd_text),
+            required_soft_skills=SectionMatcher.required_soft_skills(jd_text),
+            phrases=ATSScoreCalculator.extract_jd_phrases(jd_text)
+        )
+
+        if embed:
+            profile.term_embeddings = (
+                m.keyword_extractor.encode_terms(terms) if terms
+                else np.zeros((0, 0), dtype=np.float32)
+            )
+            profile.embedding = np.asarray(
+                m.similarity_calculator.model.encode([jd_text])[0],
+                dtype=np.float32
+            )
+            profile.stage_embeddings = {
+                stage: np.asarray(m.jd_stage_embedding(profile, stage), dtype=np.float32)
+                for stage in JD_EMBEDDING_STAGES
+                if m.models[stage] != m.models['document']
+            }
+        return profile
+
+    def summary(self) -> Dict:
+        """Metadata returned by the API"""
+        return {
+            "id": self.id,
+            "characters": len(self.jd_text),
+            "terms": len(self.terms),
+            "required_years": self.required_years,
+            "required_soft_skills": self.required_soft_skills
+        }
+
+    def to_bytes(self) -> bytes:
+        """Compact serialized form: numpy arrays plus a JSON header"""
+        meta = {
+            "jd_text": self.jd_text,
+            "terms": self.terms,
+            "term_counts": self.term_counts,
+            "required_years": self.required_years,
+            "required_soft_skills": self.required_soft_skills,
+            "phrases": self.phrases,
+            "fingerprint": self.fingerprint
+        }
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            meta=np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8),
+            term_embeddings=np.asarray(self.term_embeddings, dtype=np.float32),
+            embedding=np.asarray(self.embedding, dtype=np.float32),
+            **{
+                f"{self.STAGE_EMBEDDING_PREFIX}{stage}": np.asarray(embedding, dtype=np.float32)
+                for stage, embedding in self.stage_embeddings.items()
+            }
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'JobProfile':
+        with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+            meta = json.loads(arrays['meta'].tobytes().decode('utf-8'))
+            prefix = cls.STAGE_EMBEDDING_PREFIX
+            return cls(
+                term_embeddings=arrays['term_embeddings'],
+                embedding=arrays['embedding'],
+                stage_embeddings={
+                    name[len(prefix):]: arrays[name]
+                    for name in arrays.files if name.startswith(prefix)
+                },
+                **meta
+            )
+
+
+class JobProfileStore:
+    """
+    Registered job profiles, persisted as one .npz file each
+    with an in-process LRU in front
+    """
+
+    ID_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+    def __init__(self, matcher_service, root: Path = None, max_cached: int = None):
+        self.matcher = matcher_service
+        self.root = Path(root or Config.JOB_PROFILE_DIR)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_cached = max_cached or Config.JOB_PROFILE_MAX_CACHED
+        self._cache: 'OrderedDict[str, JobProfile]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, profile_id: str) -> Path:
+        return self.root / f"{profile_id}.npz"
+
+    def register(self, jd_text: str, jd_terms: Optional[List[str]] = None) -> JobProfile:
+        """Compile (or reuse) the profile for a raw JD text"""
+        cleaned = self.matcher.preprocessor.clean_text(jd_text)
+        profile_id = hashlib.sha256(cleaned.encode('utf-8')).hexdigest()
+
+        profile = self.get(profile_id)
+        if profile is None:
+            profile = JobProfile.compile(cleaned, self.matcher, jd_terms)
+            self._save(profile)
+        return profile
+
+    def _save(self, profile: JobProfile):
+        # Atomic write so concurrent workers never read a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.root), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(profile.to_bytes())
+        os.replace(tmp_path, self._path(profile.id))
+        self._remember(profile)
+
+    def get(self, profile_id: str) -> Optional[JobProfile]:
+        """Load a profile by id (None if unknown or malformed id)"""
+        if not profile_id or not self.ID_PATTERN.match(profile_id):
+            return None
+
+        with self._lock:
+            profile = self._cache.get(profile_id)
+            if profile is not None:
+                self._cache.move_to_end(profile_id)
+                return profile
+
+        path = self._path(profile_id)
+        if not path.exists():
+            return None
+
+        profile = JobProfile.from_bytes(path.read_bytes())
+
+        # Profiles compiled under another scoring config are rebuilt
+        if profile.fingerprint != config_fingerprint():
+            profile = JobProfile.compile(profile.jd_text, self.matcher)
+            self._save(profile)
+            return profile
+
+        self._remember(profile)
+        return profile
+
+    def delete(self, profile_id: str) -> bool:
+        """Remove a registered profile"""
+        if not profile_id or not self.ID_PATTERN.match(profile_id):
+            return False
+
+        with self._lock:
+            self._cache.pop(profile_id, None)
+
+        path = self._path(profile_id)
+        if not path.exists():
+            return False
+        path.unlink()
+        return True
+
+    def _remember(self, profile: JobProfile):
+        with self._lock:
+            self._cache[profile.id] = profile
+            self._cache.move_to_end(profile.id)
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
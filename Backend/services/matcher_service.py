@@ -4,8 +4,11 @@ Coordinates all analysis operations
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import partial
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 # Add utils to path
 backend_dir = Path(__file__).parent.parent
@@ -14,10 +17,22 @@ sys.path.insert(0, str(backend_dir))
 from utils.file_utils import FileUtils
 from utils.text_preprocessing import TextPreprocessor
 from utils.keyword_extraction import KeywordExtractor
-from utils.experience_parser import ExperienceParser
+from utils.experience_parser import ExperienceParser, ExperienceTimeline
 from utils.similarity import SimilarityCalculator
 from utils.ats_score import ATSScoreCalculator
 from utils.section_matcher import SectionMatcher
+from utils.skill_lexicon import SkillLexicon
+from utils.term_canonicalizer import TermCanonicalizer
+from utils.model_loader import load_sentence_model
+from services.analysis_result import AnalysisResult, AtsResult, ExperienceResult, KeywordResult
+from services.result_cache import ResultCache, analysis_key
+from services.scoring_model import ScoringModel
+from services.single_flight import SingleFlight
+from services.job_profile import JobProfile
+from services.thread_budget import ThreadBudget
+from services.deadline import Deadline, StageCosts
+from services.stage_graph import Stage, StageGraph
+from services.stage_models import JD_EMBEDDING_STAGES, stage_models
 from instance.config import Config
 
 
@@ -28,167 +43,676 @@ class MatcherService:
     """
     
     def __init__(self):
+        # Cap torch/BLAS threads before any model work
+        self.thread_budget = ThreadBudget.current() or ThreadBudget.from_config().apply()
+        
+        # Encoder of each stage (STAGE_MODELS); components asking for the
+        # same model share one loaded instance
+        self.models = stage_models()
+        
         # Initialize all components
         self.file_utils = FileUtils()
         self.preprocessor = TextPreprocessor()
-        self.keyword_extractor = KeywordExtractor(Config.SENTENCE_MODEL)
+        self.skill_lexicon = None
+        if Config.USE_SKILL_LEXICON:
+            self.skill_lexicon = SkillLexicon.load(
+                Config.SKILL_LEXICON_PATH,
+                Config.SKILL_EMBEDDINGS_PATH,
+                self.models['keywords']
+            )
+        self.keyword_extractor = KeywordExtractor(
+            self.models['keywords'],
+            self.skill_lexicon,
+            TermCanonicalizer(self.skill_lexicon) if Config.CANONICALIZE_TERMS else None
+        )
         self.experience_parser = ExperienceParser()
-        self.similarity_calculator = SimilarityCalculator(Config.SENTENCE_MODEL)
+        self.similarity_calculator = SimilarityCalculator(self.models['document'])
+        self.highlight_calculator = SimilarityCalculator(self.models['highlights'])
         self.ats_calculator = ATSScoreCalculator()
-        self.section_matcher = SectionMatcher(Config.SENTENCE_MODEL)
+        self.section_matcher = SectionMatcher(self.models['sections'])
+        self.result_cache = ResultCache.from_config()
+        self.stage_costs = StageCosts()
+        self.single_flight = SingleFlight()
+        self.stage_executor = ThreadPoolExecutor(
+            max_workers=self.thread_budget.stage_workers,
+            thread_name_prefix='analysis-stage'
+        )
+        self.stage_graph = self._build_stage_graph()
     
-    def analyze(self, resume_text: str, jd_text: str) -> Dict:
+    def analyze(
+        self, 
+        resume_text: str, 
+        jd: Union[str, JobProfile], 
+        deadline: Optional[Deadline] = None
+    ) -> AnalysisResult:
         """
         Main analysis function - coordinates all operations
         
         Args:
             resume_text: Raw resume text
-            jd_text: Raw job description text
+            jd: Raw job description text or a compiled JobProfile
+            deadline: Optional latency budget; optional stages are
+                approximated or skipped to meet it
         
         Returns:
-            Complete analysis results dictionary
+            Complete AnalysisResult (to_dict() gives the API response)
         """
         # 1. Clean texts
         resume_text = self.preprocessor.clean_text(resume_text)
-        jd_text = self.preprocessor.clean_text(jd_text)
         
-        # 2. Extract keywords and technical terms
-        jd_terms = self.keyword_extractor.extract_all_terms(
-            jd_text, 
-            Config.TOP_KEYWORDS
+        if isinstance(jd, JobProfile):
+            return self._analyze_cleaned(resume_text, jd.jd_text, profile=jd, deadline=deadline)
+        
+        jd_text = self.preprocessor.clean_text(jd)
+        return self._analyze_cleaned(resume_text, jd_text, deadline=deadline)
+    
+    def analyze_documents(self, resume_doc, jd, deadline: Optional[Deadline] = None) -> AnalysisResult:
+        """
+        Analyze a stored resume (see services/document_store.py) against
+        a stored JD document or a compiled JobProfile
+        Reuses cleaned text and precomputed terms
+        """
+        if isinstance(jd, JobProfile):
+            return self._analyze_cleaned(
+                resume_doc.cleaned_text,
+                jd.jd_text,
+                resume_terms=resume_doc.terms,
+                profile=jd,
+                deadline=deadline
+            )
+        
+        return self._analyze_cleaned(
+            resume_doc.cleaned_text,
+            jd.cleaned_text,
+            resume_terms=resume_doc.terms,
+            jd_terms=jd.terms,
+            deadline=deadline
         )
-        resume_terms = self.keyword_extractor.extract_all_terms(
+    
+    def compile_job_profile(
+        self, 
+        jd_text: str, 
+        jd_terms: Optional[List[str]] = None, 
+        embed: bool = True
+    ) -> JobProfile:
+        """Compile all JD-side artifacts for cleaned JD text"""
+        return JobProfile.compile(jd_text, self, jd_terms, embed)
+    
+    def _analyze_cleaned(
+        self, 
+        resume_text: str, 
+        jd_text: str, 
+        resume_terms: Optional[List[str]] = None,
+        jd_terms: Optional[List[str]] = None,
+        profile: Optional[JobProfile] = None,
+        deadline: Optional[Deadline] = None
+    ) -> AnalysisResult:
+        """
+        Identical documents under the same scoring config are served from
+        cache, and identical concurrent requests share one computation
+        """
+        key = analysis_key(resume_text, jd_text)
+        if self.result_cache is not None:
+            results = self.result_cache.get(key)
+            if results is not None:
+                return results
+        
+        return self.single_flight.do(
+            self._flight_key(key, deadline), 
+            self._analyze_and_store, 
+            key, 
             resume_text, 
-            Config.TOP_KEYWORDS
+            jd_text, 
+            resume_terms, 
+            jd_terms,
+            profile,
+            deadline
         )
+    
+    @staticmethod
+    def _flight_key(key: str, deadline: Optional[Deadline]) -> str:
+        """
+        Deadline runs may be degraded, so full requests never join them,
+        and only runs with the same budget join each other
+        """
+        return f"{key}:deadline:{deadline.budget_ms:g}" if deadline is not None else key
+    
+    async def analyze_async(
+        self, 
+        resume_text: str, 
+        jd: Union[str, JobProfile], 
+        executor=None, 
+        deadline: Optional[Deadline] = None
+    ) -> AnalysisResult:
+        """
+        Async variant of analyze() for event-loop callers
+        The analysis runs on the executor; concurrent identical requests
+        (sync or async) await the same in-flight computation
+        """
+        resume_text = self.preprocessor.clean_text(resume_text)
         
-        # Convert to lists for processing
-        all_jd_terms = list(jd_terms)
-        all_resume_terms = list(resume_terms)
+        profile = jd if isinstance(jd, JobProfile) else None
+        jd_text = profile.jd_text if profile else self.preprocessor.clean_text(jd)
         
-        # 3. Semantic keyword matching
-        matched_keywords, missing_keywords = self.keyword_extractor.semantic_keyword_matching(
-            all_resume_terms,
-            all_jd_terms,
-            threshold=Config.SIMILARITY_THRESHOLD
-        )
-        
-        # 4. Calculate overall semantic similarity
-        semantic_similarity = self.similarity_calculator.calculate_semantic_similarity(
+        return await self._analyze_cleaned_async(
             resume_text, 
-            jd_text
+            jd_text, 
+            profile=profile, 
+            executor=executor,
+            deadline=deadline
         )
+    
+    async def analyze_documents_async(
+        self, 
+        resume_doc, 
+        jd, 
+        executor=None, 
+        deadline: Optional[Deadline] = None
+    ) -> AnalysisResult:
+        """Async variant of analyze_documents()"""
+        if isinstance(jd, JobProfile):
+            return await self._analyze_cleaned_async(
+                resume_doc.cleaned_text,
+                jd.jd_text,
+                resume_terms=resume_doc.terms,
+                profile=jd,
+                executor=executor,
+                deadline=deadline
+            )
         
-        # 5. Calculate skill match score
-        total_jd_terms = len(all_jd_terms)
-        if total_jd_terms > 0:
-            keyword_match_ratio = len(matched_keywords) / total_jd_terms
-            skill_match_score = (keyword_match_ratio * 0.5 + semantic_similarity * 0.5) * 100
-        else:
-            skill_match_score = 0.0
-        
-        # 6. Extract experience
-        required_years = self.experience_parser.extract_experience_years(jd_text)
-        candidate_years = self.experience_parser.extract_experience_years(resume_text)
-        experience_match_score = self.experience_parser.calculate_experience_match(
-            required_years, 
-            candidate_years
+        return await self._analyze_cleaned_async(
+            resume_doc.cleaned_text,
+            jd.cleaned_text,
+            resume_terms=resume_doc.terms,
+            jd_terms=jd.terms,
+            executor=executor,
+            deadline=deadline
         )
+    
+    async def _analyze_cleaned_async(
+        self, 
+        resume_text: str, 
+        jd_text: str, 
+        resume_terms: Optional[List[str]] = None,
+        jd_terms: Optional[List[str]] = None,
+        profile: Optional[JobProfile] = None,
+        executor=None,
+        deadline: Optional[Deadline] = None
+    ) -> AnalysisResult:
+        key = analysis_key(resume_text, jd_text)
+        if self.result_cache is not None:
+            results = self.result_cache.get(key)
+            if results is not None:
+                return results
         
-        # 7. Extract relevant highlights
-        highlights = self.similarity_calculator.extract_relevant_highlights(
+        return await self.single_flight.do_async(
+            self._flight_key(key, deadline), 
+            self._analyze_and_store, 
+            key, 
             resume_text, 
             jd_text, 
-            Config.TOP_HIGHLIGHTS
+            resume_terms,
+            jd_terms,
+            profile,
+            deadline,
+            executor=executor
         )
+    
+    def _analyze_and_store(
+        self, 
+        key: str, 
+        resume_text: str, 
+        jd_text: str, 
+        resume_terms: Optional[List[str]] = None,
+        jd_terms: Optional[List[str]] = None,
+        profile: Optional[JobProfile] = None,
+        deadline: Optional[Deadline] = None
+    ) -> AnalysisResult:
+        """Run the analysis and publish it to the result cache"""
+        if profile is None:
+            profile = self.stage_costs.time(
+                'job_profile', 
+                self.compile_job_profile, 
+                jd_text, 
+                jd_terms
+            )
         
-        # 8. Section analysis
-        section_analysis = self.section_matcher.analyze_section_match(
-            resume_text, 
-            jd_text
+        results = self._run_analysis(resume_text, profile, resume_terms, deadline)
+        
+        # Degraded results are never cached; the deadline summary belongs
+        # to this response only, not to later requests served from cache
+        if self.result_cache is not None and not (deadline and deadline.degraded):
+            self.result_cache.set(key, replace(results, deadline=None))
+        return results
+    
+    def stats(self) -> Dict:
+        """Counters for the result cache, request coalescing, stages and term collapsing"""
+        canonicalizer = self.keyword_extractor.canonicalizer
+        return {
+            "result_cache": self.result_cache.stats() if self.result_cache else None,
+            "single_flight": self.single_flight.stats(),
+            "stage_costs_ms": self.stage_costs.snapshot(),
+            "stage_graph": self.stage_graph.stats(),
+            "thread_budget": self.thread_budget.summary(),
+            "term_canonicalizer": canonicalizer.stats() if canonicalizer else None,
+            "stage_models": self.models
+        }
+    
+    def analysis_key(self, resume_text: str, jd_text: str) -> str:
+        """Content hash of an analysis request (also used as its ETag)"""
+        return analysis_key(
+            self.preprocessor.clean_text(resume_text),
+            self.preprocessor.clean_text(jd_text)
+        )
+    
+    def _build_stage_graph(self) -> StageGraph:
+        """
+        The analysis pipeline: every stage names the values it needs.
+        Roots are 'resume_text' (cleaned) and 'profile' (JobProfile, with
+        or without embeddings); 'result' is the full AnalysisResult.
+        Lexical stages are registered first so they start first.
+        Highlights and sections compare against jd_<stage>_embedding,
+        the document JD embedding unless STAGE_MODELS gives them their own.
+        """
+        graph = StageGraph(self.stage_costs, self.stage_executor)
+        kw = self.keyword_extractor
+        
+        # Lexical stages (no model calls)
+        graph.add(Stage(
+            'experience',
+            lambda resume_text: self.experience_parser.parse(resume_text),
+            inputs=('resume_text',)
+        ))
+        graph.add(Stage(
+            'ats_components',
+            self._ats_components,
+            inputs=('resume_text', 'profile')
+        ))
+        graph.add(Stage(
+            'terms',
+            lambda resume_text: list(kw.extract_all_terms(resume_text, Config.TOP_KEYWORDS)),
+            inputs=('resume_text',)
+        ))
+        graph.add(Stage(
+            'top_resume_keywords',
+            lambda resume_text: kw.extract_dynamic_keywords(resume_text, top_n=20),
+            inputs=('resume_text',),
+            skipped=[]
+        ))
+        
+        # JD embeddings: free for compiled profiles, encoded otherwise
+        graph.add(Stage(
+            'jd_embedding',
+            self._jd_embedding,
+            inputs=('profile',),
+            memoize=False
+        ))
+        graph.add(Stage(
+            'jd_term_embeddings',
+            lambda profile: (
+                profile.term_embeddings if profile.term_embeddings is not None
+                else kw.encode_terms(profile.terms) if profile.terms else None
+            ),
+            inputs=('profile',),
+            memoize=False
+        ))
+        for stage in JD_EMBEDDING_STAGES:
+            if self.models[stage] == self.models['document']:
+                graph.add(Stage(
+                    f'jd_{stage}_embedding',
+                    lambda jd_embedding: jd_embedding,
+                    inputs=('jd_embedding',),
+                    memoize=False
+                ))
+            else:
+                graph.add(Stage(
+                    f'jd_{stage}_embedding',
+                    partial(self.jd_stage_embedding, stage=stage),
+                    inputs=('profile',),
+                    memoize=False
+                ))
+        
+        # Semantic stages
+        graph.add(Stage(
+            'semantic_similarity',
+            lambda resume_text, profile, jd_embedding: self.similarity_calculator.similarity_to_embedding(
+                resume_text,
+                jd_embedding if profile.jd_text else None
+            ),
+            inputs=('resume_text', 'profile', 'jd_embedding')
+        ))
+        graph.add(Stage(
+            'resume_term_embeddings',
+            lambda terms: kw.encode_terms(terms) if terms else None,
+            inputs=('terms',)
+        ))
+        graph.add(Stage(
+            'keywords',
+            self._match_keywords,
+            inputs=('profile', 'terms', 'jd_term_embeddings', 'resume_term_embeddings')
+        ))
+        graph.add(Stage(
+            'section_match_analysis',
+            lambda resume_text, profile, jd_sections_embedding: self.section_matcher.analyze_section_match_embedding(
+                resume_text,
+                jd_sections_embedding,
+                profile.required_soft_skills
+            ),
+            inputs=('resume_text', 'profile', 'jd_sections_embedding'),
+            approximate=lambda resume_text, profile, semantic_similarity: (
+                self.section_matcher.approximate_section_match(
+                    resume_text,
+                    semantic_similarity,
+                    profile.required_soft_skills
+                )
+            ),
+            approximate_inputs=('resume_text', 'profile', 'semantic_similarity'),
+            skipped={}
+        ))
+        graph.add(Stage(
+            'relevant_experience_highlights',
+            lambda resume_text, jd_highlights_embedding: self.highlight_calculator.highlights_for_embedding(
+                resume_text,
+                jd_highlights_embedding,
+                Config.TOP_HIGHLIGHTS
+            ),
+            inputs=('resume_text', 'jd_highlights_embedding'),
+            approximate=lambda resume_text, profile: self.highlight_calculator.rank_highlights_lexical(
+                self.highlight_calculator.split_sentences(resume_text),
+                profile.terms,
+                Config.TOP_HIGHLIGHTS
+            ),
+            approximate_inputs=('resume_text', 'profile'),
+            skipped=[]
+        ))
+        
+        # Scoring
+        graph.add(Stage(
+            'result',
+            self._result_stage,
+            inputs=(
+                'resume_text', 'profile', 'keywords', 'semantic_similarity', 'experience',
+                'ats_components', 'relevant_experience_highlights', 'section_match_analysis',
+                'top_resume_keywords'
+            ),
+            memoize=False
+        ))
+        return graph
+    
+    def _result_stage(
+        self,
+        resume_text: str,
+        profile: JobProfile,
+        keywords: Tuple[List[str], List[str]],
+        semantic_similarity: float,
+        experience: ExperienceTimeline,
+        ats_components: Dict[str, float],
+        relevant_experience_highlights: List[str],
+        section_match_analysis: Dict[str, str],
+        top_resume_keywords: List[str]
+    ) -> AnalysisResult:
+        matched_keywords, missing_keywords = keywords
+        return self.build_results(
+            resume_text=resume_text,
+            profile=profile,
+            matched_keywords=matched_keywords,
+            missing_keywords=missing_keywords,
+            semantic_similarity=semantic_similarity,
+            experience=experience,
+            highlights=relevant_experience_highlights,
+            section_analysis=section_match_analysis,
+            resume_keywords=top_resume_keywords,
+            ats_components=ats_components
         )
+    
+    def _jd_embedding(self, profile: JobProfile):
+        if profile.embedding is not None:
+            return profile.embedding
+        return self.similarity_calculator.model.encode([profile.jd_text])[0]
+    
+    def jd_stage_embedding(self, profile: JobProfile, stage: str):
+        """JD embedding in a stage's encoder (the document one when shared)"""
+        if self.models[stage] == self.models['document']:
+            return self._jd_embedding(profile)
+        embedding = profile.stage_embeddings.get(stage)
+        if embedding is not None:
+            return embedding
+        return load_sentence_model(self.models[stage]).encode([profile.jd_text])[0]
+    
+    def _match_keywords(self, profile: JobProfile, terms, jd_term_embeddings, resume_term_embeddings):
+        """Split JD terms into (matched, missing) against the resume terms"""
+        if not terms or not profile.terms:
+            return [], list(profile.terms)
+        return self.keyword_extractor.match_embeddings(
+            profile.terms,
+            jd_term_embeddings,
+            resume_term_embeddings,
+            threshold=Config.SIMILARITY_THRESHOLD
+        )
+    
+    def _ats_components(self, resume_text: str, profile: JobProfile) -> Dict[str, float]:
+        """Lexical ATS checks (sections, contact info, formatting, JD phrases)"""
+        return {
+            "section_completeness": self.ats_calculator.calculate_section_score(resume_text),
+            "contact_info": self.ats_calculator.calculate_contact_score(resume_text),
+            "formatting": self.ats_calculator.calculate_formatting_score(resume_text),
+            "contextual_match": self.ats_calculator.calculate_contextual_score(
+                resume_text,
+                profile.jd_text,
+                profile.phrases
+            )
+        }
+    
+    def run_stages(
+        self, 
+        resume_text: str, 
+        jd: Union[str, JobProfile], 
+        outputs: Iterable[str], 
+        deadline: Optional[Deadline] = None
+    ) -> Dict:
+        """
+        Compute only the named stage outputs, e.g. ['experience', 'ats_components']
+        Only the stages they depend on run; a raw JD is compiled without
+        embeddings, so lexical outputs never touch the model. Stages
+        registered on self.stage_graph are available by name.
+        """
+        resume_text = self.preprocessor.clean_text(resume_text)
+        if not isinstance(jd, JobProfile):
+            jd = self.compile_job_profile(self.preprocessor.clean_text(jd), embed=False)
+        return self.stage_graph.run({'resume_text': resume_text, 'profile': jd}, outputs, deadline)
+    
+    def _run_analysis(
+        self, 
+        resume_text: str, 
+        profile: JobProfile, 
+        resume_terms: Optional[List[str]] = None,
+        deadline: Optional[Deadline] = None
+    ) -> AnalysisResult:
+        """
+        Run every resume-side stage on cleaned resume text
+        All JD-side work comes precompiled in the profile; terms
+        precomputed by the document store are used when given.
+        Under a deadline, optional stages run in full, as a cheaper
+        approximation, or not at all - whichever still fits.
+        """
+        values = {'resume_text': resume_text, 'profile': profile}
+        if resume_terms is not None:
+            values['terms'] = list(resume_terms)
+        
+        results = self.stage_graph.run(values, ['result'], deadline)['result']
+        
+        if deadline is not None:
+            results.deadline = deadline.summary()
+        return results
+    
+    # Stages whose outputs are streamed to the client
+    STREAM_STAGES = (
+        'experience',
+        'ats_components',
+        'top_resume_keywords',
+        'keywords',
+        'semantic_similarity',
+        'relevant_experience_highlights',
+        'section_match_analysis'
+    )
+    
+    def analyze_stream(self, resume_text: str, jd_text: str) -> Iterator[Tuple[str, Dict]]:
+        """
+        Streaming variant of analyze()
+        Independent stages run concurrently on the stage pool and each
+        one is yielded as (stage_name, payload) as soon as it finishes.
+        Cheap lexical stages complete first; the final 'result' event
+        carries the same response analyze() returns (as a dict).
+        """
+        resume_text = self.preprocessor.clean_text(resume_text)
+        jd_text = self.preprocessor.clean_text(jd_text)
+        
+        # Lexical JD artifacts are cheap; the JD is embedded by its own stages
+        profile = self.compile_job_profile(jd_text, embed=False)
         
-        # 9. Calculate ATS score
-        ats_score, ats_label = self.ats_calculator.calculate_ats_score(
-            resume_text,
-            jd_text,
-            matched_keywords,
-            all_jd_terms,
-            semantic_similarity
+        values = {'resume_text': resume_text, 'profile': profile}
+        for stage, output in self.stage_graph.run_iter(values, ['result'], inline=False):
+            if stage in self.STREAM_STAGES:
+                yield stage, self._stream_payload(stage, output, profile)
+            elif stage == 'result':
+                yield 'result', output.to_dict()
+    
+    def _stream_payload(self, stage: str, output, profile: JobProfile):
+        """Client-facing payload for a finished streaming stage"""
+        if stage == 'ats_components':
+            return dict(output, contextual_match=round(output["contextual_match"], 2))
+        if stage == 'experience':
+            return {
+                "required_years": profile.required_years,
+                "candidate_years": output.years,
+                "experience_match_score_percent": round(
+                    self.experience_parser.calculate_experience_match(profile.required_years, output.years), 2
+                ),
+                "timeline": output.to_dict()
+            }
+        if stage == 'keywords':
+            matched_keywords, missing_keywords = output
+            return {
+                "matched": self.keyword_extractor.prioritize_by_counts(matched_keywords, profile.term_counts, top_n=7),
+                "missing": self.keyword_extractor.prioritize_by_counts(missing_keywords, profile.term_counts, top_n=7)
+            }
+        if stage == 'semantic_similarity':
+            return {"semantic_similarity_percent": round(output * 100, 2)}
+        return output
+    
+    def build_results(
+        self,
+        resume_text: str,
+        profile: JobProfile,
+        matched_keywords: List[str],
+        missing_keywords: List[str],
+        semantic_similarity: float,
+        experience: ExperienceTimeline,
+        highlights: List[str],
+        section_analysis: Dict[str, str],
+        resume_keywords: List[str],
+        ats_components: Optional[Dict[str, float]] = None
+    ) -> AnalysisResult:
+        """
+        Score the extracted signals and compile the response
+        Takes cleaned resume text; every step here is cheap (no model calls)
+        """
+        if ats_components is None:
+            ats_components = self._ats_components(resume_text, profile)
+        
+        # 1. Keyword coverage
+        total_jd_terms = len(profile.terms)
+        keyword_match_ratio = len(matched_keywords) / total_jd_terms if total_jd_terms else 0.0
+        
+        # 2. Experience match
+        required_years = profile.required_years
+        candidate_years = experience.years
+        experience_match_score = self.experience_parser.calculate_experience_match(
+            required_years, 
+            candidate_years
+        )
+        
+        # 3. Raw features (stored with the result for rescoring)
+        features = ScoringModel.features(
+            keyword_ratio=keyword_match_ratio,
+            semantic_similarity=semantic_similarity,
+            section_score=ats_components["section_completeness"],
+            contact_score=ats_components["contact_info"],
+            formatting_score=ats_components["formatting"],
+            contextual_score=ats_components["contextual_match"],
+            experience_match_score=experience_match_score,
+            jd_has_terms=total_jd_terms > 0
         )
         
-        # 10. Prioritize keywords for display
-        top_matched = self.keyword_extractor.prioritize_keywords(
+        # 4. Prioritize keywords for display
+        top_matched = self.keyword_extractor.prioritize_by_counts(
             matched_keywords, 
-            jd_text, 
+            profile.term_counts, 
             top_n=7
         )
-        top_missing = self.keyword_extractor.prioritize_keywords(
+        top_missing = self.keyword_extractor.prioritize_by_counts(
             missing_keywords, 
-            jd_text, 
+            profile.term_counts, 
             top_n=7
         )
         
-        # 11. Get top resume keywords
-        resume_keywords = self.keyword_extractor.extract_dynamic_keywords(
-            resume_text, 
-            top_n=20
-        )
+        # 5. Skill, ATS and overall scores (Config.WEIGHTS, ATS weights)
+        scores = ScoringModel().score(ScoringModel.to_matrix([features]))
         
-        # 12. Calculate overall match
-        overall_match = (
-            skill_match_score * Config.WEIGHTS['skills'] +
-            semantic_similarity * 100 * Config.WEIGHTS['semantic'] +
-            ats_score * Config.WEIGHTS['ats'] +
-            experience_match_score * Config.WEIGHTS['experience']
+        # 6. Compile results (numpy scalars become plain floats here, once)
+        return AnalysisResult(
+            skill_match_score_percent=float(scores["skill_match"][0]),
+            experience_match_score_percent=float(scores["experience_match"][0]),
+            keywords=KeywordResult(matched=top_matched, missing=top_missing),
+            experience=ExperienceResult(
+                required_years=required_years,
+                candidate_years=candidate_years,
+                timeline=experience.to_dict()
+            ),
+            relevant_experience_highlights=highlights,
+            ats=AtsResult(
+                score_percent=float(scores["ats_score"][0]),
+                label=str(scores["ats_label"][0])
+            ),
+            top_resume_keywords=resume_keywords,
+            section_match_analysis=section_analysis,
+            overall_match_percent=float(scores["overall_match"][0]),
+            features=features
         )
-        
-        # 13. Compile results
-        results = {
-            "skill_match_score_percent": round(skill_match_score, 2),
-            "experience_match_score_percent": round(experience_match_score, 2),
-            "keywords": {
-                "matched": top_matched,
-                "missing": top_missing
-            },
-            "experience": {
-                "required_years": required_years,
-                "candidate_years": candidate_years
-            },
-            "relevant_experience_highlights": highlights,
-            "ats": {
-                "score_percent": ats_score,
-                "label": ats_label
-            },
-            "top_resume_keywords": resume_keywords,
-            "section_match_analysis": section_analysis,
-            "overall_match_percent": round(overall_match, 2)
-        }
-        
-        return results
     
     def analyze_from_assets(self) -> Dict:
         """
         Convenience method to analyze files from assets directory
         Used for testing
         """
+        resume_text, jd_text, error = self.read_assets()
+        if error:
+            return {"error": error}
+        
+        # Run analysis
+        return self.analyze(resume_text, jd_text).to_dict()
+    
+    def read_assets(self) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """
+        Read resume and job description from the assets directory
+        Returns: (resume_text, jd_text, error_message)
+        """
         assets_dir = Path(Config.ASSETS_DIR)
         
         # Find resume file
         resume_path = self.file_utils.find_resume_in_assets(assets_dir)
         if not resume_path:
-            return {"error": "Resume file not found in assets/"}
+            return None, None, "Resume file not found in assets/"
         
         jd_path = assets_dir / "job.txt"
         if not jd_path.exists():
-            return {"error": "Job description file not found in assets/"}
+            return None, None, "Job description file not found in assets/"
         
         # Read files
         resume_text = self.file_utils.read_file(str(resume_path))
         jd_text = self.file_utils.read_file(str(jd_path))
         
         if not resume_text or not jd_text:
-            return {"error": "Failed to extract text from files"}
+            return None, None, "Failed to extract text from files"
         
-        # Run analysis
-        return self.analyze(resume_text, jd_text)
\ No newline at end of file
+        return resume_text, jd_text, None
@@ -0,0 +1,268 @@
+"""
+Parser Pool
+Document text extraction in sandboxed, recycled worker processes
+"""
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+from collections import defaultdict
+from multiprocessing import Pipe
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from instance.config import Config
+
+
+# Formats parsed out of process; plain text is read in place
+PARSED_SUFFIXES = {'.pdf', '.docx'}
+
+
+class ParseError(Exception):
+    """A document the parser pool could not extract"""
+
+    STATUS = {
+        'too_large': 413,
+        'invalid_document': 422,
+        'unsupported': 422,
+        'memory_limit': 422,
+        'cpu_limit': 422,
+        'timeout': 422,
+        'crashed': 500,
+        'busy': 503
+    }
+
+    def __init__(self, reason: str, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.reason = reason
+        self.status = self.STATUS.get(reason, 500)
+        self.retry_after = retry_after
+
+    def to_dict(self) -> Dict:
+        return {"error": str(self), "reason": self.reason}
+
+
+class ParserWorker:
+    """One parse process (tools/parse_worker.py), started on first use"""
+
+    def __init__(self, worker_id: int, memory_mb: int, cpu_seconds: int):
+        self.worker_id = worker_id
+        self.memory_mb = memory_mb
+        self.cpu_seconds = cpu_seconds
+        self.process = None
+        self.conn = None
+        self.tasks = 0
+        self.spawns = 0
+        self.rss_mb = None
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        script = Path(__file__).parent.parent / "tools" / "parse_worker.py"
+        conn, child = Pipe()
+        self.process = subprocess.Popen(
+            [
+                sys.executable, str(script),
+                '--fd', str(child.fileno()),
+                '--memory-mb', str(self.memory_mb),
+                '--cpu-seconds', str(self.cpu_seconds)
+            ],
+            pass_fds=(child.fileno(),)
+        )
+        child.close()
+        self.conn = conn
+        self.tasks = 0
+        self.spawns += 1
+        self.rss_mb = None
+
+    def send(self, request: Dict):
+        """
+        One JSON request frame, then the raw document bytes as a second
+        frame when the request carries data
+        """
+        data = request.get("data")
+        header = dict(request, data=None, has_data=data is not None)
+        self.conn.send_bytes(json.dumps(header).encode('utf-8'))
+        if data is not None:
+            self.conn.send_bytes(data)
+
+    def run(self, request: Dict, timeout: float) -> Dict:
+        """Send one request; raises ParseError when the process dies or hangs"""
+        if not self.alive:
+            self.stop()
+            self.start()
+
+        self.tasks += 1
+        try:
+            self.send(request)
+            if not self.conn.poll(timeout):
+                self.stop(kill=True)
+                raise ParseError('timeout', f"Parsing took longer than {timeout}s")
+            # Replies are JSON, never unpickled: the worker parses untrusted files
+            response = json.loads(self.conn.recv_bytes().decode('utf-8'))
+        except (EOFError, OSError):
+            raise ParseError(*self._exit_reason())
+        except ValueError:
+            self.stop(kill=True)
+            raise ParseError('crashed', "Parser process sent a malformed reply")
+        if not isinstance(response, dict):
+            self.stop(kill=True)
+            raise ParseError('crashed', "Parser process sent a malformed reply")
+
+        self.rss_mb = response.get('rss_mb')
+        return response
+
+    def _exit_reason(self):
+        """Why the process went away (it is reaped either way)"""
+        try:
+            code = self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            code = None
+        self.stop(kill=True)
+        if code == -signal.SIGXCPU:
+            return 'cpu_limit', f"Parsing exceeded {self.cpu_seconds}s of CPU"
+        if code == -signal.SIGKILL:
+            # Hard CPU limit or the kernel OOM killer
+            return 'memory_limit', "Parser process was killed"
+        return 'crashed', f"Parser process exited with code {code}"
+
+    def stop(self, kill: bool = False):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        if self.process is not None:
+            if kill:
+                self.process.kill()
+            try:
+                # Closing the connection ends the worker loop
+                self.process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+
+    def stats(self) -> Dict:
+        return {
+            "worker": self.worker_id,
+            "pid": self.process.pid if self.alive else None,
+            "tasks": self.tasks,
+            "spawns": self.spawns,
+            "rss_mb": self.rss_mb
+        }
+
+
+class ParserPool:
+    """
+    Fixed set of parse processes shared by a web worker's requests
+    - address-space cap (PARSER_MEMORY_LIMIT_MB) and per-document CPU
+      limit (PARSER_CPU_SECONDS) inside each process, wall-clock timeout
+      (PARSER_TIMEOUT) from here
+    - a process is replaced after PARSER_MAX_TASKS documents, when its RSS
+      ends a task above PARSER_MAX_RSS_MB, or when it fails hard
+    - requests wait up to PARSER_QUEUE_TIMEOUT for a free process
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        size = Config.PARSER_WORKERS if workers is None else workers
+        # Limits and fd passing are POSIX-only; elsewhere parse in place
+        self.enabled = size > 0 and os.name == 'posix'
+        self.size = size if self.enabled else 0
+
+        self._workers: List[ParserWorker] = [
+            ParserWorker(i, Config.PARSER_MEMORY_LIMIT_MB, Config.PARSER_CPU_SECONDS)
+            for i in range(self.size)
+        ]
+        self._idle = list(self._workers)
+        self._waiting = 0
+        self._cond = threading.Condition()
+        self.counters = defaultdict(int)
+
+    def handles(self, filename: Optional[str]) -> bool:
+        return self.enabled and Path(filename or '').suffix.lower() in PARSED_SUFFIXES
+
+    def extract(self, data: bytes, filename: Optional[str], max_pages: Optional[int] = None) -> Optional[str]:
+        """Text of an uploaded document (raises ParseError)"""
+        suffix = Path(filename or '').suffix.lower()
+        return self._run({"data": data, "suffix": suffix, "max_pages": max_pages})
+
+    def extract_path(self, path: str, max_pages: Optional[int] = None) -> Optional[str]:
+        """Text of a document on disk (raises ParseError)"""
+        return self._run({"path": str(path), "max_pages": max_pages})
+
+    # ------------------------------------------------------------------
+    # Worker checkout
+    # ------------------------------------------------------------------
+
+    def _checkout(self) -> ParserWorker:
+        with self._cond:
+            if not self._idle:
+                self._waiting += 1
+                self.counters["queued"] += 1
+                ready = self._cond.wait_for(lambda: self._idle, timeout=Config.PARSER_QUEUE_TIMEOUT)
+                self._waiting -= 1
+                if not ready:
+                    self.counters["failed_busy"] += 1
+                    raise ParseError('busy', "All parser processes are busy", Config.PARSER_QUEUE_TIMEOUT)
+            return self._idle.pop()
+
+    def _checkin(self, worker: ParserWorker, recycle: Optional[str]):
+        if recycle:
+            worker.stop(kill=recycle not in ('max_tasks', 'rss'))
+        with self._cond:
+            if recycle:
+                self.counters[f"recycled_{recycle}"] += 1
+            self._idle.append(worker)
+            self._cond.notify()
+
+    def _run(self, request: Dict) -> Optional[str]:
+        worker = self._checkout()
+        recycle = None
+        try:
+            try:
+                response = worker.run(request, Config.PARSER_TIMEOUT)
+            except ParseError as e:
+                # The process is gone or hung
+                recycle = e.reason
+                raise
+
+            if not response["ok"]:
+                if response["reason"] == 'memory_limit':
+                    recycle = 'memory_limit'
+                raise ParseError(response["reason"], response["error"])
+
+            # Healthy, but due for replacement?
+            if worker.tasks >= Config.PARSER_MAX_TASKS:
+                recycle = 'max_tasks'
+            elif Config.PARSER_MAX_RSS_MB and (worker.rss_mb or 0) > Config.PARSER_MAX_RSS_MB:
+                recycle = 'rss'
+            return response.get("text")
+        except ParseError as e:
+            with self._cond:
+                self.counters[f"failed_{e.reason}"] += 1
+            raise
+        finally:
+            with self._cond:
+                self.counters["tasks"] += 1
+            self._checkin(worker, recycle)
+
+    def close(self):
+        with self._cond:
+            workers = list(self._workers)
+        for worker in workers:
+            worker.stop()
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return dict(
+                self.counters,
+                enabled=self.enabled,
+                workers=self.size,
+                busy=self.size - len(self._idle),
+                queue_depth=self._waiting,
+                processes=[worker.stats() for worker in self._workers]
+            )
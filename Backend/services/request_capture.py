@@ -0,0 +1,267 @@
+"""
+Request Capture
+Spool slow or failed analysis requests for offline replay
+"""
+
+import importlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+from collections import defaultdict
+from contextvars import Context, ContextVar, copy_context
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from services.result_cache import config_fingerprint, config_settings
+from services.stage_graph import trace_stages
+from services.thread_budget import ThreadBudget
+from instance.config import Config
+
+
+EMAIL_PATTERN = re.compile(r'[\w.+-]+@[\w-]+\.[\w.-]+')
+PHONE_PATTERN = re.compile(r'\+?\d[\d\s().-]{7,}\d')
+
+
+def redact_contact_info(text: str) -> str:
+    """
+    Mask e-mail addresses and phone numbers
+    Usable as CAPTURE_REDACTOR; replays then score contact info lower
+    """
+    text = EMAIL_PATTERN.sub('user@example.com', text)
+    return PHONE_PATTERN.sub('000-000-0000', text)
+
+
+def load_redactor(spec: Optional[str]) -> Optional[Callable[[str], str]]:
+    """Resolve a 'module:function' redaction hook"""
+    if not spec:
+        return None
+    module_name, _, function_name = spec.partition(':')
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+# The capture observing the current request, if any
+_current: ContextVar[Optional['Capture']] = ContextVar('request_capture', default=None)
+
+
+def current_capture() -> Optional['Capture']:
+    return _current.get()
+
+
+class Capture:
+    """One observed request; written to the spool if slow or failed"""
+
+    def __init__(self, endpoint: str):
+        self.id = uuid.uuid4().hex
+        self.endpoint = endpoint
+        self.created = time.time()
+        self.start = time.perf_counter()
+        self.resume_text: Optional[str] = None
+        self.jd_text: Optional[str] = None
+        self.params: Dict = {}
+        self.error: Optional[Dict] = None
+        self.finished = False
+        # Stage timings of every graph run in this request's context
+        self._tracing = trace_stages()
+        self.stages: List[Dict] = self._tracing.__enter__()
+        self._token = _current.set(self)
+
+    def inputs(self, resume_text: str, jd_text: str, **params):
+        """Record the extracted texts (and e.g. deadline_ms) to replay"""
+        self.resume_text = resume_text
+        self.jd_text = jd_text
+        self.params.update(params)
+
+    def fail(self, error: BaseException):
+        self.error = {
+            "type": type(error).__name__,
+            "message": str(error),
+            "traceback": traceback.format_exception(type(error), error, error.__traceback__)
+        }
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start) * 1000
+
+    def detach(self) -> Context:
+        """
+        Move observation to a copy of the current context
+        For bodies produced after the view returns (streams): run them in
+        the returned context, while this one (a reused worker thread's)
+        no longer sees the capture
+        """
+        context = copy_context()
+        self._reset()
+        return context
+
+    def close(self):
+        """Stop observing (idempotent)"""
+        if self.finished:
+            return
+        self.finished = True
+        self._reset()
+
+    def _reset(self):
+        # Tokens from another context, or already used by detach(), cannot
+        # reset; the variables are dropped with the (copied) context
+        try:
+            self._tracing.__exit__(None, None, None)
+        except ValueError:
+            pass
+        try:
+            _current.reset(self._token)
+        except (ValueError, RuntimeError):
+            _current.set(None)
+
+
+class RequestCapture:
+    """
+    Opt-in spool of slow requests (CAPTURE_SLOW_REQUESTS)
+    Requests slower than CAPTURE_THRESHOLD_MS, and failed ones with
+    CAPTURE_ERRORS, are written to CAPTURE_DIR as one JSON file each:
+    extracted texts (through CAPTURE_REDACTOR), the config fingerprint
+    and settings, per-stage timings, learned stage costs and host load.
+    tools/replay_captures.py re-runs them under the profiler.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        threshold_ms: Optional[float] = None,
+        enabled: Optional[bool] = None,
+        redactor: Optional[Callable[[str], str]] = None,
+        max_files: Optional[int] = None,
+        stage_costs=None
+    ):
+        self.enabled = Config.CAPTURE_SLOW_REQUESTS if enabled is None else enabled
+        self.root = Path(root or Config.CAPTURE_DIR)
+        self.threshold_ms = Config.CAPTURE_THRESHOLD_MS if threshold_ms is None else threshold_ms
+        self.redactor = redactor
+        self.max_files = Config.CAPTURE_MAX_FILES if max_files is None else max_files
+        self.stage_costs = stage_costs
+        self._lock = threading.Lock()
+        self.counters = defaultdict(int)
+
+    @classmethod
+    def from_config(cls, stage_costs=None) -> 'RequestCapture':
+        return cls(redactor=load_redactor(Config.CAPTURE_REDACTOR), stage_costs=stage_costs)
+
+    def start(self, endpoint: str) -> Optional[Capture]:
+        """Begin observing a request (None when capture is off)"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            self.counters["observed"] += 1
+        return Capture(endpoint)
+
+    def finish(self, capture: Optional[Capture], status: Optional[int] = None) -> Optional[Path]:
+        """Stop observing; returns the spool file if the request was kept"""
+        if capture is None or capture.finished:
+            return None
+        capture.close()
+
+        elapsed_ms = capture.elapsed_ms()
+        if capture.error is not None and Config.CAPTURE_ERRORS:
+            reason = 'error'
+        elif elapsed_ms >= self.threshold_ms:
+            reason = 'slow'
+        else:
+            return None
+
+        try:
+            path = self._write(capture, reason, status, elapsed_ms)
+        except Exception as e:
+            # Capture (including a custom redactor) must never fail the
+            # request it observes
+            print(f"Request capture failed: {type(e).__name__}: {e}")
+            with self._lock:
+                self.counters["write_failures"] += 1
+            return None
+
+        with self._lock:
+            self.counters[f"captured_{reason}"] += 1
+        return path
+
+    def _write(self, capture: Capture, reason: str, status: Optional[int], elapsed_ms: float) -> Path:
+        redact = self.redactor or (lambda text: text)
+        budget = ThreadBudget.current()
+        record = {
+            "id": capture.id,
+            "endpoint": capture.endpoint,
+            "captured_at": datetime.fromtimestamp(capture.created, timezone.utc).isoformat(timespec='seconds'),
+            "reason": reason,
+            "status": status,
+            "elapsed_ms": round(elapsed_ms, 2),
+            "threshold_ms": self.threshold_ms,
+            "redacted": self.redactor is not None,
+            "resume_text": redact(capture.resume_text) if capture.resume_text else capture.resume_text,
+            "jd_text": redact(capture.jd_text) if capture.jd_text else capture.jd_text,
+            "params": capture.params,
+            "error": capture.error,
+            "config_fingerprint": config_fingerprint(),
+            "config": config_settings(),
+            "stages": capture.stages,
+            "stage_costs_ms": self.stage_costs.snapshot() if self.stage_costs else None,
+            "host": {
+                "pid": os.getpid(),
+                "cpu_count": os.cpu_count(),
+                "load_avg": list(os.getloadavg()) if hasattr(os, 'getloadavg') else None,
+                "thread_budget": budget.summary() if budget else None
+            }
+        }
+
+        # Time-ordered names (microseconds, so pruning keeps the newest); atomic
+        # write so replays never read a partial file
+        self.root.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.fromtimestamp(capture.created, timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+        path = self.root / f"{stamp}-{capture.id}.json"
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.root), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(record, f, default=str)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        self._prune()
+        return path
+
+    def _prune(self):
+        """Keep the newest CAPTURE_MAX_FILES captures"""
+        if not self.max_files:
+            return
+        captures = self.paths(self.root)
+        for path in captures[:max(0, len(captures) - self.max_files)]:
+            try:
+                path.unlink()
+                with self._lock:
+                    self.counters["pruned"] += 1
+            except OSError:
+                pass
+
+    @staticmethod
+    def paths(root: Path) -> List[Path]:
+        """Capture files under root, oldest first"""
+        return sorted(Path(root).glob('*.json'))
+
+    @staticmethod
+    def load(path: Path) -> Dict:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(
+                self.counters,
+                enabled=self.enabled,
+                threshold_ms=self.threshold_ms,
+                redacted=self.redactor is not None
+            )
@@ -0,0 +1,216 @@
+"""
+Result Cache
+Whole-analysis cache keyed by document hashes and scoring config
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils.ats_score import ATSScoreCalculator
+from services.analysis_result import AnalysisResult
+from services.stage_models import stage_models
+from instance.config import Config
+
+
+def text_digest(text: str) -> str:
+    """SHA-256 of a (cleaned) document"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def config_settings() -> Dict:
+    """Everything that changes analysis output"""
+    return {
+        'scoring_version': Config.SCORING_VERSION,
+        'model': Config.SENTENCE_MODEL,
+        'stage_models': stage_models(),
+        'skill_lexicon': Config.USE_SKILL_LEXICON,
+        'canonicalize_terms': Config.CANONICALIZE_TERMS,
+        'top_keywords': Config.TOP_KEYWORDS,
+        'similarity_threshold': Config.SIMILARITY_THRESHOLD,
+        'top_highlights': Config.TOP_HIGHLIGHTS,
+        'weights': Config.WEIGHTS,
+        'ats_thresholds': Config.ATS_THRESHOLDS,
+        'ats_weights': ATSScoreCalculator.WEIGHTS,
+        'ats_label_thresholds': ATSScoreCalculator.THRESHOLDS
+    }
+
+
+def config_fingerprint() -> str:
+    """
+    Fingerprint of config_settings()
+    Cached results from another model, threshold or weighting never match
+    """
+    encoded = json.dumps(config_settings(), sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:16]
+
+
+def analysis_key(resume_text: str, jd_text: str) -> str:
+    """Cache key for one analysis of cleaned resume and JD texts"""
+    raw = f"{text_digest(resume_text)}:{text_digest(jd_text)}:{config_fingerprint()}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class MemoryCacheBackend:
+    """In-process LRU store (per worker)"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, ttl: float) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            created, value = entry
+            if time.time() - created > ttl:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """On-disk LRU store shared by all workers on a host"""
+
+    def __init__(self, path: Path, max_entries: int = 1024):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+            'created REAL NOT NULL, accessed REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)')
+        conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread; WAL lets worker processes read concurrently
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=5.0)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, ttl: float) -> Optional[str]:
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT value, created FROM results WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        value, created = row
+        now = time.time()
+        if now - created > ttl:
+            conn.execute('DELETE FROM results WHERE key = ?', (key,))
+            conn.commit()
+            return None
+
+        conn.execute('UPDATE results SET accessed = ? WHERE key = ?', (now, key))
+        conn.commit()
+        return value
+
+    def set(self, key: str, value: str):
+        conn = self._connect()
+        now = time.time()
+        conn.execute(
+            'INSERT OR REPLACE INTO results (key, value, created, accessed) VALUES (?, ?, ?, ?)',
+            (key, value, now, now)
+        )
+        # Evict least recently used rows over the limit
+        conn.execute(
+            'DELETE FROM results WHERE key IN ('
+            'SELECT key FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+        conn.commit()
+
+    def clear(self):
+        conn = self._connect()
+        conn.execute('DELETE FROM results')
+        conn.commit()
+
+    def __len__(self):
+        return self._connect().execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+
+class ResultCache:
+    """TTL + LRU cache of complete analysis results"""
+
+    BACKENDS = {
+        'memory': MemoryCacheBackend,
+        'sqlite': SQLiteCacheBackend
+    }
+
+    def __init__(self, backend, ttl: float = 3600):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls) -> Optional['ResultCache']:
+        """Build the cache selected by Config.RESULT_CACHE_BACKEND (None disables it)"""
+        name = Config.RESULT_CACHE_BACKEND
+        if not name:
+            return None
+        if name not in cls.BACKENDS:
+            raise ValueError(f"Unknown result cache backend: {name}")
+
+        if name == 'sqlite':
+            backend = SQLiteCacheBackend(Config.RESULT_CACHE_PATH, Config.RESULT_CACHE_MAX_ENTRIES)
+        else:
+            backend = MemoryCacheBackend(Config.RESULT_CACHE_MAX_ENTRIES)
+        return cls(backend, Config.RESULT_CACHE_TTL)
+
+    def get(self, key: str) -> Optional[AnalysisResult]:
+        value = self.backend.get(key, self.ttl)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return AnalysisResult.from_json(value)
+
+    def set(self, key: str, results: AnalysisResult):
+        self.backend.set(key, results.to_json().decode('utf-8'))
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> Dict:
+        return {
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses
+        }
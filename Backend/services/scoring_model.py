@@ -0,0 +1,143 @@
+"""
+Scoring Model
+Linear scoring over stored features, vectorized across candidates
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from utils.ats_score import ATSScoreCalculator
+from instance.config import Config
+
+
+# Raw per-analysis features, each in [0, 1] (stored in this order)
+FEATURES = (
+    'keyword_ratio',         # matched / JD terms
+    'semantic_similarity',   # resume vs JD embedding
+    'section_completeness',  # required sections present
+    'contact_info',          # email, phone
+    'formatting',            # length, structure
+    'contextual_match',      # JD phrases found verbatim
+    'experience_match',      # candidate vs required years
+    'jd_has_terms'           # 0 when the JD yielded no terms (skill score 0)
+)
+
+# Max points of the contact / formatting checks in ATSScoreCalculator
+CHECK_POINTS = 10.0
+
+ATS_LABELS = np.array(['Excellent', 'Good', 'Fair', 'Poor'], dtype=object)
+
+
+class ScoringModel:
+    """
+    Weights that turn a feature matrix into skill, ATS and overall scores
+    Defaults reproduce MatcherService.build_results; overrides rescore
+    stored candidates without any model calls
+    """
+
+    def __init__(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        ats_weights: Optional[Dict[str, float]] = None,
+        ats_thresholds: Optional[Dict[str, float]] = None
+    ):
+        self.weights = self._merge('weights', Config.WEIGHTS, weights)
+        self.ats_weights = self._merge('ats_weights', ATSScoreCalculator.WEIGHTS, ats_weights)
+        self.ats_thresholds = self._merge('ats_thresholds', ATSScoreCalculator.THRESHOLDS, ats_thresholds)
+
+        # Column weights for the ATS score, in FEATURES order
+        w = self.ats_weights
+        self._ats_vector = np.array([
+            w['keyword_match'],
+            w['semantic_similarity'],
+            w['section_completeness'],
+            w['contact_info'],
+            w['formatting'],
+            w['contextual_match'],
+            0.0,
+            0.0
+        ], dtype=np.float64)
+
+    @staticmethod
+    def _merge(name: str, defaults: Dict[str, float], overrides: Optional[Dict]) -> Dict[str, float]:
+        """Defaults with overrides applied; unknown keys and non-numbers are errors"""
+        merged = dict(defaults)
+        for key, value in (overrides or {}).items():
+            if key not in defaults:
+                raise ValueError(f"Unknown {name} key: {key}")
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"{name}.{key} must be a number")
+            merged[key] = value
+        return merged
+
+    @staticmethod
+    def features(
+        keyword_ratio: float,
+        semantic_similarity: float,
+        section_score: float,
+        contact_score: float,
+        formatting_score: float,
+        contextual_score: float,
+        experience_match_score: float,
+        jd_has_terms: bool = True
+    ) -> Dict[str, float]:
+        """Normalize ATSScoreCalculator / ExperienceParser outputs to [0, 1] features"""
+        ats = ATSScoreCalculator.WEIGHTS
+        return {
+            'keyword_ratio': float(keyword_ratio),
+            'semantic_similarity': float(semantic_similarity),
+            'section_completeness': float(section_score) / ats['section_completeness'],
+            'contact_info': float(contact_score) / CHECK_POINTS,
+            'formatting': float(formatting_score) / CHECK_POINTS,
+            'contextual_match': float(contextual_score) / ats['contextual_match'],
+            'experience_match': float(experience_match_score) / 100.0,
+            'jd_has_terms': 1.0 if jd_has_terms else 0.0
+        }
+
+    @staticmethod
+    def to_matrix(rows: List[Dict[str, float]]) -> np.ndarray:
+        return np.array([[row.get(f, 0.0) for f in FEATURES] for row in rows], dtype=np.float64).reshape(-1, len(FEATURES))
+
+    def score(self, matrix: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Score every row at once
+        Returns arrays: skill_match, experience_match, ats_score,
+        ats_label, overall_match (percent, rounded like the API)
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        keyword_ratio = matrix[:, 0]
+        semantic = matrix[:, 1]
+
+        skill = np.where(matrix[:, 7] > 0, (keyword_ratio * 0.5 + semantic * 0.5) * 100, 0.0)
+        experience = matrix[:, 6] * 100
+        ats = np.round(matrix @ self._ats_vector, 2)
+
+        t = self.ats_thresholds
+        labels = ATS_LABELS[np.select(
+            [ats >= t['excellent'], ats >= t['good'], ats >= t['fair']],
+            [0, 1, 2],
+            default=3
+        )]
+
+        w = self.weights
+        overall = (
+            skill * w['skills'] +
+            semantic * 100 * w['semantic'] +
+            ats * w['ats'] +
+            experience * w['experience']
+        )
+        return {
+            "skill_match": np.round(skill, 2),
+            "experience_match": np.round(experience, 2),
+            "ats_score": ats,
+            "ats_label": labels,
+            "overall_match": np.round(overall, 2)
+        }
+
+    def summary(self) -> Dict:
+        return {
+            "weights": self.weights,
+            "ats_weights": self.ats_weights,
+            "ats_thresholds": self.ats_thresholds
+        }
@@ -0,0 +1,504 @@
+"""
+Sharded Search
+Scatter-gather vector scoring across shard processes or nodes
+"""
+
+import base64
+import ipaddress
+import json
+import os
+import secrets
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener, answer_challenge, deliver_challenge
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from instance.config import Config
+
+
+# The key this module shipped with once; it is public, so never accepted
+PUBLIC_DEFAULT_AUTHKEY = b'change-this-shard-key'
+MIN_REMOTE_AUTHKEY_BYTES = 16
+
+# Seconds a new connection has to complete the key handshake
+HANDSHAKE_TIMEOUT = 5.0
+
+# Array dtypes allowed in frames
+FRAME_DTYPES = {'float32': np.float32, 'int64': np.int64}
+
+
+def check_authkey(key: Optional[bytes], host: str) -> bytes:
+    """
+    Validate a shard key for a bind or dial address
+    Raises ValueError for a missing or public key, and for a short key
+    on a non-loopback address
+    """
+    if not key:
+        raise ValueError("No shard key: set the SEARCH_SHARD_AUTHKEY environment variable")
+    if key == PUBLIC_DEFAULT_AUTHKEY:
+        raise ValueError("SEARCH_SHARD_AUTHKEY is the public default key; set a secret one")
+    if not is_loopback(host) and len(key) < MIN_REMOTE_AUTHKEY_BYTES:
+        raise ValueError(
+            f"Shards on {host} need a SEARCH_SHARD_AUTHKEY of at least {MIN_REMOTE_AUTHKEY_BYTES} bytes"
+        )
+    return key
+
+
+def is_loopback(host: str) -> bool:
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _encode(value):
+    """JSON-safe form of a frame value (numpy arrays as typed base64)"""
+    if isinstance(value, np.ndarray):
+        dtype = np.dtype(value.dtype).name
+        if dtype not in FRAME_DTYPES:
+            value, dtype = value.astype(np.float32), 'float32'
+        return {
+            "__array__": dtype,
+            "data": base64.b64encode(np.ascontiguousarray(value).tobytes()).decode('ascii')
+        }
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _decode(value):
+    if isinstance(value, dict):
+        if "__array__" in value:
+            dtype = FRAME_DTYPES[value["__array__"]]
+            return np.frombuffer(base64.b64decode(value["data"]), dtype=dtype).copy()
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+
+def send_frame(conn, *message):
+    """
+    Send one JSON frame
+    Frames are data only: nothing a peer sends is ever unpickled
+    """
+    conn.send_bytes(json.dumps(_encode(list(message))).encode('utf-8'))
+
+
+def recv_frame(conn) -> List:
+    return _decode(json.loads(conn.recv_bytes().decode('utf-8')))
+
+
+def chunk_bounds(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Interleaved [start, end) row bounds, one pair per resume"""
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = starts + np.asarray(counts, dtype=np.int64)
+    return np.column_stack([starts, ends]).ravel()
+
+
+def chunk_max_scores(vectors: np.ndarray, bounds: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """
+    Best chunk cosine similarity per resume
+    Rows are contiguous per resume: reduceat over the interleaved bounds
+    takes each max; the -inf sentinel keeps the last end index in range
+    """
+    if not len(bounds):
+        return np.zeros(0, dtype=np.float32)
+    row_scores = np.append(vectors @ query, np.float32(-np.inf))
+    return np.maximum.reduceat(row_scores, bounds)[::2].astype(np.float32)
+
+
+def hybrid_top_k(
+    vector: np.ndarray,
+    lexical: np.ndarray,
+    weight: float,
+    k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Positions and scores of the k best weighted vector + lexical scores"""
+    scores = weight * vector + (1 - weight) * lexical
+    valid = np.flatnonzero(np.isfinite(scores))
+    k = min(k, len(valid))
+    if not k:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+    top = valid[np.argpartition(-scores[valid], k - 1)[:k]]
+    top = top[np.argsort(-scores[top])]
+    return top, scores[top]
+
+
+class VectorShard:
+    """
+    One partition of the talent pool's vector file
+    Holds a private copy of its resumes' chunk rows
+    """
+
+    def __init__(self, vectors_path: Path, dim: int):
+        self.vectors_path = Path(vectors_path)
+        self.dim = dim
+        self.reset()
+
+    def reset(self):
+        self.ordinals = np.zeros(0, dtype=np.int64)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.matrix = np.zeros((0, self.dim), dtype=np.float32)
+        self.bounds = np.zeros(0, dtype=np.int64)
+
+    def load(self, ordinals: List[int], starts: List[int], counts: List[int]) -> int:
+        """Append resumes (by index ordinal and row range) to this shard"""
+        if not ordinals:
+            return len(self.ordinals)
+
+        rows = self.vectors_path.stat().st_size // (4 * self.dim)
+        table = np.memmap(self.vectors_path, dtype=np.float32, mode='r', shape=(rows, self.dim))
+        index = np.concatenate([np.arange(s, s + c) for s, c in zip(starts, counts)])
+
+        self.matrix = np.vstack([self.matrix, np.asarray(table[index])])
+        self.ordinals = np.concatenate([self.ordinals, np.asarray(ordinals, dtype=np.int64)])
+        self.counts = np.concatenate([self.counts, np.asarray(counts, dtype=np.int64)])
+        local_starts = np.concatenate([[0], np.cumsum(self.counts)[:-1]])
+        self.bounds = chunk_bounds(local_starts, self.counts)
+        return len(self.ordinals)
+
+    def query(self, query: np.ndarray, lexical: np.ndarray, weight: float, k: int) -> Dict:
+        """Local top-k; lexical is aligned with this shard's ordinals"""
+        start = time.perf_counter()
+        vector = chunk_max_scores(self.matrix, self.bounds, query)
+        top, scores = hybrid_top_k(vector, lexical, weight, k)
+        return {
+            "ordinals": self.ordinals[top],
+            "scores": scores,
+            "vector_scores": vector[top],
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+        }
+
+
+def serve(listener: Listener, authkey: bytes, index_dir: Optional[Path] = None):
+    """
+    Shard server loop (see tools/search_shard.py)
+    The listener is created without an authkey: each connection's key
+    handshake runs on its own thread with a timeout, so a client with a
+    wrong key, a stray TCP connection or a stalled peer never takes the
+    shard down or blocks later connections. Each coordinator connection
+    gets its own shard state.
+    """
+    while True:
+        try:
+            conn = listener.accept()
+        except OSError as e:
+            if getattr(listener, '_listener', None) is None:
+                return  # listener closed
+            print(f"Shard accept failed: {e}")
+            time.sleep(0.1)
+            continue
+        threading.Thread(target=_serve_connection, args=(conn, authkey, index_dir), daemon=True).start()
+
+
+def _set_receive_timeout(conn, seconds: float):
+    """SO_RCVTIMEO on a connection's socket (0 = block indefinitely)"""
+    sock = socket.socket(fileno=conn.fileno())
+    try:
+        whole = int(seconds)
+        sock.setsockopt(
+            socket.SOL_SOCKET,
+            socket.SO_RCVTIMEO,
+            struct.pack('ll', whole, int((seconds - whole) * 1_000_000))
+        )
+    finally:
+        sock.detach()
+
+
+def authenticate(conn, authkey: bytes, timeout: float = None) -> bool:
+    """Server side of the key handshake; closes the connection on failure"""
+    try:
+        _set_receive_timeout(conn, timeout or HANDSHAKE_TIMEOUT)
+        deliver_challenge(conn, authkey)
+        answer_challenge(conn, authkey)
+        _set_receive_timeout(conn, 0)
+        return True
+    except (AuthenticationError, EOFError, OSError) as e:
+        print(f"Rejected shard connection: {type(e).__name__}: {e}")
+        conn.close()
+        return False
+
+
+def _serve_connection(conn, authkey: bytes, index_dir: Optional[Path]):
+    if not authenticate(conn, authkey):
+        return
+    shard = None
+    try:
+        while True:
+            try:
+                message = recv_frame(conn)
+                op = message[0]
+            except (ValueError, KeyError, IndexError, TypeError) as e:
+                send_frame(conn, 'error', f"Malformed frame: {e}")
+                continue
+            try:
+                if op == 'open':
+                    # A node may keep the index at its own path
+                    path = Path(index_dir) / "vectors.f32" if index_dir else message[1]
+                    shard = VectorShard(path, int(message[2]))
+                    send_frame(conn, 'ok', None)
+                elif op == 'load':
+                    send_frame(conn, 'ok', shard.load(*message[1:]))
+                elif op == 'reset':
+                    shard.reset()
+                    send_frame(conn, 'ok', None)
+                elif op == 'query':
+                    query, lexical, weight, k = message[1:]
+                    send_frame(conn, 'ok', shard.query(query, lexical, float(weight), int(k)))
+                elif op == 'ping':
+                    send_frame(conn, 'ok', len(shard.ordinals) if shard else 0)
+                else:
+                    send_frame(conn, 'error', f"Unknown op: {op}")
+            except Exception as e:
+                send_frame(conn, 'error', f"{type(e).__name__}: {e}")
+    except (EOFError, OSError):
+        pass
+    finally:
+        conn.close()
+
+
+class ShardClient:
+    """Coordinator-side handle for one shard process or node"""
+
+    def __init__(self, shard_id: int, address: Optional[Tuple[str, int]] = None):
+        self.shard_id = shard_id
+        self.address = address
+        self.remote = address is not None
+        # Remote nodes share the configured secret; a local shard process
+        # gets a fresh random key through its environment
+        self.authkey = (
+            check_authkey(Config.SEARCH_SHARD_AUTHKEY, address[0]) if self.remote
+            else secrets.token_hex(32).encode('ascii')
+        )
+        self.process = None
+        self.conn = None
+        self.ordinals: List[int] = []
+        self.ordinal_array = np.zeros(0, dtype=np.int64)
+
+        # Health
+        self.healthy = False
+        self.queries = 0
+        self.errors = 0
+        self.last_ms = None
+        self.total_ms = 0.0
+        self.last_error = None
+
+    def connect(self, vectors_path: Path, dim: int):
+        """Start (local) or dial (remote) the shard and open the vector file"""
+        self.close()
+        if not self.remote:
+            # Local shard: a child process running the shard server on an
+            # ephemeral port, reported on its first stdout line
+            script = Path(__file__).parent.parent / "tools" / "search_shard.py"
+            self.process = subprocess.Popen(
+                [sys.executable, str(script), '--host', '127.0.0.1', '--port', '0'],
+                stdout=subprocess.PIPE,
+                text=True,
+                env=dict(os.environ, SEARCH_SHARD_AUTHKEY=self.authkey.decode('ascii'))
+            )
+            port = int(self.process.stdout.readline().strip())
+            self.address = ('127.0.0.1', port)
+
+        self.conn = Client(self.address, authkey=self.authkey)
+        self.call('open', str(vectors_path), dim)
+        self.healthy = True
+
+    def call(self, *message, timeout: float = None):
+        send_frame(self.conn, *message)
+        return self.receive(timeout)
+
+    def receive(self, timeout: float = None):
+        if timeout is not None and not self.conn.poll(timeout):
+            raise TimeoutError(f"Shard {self.shard_id} did not answer within {timeout}s")
+        status, payload = recv_frame(self.conn)
+        if status != 'ok':
+            raise RuntimeError(payload)
+        return payload
+
+    def fail(self, error: Exception):
+        """Mark unhealthy; the coordinator reconnects on the next sync"""
+        self.errors += 1
+        self.healthy = False
+        self.last_error = f"{type(error).__name__}: {error}"
+        self.close()
+
+    def close(self):
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except OSError:
+                pass
+            self.conn = None
+        if self.process is not None:
+            self.process.terminate()
+            self.process.wait()
+            self.process = None
+            self.address = None
+
+    def stats(self) -> Dict:
+        return {
+            "shard": self.shard_id,
+            "address": f"{self.address[0]}:{self.address[1]}" if self.address else None,
+            "remote": self.remote,
+            "healthy": self.healthy,
+            "resumes": len(self.ordinals),
+            "queries": self.queries,
+            "errors": self.errors,
+            "last_ms": self.last_ms,
+            "avg_ms": round(self.total_ms / self.queries, 2) if self.queries else None,
+            "last_error": self.last_error
+        }
+
+
+class ShardedSearch:
+    """
+    Coordinator: partitions the talent pool's resumes round-robin across
+    shards, fans each query out and merges the per-shard top-k
+    Shards are local processes (Config.SEARCH_SHARDS) or remote nodes
+    (Config.SEARCH_SHARD_ADDRESSES, each running tools/search_shard.py)
+    """
+
+    def __init__(self, index, n_shards: int = None, addresses: List[str] = None, timeout: float = None):
+        self.index = index
+        self.timeout = timeout or Config.SEARCH_SHARD_TIMEOUT
+        addresses = addresses if addresses is not None else Config.SEARCH_SHARD_ADDRESSES
+        if addresses:
+            self.shards = [
+                ShardClient(i, (host, int(port)))
+                for i, (host, port) in enumerate(a.rsplit(':', 1) for a in addresses)
+            ]
+        else:
+            self.shards = [ShardClient(i) for i in range(n_shards or Config.SEARCH_SHARDS)]
+        self._synced = 0
+        self._inode = None
+
+    def _sync(self):
+        """Ship resumes added since the last query (caller holds the index lock)"""
+        index = self.index
+        if index.dim is None:
+            return
+
+        # Compaction renumbers ordinals - redistribute everything
+        if index._log_inode != self._inode or len(index.doc_ids) < self._synced:
+            for shard in self.shards:
+                shard.ordinals = []
+                if shard.healthy:
+                    try:
+                        shard.call('reset', timeout=self.timeout)
+                    except Exception as e:
+                        shard.fail(e)
+            self._synced = 0
+            self._inode = index._log_inode
+
+        new = [o for o in range(self._synced, len(index.doc_ids)) if index.live[o]]
+        assigned = {shard.shard_id: [] for shard in self.shards}
+        for o in new:
+            assigned[o % len(self.shards)].append(o)
+        self._synced = len(index.doc_ids)
+
+        for shard in self.shards:
+            pending = assigned[shard.shard_id]
+            if not shard.healthy:
+                # (Re)start and reload everything this shard owns
+                pending = shard.ordinals + pending
+                shard.ordinals = []
+            try:
+                if not shard.healthy:
+                    shard.connect(index.vectors_path, index.dim)
+
+                if pending:
+                    shard.call(
+                        'load',
+                        pending,
+                        [index.row_starts[o] for o in pending],
+                        [index.row_counts[o] for o in pending],
+                        timeout=self.timeout * 10
+                    )
+                    shard.ordinals = shard.ordinals + pending
+                shard.ordinal_array = np.asarray(shard.ordinals, dtype=np.int64)
+            except Exception as e:
+                # Keep ownership so a later sync reloads these resumes
+                shard.ordinals = shard.ordinals + pending
+                shard.ordinal_array = np.asarray(shard.ordinals, dtype=np.int64)
+                shard.fail(e)
+
+    def search(self, query: np.ndarray, lexical: np.ndarray, weight: float, k: int) -> Dict:
+        """
+        Scatter the query, gather per-shard top-k and merge
+        lexical covers every index ordinal (-inf for deleted resumes)
+        """
+        self._sync()
+
+        # 1. Scatter
+        sent = []
+        for shard in self.shards:
+            if not shard.healthy or not len(shard.ordinal_array):
+                continue
+            try:
+                send_frame(
+                    shard.conn,
+                    'query',
+                    np.asarray(query, dtype=np.float32),
+                    np.asarray(lexical[shard.ordinal_array], dtype=np.float32),
+                    weight,
+                    k
+                )
+                sent.append((shard, time.perf_counter()))
+            except Exception as e:
+                shard.fail(e)
+
+        # 2. Gather within the deadline
+        deadline = time.perf_counter() + self.timeout
+        parts = []
+        for shard, started in sent:
+            try:
+                result = shard.receive(max(0.0, deadline - time.perf_counter()))
+            except Exception as e:
+                shard.fail(e)
+                continue
+            shard.queries += 1
+            shard.last_ms = round((time.perf_counter() - started) * 1000, 2)
+            shard.total_ms += shard.last_ms
+            parts.append(result)
+
+        # 3. Merge
+        if parts:
+            ordinals = np.concatenate([p["ordinals"] for p in parts])
+            scores = np.concatenate([p["scores"] for p in parts])
+            vector = np.concatenate([p["vector_scores"] for p in parts])
+        else:
+            ordinals = np.zeros(0, dtype=np.int64)
+            scores = vector = np.zeros(0, dtype=np.float32)
+
+        order = np.argsort(-scores)[:k]
+        expected = sum(1 for s in self.shards if len(s.ordinals))
+        return {
+            "ordinals": ordinals[order],
+            "scores": scores[order],
+            "vector_scores": vector[order],
+            "partial": len(parts) < expected
+        }
+
+    def stats(self) -> List[Dict]:
+        return [shard.stats() for shard in self.shards]
+
+    def close(self):
+        for shard in self.shards:
+            shard.close()
+            shard.healthy = False
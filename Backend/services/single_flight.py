@@ -0,0 +1,92 @@
+"""
+Single Flight
+Collapse concurrent identical computations into one
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Tuple
+
+
+class SingleFlight:
+    """
+    Request coalescing keyed by content hash
+    The first caller for a key runs the computation; callers arriving
+    while it is in flight wait on the same future and share its result.
+    Works for threads (gunicorn gthread workers) and asyncio callers.
+    Coalescing is per process - across workers the shared result cache
+    takes over once the first computation finishes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+
+        # Counters
+        self.executions = 0
+        self.coalesced = 0
+        self.failures = 0
+
+    def _claim(self, key: str) -> Tuple[Future, bool]:
+        """Return the in-flight future for key and whether the caller leads it"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+
+            future = Future()
+            self._calls[key] = future
+            self.executions += 1
+            return future, True
+
+    def _run(self, key: str, future: Future, fn: Callable, args, kwargs):
+        """Run the computation and publish its outcome to every waiter"""
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                self._calls.pop(key, None)
+                self.failures += 1
+            future.set_exception(e)
+        else:
+            with self._lock:
+                self._calls.pop(key, None)
+            future.set_result(result)
+
+    def do(self, key: str, fn: Callable, *args, **kwargs):
+        """Run fn once per key across concurrent threads"""
+        future, leader = self._claim(key)
+        if leader:
+            self._run(key, future, fn, args, kwargs)
+        return future.result()
+
+    async def do_async(self, key: str, fn: Callable, *args, executor=None, **kwargs):
+        """
+        Async variant - the leader runs fn on an executor so the event
+        loop is never blocked; waiters await the shared future
+        """
+        future, leader = self._claim(key)
+        if leader:
+            # Carry the caller's context (request capture, stage traces)
+            # onto the executor thread, as asyncio.to_thread does
+            context = contextvars.copy_context()
+            loop = asyncio.get_running_loop()
+            loop.run_in_executor(
+                executor,
+                functools.partial(context.run, self._run, key, future, fn, args, kwargs)
+            )
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            in_flight = len(self._calls)
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+            "in_flight": in_flight
+        }
@@ -0,0 +1,383 @@
+"""
+Stage Graph
+Analysis pipeline as a DAG of named stages with declared inputs
+"""
+
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from services.deadline import Deadline, StageCosts
+from services.result_cache import config_fingerprint, text_digest
+from instance.config import Config
+
+
+class Stage:
+    """
+    One named pipeline step: output = fn(**inputs)
+    Inputs name root values or other stages' outputs. Optional stages
+    (approximate or skipped given) may be degraded under a deadline:
+    approximate(**approximate_inputs) or a copy of skipped.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable,
+        inputs: Iterable[str] = (),
+        memoize: bool = True,
+        approximate: Optional[Callable] = None,
+        approximate_inputs: Optional[Iterable[str]] = None,
+        skipped: Any = None,
+        optional: bool = False
+    ):
+        self.name = name
+        self.fn = fn
+        self.inputs = tuple(inputs)
+        self.memoize = memoize
+        self.approximate = approximate
+        self.approximate_inputs = tuple(self.inputs if approximate_inputs is None else approximate_inputs)
+        self.skipped = skipped
+        self.optional = optional or approximate is not None or skipped is not None
+
+    def dependencies(self, deadline: Optional[Deadline]) -> Tuple[str, ...]:
+        """Inputs to wait for (a deadline may switch to the approximation)"""
+        if deadline is None or self.approximate is None:
+            return self.inputs
+        return tuple(dict.fromkeys(self.inputs + self.approximate_inputs))
+
+
+# Per-stage records of graph runs in the current context (see trace_stages)
+_trace: ContextVar[Optional[List[Dict]]] = ContextVar('stage_trace', default=None)
+
+
+@contextmanager
+def trace_stages():
+    """
+    Collect {"stage", "mode", "elapsed_ms"} for every stage resolved by
+    graph runs started in this context; mode is 'full', 'approximate',
+    'memo' or 'skipped'
+    """
+    token = _trace.set([])
+    try:
+        yield _trace.get()
+    finally:
+        _trace.reset(token)
+
+
+def value_key(value) -> Optional[str]:
+    """
+    Content key of a root value (None = not memoizable)
+    Objects provide their own via a cache_key attribute
+    """
+    if value is None:
+        return 'none'
+    cache_key = getattr(value, 'cache_key', None)
+    if cache_key is not None:
+        return cache_key
+    if isinstance(value, str):
+        return text_digest(value)
+    if isinstance(value, (list, tuple)) and all(isinstance(v, str) for v in value):
+        return text_digest('\x00'.join(value))
+    if isinstance(value, (int, float, bool)):
+        return repr(value)
+    return None
+
+
+class StageGraph:
+    """
+    Registered stages plus a runner for any subset of their outputs
+    - only stages the requested outputs depend on run; values passed in
+      (e.g. precomputed terms) replace the stage that would produce them
+    - independent stages run in parallel on the executor; unless
+      streaming, the calling thread runs one of each ready batch itself
+    - outputs are memoized (LRU, STAGE_MEMO_MAX_ENTRIES) by a hash of
+      the stage, its input keys and the scoring config, so work that
+      depends only on the resume is shared across job descriptions
+    """
+
+    def __init__(
+        self,
+        costs: Optional[StageCosts] = None,
+        executor: Optional[Executor] = None,
+        memo_size: Optional[int] = None
+    ):
+        self.stages: 'OrderedDict[str, Stage]' = OrderedDict()
+        self.costs = costs or StageCosts()
+        self.executor = executor
+        self.memo_size = Config.STAGE_MEMO_MAX_ENTRIES if memo_size is None else memo_size
+        self._memo: 'OrderedDict[str, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.counters = defaultdict(int)
+
+    def add(self, stage: Stage, replace: bool = False) -> Stage:
+        """Register a stage (replace=True swaps out an existing one)"""
+        if stage.name in self.stages and not replace:
+            raise ValueError(f"Stage '{stage.name}' is already registered")
+        self.stages[stage.name] = stage
+        return stage
+
+    def stage(self, name: str, inputs: Iterable[str] = (), **options) -> Callable:
+        """Decorator form of add()"""
+        replace = options.pop('replace', False)
+
+        def register(fn: Callable) -> Callable:
+            self.add(Stage(name, fn, inputs, **options), replace=replace)
+            return fn
+        return register
+
+    def plan(
+        self,
+        targets: Iterable[str],
+        provided: Iterable[str] = (),
+        deadline: Optional[Deadline] = None
+    ) -> List[str]:
+        """Stages needed for targets, in dependency (registration) order"""
+        provided = set(provided)
+        needed = set()
+        visiting = set()
+
+        def visit(name: str):
+            if name in provided or name in needed:
+                return
+            if name not in self.stages:
+                raise KeyError(f"No stage or input named '{name}'")
+            if name in visiting:
+                raise ValueError(f"Stage '{name}' depends on itself")
+            visiting.add(name)
+            for dependency in self.stages[name].dependencies(deadline):
+                visit(dependency)
+            visiting.discard(name)
+            needed.add(name)
+
+        for target in targets:
+            visit(target)
+        return [name for name in self.stages if name in needed]
+
+    def run(
+        self,
+        values: Dict[str, Any],
+        targets: Iterable[str],
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
+        """Compute targets from root values; returns {target: output}"""
+        targets = list(targets)
+        outputs = dict(self.run_iter(values, targets, deadline))
+        return {target: outputs[target] if target in outputs else values[target] for target in targets}
+
+    def run_iter(
+        self,
+        values: Dict[str, Any],
+        targets: Iterable[str],
+        deadline: Optional[Deadline] = None,
+        inline: bool = True
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        Yield (stage, output) for every stage run, as each finishes
+        inline=False keeps the calling thread free to yield promptly
+        """
+        waiting = self.plan(targets, values, deadline)
+        outputs = dict(values)
+        keys = {name: value_key(value) for name, value in values.items()}
+        fingerprint = config_fingerprint()
+        trace = _trace.get()
+        # Runs started inside a stage stay inline (no nested pool waits)
+        executor = None if getattr(self._local, 'active', False) else self.executor
+        pending = {}
+
+        try:
+            while waiting or pending:
+                # 1. Resolve every stage whose inputs are available
+                ready = [
+                    name for name in waiting
+                    if all(d in outputs for d in self.stages[name].dependencies(deadline))
+                ]
+                calls = []
+                for name in ready:
+                    waiting.remove(name)
+                    call = self._prepare(self.stages[name], outputs, keys, fingerprint, deadline, trace)
+                    if call is None:
+                        yield name, outputs[name]  # memoized or skipped
+                    else:
+                        calls.append(call)
+
+                # 2. Run them on the pool, keeping the last one here
+                if calls:
+                    if executor is not None:
+                        split = len(calls) - 1 if inline else len(calls)
+                        for call in calls[:split]:
+                            pending[executor.submit(self._execute, call)] = call
+                        calls = calls[split:]
+                    for call in calls:
+                        outputs[call.name] = self._finish(call, self._execute(call), trace)
+                        yield call.name, outputs[call.name]
+                if ready:
+                    continue  # resolved stages may unblock others
+
+                if not pending:
+                    raise RuntimeError(f"Stages cannot run: {', '.join(waiting)}")
+
+                # 3. Collect pool results as they finish
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    call = pending.pop(future)
+                    outputs[call.name] = self._finish(call, future.result(), trace)
+                    yield call.name, outputs[call.name]
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _prepare(
+        self,
+        stage: Stage,
+        outputs: Dict[str, Any],
+        keys: Dict[str, Optional[str]],
+        fingerprint: str,
+        deadline: Optional[Deadline],
+        trace: Optional[List[Dict]] = None
+    ) -> Optional['StageCall']:
+        """
+        Resolve a ready stage from the memo or as skipped (output stored,
+        returns None), else return the call to make
+        """
+        key = self._memo_key(stage.name, stage.inputs, keys, fingerprint)
+        keys[stage.name] = key
+
+        # A memoized full result beats any degradation
+        if self._recall(stage, key, outputs):
+            self._record(trace, stage.name, 'memo')
+            return None
+
+        mode = self._mode(stage, deadline)
+        if mode == 'skipped':
+            deadline.degrade(stage.name, 'skipped')
+            outputs[stage.name] = copy.copy(stage.skipped)
+            keys[stage.name] = None
+            self._count('skipped')
+            self._record(trace, stage.name, 'skipped')
+            return None
+
+        if mode == 'approximate':
+            deadline.degrade(stage.name, 'approximate')
+            cost_name = f"{stage.name}:approximate"
+            key = self._memo_key(cost_name, stage.approximate_inputs, keys, fingerprint)
+            keys[stage.name] = key
+            if self._recall(stage, key, outputs):
+                self._record(trace, stage.name, 'memo')
+                return None
+            self._count('approximated')
+            inputs = {name: outputs[name] for name in stage.approximate_inputs}
+            return StageCall(stage.name, stage.approximate, inputs, cost_name, key if stage.memoize else None, mode)
+
+        inputs = {name: outputs[name] for name in stage.inputs}
+        return StageCall(stage.name, stage.fn, inputs, stage.name, key if stage.memoize else None)
+
+    def _mode(self, stage: Stage, deadline: Optional[Deadline]) -> str:
+        """
+        'full' if the stage's estimated cost fits the deadline, else
+        'approximate' if that fits, else 'skipped'
+        """
+        if not stage.optional or deadline is None or deadline.allows(self.costs.estimate(stage.name)):
+            return 'full'
+        if stage.approximate is not None and deadline.allows(self.costs.estimate(f"{stage.name}:approximate")):
+            return 'approximate'
+        return 'skipped'
+
+    def _execute(self, call: 'StageCall'):
+        previous = getattr(self._local, 'active', False)
+        self._local.active = True
+        start = time.perf_counter()
+        try:
+            return self.costs.time(call.cost_name, call.fn, **call.inputs)
+        finally:
+            call.elapsed_ms = (time.perf_counter() - start) * 1000
+            self._local.active = previous
+
+    def _finish(self, call: 'StageCall', output, trace: Optional[List[Dict]] = None):
+        self._count('runs')
+        self._record(trace, call.name, call.mode, call.elapsed_ms)
+        if call.memo_key is not None and self.memo_size:
+            with self._lock:
+                self._memo[call.memo_key] = output
+                self._memo.move_to_end(call.memo_key)
+                while len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+        return output
+
+    @staticmethod
+    def _memo_key(
+        name: str,
+        inputs: Tuple[str, ...],
+        keys: Dict[str, Optional[str]],
+        fingerprint: str
+    ) -> Optional[str]:
+        """Hash of stage and input keys (None if any input has no key)"""
+        input_keys = [keys.get(i) for i in inputs]
+        if any(k is None for k in input_keys):
+            return None
+        raw = '|'.join([fingerprint, name] + input_keys)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _recall(self, stage: Stage, key: Optional[str], outputs: Dict[str, Any]) -> bool:
+        if not stage.memoize or key is None or not self.memo_size:
+            return False
+        with self._lock:
+            if key not in self._memo:
+                self.counters['memo_misses'] += 1
+                return False
+            self._memo.move_to_end(key)
+            outputs[stage.name] = self._memo[key]
+            self.counters['memo_hits'] += 1
+            return True
+
+    @staticmethod
+    def _record(trace: Optional[List[Dict]], stage: str, mode: str, elapsed_ms: float = 0.0):
+        if trace is not None:
+            trace.append({"stage": stage, "mode": mode, "elapsed_ms": round(elapsed_ms, 2)})
+
+    def _count(self, counter: str):
+        with self._lock:
+            self.counters[counter] += 1
+
+    def clear(self):
+        """Drop all memoized outputs"""
+        with self._lock:
+            self._memo.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(
+                self.counters,
+                memo_entries=len(self._memo),
+                stages=list(self.stages)
+            )
+
+
+class StageCall:
+    """A resolved stage run: fn(**inputs), timed as cost_name"""
+
+    __slots__ = ('name', 'fn', 'inputs', 'cost_name', 'memo_key', 'mode', 'elapsed_ms')
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable,
+        inputs: Dict[str, Any],
+        cost_name: str,
+        memo_key: Optional[str],
+        mode: str = 'full'
+    ):
+        self.name = name
+        self.fn = fn
+        self.inputs = inputs
+        self.cost_name = cost_name
+        self.memo_key = memo_key
+        self.mode = mode
+        self.elapsed_ms = 0.0
@@ -0,0 +1,36 @@
+"""
+Stage Models
+Which sentence encoder each analysis stage uses
+"""
+
+from typing import Dict
+
+from instance.config import Config
+
+
+# Stages that encode text, by what they compare
+MODEL_STAGES = (
+    'keywords',     # short terms against terms (and the skill lexicon)
+    'highlights',   # resume sentences against the JD
+    'sections',     # resume sections against the JD
+    'document'      # whole resume against the whole JD
+)
+
+# Stages compared against a JD embedding; one on another encoder than
+# 'document' gets its own (JobProfile.stage_embeddings)
+JD_EMBEDDING_STAGES = ('highlights', 'sections')
+
+
+def stage_model(stage: str) -> str:
+    """Model name for a stage: STAGE_MODELS, else SENTENCE_MODEL"""
+    if stage not in MODEL_STAGES:
+        raise KeyError(f"Unknown model stage '{stage}' (expected one of {', '.join(MODEL_STAGES)})")
+    return (Config.STAGE_MODELS or {}).get(stage) or Config.SENTENCE_MODEL
+
+
+def stage_models() -> Dict[str, str]:
+    """Resolved model of every stage"""
+    unknown = set(Config.STAGE_MODELS or {}) - set(MODEL_STAGES)
+    if unknown:
+        raise KeyError(f"Unknown STAGE_MODELS stages: {', '.join(sorted(unknown))}")
+    return {stage: stage_model(stage) for stage in MODEL_STAGES}
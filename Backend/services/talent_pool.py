@@ -0,0 +1,430 @@
+"""
+Talent Pool Index
+Persistent hybrid (lexical + vector) search over every indexed resume
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows - single process only
+    fcntl = None
+
+from services.sharded_search import ShardedSearch, chunk_bounds, chunk_max_scores, hybrid_top_k
+from services.stage_models import stage_model
+from instance.config import Config
+
+
+class TalentPoolIndex:
+    """
+    Resume index for "best existing candidates for this JD" queries
+
+    On disk (Config.TALENT_POOL_DIR):
+        vectors.f32   append-only float32 rows, one per resume chunk
+        entries.jsonl append-only log of add/delete operations
+        meta.json     model name and embedding dimension
+
+    In memory, the log is replayed into an inverted index (term -> resumes)
+    and a row table, so add/delete never rebuild anything. Every worker
+    process tails the same log, picking up other workers' writes.
+    Vector scoring can be partitioned across shard processes or nodes.
+    """
+
+    def __init__(self, matcher_service, root: Path = None, shards: int = None):
+        self.matcher = matcher_service
+        self.root = Path(root or Config.TALENT_POOL_DIR)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.root / "vectors.f32"
+        self.log_path = self.root / "entries.jsonl"
+        self.meta_path = self.root / "meta.json"
+        self.lock_path = self.root / ".lock"
+        self._lock = threading.RLock()
+        self._load_meta()
+        self._reset()
+
+        # Scatter-gather vector scoring (services/sharded_search.py)
+        self.shards = None
+        n_shards = Config.SEARCH_SHARDS if shards is None else shards
+        if n_shards or Config.SEARCH_SHARD_ADDRESSES:
+            self.shards = ShardedSearch(self, n_shards)
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+
+    def _load_meta(self):
+        model_name = stage_model('document')
+        meta = {}
+        if self.meta_path.exists():
+            meta = json.loads(self.meta_path.read_text(encoding='utf-8'))
+
+        if meta and meta.get("model") != model_name:
+            # Vectors from another model are not comparable - start over
+            print(f"Talent pool built with {meta.get('model')}, resetting for {model_name}")
+            for path in (self.vectors_path, self.log_path):
+                if path.exists():
+                    path.unlink()
+            meta = {}
+
+        self.dim = meta.get("dim")
+
+    def _save_meta(self):
+        self.meta_path.write_text(
+            json.dumps({"model": stage_model('document'), "dim": self.dim}),
+            encoding='utf-8'
+        )
+
+    def _reset(self):
+        """Empty in-memory view; filled by replaying the log"""
+        self.doc_ids: List[str] = []            # ordinal -> resume id
+        self.ordinals: Dict[str, int] = {}      # live resume id -> ordinal
+        self.filenames: List[Optional[str]] = []
+        self.doc_terms: List[List[str]] = []
+        self.row_starts: List[int] = []
+        self.row_counts: List[int] = []
+        self.live: List[bool] = []
+        self.postings: Dict[str, Set[int]] = {}
+        self._posting_arrays: Dict[str, np.ndarray] = {}
+        self._starts_array = None
+        self._live_array = None
+        self._vectors = None
+        self._log_offset = 0
+        self._log_inode = None
+
+    def _refresh(self):
+        """Apply log entries written since the last refresh (by any process)"""
+        if not self.log_path.exists():
+            if self._log_offset:
+                self._reset()
+            return
+
+        stat = self.log_path.stat()
+        if self._log_inode is not None and stat.st_ino != self._log_inode:
+            # Log was compacted - replay from scratch
+            self._reset()
+        if stat.st_size == self._log_offset:
+            return
+
+        with open(self.log_path, 'rb') as f:
+            f.seek(self._log_offset)
+            data = f.read()
+
+        # Only apply complete lines; a concurrent writer may be mid-line
+        end = data.rfind(b'\n') + 1
+        for line in data[:end].splitlines():
+            if line.strip():
+                self._apply(json.loads(line))
+        self._log_offset += end
+        self._log_inode = stat.st_ino
+        self._vectors = None
+        if self.dim is None:
+            # First vectors were written by another process
+            self._load_meta()
+
+    def _apply(self, entry: Dict):
+        if entry["op"] == "add":
+            self._remove(entry["id"])
+            ordinal = len(self.doc_ids)
+            self.doc_ids.append(entry["id"])
+            self.filenames.append(entry.get("filename"))
+            self.doc_terms.append(entry["terms"])
+            self.row_starts.append(entry["start"])
+            self.row_counts.append(entry["rows"])
+            self.live.append(True)
+            self.ordinals[entry["id"]] = ordinal
+            for term in entry["terms"]:
+                self.postings.setdefault(term, set()).add(ordinal)
+                self._posting_arrays.pop(term, None)
+        elif entry["op"] == "delete":
+            self._remove(entry["id"])
+
+        self._starts_array = None
+        self._live_array = None
+
+    def _remove(self, doc_id: str):
+        ordinal = self.ordinals.pop(doc_id, None)
+        if ordinal is None:
+            return
+        self.live[ordinal] = False
+        for term in self.doc_terms[ordinal]:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.discard(ordinal)
+                if not postings:
+                    del self.postings[term]
+            self._posting_arrays.pop(term, None)
+        self.doc_terms[ordinal] = []
+
+    def _vector_table(self) -> Optional[np.ndarray]:
+        """Memory-mapped view of every stored chunk vector"""
+        if self._vectors is None and self.dim and self.vectors_path.exists():
+            rows = self.vectors_path.stat().st_size // (4 * self.dim)
+            if rows:
+                self._vectors = np.memmap(
+                    self.vectors_path, dtype=np.float32, mode='r', shape=(rows, self.dim)
+                )
+        return self._vectors
+
+    def _write_locked(self):
+        """Cross-process write lock (flock) around appends"""
+        handle = open(self.lock_path, 'a')
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def _append_log(self, entry: Dict):
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def chunk_text(self, text: str) -> List[str]:
+        """Split a resume into at most TALENT_POOL_MAX_CHUNKS sentence groups"""
+        sentences = self.matcher.similarity_calculator.split_sentences(text)
+        if not sentences:
+            return [text] if text.strip() else []
+
+        size = Config.TALENT_POOL_CHUNK_SENTENCES
+        n_chunks = min(Config.TALENT_POOL_MAX_CHUNKS, math.ceil(len(sentences) / size))
+        groups = np.array_split(np.array(sentences, dtype=object), n_chunks)
+        return ['. '.join(group) for group in groups if len(group)]
+
+    def add(self, doc_id: str, cleaned_text: str, terms: List[str], filename: Optional[str] = None) -> bool:
+        """
+        Index (or re-index) a resume
+        Returns False when the resume has no text to index
+        """
+        chunks = self.chunk_text(cleaned_text)
+        if not chunks:
+            return False
+
+        # Encode outside the lock; normalized so a dot product is cosine
+        embeddings = np.asarray(
+            self.matcher.similarity_calculator.model.encode(chunks),
+            dtype=np.float32
+        )
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = embeddings / np.where(norms == 0, 1.0, norms)
+
+        with self._lock:
+            handle = self._write_locked()
+            try:
+                self._refresh()
+                if self.dim is None:
+                    self.dim = int(embeddings.shape[1])
+                    self._save_meta()
+
+                # Start row from the file itself so concurrent writers agree
+                start = 0
+                if self.vectors_path.exists():
+                    start = self.vectors_path.stat().st_size // (4 * self.dim)
+                with open(self.vectors_path, 'ab') as f:
+                    f.write(embeddings.tobytes())
+
+                self._append_log({
+                    "op": "add",
+                    "id": doc_id,
+                    "start": start,
+                    "rows": len(chunks),
+                    "terms": sorted(set(t.lower() for t in terms)),
+                    "filename": filename
+                })
+                self._refresh()
+            finally:
+                handle.close()
+        return True
+
+    def add_document(self, document) -> bool:
+        """Index a Document from services/document_store.py"""
+        return self.add(document.id, document.cleaned_text, document.terms, document.filename)
+
+    def delete(self, doc_id: str) -> bool:
+        """Remove a resume from search results (rows are reclaimed by compact)"""
+        with self._lock:
+            handle = self._write_locked()
+            try:
+                self._refresh()
+                if doc_id not in self.ordinals:
+                    return False
+                self._append_log({"op": "delete", "id": doc_id})
+                self._refresh()
+                return True
+            finally:
+                handle.close()
+
+    def contains(self, doc_id: str) -> bool:
+        with self._lock:
+            self._refresh()
+            return doc_id in self.ordinals
+
+    def compact(self) -> Dict:
+        """Rewrite the vector file and log without deleted resumes"""
+        with self._lock:
+            handle = self._write_locked()
+            try:
+                self._refresh()
+                vectors = self._vector_table()
+                live = [o for o in range(len(self.doc_ids)) if self.live[o]]
+
+                tmp_vectors = self.vectors_path.with_suffix('.tmp')
+                tmp_log = self.log_path.with_suffix('.tmp')
+                start = 0
+                with open(tmp_vectors, 'wb') as vf, open(tmp_log, 'w', encoding='utf-8') as lf:
+                    for o in live:
+                        rows = vectors[self.row_starts[o]:self.row_starts[o] + self.row_counts[o]]
+                        vf.write(np.ascontiguousarray(rows).tobytes())
+                        lf.write(json.dumps({
+                            "op": "add",
+                            "id": self.doc_ids[o],
+                            "start": start,
+                            "rows": self.row_counts[o],
+                            "terms": self.doc_terms[o],
+                            "filename": self.filenames[o]
+                        }) + '\n')
+                        start += self.row_counts[o]
+
+                removed = len(self.doc_ids) - len(live)
+                self._vectors = None
+                os.replace(tmp_vectors, self.vectors_path)
+                os.replace(tmp_log, self.log_path)
+                self._reset()
+                self._refresh()
+                return {"resumes": len(live), "removed": removed, "rows": start}
+            finally:
+                handle.close()
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _posting_array(self, term: str) -> np.ndarray:
+        array = self._posting_arrays.get(term)
+        if array is None:
+            array = np.fromiter(self.postings.get(term, ()), dtype=np.int64)
+            self._posting_arrays[term] = array
+        return array
+
+    def lexical_scores(self, jd_terms: List[str]) -> np.ndarray:
+        """
+        IDF-weighted share of JD terms each resume contains (0-1)
+        Postings are cached as numpy arrays so common terms cost one
+        vectorized add instead of a Python loop over resumes
+        """
+        n_docs = len(self.doc_ids)
+        scores = np.zeros(n_docs, dtype=np.float32)
+        n_live = len(self.ordinals)
+        if not n_live:
+            return scores
+
+        total = 0.0
+        for term in set(t.lower() for t in jd_terms):
+            postings = self._posting_array(term)
+            idf = math.log((n_live + 1) / (len(postings) + 1)) + 1.0
+            total += idf
+            if len(postings):
+                scores[postings] += idf
+        return scores / total if total else scores
+
+    def vector_scores(self, jd_embedding: np.ndarray) -> np.ndarray:
+        """Best chunk cosine similarity per resume"""
+        n_docs = len(self.doc_ids)
+        vectors = self._vector_table()
+        if vectors is None or not n_docs:
+            return np.zeros(n_docs, dtype=np.float32)
+
+        if self._starts_array is None:
+            self._starts_array = chunk_bounds(self.row_starts, self.row_counts)
+        return chunk_max_scores(vectors, self._starts_array, self._query(jd_embedding))
+
+    @staticmethod
+    def _query(jd_embedding: np.ndarray) -> np.ndarray:
+        query = np.asarray(jd_embedding, dtype=np.float32)
+        return query / (np.linalg.norm(query) or 1.0)
+
+    def search(self, profile, top_k: int = None) -> Dict:
+        """
+        Top-k resumes for a compiled JobProfile
+        score = w * vector + (1 - w) * lexical, w = TALENT_POOL_VECTOR_WEIGHT
+        Vector scoring runs in-process or scatter-gathers across shards
+        """
+        start = time.perf_counter()
+        top_k = top_k or Config.TALENT_POOL_TOP_K
+        weight = Config.TALENT_POOL_VECTOR_WEIGHT
+        if profile.embedding is None:
+            # Lexical-only profile (e.g. streaming) - rank on terms alone
+            weight = 0.0
+
+        with self._lock:
+            self._refresh()
+            n_docs = len(self.doc_ids)
+            results = []
+            partial = False
+            if self.ordinals:
+                lexical = self.lexical_scores(profile.terms)
+                if self._live_array is None:
+                    self._live_array = np.asarray(self.live, dtype=bool)
+                lexical[~self._live_array] = -np.inf
+
+                if self.shards is not None and weight:
+                    merged = self.shards.search(self._query(profile.embedding), lexical, weight, top_k)
+                    top, scores, vector = merged["ordinals"], merged["scores"], merged["vector_scores"]
+                    partial = merged["partial"]
+                else:
+                    vector = (
+                        self.vector_scores(profile.embedding) if weight
+                        else np.zeros(n_docs, dtype=np.float32)
+                    )
+                    top, scores = hybrid_top_k(vector, lexical, weight, top_k)
+                    vector = vector[top]
+
+                jd_terms = set(t.lower() for t in profile.terms)
+                for o, score, vector_score in zip(top, scores, vector):
+                    results.append({
+                        "resume_id": self.doc_ids[o],
+                        "filename": self.filenames[o],
+                        "score": round(float(score) * 100, 2),
+                        "vector_score": round(float(vector_score) * 100, 2),
+                        "lexical_score": round(float(lexical[o]) * 100, 2),
+                        "matched_terms": len(jd_terms.intersection(self.doc_terms[o]))
+                    })
+
+        response = {
+            "results": results,
+            "searched": len(self.ordinals),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+        }
+        if self.shards is not None:
+            response["partial"] = partial
+        return response
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._refresh()
+            vectors = self._vector_table()
+            stats = {
+                "resumes": len(self.ordinals),
+                "deleted": len(self.doc_ids) - len(self.ordinals),
+                "rows": 0 if vectors is None else int(vectors.shape[0]),
+                "terms": len(self.postings),
+                "dim": self.dim
+            }
+            if self.shards is not None:
+                stats["shards"] = self.shards.stats()
+            return stats
+
+    def close(self):
+        """Stop shard processes"""
+        if self.shards is not None:
+            self.shards.close()
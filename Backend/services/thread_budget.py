@@ -0,0 +1,127 @@
+"""
+Thread Budget
+Split the machine's cores between workers, requests, torch and BLAS
+"""
+
+import os
+import threading
+from typing import Dict, Optional
+
+from instance.config import Config
+
+
+# Environment variables read by BLAS/OpenMP runtimes when they start;
+# set so child processes (shards, parse pools, bulk workers) inherit them
+THREAD_ENV_VARS = [
+    'OMP_NUM_THREADS',
+    'OPENBLAS_NUM_THREADS',
+    'MKL_NUM_THREADS',
+    'VECLIB_MAXIMUM_THREADS',
+    'NUMEXPR_NUM_THREADS'
+]
+
+
+def available_cores() -> int:
+    """Cores this process may run on (respects taskset/cgroup affinity)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class ThreadBudget:
+    """
+    One CPU layout for the whole process tree
+    workers x request_threads analyses run at once, and each gets
+    cores / (workers x request_threads) intra-op threads, so the total
+    never exceeds the core count
+    """
+
+    _applied: Optional['ThreadBudget'] = None
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        cores: Optional[int] = None,
+        workers: int = 1,
+        request_threads: int = 1,
+        torch_threads: Optional[int] = None,
+        blas_threads: Optional[int] = None
+    ):
+        self.cores = cores or available_cores()
+        self.workers = max(1, workers)
+        self.request_threads = max(1, request_threads)
+
+        per_analysis = max(1, self.cores // (self.workers * self.request_threads))
+        self.torch_threads = torch_threads or per_analysis
+        self.blas_threads = blas_threads or self.torch_threads
+
+    @classmethod
+    def from_config(cls, **overrides) -> 'ThreadBudget':
+        settings = {
+            "cores": Config.CPU_CORES,
+            "workers": Config.WEB_WORKERS,
+            "request_threads": Config.REQUEST_THREADS,
+            "torch_threads": Config.TORCH_THREADS,
+            "blas_threads": Config.BLAS_THREADS
+        }
+        settings.update(overrides)
+        return cls(**settings)
+
+    @property
+    def stage_workers(self) -> int:
+        """Threads for MatcherService's stage executor"""
+        return Config.STAGE_WORKERS or self.request_threads
+
+    @property
+    def analysis_workers(self) -> int:
+        """Threads running whole analyses (ASGI executor)"""
+        return Config.ASGI_ANALYSIS_WORKERS or self.request_threads
+
+    def apply(self) -> 'ThreadBudget':
+        """
+        Apply the limits to this process (idempotent)
+        BLAS pools are already loaded by numpy/sklearn, so they are
+        capped at runtime through threadpoolctl; the environment
+        variables cover processes started later
+        """
+        with ThreadBudget._lock:
+            for name in THREAD_ENV_VARS:
+                os.environ[name] = str(self.blas_threads)
+
+            try:
+                from threadpoolctl import threadpool_limits
+                threadpool_limits(limits=self.blas_threads)
+            except ImportError:
+                pass
+
+            try:
+                import torch
+                torch.set_num_threads(self.torch_threads)
+                if ThreadBudget._applied is None:
+                    # Only allowed before torch runs any parallel work
+                    try:
+                        torch.set_num_interop_threads(1)
+                    except RuntimeError:
+                        pass
+            except ImportError:
+                pass
+
+            ThreadBudget._applied = self
+        return self
+
+    @classmethod
+    def current(cls) -> Optional['ThreadBudget']:
+        """Budget last applied in this process"""
+        return cls._applied
+
+    def summary(self) -> Dict:
+        return {
+            "cores": self.cores,
+            "workers": self.workers,
+            "request_threads": self.request_threads,
+            "torch_threads": self.torch_threads,
+            "blas_threads": self.blas_threads,
+            "stage_workers": self.stage_workers,
+            "total_threads": self.workers * self.request_threads * self.torch_threads
+        }
@@ -0,0 +1,46 @@
+"""
+Test configuration
+Backend on the import path, and a Flask client for endpoint tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+
+@pytest.fixture(scope='session')
+def app_client(tmp_path_factory):
+    """
+    Flask test client on the stub embedder, with every store under a
+    temporary directory (app.py builds its services at import)
+    """
+    from instance.config import Config
+
+    root = tmp_path_factory.mktemp('instance')
+    Config.SENTENCE_MODEL = 'stub:dim=64'
+    Config.RESULT_CACHE_BACKEND = 'memory'
+    Config.CAPTURE_SLOW_REQUESTS = False
+    for name in ('DOCUMENT_STORE_DIR', 'JOB_PROFILE_DIR', 'TALENT_POOL_DIR', 'FEATURE_STORE_DIR', 'CAPTURE_DIR'):
+        setattr(Config, name, root / name.lower())
+
+    import app
+    return app.app.test_client()
+
+
+@pytest.fixture(scope='session')
+def matcher():
+    """MatcherService on the stub embedder: deterministic vectors, no model download"""
+    from instance.config import Config
+
+    saved = Config.SENTENCE_MODEL, Config.RESULT_CACHE_BACKEND
+    Config.SENTENCE_MODEL, Config.RESULT_CACHE_BACKEND = 'stub:dim=64', 'memory'
+    from services.matcher_service import MatcherService
+    matcher = MatcherService()
+    yield matcher
+    matcher.stage_executor.shutdown(wait=False)
+    Config.SENTENCE_MODEL, Config.RESULT_CACHE_BACKEND = saved
@@ -0,0 +1,76 @@
+"""
+Admission Control tests
+Per-client token bucket and client identity
+"""
+
+import pytest
+
+from services import admission
+from services.admission import AdmissionController, AdmissionError, client_identity
+from instance.config import Config
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(admission.time, 'monotonic', clock)
+    monkeypatch.setattr(Config, 'CLIENT_RATE_PER_MINUTE', 60)  # one token per second
+    monkeypatch.setattr(Config, 'CLIENT_RATE_BURST', 3)
+    return clock
+
+
+def test_burst_then_rate_limited(clock):
+    controller = AdmissionController()
+    for _ in range(3):
+        controller.check_rate('a')
+    with pytest.raises(AdmissionError) as e:
+        controller.check_rate('a')
+    assert e.value.status == 429
+    assert e.value.retry_after == 1.0
+    assert controller.counters['rejected_rate_limited'] == 1
+
+
+def test_tokens_refill_over_time(clock):
+    controller = AdmissionController()
+    for _ in range(3):
+        controller.check_rate('a')
+    clock.now += 2.0
+    controller.check_rate('a')
+    controller.check_rate('a')
+    with pytest.raises(AdmissionError):
+        controller.check_rate('a')
+
+
+def test_buckets_are_per_client(clock):
+    controller = AdmissionController()
+    for _ in range(3):
+        controller.check_rate('a')
+    controller.check_rate('b')
+
+
+def test_zero_rate_disables_the_limit(clock, monkeypatch):
+    monkeypatch.setattr(Config, 'CLIENT_RATE_PER_MINUTE', 0)
+    controller = AdmissionController()
+    for _ in range(100):
+        controller.check_rate('a')
+
+
+def test_client_header_ignored_from_untrusted_addresses(monkeypatch):
+    monkeypatch.setattr(Config, 'ADMISSION_CLIENT_HEADER', 'X-Client-Id')
+    monkeypatch.setattr(Config, 'ADMISSION_TRUSTED_PROXIES', ['10.0.0.0/8'])
+    headers = {'X-Client-Id': 'someone-else'}
+    assert client_identity('203.0.113.7', headers) == '203.0.113.7'
+    assert client_identity('10.1.2.3', headers) == 'someone-else'
+    assert client_identity(None, {}) == 'unknown'
+
+
+def test_client_header_off_by_default():
+    assert client_identity('10.1.2.3', {'X-Client-Id': 'x'}) == '10.1.2.3'
@@ -0,0 +1,47 @@
+"""
+Analysis Result tests
+Typed results round-trip through JSON and MessagePack unchanged
+"""
+
+import numpy as np
+import pytest
+
+from services.analysis_result import AnalysisResult
+from utils import serialization
+from utils.serialization import dumps, loads
+
+
+RESUME = "Backend engineer.\nExperience\nPython and SQL, Jan 2018 - Dec 2023.\nSkills\nPython, SQL"
+JD = "Backend engineer with 3+ years of Python and SQL experience."
+
+
+@pytest.fixture(scope='module')
+def result(matcher) -> AnalysisResult:
+    return matcher.analyze(RESUME, JD)
+
+
+def test_json_round_trip(result):
+    assert AnalysisResult.from_json(result.to_json()) == result
+
+
+def test_optional_blocks_only_when_set(result):
+    data = result.to_dict()
+    assert "deadline" not in data and "incremental" not in data
+    assert AnalysisResult.from_dict(data).deadline is None
+
+
+def test_numpy_values_encode_as_plain_numbers():
+    assert loads(dumps({"score": np.float32(0.5), "rows": np.arange(3), "terms": {'a'}})) == {
+        "score": 0.5, "rows": [0, 1, 2], "terms": ['a']
+    }
+
+
+def test_msgpack_round_trip(result):
+    pytest.importorskip('msgpack')
+    assert AnalysisResult.from_msgpack(result.to_msgpack()) == result
+
+
+def test_msgpack_missing_is_a_clear_error(result, monkeypatch):
+    monkeypatch.setattr(serialization, 'msgpack', None)
+    with pytest.raises(ImportError, match='pip install msgpack'):
+        result.to_msgpack()
@@ -0,0 +1,61 @@
+"""
+ASGI tests
+Native async endpoints agree with the Flask app they wrap
+"""
+
+import io
+
+import pytest
+from starlette.testclient import TestClient
+
+
+RESUME = b"Backend engineer. Experience Python, SQL and Docker, Jan 2018 - Dec 2023."
+JD = b"Backend engineer with 3+ years of Python and SQL experience."
+
+
+@pytest.fixture(scope='module')
+def asgi_client(app_client):
+    import asgi
+    # Not entered as a context manager: the lifespan would shut down the
+    # module's analysis executor for the rest of the session
+    return TestClient(asgi.app)
+
+
+def uploads() -> dict:
+    return {
+        'resume': ('resume.txt', io.BytesIO(RESUME)),
+        'job_description': ('jd.txt', io.BytesIO(JD))
+    }
+
+
+def test_health_is_served_natively(asgi_client):
+    assert asgi_client.get('/health').json()["mode"] == 'asgi'
+
+
+def test_analysis_matches_the_flask_endpoint(asgi_client, app_client):
+    native = asgi_client.post('/analyze', files=uploads())
+    assert native.status_code == 200
+
+    flask = app_client.post('/analyze', data={
+        'resume': (io.BytesIO(RESUME), 'resume.txt'),
+        'job_description': (io.BytesIO(JD), 'jd.txt')
+    }, content_type='multipart/form-data')
+    assert native.json() == flask.get_json()
+    assert native.headers['ETag'] == flask.headers['ETag']
+
+
+def test_matching_etag_is_not_modified(asgi_client):
+    etag = asgi_client.post('/analyze', files=uploads()).headers['ETag']
+    again = asgi_client.post('/analyze', files=uploads(), headers={'If-None-Match': etag})
+    assert again.status_code == 304
+
+
+def test_stream_ends_with_result_event(asgi_client):
+    body = asgi_client.post('/analyze/stream', files=uploads()).text
+    assert body.rstrip().split('\n\n')[-1].startswith('event: result')
+
+
+def test_other_routes_reach_flask(asgi_client):
+    response = asgi_client.get('/talent-pool')
+    assert response.status_code == 200
+    assert "resumes" in response.json()
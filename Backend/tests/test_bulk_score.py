@@ -0,0 +1,97 @@
+"""
+Bulk Scoring tests
+Checkpoint resume, retrying failed files, and the flattened output
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from instance.config import Config
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+import bulk_score
+from bulk_score import Checkpoint
+
+
+JD = "Backend engineer with 3+ years of Python and SQL experience."
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    # Worker processes are forked, so they inherit the stub embedder
+    monkeypatch.setattr(Config, 'SENTENCE_MODEL', 'stub:dim=64')
+    monkeypatch.setattr(Config, 'RESULT_CACHE_BACKEND', 'memory')
+
+    resumes = tmp_path / 'resumes'
+    resumes.mkdir()
+    for name, skills in [('a.txt', 'Python and SQL'), ('b.txt', 'React and CSS'), ('c.txt', 'Go and Rust')]:
+        (resumes / name).write_text(f"Engineer. Experience {skills}, Jan 2018 - Dec 2023.")
+    (resumes / 'notes.md').write_text("not a resume")
+    (tmp_path / 'jd.txt').write_text(JD)
+    return tmp_path
+
+
+def run(corpus, *extra) -> int:
+    return bulk_score.main([
+        '--jd', str(corpus / 'jd.txt'),
+        '--resumes', str(corpus / 'resumes'),
+        '--output', str(corpus / 'scores.csv'),
+        '--workers', '1',
+        *extra
+    ])
+
+
+def checkpoint_lines(corpus) -> list:
+    path = corpus / 'scores.csv.checkpoint.jsonl'
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_only_resume_suffixes_are_collected(corpus):
+    files = bulk_score.collect_files(str(corpus / 'resumes'))
+    assert [Path(f).name for f in files] == ['a.txt', 'b.txt', 'c.txt']
+
+
+def test_checkpoint_ignores_other_runs_and_partial_lines(tmp_path):
+    path = tmp_path / 'run.jsonl'
+    path.write_text(
+        json.dumps({"file": "a", "error": None, "run_key": "this"}) + '\n' +
+        json.dumps({"file": "b", "error": "boom", "run_key": "this"}) + '\n' +
+        json.dumps({"file": "c", "error": None, "run_key": "other-jd"}) + '\n' +
+        '{"file": "d", "err'
+    )
+    checkpoint = Checkpoint(path, 'this')
+    checkpoint.close()
+    assert checkpoint.done() == {'a'}
+    assert checkpoint.failed() == {'b'}
+
+
+def test_rerun_scores_only_missing_and_failed_files(corpus):
+    assert run(corpus) == 0
+    records = checkpoint_lines(corpus)
+    assert len(records) == 3
+
+    # Pretend the run was interrupted after a, and b had failed
+    by_name = {Path(r["file"]).name: r for r in records}
+    by_name['b.txt'] = dict(by_name['b.txt'], result=None, error="RuntimeError: crashed")
+    (corpus / 'scores.csv.checkpoint.jsonl').write_text(
+        json.dumps(by_name['a.txt']) + '\n' + json.dumps(by_name['b.txt']) + '\n'
+    )
+
+    assert run(corpus) == 0
+    rescored = [Path(r["file"]).name for r in checkpoint_lines(corpus)[2:]]
+    assert sorted(rescored) == ['b.txt', 'c.txt']
+
+    frame = pd.read_csv(corpus / 'scores.csv')
+    assert len(frame) == 3
+    assert frame["error"].isna().all()
+    assert list(frame["overall_match_percent"]) == sorted(frame["overall_match_percent"], reverse=True)
+
+
+def test_restart_ignores_the_checkpoint(corpus):
+    run(corpus)
+    run(corpus, '--restart')
+    assert len(checkpoint_lines(corpus)) == 3
@@ -0,0 +1,74 @@
+"""
+Deadline tests
+Budgets, learned stage costs, and degraded analyses kept out of the cache
+"""
+
+import io
+
+import pytest
+
+from services.deadline import Deadline, StageCosts
+from instance.config import Config
+
+
+RESUME = "Backend engineer.\nExperience\nPython and SQL, Jan 2018 - Dec 2023.\nSkills\nPython, SQL, Docker"
+JD = "Backend engineer with 3+ years of Python and SQL experience."
+
+
+@pytest.mark.parametrize("value, budget", [('250', 250.0), (80, 80.0), ('soon', None), (None, None), ('', None)])
+def test_budget_from_header_value(value, budget, monkeypatch):
+    monkeypatch.setattr(Config, 'ANALYSIS_DEADLINE_MS', None)
+    deadline = Deadline.from_value(value)
+    assert (deadline.budget_ms if deadline else None) == budget
+
+
+def test_config_default_budget(monkeypatch):
+    monkeypatch.setattr(Config, 'ANALYSIS_DEADLINE_MS', 500)
+    assert Deadline.from_value(None).budget_ms == 500
+
+
+def test_stage_costs_move_toward_observations():
+    costs = StageCosts({'keywords': 100.0})
+    costs.observe('keywords', 200.0)
+    assert costs.estimate('keywords') == pytest.approx(120.0)
+    costs.observe('new_stage', 30.0)
+    assert costs.estimate('new_stage') == 30.0
+    assert costs.estimate('unknown') == 0.0
+
+
+def test_spent_budget_degrades_optional_stages(matcher):
+    matcher.result_cache.clear()
+    results = matcher.analyze(RESUME, JD, Deadline(0.001))
+
+    assert results.degraded
+    assert set(results.deadline["degraded"].values()) <= {'approximate', 'skipped'}
+    assert len(matcher.result_cache.backend) == 0  # degraded: not cached
+
+
+def test_deadline_summary_is_not_served_from_cache(matcher):
+    matcher.result_cache.clear()
+    within = matcher.analyze(RESUME, JD, Deadline(60_000))
+    assert within.deadline["degraded"] == {}
+
+    hits = matcher.result_cache.hits
+    plain = matcher.analyze(RESUME, JD)
+    assert matcher.result_cache.hits == hits + 1
+
+    expected = within.to_dict()
+    expected.pop("deadline")
+    assert plain.to_dict() == expected
+
+
+def test_degraded_response_has_no_etag(app_client):
+    response = app_client.post(
+        '/analyze',
+        data={
+            'resume': (io.BytesIO(RESUME.encode()), 'resume.txt'),
+            'job_description': (io.BytesIO(JD.encode()), 'jd.txt')
+        },
+        content_type='multipart/form-data',
+        headers={'X-Deadline-Ms': '0.001'}
+    )
+    assert response.status_code == 200
+    assert response.get_json()["deadline"]["degraded"]
+    assert 'ETag' not in response.headers
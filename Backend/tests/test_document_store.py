@@ -0,0 +1,78 @@
+"""
+Document Store tests
+Content-addressed dedup and uploads that never touch shared paths
+"""
+
+import io
+
+from instance.config import Config
+
+
+RESUME = b"Backend engineer. Experience Python, SQL and Docker, Jan 2018 - Dec 2023. jane@example.com"
+OTHER_RESUME = b"Frontend developer. Experience React, TypeScript and CSS, Jan 2020 - Dec 2023."
+JD = b"Backend engineer with 3+ years of Python and SQL experience."
+
+
+def upload(client, data: bytes, filename: str):
+    return client.post(
+        '/documents',
+        data={'file': (io.BytesIO(data), filename)},
+        content_type='multipart/form-data'
+    )
+
+
+def analyze_upload(client, resume: bytes, resume_name: str, jd: bytes = JD, jd_name: str = 'jd.txt'):
+    return client.post(
+        '/analyze',
+        data={
+            'resume': (io.BytesIO(resume), resume_name),
+            'job_description': (io.BytesIO(jd), jd_name)
+        },
+        content_type='multipart/form-data'
+    )
+
+
+def test_same_bytes_are_stored_once(app_client):
+    first = upload(app_client, RESUME, 'a.txt')
+    second = upload(app_client, RESUME, 'renamed.txt')
+    assert first.status_code == 201
+    assert second.status_code == 200
+    assert first.get_json()["id"] == second.get_json()["id"]
+
+
+def test_document_id_is_the_content_hash(app_client):
+    from app import document_store
+
+    doc_id = upload(app_client, OTHER_RESUME, 'b.txt').get_json()["id"]
+    assert doc_id == document_store.content_id(OTHER_RESUME)
+    assert app_client.get(f'/documents/{doc_id}').status_code == 200
+
+
+def test_malformed_ids_are_not_looked_up(app_client):
+    from app import document_store
+
+    assert document_store.get('../../etc/passwd') is None
+    assert app_client.get('/documents/not-a-hash').status_code == 404
+
+
+def test_put_text_dedups_on_stripped_text(app_client):
+    from app import document_store
+
+    first, created = document_store.put_text("  Python developer with SQL  ")
+    again, created_again = document_store.put_text("Python developer with SQL")
+    assert created and not created_again
+    assert first.id == again.id
+
+
+def test_upload_filename_is_never_used_as_a_path(app_client):
+    response = analyze_upload(app_client, RESUME, '../escape.txt', jd_name='../../escape_jd.txt')
+    assert response.status_code == 200
+    # Where the old upload folder (BASE_DIR/backend/uploads) would have put them
+    assert not (Config.BASE_DIR / 'backend' / 'escape.txt').exists()
+    assert not (Config.BASE_DIR / 'escape_jd.txt').exists()
+
+
+def test_uploads_with_the_same_name_do_not_collide(app_client):
+    first = analyze_upload(app_client, RESUME, 'resume.txt').get_json()
+    second = analyze_upload(app_client, OTHER_RESUME, 'resume.txt').get_json()
+    assert first["overall_match_percent"] != second["overall_match_percent"]
@@ -0,0 +1,78 @@
+"""
+Experience Parser tests
+Role timeline extraction: section scoping, range arithmetic, merging
+"""
+
+from datetime import date
+
+from utils.experience_parser import ExperienceParser, ExperienceTimeline, month_index
+from utils.text_preprocessing import TextPreprocessor
+
+
+TODAY = date(2026, 1, 15)
+
+
+def parse(text: str) -> ExperienceTimeline:
+    # The matcher parses cleaned text, which has no line breaks
+    return ExperienceParser.parse(TextPreprocessor.clean_text(text), today=TODAY)
+
+
+def test_bare_year_range_keeps_whole_year_arithmetic():
+    assert parse("Engineer, Acme 2020 - 2023").total_months == 36
+
+
+def test_bare_end_year_after_dated_start_is_inclusive():
+    # Mar 2020 through Dec 2021
+    assert parse("Engineer, Acme Mar 2020 - 2021").total_months == 22
+
+
+def test_month_end_is_inclusive():
+    assert parse("Engineer, Acme Jan 2020 - Mar 2020").total_months == 3
+
+
+def test_present_resolves_against_today():
+    timeline = parse("Engineer, Acme Jan 2025 - Present")
+    assert timeline.total_months == 13
+    assert timeline.to_dict()["current_role"]
+
+
+def test_education_and_project_ranges_are_not_roles():
+    text = """
+    Education
+    State University, B.S. Computer Science 2012 - 2016
+    Experience
+    Software Engineer, Acme Jan 2018 - Dec 2019
+    Projects
+    Chatbot (Oct 2019 - Oct 2020)
+    """
+    timeline = parse(text)
+    assert [(r["start"], r["end"]) for r in timeline.to_dict()["roles"]] == [("2018-01", "2019-12")]
+    assert timeline.years == 2
+
+
+def test_experience_heading_after_projects_counts_again():
+    text = """
+    PROJECTS
+    Side project 2015 - 2016
+    WORK HISTORY
+    Analyst, Initech Jun 2016 - May 2018
+    """
+    assert parse(text).total_months == 24
+
+
+def test_heading_words_inside_sentences_do_not_switch_sections():
+    text = "Engineer, Acme Jan 2018 - Dec 2019. Led projects for clients. Consultant, Initech Jan 2020 - Dec 2020"
+    assert parse(text).total_months == 36
+
+
+def test_overlapping_roles_are_merged():
+    assert ExperienceTimeline.merge([
+        (month_index(2020, 1), month_index(2021, 1), False),
+        (month_index(2020, 6), month_index(2021, 6), False),
+        (month_index(2021, 6), month_index(2022, 1), False),
+        (month_index(2023, 1), month_index(2023, 7), False)
+    ]) == [(month_index(2020, 1), month_index(2022, 1)), (month_index(2023, 1), month_index(2023, 7))]
+
+
+def test_explicit_years_win_over_timeline():
+    assert parse("Summary: 7+ years building APIs. Engineer, Acme 2020 - 2022").years == 7
@@ -0,0 +1,84 @@
+"""
+Incremental Analyzer tests
+Edits reuse session state and still match a full analysis
+"""
+
+import pytest
+
+from services.incremental_analyzer import IncrementalAnalyzer
+
+
+RESUME = (
+    "Jane Doe jane@example.com\n"
+    "Summary\nBackend engineer who builds data services.\n"
+    "Experience\nSoftware Engineer, Acme Jan 2018 - Dec 2023\n"
+    "• Built REST APIs in Python and SQL. Ran Docker workloads on Kubernetes.\n"
+    "Education\nB.S. Computer Science 2014 - 2018\n"
+    "Skills\nPython, SQL, Docker, Kubernetes"
+)
+EDITED = RESUME.replace("Ran Docker workloads on Kubernetes.", "Tuned PostgreSQL queries and Redis caches.")
+JD = "Backend engineer with 5+ years of Python, SQL and Docker experience building REST APIs."
+
+
+def response(result) -> dict:
+    data = result.to_dict()
+    data.pop("incremental", None)
+    return data
+
+
+@pytest.fixture
+def analyzer(matcher):
+    return IncrementalAnalyzer(matcher)
+
+
+def test_incremental_result_equals_full_analysis(analyzer, matcher):
+    session_id = analyzer.analyze(RESUME, JD).incremental["session_id"]
+    edited = analyzer.analyze(EDITED, JD, session_id)
+    expected = response(matcher.analyze(EDITED, JD))
+    actual = response(edited)
+
+    # Raw features are unrounded; the document vector is encoded on its own
+    assert actual.pop("features") == pytest.approx(expected.pop("features"))
+    assert actual == expected
+
+
+def test_edit_recomputes_only_changed_sentences(analyzer):
+    first = analyzer.analyze(RESUME, JD).incremental
+    assert first["jd_changed"]
+    assert first["sentences_changed"] == first["sentences_total"]
+
+    edited = analyzer.analyze(EDITED, JD, first["session_id"]).incremental
+    assert not edited["jd_changed"]
+    assert edited["sentences_changed"] == 1
+
+    again = analyzer.analyze(EDITED, JD, first["session_id"]).incremental
+    assert again["sentences_changed"] == 0
+    assert again["terms_encoded"] == 0
+
+
+def test_new_jd_resets_jd_side_only(analyzer):
+    session_id = analyzer.analyze(RESUME, JD).incremental["session_id"]
+    changed = analyzer.analyze(RESUME, "Data engineer with Spark and Airflow.", session_id).incremental
+    assert changed["jd_changed"]
+    assert changed["sentences_changed"] == 0
+
+
+def test_cached_state_stays_bounded_across_edits(analyzer):
+    session_id = analyzer.analyze(RESUME, JD).incremental["session_id"]
+    for i in range(30):
+        text = RESUME + f", Go, Rust, tool{i}, service{i}, queue{i}"
+        analyzer.analyze(text, JD, session_id)
+    session = analyzer.get_session(session_id)
+    assert len(session.section_similarities) <= 2 * 6
+    assert len(session.term_embeddings) < 30 * 3
+
+    # Pruning keeps the canonical terms the encoder cached
+    again = analyzer.analyze(text, JD, session_id).incremental
+    assert again["terms_encoded"] == 0
+
+
+def test_sessions_are_evicted_lru(matcher):
+    analyzer = IncrementalAnalyzer(matcher, max_sessions=2)
+    ids = [analyzer.get_session().session_id for _ in range(3)]
+    assert not analyzer.drop_session(ids[0])
+    assert analyzer.drop_session(ids[2])
@@ -0,0 +1,45 @@
+"""
+Job Profile tests
+Registration at /jobs-descriptions and the compact serialized form
+"""
+
+import numpy as np
+
+from services.job_profile import JobProfile
+
+
+JD = "Backend engineer with 3+ years of Python and SQL experience. Strong communication."
+RESUME = "Backend engineer. Experience Python, SQL and Docker, Jan 2018 - Dec 2023."
+
+
+def test_register_get_delete(app_client):
+    created = app_client.post('/jobs-descriptions', json={"text": JD})
+    assert created.status_code == 201
+    profile_id = created.get_json()["id"]
+
+    assert app_client.get(f'/jobs-descriptions/{profile_id}').get_json()["required_years"] == 3
+    assert app_client.delete(f'/jobs-descriptions/{profile_id}').status_code == 200
+    assert app_client.get(f'/jobs-descriptions/{profile_id}').status_code == 404
+
+
+def test_same_text_registers_one_profile(app_client):
+    first = app_client.post('/jobs-descriptions', json={"text": JD}).get_json()
+    second = app_client.post('/jobs-descriptions', json={"text": JD}).get_json()
+    assert first["id"] == second["id"]
+
+
+def test_profile_round_trips_through_bytes(matcher):
+    profile = matcher.compile_job_profile(matcher.preprocessor.clean_text(JD))
+    restored = JobProfile.from_bytes(profile.to_bytes())
+    assert restored.id == profile.id
+    assert restored.terms == profile.terms
+    assert np.array_equal(restored.term_embeddings, profile.term_embeddings)
+    assert restored.stage_embeddings.keys() == profile.stage_embeddings.keys()
+
+
+def test_profile_analysis_equals_raw_jd(matcher):
+    profile = matcher.compile_job_profile(matcher.preprocessor.clean_text(JD))
+    matcher.result_cache.clear()
+    from_profile = matcher.analyze(RESUME, profile).to_dict()
+    matcher.result_cache.clear()
+    assert from_profile == matcher.analyze(RESUME, JD).to_dict()
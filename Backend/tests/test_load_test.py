@@ -0,0 +1,77 @@
+"""
+Load Test tests
+Deterministic stub embedder and the load-test harness
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from utils.model_loader import StubEmbedder
+from instance.config import Config
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+import load_test
+
+
+def test_stub_vectors_are_deterministic_unit_vectors():
+    a, b = StubEmbedder(dim=64), StubEmbedder(dim=64)
+    vectors = a.encode(["python developer", "python engineer", "pastry chef"])
+    assert np.array_equal(vectors, b.encode(["python developer", "python engineer", "pastry chef"]))
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+
+
+def test_stub_options_from_model_name():
+    stub = StubEmbedder.from_name('stub:dim=16,cost_ms=0,per_text_ms=0,mode=spin')
+    assert stub.get_sentence_embedding_dimension() == 16
+    assert stub.encode("one text").shape == (16,)
+    with pytest.raises(ValueError):
+        StubEmbedder.from_name('stub:gpu=1')
+
+
+def test_stub_accounts_for_its_cost():
+    stub = StubEmbedder(dim=8, cost_ms=1.0, per_text_ms=0.5)
+    stub.encode(["a", "b"])
+    assert stub.stats() == {"calls": 1, "texts": 2, "cost_ms": 2.0}
+
+
+def test_overrides_and_mix_parsing():
+    overrides = load_test.parse_overrides(['RESULT_CACHE_BACKEND=null', 'REQUEST_THREADS=2', 'SENTENCE_MODEL=stub'])
+    assert overrides['RESULT_CACHE_BACKEND'] is None
+    assert overrides['REQUEST_THREADS'] == 2
+    assert overrides['SENTENCE_MODEL'] == 'stub'
+    assert overrides['CLIENT_RATE_PER_MINUTE'] == 0
+    with pytest.raises(SystemExit):
+        load_test.parse_overrides(['NOT_A_SETTING=1'])
+
+    assert load_test.parse_mix('analyze=3,health') == {'analyze': 3.0, 'health': 1.0}
+    with pytest.raises(SystemExit):
+        load_test.parse_mix('upload=1')
+
+
+def test_summary_counts_errors_per_scenario():
+    samples = [('analyze', 10.0, 200, None), ('analyze', 30.0, 503, None), ('health', 1.0, None, 'OSError: refused')]
+    summary = load_test.summarize(samples, wall=2.0)
+    assert summary["requests"] == 3
+    assert summary["error_rate"] == round(2 / 3, 4)
+    assert summary["statuses"] == {'200': 1, '503': 1, 'exception': 1}
+    assert summary["scenarios"]["analyze"]["error_rate"] == 0.5
+    assert summary["first_error"] == 'OSError: refused'
+
+
+def test_inprocess_run_has_no_errors(app_client, monkeypatch):
+    monkeypatch.setattr(Config, 'CLIENT_RATE_PER_MINUTE', 0)
+    args = argparse.Namespace(seed=0, requests=6, warmup=0, duration=None, concurrency=2)
+    result = load_test.run_load(
+        load_test.InProcessClient(),
+        args,
+        {'analyze': 1, 'stream': 1, 'documents': 1, 'health': 1},
+        "Backend engineer. Python and SQL, Jan 2018 - Dec 2023.",
+        "Backend engineer with Python and SQL experience."
+    )
+    assert result["requests"] == 6
+    assert result["error_rate"] == 0.0
@@ -0,0 +1,68 @@
+"""
+Parser Pool tests
+DOCX results and failures from the sandboxed worker
+"""
+
+import io
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from services.parser_pool import ParseError, ParserPool
+
+
+W = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+
+def make_docx(*paragraphs: str) -> bytes:
+    body = ''.join(f'<w:p><w:r><w:t>{p}</w:t></w:r></w:p>' for p in paragraphs)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('word/document.xml', f'<w:document xmlns:w="{W}"><w:body>{body}</w:body></w:document>')
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def pool():
+    if sys.platform == 'win32':
+        pytest.skip("parse workers are POSIX-only")
+    pool = ParserPool(workers=1)
+    yield pool
+    pool.close()
+
+
+def test_docx_text_comes_back(pool):
+    assert pool.extract(make_docx("Skills", "Python and SQL"), 'cv.docx') == "Skills\nPython and SQL"
+
+
+def test_corrupt_docx_is_rejected_not_empty(pool):
+    with pytest.raises(ParseError) as e:
+        pool.extract(b'PK\x03\x04 not really a zip', 'cv.docx')
+    assert e.value.reason == 'invalid_document'
+    assert e.value.status == 422
+
+    # The worker is still usable
+    assert pool.extract(make_docx("Python"), 'cv.docx') == "Python"
+
+
+def test_docx_without_a_body_is_rejected(pool):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('word/styles.xml', '<styles/>')
+    with pytest.raises(ParseError) as e:
+        pool.extract(buffer.getvalue(), 'cv.docx')
+    assert e.value.reason == 'invalid_document'
+
+
+def test_docx_memory_error_reaches_the_worker_loop(monkeypatch):
+    sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+    import parse_worker
+
+    def exhausted(source):
+        raise MemoryError
+
+    monkeypatch.setattr(parse_worker.FileUtils, 'docx_text', exhausted)
+    with pytest.raises(MemoryError):
+        parse_worker.parse({"data": make_docx("Python"), "suffix": ".docx"})
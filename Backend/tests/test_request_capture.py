@@ -0,0 +1,142 @@
+"""
+Request Capture tests
+Slow and failed requests spooled for replay, never failing the request
+"""
+
+import io
+import sys
+from pathlib import Path
+
+from services.request_capture import RequestCapture, current_capture, redact_contact_info
+from instance.config import Config
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+import replay_captures
+
+
+RESUME = "Backend engineer. Experience Python and SQL, Jan 2018 - Dec 2023. jane@example.com +1 555 010 0199"
+JD = "Backend engineer with 3+ years of Python and SQL experience."
+
+
+def captured(spool: RequestCapture, endpoint: str = 'analyze', error: Exception = None, status: int = 200):
+    capture = spool.start(endpoint)
+    capture.inputs(RESUME, JD, deadline_ms=None)
+    if error is not None:
+        capture.fail(error)
+    return spool.finish(capture, status)
+
+
+def test_slow_request_is_spooled_with_its_stages(tmp_path, matcher):
+    spool = RequestCapture(root=tmp_path, threshold_ms=0, enabled=True)
+    capture = spool.start('analyze')
+    assert current_capture() is capture
+    capture.inputs(RESUME, JD)
+    matcher.stage_graph.clear()
+    matcher.analyze(RESUME, JD)
+    path = spool.finish(capture, 200)
+
+    assert current_capture() is None
+    record = RequestCapture.load(path)
+    assert record["reason"] == 'slow'
+    assert record["status"] == 200
+    assert record["resume_text"] == RESUME and record["jd_text"] == JD
+    assert record["stages"]
+    assert record["config_fingerprint"]
+    assert spool.stats()["captured_slow"] == 1
+    assert spool.finish(capture, 200) is None  # finishing twice writes nothing
+
+
+def test_fast_request_is_not_kept(tmp_path):
+    spool = RequestCapture(root=tmp_path, threshold_ms=60_000, enabled=True)
+    assert captured(spool) is None
+    assert RequestCapture.paths(tmp_path) == []
+
+
+def test_failed_request_is_kept_however_fast(tmp_path, monkeypatch):
+    spool = RequestCapture(root=tmp_path, threshold_ms=60_000, enabled=True)
+    record = RequestCapture.load(captured(spool, error=RuntimeError("boom"), status=500))
+    assert record["reason"] == 'error'
+    assert record["error"]["type"] == 'RuntimeError' and record["error"]["message"] == 'boom'
+
+    monkeypatch.setattr(Config, 'CAPTURE_ERRORS', False)
+    assert captured(spool, error=RuntimeError("boom")) is None
+
+
+def test_disabled_capture_observes_nothing(tmp_path):
+    spool = RequestCapture(root=tmp_path, threshold_ms=0, enabled=False)
+    assert spool.start('analyze') is None
+    assert spool.finish(None) is None
+
+
+def test_spool_keeps_the_newest_files(tmp_path):
+    spool = RequestCapture(root=tmp_path, threshold_ms=0, enabled=True, max_files=2)
+    paths = [captured(spool) for _ in range(4)]
+    assert RequestCapture.paths(tmp_path) == paths[-2:]  # written within the same second
+    assert spool.stats()["pruned"] == 2
+
+
+def test_redactor_masks_contact_info(tmp_path):
+    spool = RequestCapture(root=tmp_path, threshold_ms=0, enabled=True, redactor=redact_contact_info)
+    record = RequestCapture.load(captured(spool))
+    assert record["redacted"]
+    assert 'jane@example.com' not in record["resume_text"]
+    assert '555' not in record["resume_text"]
+    assert record["jd_text"] == JD
+
+
+def failing_redactor(text: str) -> str:
+    raise RuntimeError("redactor bug")
+
+
+def test_raising_redactor_does_not_fail_finish(tmp_path):
+    spool = RequestCapture(root=tmp_path, threshold_ms=0, enabled=True, redactor=failing_redactor)
+    assert captured(spool) is None
+    assert spool.stats()["write_failures"] == 1
+    assert list(tmp_path.iterdir()) == []  # no partial or temporary file
+
+
+def test_raising_redactor_does_not_fail_the_request(app_client, monkeypatch, tmp_path):
+    import app
+
+    monkeypatch.setattr(Config, 'CLIENT_RATE_PER_MINUTE', 0)
+    monkeypatch.setattr(app.request_capture, 'enabled', True)
+    monkeypatch.setattr(app.request_capture, 'threshold_ms', 0)
+    monkeypatch.setattr(app.request_capture, 'root', tmp_path)
+    monkeypatch.setattr(app.request_capture, 'redactor', failing_redactor)
+
+    response = app_client.post(
+        '/analyze',
+        data={
+            'resume': (io.BytesIO(RESUME.encode()), 'resume.txt'),
+            'job_description': (io.BytesIO(JD.encode()), 'jd.txt')
+        },
+        content_type='multipart/form-data'
+    )
+    assert response.status_code == 200
+    assert 'X-Capture-Id' not in response.headers
+
+
+def test_captured_request_replays(app_client, monkeypatch, tmp_path):
+    import app
+
+    monkeypatch.setattr(Config, 'CLIENT_RATE_PER_MINUTE', 0)
+    monkeypatch.setattr(Config, 'RESULT_CACHE_BACKEND', Config.RESULT_CACHE_BACKEND)
+    monkeypatch.setattr(app.request_capture, 'enabled', True)
+    monkeypatch.setattr(app.request_capture, 'threshold_ms', 0)
+    monkeypatch.setattr(app.request_capture, 'root', tmp_path / "spool")
+
+    response = app_client.post(
+        '/analyze',
+        data={
+            'resume': (io.BytesIO(RESUME.encode()), 'resume.txt'),
+            'job_description': (io.BytesIO(JD.encode()), 'jd.txt')
+        },
+        content_type='multipart/form-data'
+    )
+    assert response.status_code == 200
+    [path] = RequestCapture.paths(tmp_path / "spool")
+    assert path.stem.endswith(response.headers['X-Capture-Id'])
+
+    report = tmp_path / "replay.json"
+    assert replay_captures.main([str(tmp_path / "spool"), '--top', '3', '--json', str(report)]) == 0
+    assert report.exists()
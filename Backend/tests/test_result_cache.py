@@ -0,0 +1,75 @@
+"""
+Result Cache tests
+Hits and misses, TTL and LRU limits, and config fingerprint invalidation
+"""
+
+import pytest
+
+from services import result_cache
+from services.result_cache import MemoryCacheBackend, ResultCache, SQLiteCacheBackend, analysis_key
+from instance.config import Config
+
+
+RESUME = "Backend engineer. Experience Python, SQL and Docker, Jan 2018 - Dec 2023."
+JD = "Backend engineer with 3+ years of Python and SQL experience."
+
+
+def backends(tmp_path):
+    return [MemoryCacheBackend(max_entries=2), SQLiteCacheBackend(tmp_path / 'cache.db', max_entries=2)]
+
+
+def test_miss_then_hit(tmp_path):
+    for backend in backends(tmp_path):
+        assert backend.get('a', ttl=60) is None
+        backend.set('a', '{"x": 1}')
+        assert backend.get('a', ttl=60) == '{"x": 1}'
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, 'time', lambda: now[0])
+    for backend in backends(tmp_path):
+        for key in ('a', 'b'):
+            backend.set(key, key)
+            now[0] += 1
+        backend.get('a', ttl=60)
+        now[0] += 1
+        backend.set('c', 'c')
+        assert backend.get('b', ttl=60) is None
+        assert backend.get('a', ttl=60) == 'a'
+        assert len(backend) == 2
+
+
+def test_expired_entries_miss(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, 'time', lambda: now[0])
+    for backend in backends(tmp_path):
+        backend.set('a', 'a')
+        now[0] += 61
+        assert backend.get('a', ttl=60) is None
+
+
+def test_key_changes_with_scoring_config(monkeypatch):
+    key = analysis_key(RESUME, JD)
+    assert analysis_key(RESUME, JD) == key
+
+    monkeypatch.setattr(Config, 'WEIGHTS', dict(Config.WEIGHTS, semantic_similarity=0.9))
+    weighted = analysis_key(RESUME, JD)
+    monkeypatch.setattr(Config, 'SCORING_VERSION', Config.SCORING_VERSION + '-next')
+    assert len({key, weighted, analysis_key(RESUME, JD)}) == 3
+
+
+def test_unknown_backend_is_an_error(monkeypatch):
+    monkeypatch.setattr(Config, 'RESULT_CACHE_BACKEND', 'redis')
+    with pytest.raises(ValueError):
+        ResultCache.from_config()
+
+
+def test_repeat_analysis_is_served_from_cache(matcher):
+    matcher.result_cache.clear()
+    hits = matcher.result_cache.hits
+    first = matcher.analyze(RESUME, JD)
+    again = matcher.analyze(RESUME, JD)
+
+    assert matcher.result_cache.hits == hits + 1
+    assert again.to_dict() == first.to_dict()
@@ -0,0 +1,100 @@
+"""
+Score Equivalence tests
+Mode parsing, comparison metrics and a recorded golden run on the stub embedder
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from instance.config import Config
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+import score_equivalence
+
+
+RESULT = {
+    "skill_match_score_percent": 60.0,
+    "experience_match_score_percent": 100.0,
+    "overall_match_percent": 72.5,
+    "ats": {"score_percent": 80.0, "label": "Good"},
+    "experience": {"required_years": 3, "candidate_years": 5},
+    "keywords": {"matched": ["python", "sql"], "missing": ["docker"]},
+    "top_resume_keywords": ["python", "sql", "flask"],
+    "section_match_analysis": {"skills": "strong", "experience": "strong"},
+    "relevant_experience_highlights": ["built apis", "ran sql", "shipped flask"]
+}
+
+
+def test_parse_mode_splits_path_budget_and_overrides():
+    assert score_equivalence.parse_mode('stream') == ('stream', None, {})
+    assert score_equivalence.parse_mode('deadline:50') == ('deadline', '50', {})
+    path, arg, overrides = score_equivalence.parse_mode('reference:USE_SKILL_LEXICON=false,SENTENCE_MODEL=stub:dim=8')
+    assert (path, arg) == ('reference', None)
+    assert overrides == {'USE_SKILL_LEXICON': False, 'SENTENCE_MODEL': 'stub:dim=8'}
+
+    for spec in ('deadline', 'teleport', 'reference:NOT_A_SETTING=1'):
+        with pytest.raises(SystemExit):
+            score_equivalence.parse_mode(spec)
+
+
+def test_identical_results_compare_perfectly():
+    metrics = score_equivalence.compare(RESULT, json.loads(json.dumps(RESULT)))["metrics"]
+    assert metrics == {
+        "score_delta": 0.0,
+        "keyword_jaccard": 1.0,
+        "highlight_overlap": 1.0,
+        "section_agreement": 1.0,
+        "exact_agreement": 1.0
+    }
+
+
+def test_rank_overlap_penalizes_reordering_at_the_top():
+    top_swapped = score_equivalence.rank_overlap(['a', 'b', 'c'], ['b', 'a', 'c'])
+    tail_swapped = score_equivalence.rank_overlap(['a', 'b', 'c'], ['a', 'c', 'b'])
+    assert top_swapped < tail_swapped < 1.0
+    assert score_equivalence.rank_overlap([], None) == 1.0
+
+
+def test_evaluate_reports_cases_outside_tolerance():
+    drifted = json.loads(json.dumps(RESULT))
+    drifted["overall_match_percent"] += 2.0
+    drifted["ats"]["label"] = "Fair"
+
+    outcome = score_equivalence.evaluate(
+        {"a": RESULT, "b": RESULT}, {"a": RESULT, "b": drifted}, score_equivalence.DEFAULT_TOLERANCES
+    )
+    assert not outcome["passed"]
+    assert outcome["worst"]["score_delta"] == 2.0
+    assert set(outcome["failures"]) == {"b"}
+    assert set(outcome["failures"]["b"]) == {"score_delta", "exact_agreement"}
+
+    loose = score_equivalence.parse_tolerances(['score_delta=5', 'exact_agreement=0'])
+    assert score_equivalence.evaluate({"b": RESULT}, {"b": drifted}, loose)["passed"]
+    # A case the candidate never produced fails the mode
+    assert not score_equivalence.evaluate({"a": RESULT, "b": RESULT}, {"a": RESULT}, loose)["passed"]
+    with pytest.raises(SystemExit):
+        score_equivalence.parse_tolerances(['speed=1'])
+
+
+def test_recorded_golden_passes_every_fast_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'SENTENCE_MODEL', 'stub:dim=64')
+    monkeypatch.setattr(Config, 'RESULT_CACHE_BACKEND', 'memory')
+    (tmp_path / "resumes").mkdir()
+    (tmp_path / "jds").mkdir()
+    (tmp_path / "resumes" / "jane.txt").write_text(
+        "Summary\nBackend engineer.\nExperience\nSoftware Engineer, Acme Jan 2018 - Dec 2023\n"
+        "• Built REST APIs in Python and SQL\nSkills\nPython, SQL, Docker"
+    )
+    (tmp_path / "jds" / "backend.txt").write_text("Backend engineer with 3+ years of Python, SQL and Docker.")
+    golden = tmp_path / "golden.json"
+
+    assert score_equivalence.main(['--corpus', str(tmp_path), '--record', str(golden)]) == 0
+    recorded = json.loads(golden.read_text())
+    assert recorded["model"] == 'stub:dim=64'
+    assert [case["id"] for case in recorded["cases"]] == ["jane.txt|backend.txt"]
+
+    modes = ['reference', 'stream', 'incremental', 'profile', 'documents']
+    assert score_equivalence.main(['--golden', str(golden), '--mode', *modes]) == 0
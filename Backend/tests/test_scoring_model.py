@@ -0,0 +1,81 @@
+"""
+Scoring Model tests
+Vectorized scores agree with ATSScoreCalculator and the analysis path
+"""
+
+import pytest
+
+from services.scoring_model import ScoringModel
+from utils.ats_score import ATSScoreCalculator
+
+
+RESUME = (
+    "Jane Doe jane@example.com +1 555 010 0199 Summary Backend engineer. "
+    "Experience Software Engineer, Acme Jan 2018 - Dec 2023 built REST APIs in Python and SQL. "
+    "Education B.S. Computer Science 2014 - 2018 Skills Python, SQL, Docker, Kubernetes"
+)
+JD = "Backend engineer with 5+ years of Python, SQL and Docker experience building REST APIs."
+
+
+@pytest.mark.parametrize("matched, jd_terms, semantic", [
+    (['python', 'sql'], ['python', 'sql', 'docker', 'rest'], 0.71),
+    ([], ['python'], 0.2),
+    (['python'], ['python'], 0.95)
+])
+def test_ats_score_matches_calculator(matched, jd_terms, semantic):
+    expected, label = ATSScoreCalculator.calculate_ats_score(RESUME, JD, matched, jd_terms, semantic)
+
+    features = ScoringModel.features(
+        keyword_ratio=len(matched) / len(jd_terms),
+        semantic_similarity=semantic,
+        section_score=ATSScoreCalculator.calculate_section_score(RESUME),
+        contact_score=ATSScoreCalculator.calculate_contact_score(RESUME),
+        formatting_score=ATSScoreCalculator.calculate_formatting_score(RESUME),
+        contextual_score=ATSScoreCalculator.calculate_contextual_score(RESUME, JD),
+        experience_match_score=100.0
+    )
+    scores = ScoringModel().score(ScoringModel.to_matrix([features]))
+    assert scores["ats_score"][0] == pytest.approx(expected, abs=0.01)
+    assert scores["ats_label"][0] == label
+
+
+def test_rows_score_independently():
+    rows = [
+        dict.fromkeys(ScoringModel.features(0.5, 0.5, 15, 10, 10, 5, 100), 0.0),
+        ScoringModel.features(0.5, 0.5, 15, 10, 10, 5, 100)
+    ]
+    batch = ScoringModel().score(ScoringModel.to_matrix(rows))
+    single = ScoringModel().score(ScoringModel.to_matrix(rows[1:]))
+    assert batch["overall_match"][1] == single["overall_match"][0]
+    assert batch["skill_match"][0] == 0.0  # jd_has_terms = 0
+
+
+def test_unknown_override_is_rejected():
+    with pytest.raises(ValueError):
+        ScoringModel(weights={'nonexistent': 1.0})
+
+
+def test_stored_features_reproduce_the_response(matcher):
+    result = matcher.analyze(RESUME, JD)
+    scores = ScoringModel().score(ScoringModel.to_matrix([result.features]))
+    assert scores["overall_match"][0] == result.overall_match_percent
+    assert scores["ats_score"][0] == result.ats.score_percent
+    assert scores["skill_match"][0] == result.skill_match_score_percent
+
+
+
+@pytest.mark.parametrize("top_k", ["5", -1, 0, 2.5, True])
+def test_rescore_rejects_bad_top_k(app_client, top_k):
+    response = app_client.post('/jobs-descriptions/unknown/rescore', json={"top_k": top_k})
+    assert response.status_code == 400
+
+
+def test_rescore_default_top_k(app_client):
+    response = app_client.post('/jobs-descriptions/unknown/rescore', json={})
+    assert response.status_code == 404  # validated, then no stored candidates
+
+
+@pytest.mark.parametrize("top_k", ["5", -3, 1.5])
+def test_talent_pool_search_rejects_bad_top_k(app_client, top_k):
+    response = app_client.post('/talent-pool/search', json={"text": "Python developer", "top_k": top_k})
+    assert response.status_code == 400
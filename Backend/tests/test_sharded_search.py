@@ -0,0 +1,78 @@
+"""
+Sharded Search tests
+Shard server handshake, JSON frames and key rules
+"""
+
+import socket
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener, Pipe
+
+import numpy as np
+import pytest
+
+from services.sharded_search import check_authkey, recv_frame, send_frame, serve
+
+
+KEY = b'0123456789abcdef0123456789abcdef'
+
+
+def start_server():
+    listener = Listener(('127.0.0.1', 0))
+    threading.Thread(target=serve, args=(listener, KEY), daemon=True).start()
+    return listener
+
+
+def ping(address) -> list:
+    conn = Client(address, authkey=KEY)
+    try:
+        send_frame(conn, 'ping')
+        assert conn.poll(5)
+        return recv_frame(conn)
+    finally:
+        conn.close()
+
+
+def test_bad_key_client_does_not_take_the_shard_down():
+    listener = start_server()
+    try:
+        with pytest.raises(AuthenticationError):
+            Client(listener.address, authkey=b'wrong-key-wrong-key-wrong')
+        assert ping(listener.address) == ['ok', 0]
+    finally:
+        listener.close()
+
+
+def test_stray_and_stalled_connections_do_not_block_others():
+    listener = start_server()
+    stray = socket.create_connection(listener.address)
+    stray.sendall(b'GET / HTTP/1.0\r\n\r\n')
+    stalled = socket.create_connection(listener.address)
+    try:
+        assert ping(listener.address) == ['ok', 0]
+    finally:
+        stray.close()
+        stalled.close()
+        listener.close()
+
+
+def test_frames_round_trip_arrays_exactly():
+    a, b = Pipe()
+    query = np.array([0.5, -np.inf], dtype=np.float32)
+    send_frame(a, 'query', query, np.arange(3, dtype=np.int64), 0.25, 4)
+    op, received, ordinals, weight, k = recv_frame(b)
+    assert op == 'query'
+    assert received.dtype == np.float32 and np.array_equal(received, query)
+    assert ordinals.dtype == np.int64 and ordinals.tolist() == [0, 1, 2]
+    assert (weight, k) == (0.25, 4)
+
+
+def test_authkey_rules():
+    with pytest.raises(ValueError):
+        check_authkey(None, '127.0.0.1')
+    with pytest.raises(ValueError):
+        check_authkey(b'change-this-shard-key', '127.0.0.1')
+    with pytest.raises(ValueError):
+        check_authkey(b'short', '0.0.0.0')
+    assert check_authkey(b'short', '::1') == b'short'
+    assert check_authkey(KEY, '10.0.0.5') == KEY
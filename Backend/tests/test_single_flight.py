@@ -0,0 +1,84 @@
+"""
+Single Flight tests
+Concurrent identical calls share one execution, for threads and asyncio
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services.single_flight import SingleFlight
+
+
+def wait_for(condition, timeout: float = 5.0):
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end, "timed out"
+        time.sleep(0.01)
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return 'result'
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flight.do, 'key', compute) for _ in range(4)]
+        wait_for(lambda: flight.coalesced == 3)
+        release.set()
+        results = [f.result(5) for f in futures]
+
+    assert results == ['result'] * 4
+    assert len(calls) == 1
+    assert flight.stats() == {"executions": 1, "coalesced": 3, "failures": 0, "in_flight": 0}
+
+
+def test_sequential_calls_each_execute():
+    flight = SingleFlight()
+    assert flight.do('key', lambda: 1) == 1
+    assert flight.do('key', lambda: 2) == 2
+    assert flight.executions == 2
+
+
+def test_failure_reaches_every_waiter_and_is_not_kept():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise RuntimeError("model crashed")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(flight.do, 'key', fail) for _ in range(2)]
+        wait_for(lambda: flight.coalesced == 1)
+        release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                future.result(5)
+
+    assert flight.failures == 1
+    assert flight.do('key', lambda: 'recovered') == 'recovered'
+
+
+def test_async_callers_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    def compute(value):
+        calls.append(value)
+        time.sleep(0.05)
+        return value * 2
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async('key', compute, 21) for _ in range(3)))
+
+    assert asyncio.run(main()) == [42, 42, 42]
+    assert calls == [21]
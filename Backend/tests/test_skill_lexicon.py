@@ -0,0 +1,65 @@
+"""
+Skill Lexicon tests
+Alias lookup and the precomputed embedding table
+"""
+
+import json
+
+import numpy as np
+
+from utils.keyword_extraction import KeywordExtractor
+from utils.model_loader import StubEmbedder
+from utils.skill_lexicon import SkillLexicon
+
+
+def write_lexicon(path) -> SkillLexicon:
+    path.write_text(json.dumps({"skills": [
+        {"name": "Kubernetes", "aliases": ["k8s", "K8S."]},
+        {"name": "Python", "aliases": ["python3"]}
+    ]}))
+    return SkillLexicon.load(path)
+
+
+def test_aliases_resolve_to_canonical_names(tmp_path):
+    lexicon = write_lexicon(tmp_path / 'skills.json')
+    assert lexicon.canonical('K8s') == 'kubernetes'
+    assert lexicon.canonical(' python3, ') == 'python'
+    assert lexicon.lookup('rust') is None
+
+
+def test_missing_lexicon_file_gives_none(tmp_path):
+    assert SkillLexicon.load(tmp_path / 'absent.json') is None
+
+
+def test_table_is_only_attached_for_the_same_model_and_skills(tmp_path):
+    lexicon = write_lexicon(tmp_path / 'skills.json')
+    table = tmp_path / 'skill_embeddings.npy'
+    lexicon.build_embeddings(StubEmbedder(dim=8), table, 'stub:dim=8')
+
+    assert SkillLexicon.load(tmp_path / 'skills.json', table, 'stub:dim=8').embeddings.shape == (2, 8)
+    assert SkillLexicon.load(tmp_path / 'skills.json', table, 'other-model').embeddings is None
+
+    lexicon.skills.append('rust')
+    assert not lexicon.attach_embeddings(table, 'stub:dim=8')
+
+
+def test_known_skills_skip_the_model(tmp_path):
+    lexicon = write_lexicon(tmp_path / 'skills.json')
+    lexicon.build_embeddings(StubEmbedder(dim=8), tmp_path / 'skill_embeddings.npy', 'stub:dim=8')
+
+    extractor = KeywordExtractor('stub:dim=8', lexicon=lexicon)
+    extractor.model = StubEmbedder(dim=8)
+    embeddings = extractor.encode_terms(['k8s', 'kubernetes', 'terraform'])
+
+    assert extractor.model.texts == 1  # only 'terraform'
+    assert np.array_equal(embeddings[0], lexicon.embeddings[0])
+    assert np.array_equal(embeddings[0], embeddings[1])
+
+
+def test_aliases_share_one_encoding_without_a_table(tmp_path):
+    extractor = KeywordExtractor('stub:dim=8', lexicon=write_lexicon(tmp_path / 'skills.json'))
+    extractor.model = StubEmbedder(dim=8)
+    embeddings = extractor.encode_terms(['k8s', 'kubernetes', 'python3'])
+
+    assert extractor.model.texts == 2
+    assert np.array_equal(embeddings[0], embeddings[1])
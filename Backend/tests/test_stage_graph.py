@@ -0,0 +1,134 @@
+"""
+Stage Graph tests
+Subset planning, memoization and deadline degradation
+"""
+
+import pytest
+
+from services.deadline import Deadline, StageCosts
+from services.stage_graph import Stage, StageGraph, trace_stages
+
+
+class Calls:
+    """Counts how often each stage function ran"""
+
+    def __init__(self):
+        self.counts = {}
+
+    def wrap(self, name, fn):
+        def run(**inputs):
+            self.counts[name] = self.counts.get(name, 0) + 1
+            return fn(**inputs)
+        return run
+
+
+def build_graph(calls: Calls, costs=None) -> StageGraph:
+    """
+    text -> words -> count
+                  -> upper (optional: approximated or skipped)
+    count + upper -> summary
+    """
+    graph = StageGraph(costs=StageCosts(costs or {}), memo_size=64)
+    graph.add(Stage('words', calls.wrap('words', lambda text: text.split()), ['text']))
+    graph.add(Stage('count', calls.wrap('count', lambda words: len(words)), ['words']))
+    graph.add(Stage(
+        'upper',
+        calls.wrap('upper', lambda words: [w.upper() for w in words]),
+        ['words'],
+        approximate=calls.wrap('upper:approximate', lambda words: [w[:1].upper() for w in words]),
+        skipped=[]
+    ))
+    graph.add(Stage(
+        'summary',
+        calls.wrap('summary', lambda count, upper: f"{count}:{','.join(upper)}"),
+        ['count', 'upper']
+    ))
+    return graph
+
+
+def test_plan_includes_only_needed_stages():
+    graph = build_graph(Calls())
+    assert graph.plan(['count'], provided=['text']) == ['words', 'count']
+    assert graph.plan(['summary'], provided=['text']) == ['words', 'count', 'upper', 'summary']
+
+
+def test_plan_skips_provided_values():
+    graph = build_graph(Calls())
+    assert graph.plan(['count'], provided=['text', 'words']) == ['count']
+
+
+def test_plan_rejects_missing_inputs():
+    graph = build_graph(Calls())
+    with pytest.raises(KeyError):
+        graph.plan(['count'])  # root value 'text' not provided
+
+
+def test_subset_run_does_not_touch_other_stages():
+    calls = Calls()
+    graph = build_graph(calls)
+    assert graph.run({'text': 'a b c'}, ['count']) == {'count': 3}
+    assert calls.counts == {'words': 1, 'count': 1}
+
+
+def test_provided_value_replaces_its_stage():
+    calls = Calls()
+    graph = build_graph(calls)
+    assert graph.run({'text': 'ignored', 'words': ['x', 'y']}, ['count']) == {'count': 2}
+    assert 'words' not in calls.counts
+
+
+def test_memo_hit_on_repeat_run():
+    calls = Calls()
+    graph = build_graph(calls)
+    first = graph.run({'text': 'a b'}, ['summary'])
+    with trace_stages() as trace:
+        second = graph.run({'text': 'a b'}, ['summary'])
+
+    assert first == second == {'summary': '2:A,B'}
+    assert calls.counts['summary'] == 1
+    assert {entry['mode'] for entry in trace} == {'memo'}
+
+
+def test_memoized_full_result_beats_degradation():
+    calls = Calls()
+    graph = build_graph(calls, costs={'upper': 1000.0, 'upper:approximate': 1000.0})
+    graph.run({'text': 'a b'}, ['summary'])
+
+    deadline = Deadline(1.0)
+    result = graph.run({'text': 'a b'}, ['summary'], deadline)
+    assert result == {'summary': '2:A,B'}
+    assert deadline.degraded == {}
+
+
+def test_approximation_when_full_stage_does_not_fit():
+    calls = Calls()
+    graph = build_graph(calls, costs={'upper': 1000.0, 'upper:approximate': 0.0})
+    deadline = Deadline(100.0)
+    result = graph.run({'text': 'ab cd'}, ['summary'], deadline)
+
+    assert result == {'summary': '2:A,C'}
+    assert deadline.degraded == {'upper': 'approximate'}
+    assert 'upper' not in calls.counts
+
+
+def test_skipped_outputs_are_not_memoized():
+    calls = Calls()
+    graph = build_graph(calls, costs={'upper': 1000.0, 'upper:approximate': 1000.0})
+    deadline = Deadline(100.0)
+    assert graph.run({'text': 'a b'}, ['summary'], deadline) == {'summary': '2:'}
+    assert deadline.degraded == {'upper': 'skipped'}
+
+    # Without a deadline the skipped stage and its dependents compute in full
+    assert graph.run({'text': 'a b'}, ['summary']) == {'summary': '2:A,B'}
+    assert calls.counts['upper'] == 1
+    assert calls.counts['summary'] == 2
+    assert calls.counts['words'] == 1
+
+
+def test_clear_drops_memo():
+    calls = Calls()
+    graph = build_graph(calls)
+    graph.run({'text': 'a'}, ['count'])
+    graph.clear()
+    graph.run({'text': 'a'}, ['count'])
+    assert calls.counts['count'] == 2
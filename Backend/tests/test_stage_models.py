@@ -0,0 +1,95 @@
+"""
+Stage Models tests
+Per-stage encoders, resolved from STAGE_MODELS and shared per model name
+"""
+
+import numpy as np
+import pytest
+
+from services.result_cache import config_fingerprint
+from services.stage_models import MODEL_STAGES, stage_model, stage_models
+from utils.model_loader import load_sentence_model, loaded_models
+from instance.config import Config
+
+
+RESUME = (
+    "Summary\nBackend engineer.\nExperience\nSoftware Engineer, Acme Jan 2018 - Dec 2023\n"
+    "• Built REST APIs in Python and SQL\nSkills\nPython, SQL, Docker"
+)
+JD = "Backend engineer with 3+ years of Python, SQL and Docker experience."
+
+
+@pytest.fixture
+def split_matcher(monkeypatch):
+    """MatcherService with highlights on its own (smaller) stub encoder"""
+    monkeypatch.setattr(Config, 'SENTENCE_MODEL', 'stub:dim=64')
+    monkeypatch.setattr(Config, 'STAGE_MODELS', {'highlights': 'stub:dim=32'})
+    monkeypatch.setattr(Config, 'RESULT_CACHE_BACKEND', 'memory')
+    from services.matcher_service import MatcherService
+    matcher = MatcherService()
+    yield matcher
+    matcher.stage_executor.shutdown(wait=False)
+
+
+def test_stages_fall_back_to_the_sentence_model(monkeypatch):
+    monkeypatch.setattr(Config, 'SENTENCE_MODEL', 'stub:dim=64')
+    monkeypatch.setattr(Config, 'STAGE_MODELS', {'keywords': 'stub:dim=16'})
+    assert stage_model('keywords') == 'stub:dim=16'
+    assert stage_models() == {
+        'keywords': 'stub:dim=16',
+        'highlights': 'stub:dim=64',
+        'sections': 'stub:dim=64',
+        'document': 'stub:dim=64'
+    }
+    assert tuple(stage_models()) == MODEL_STAGES
+
+
+def test_unknown_stages_are_rejected(monkeypatch):
+    with pytest.raises(KeyError):
+        stage_model('summary')
+    monkeypatch.setattr(Config, 'STAGE_MODELS', {'higlights': 'stub:dim=32'})
+    with pytest.raises(KeyError):
+        stage_models()
+
+
+def test_one_instance_per_model_name():
+    model = load_sentence_model('stub:dim=24')
+    assert load_sentence_model('stub:dim=24') is model
+    assert load_sentence_model('stub:dim=24,cost_ms=0') is not model
+    assert loaded_models()['stub:dim=24'] is model
+
+
+def test_stages_on_the_same_model_share_it(split_matcher):
+    m = split_matcher
+    shared = load_sentence_model('stub:dim=64')
+    assert m.keyword_extractor.model is shared
+    assert m.similarity_calculator.model is shared
+    assert m.section_matcher.model is shared
+    assert m.highlight_calculator.model is load_sentence_model('stub:dim=32')
+
+
+def test_profile_embeds_the_jd_once_per_extra_model(split_matcher):
+    m = split_matcher
+    profile = m.compile_job_profile(m.preprocessor.clean_text(JD))
+    assert set(profile.stage_embeddings) == {'highlights'}
+    assert profile.stage_embeddings['highlights'].shape == (32,)
+    assert np.allclose(profile.stage_embeddings['highlights'], m.jd_stage_embedding(profile, 'highlights'))
+    assert m.jd_stage_embedding(profile, 'sections') is profile.embedding
+
+
+def test_split_models_score_profiles_like_raw_jds(split_matcher):
+    m = split_matcher
+    profile = m.compile_job_profile(m.preprocessor.clean_text(JD))
+    m.result_cache.clear()
+    from_profile = m.analyze(RESUME, profile)
+    m.result_cache.clear()
+    from_text = m.analyze(RESUME, JD)
+    assert from_profile.overall_match_percent == from_text.overall_match_percent
+    assert from_profile.relevant_experience_highlights == from_text.relevant_experience_highlights
+
+
+def test_stage_models_are_part_of_the_cache_key(monkeypatch):
+    monkeypatch.setattr(Config, 'STAGE_MODELS', {})
+    shared = config_fingerprint()
+    monkeypatch.setattr(Config, 'STAGE_MODELS', {'highlights': 'stub:dim=32'})
+    assert config_fingerprint() != shared
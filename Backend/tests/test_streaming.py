@@ -0,0 +1,54 @@
+"""
+Streaming tests
+Stage events over Server-Sent Events, ending with the full analysis
+"""
+
+import io
+import json
+
+from services.matcher_service import MatcherService
+
+
+RESUME = "Backend engineer.\nExperience\nPython, SQL and Docker, Jan 2018 - Dec 2023.\nSkills\nPython, SQL"
+JD = "Backend engineer with 3+ years of Python and SQL experience."
+
+
+def parse_events(body: str) -> list:
+    events = []
+    for block in body.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.split('\n'))
+        events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+
+def test_stream_ends_with_the_full_analysis(matcher):
+    matcher.result_cache.clear()
+    events = list(matcher.analyze_stream(RESUME, JD))
+    stages = [stage for stage, _ in events]
+
+    assert stages[-1] == 'result'
+    assert set(stages[:-1]) == set(MatcherService.STREAM_STAGES)
+    matcher.result_cache.clear()
+    assert events[-1][1] == matcher.analyze(RESUME, JD).to_dict()
+
+
+def test_stream_endpoint_sends_stage_events(app_client):
+    response = app_client.post(
+        '/analyze/stream',
+        data={
+            'resume': (io.BytesIO(RESUME.encode()), 'resume.txt'),
+            'job_description': (io.BytesIO(JD.encode()), 'jd.txt')
+        },
+        content_type='multipart/form-data'
+    )
+    assert response.mimetype == 'text/event-stream'
+
+    events = parse_events(response.get_data(as_text=True))
+    assert events[-1][0] == 'result'
+    assert all(data["stage"] == event for event, data in events)
+    experience = dict(events)['experience']["data"]
+    assert experience["required_years"] == 3
+
+
+def test_stream_without_inputs_is_rejected(app_client):
+    assert app_client.post('/analyze/stream', json={}).status_code == 400
@@ -0,0 +1,73 @@
+"""
+Talent Pool tests
+Hybrid search, deletes and compaction over the persistent index
+"""
+
+import pytest
+
+from services.talent_pool import TalentPoolIndex
+
+
+RESUMES = {
+    'python': "Backend engineer. Built REST APIs in Python and SQL. Ran Docker on Kubernetes.",
+    'frontend': "Frontend developer. Built React apps in TypeScript and CSS for retail.",
+    'data': "Data engineer. Built Spark and Airflow pipelines in Python for analytics."
+}
+JD = "Backend engineer with Python, SQL and Docker experience building REST APIs."
+
+
+@pytest.fixture
+def index(matcher, tmp_path):
+    index = TalentPoolIndex(matcher, tmp_path / 'pool', shards=0)
+    for doc_id, text in RESUMES.items():
+        terms = matcher.keyword_extractor.extract_all_terms(text)
+        assert index.add(doc_id, text, sorted(terms), f"{doc_id}.txt")
+    return index
+
+
+@pytest.fixture
+def profile(matcher):
+    return matcher.compile_job_profile(matcher.preprocessor.clean_text(JD))
+
+
+def ranked(index, profile) -> list:
+    return [r["resume_id"] for r in index.search(profile, top_k=3)["results"]]
+
+
+def test_best_candidate_ranks_first(index, profile):
+    results = index.search(profile, top_k=2)["results"]
+    assert [r["resume_id"] for r in results][0] == 'python'
+    assert len(results) == 2
+    assert results[0]["score"] >= results[1]["score"]
+
+
+def test_deleted_resumes_are_not_returned(index, profile):
+    assert index.delete('python')
+    assert not index.delete('python')
+    assert 'python' not in ranked(index, profile)
+    assert index.stats()["deleted"] == 1
+
+
+def test_reindexing_replaces_the_resume(index, profile, matcher):
+    text = RESUMES['frontend'] + " Also Python, SQL and Docker REST APIs."
+    index.add('frontend', text, sorted(matcher.keyword_extractor.extract_all_terms(text)))
+    assert index.stats()["resumes"] == 3
+    assert ranked(index, profile).count('frontend') == 1
+
+
+def test_compact_keeps_search_results(index, profile):
+    index.delete('data')
+    before = index.search(profile, top_k=3)["results"]
+    rows = index.stats()["rows"]
+
+    assert index.compact()["removed"] == 1
+    assert index.stats()["rows"] < rows
+    assert index.search(profile, top_k=3)["results"] == before
+
+
+def test_other_processes_see_writes_through_the_log(index, profile, matcher, tmp_path):
+    reader = TalentPoolIndex(matcher, tmp_path / 'pool', shards=0)
+    assert ranked(reader, profile) == ranked(index, profile)
+
+    index.delete('python')
+    assert 'python' not in ranked(reader, profile)
@@ -0,0 +1,86 @@
+"""
+Term Canonicalizer tests
+Variant merging, subsumed terms, skill n-grams and aliases
+"""
+
+from utils.keyword_extraction import KeywordExtractor
+from utils.skill_lexicon import SkillLexicon
+from utils.term_canonicalizer import TermCanonicalizer
+from utils.text_preprocessing import TextPreprocessor
+
+
+def lexicon() -> SkillLexicon:
+    skills = ['python', 'tensorflow', 'pytorch', 'kubernetes', 'machine learning']
+    aliases = {skill: i for i, skill in enumerate(skills)}
+    aliases['k8s'] = skills.index('kubernetes')
+    return SkillLexicon(skills, aliases)
+
+
+def test_stem_variants_merge_to_most_frequent_form():
+    text = "Built REST apis. Maintained apis and one api gateway."
+    result = TermCanonicalizer().canonicalize(['api', 'apis'], text)
+    assert result == {'apis'}
+
+
+def test_term_inside_longer_term_is_dropped():
+    text = "Applied machine learning to search. Machine learning pipelines."
+    result = TermCanonicalizer().canonicalize(['learning', 'machine learning'], text)
+    assert result == {'machine learning'}
+
+
+def test_term_standing_alone_somewhere_is_kept():
+    text = "Machine learning engineer. Continuous learning culture."
+    result = TermCanonicalizer().canonicalize(['learning', 'machine learning'], text)
+    assert result == {'learning', 'machine learning'}
+
+
+def test_skill_ngram_collapses_into_skills():
+    text = "Stack: python tensorflow pytorch"
+    terms = ['python', 'tensorflow', 'pytorch', 'python tensorflow pytorch']
+    result = TermCanonicalizer(lexicon()).canonicalize(terms, text)
+    assert result == {'python', 'tensorflow', 'pytorch'}
+
+
+def test_aliases_keep_the_canonical_name():
+    text = "Ran services on kubernetes (k8s) clusters"
+    result = TermCanonicalizer(lexicon()).canonicalize(['k8s', 'kubernetes'], text)
+    assert result == {'kubernetes'}
+
+
+def test_opaque_terms_only_merge_when_identical():
+    canonicalizer = TermCanonicalizer()
+    assert canonicalizer.key('c++') != canonicalizer.key('c')
+    assert canonicalizer.key('node.js') == ('node.js',)
+
+
+def test_known_skills_are_never_dropped():
+    text = "Deep machine learning work"
+    terms = ['machine learning', 'deep machine learning']
+    result = TermCanonicalizer(lexicon()).canonicalize(terms, text)
+    assert 'machine learning' in result
+
+
+def test_stats_count_terms():
+    canonicalizer = TermCanonicalizer()
+    canonicalizer.canonicalize(['api', 'apis'], "api apis")
+    stats = canonicalizer.stats()
+    assert stats['calls'] == 1
+    assert stats['terms_in'] == 2
+
+
+def test_bullet_markers_are_stripped_from_surface_forms():
+    text = "Skills\n- experience with tensorflow\n• python\n* kubernetes,"
+    terms = ['- experience with tensorflow', '• python', '* kubernetes,', 'c++', '.net']
+    result = TermCanonicalizer().canonicalize(terms, text)
+    assert result == {'experience with tensorflow', 'python', 'kubernetes', 'c++', '.net'}
+
+
+def test_bullet_prefixed_lists_rank_real_terms_first():
+    text = TextPreprocessor.clean_text(
+        "Tools: aws - build rest apis using flask\nSkills:\n- experience with tensorflow"
+    )
+    terms = TermCanonicalizer().canonicalize(TextPreprocessor.extract_phrase_terms(text), text)
+    counts = {term: text.lower().count(term) for term in terms}
+    top = KeywordExtractor.prioritize_by_counts(sorted(terms), counts, top_n=3)
+    assert not [term for term in terms if not term[0].isalnum() or ' - ' in term]
+    assert top[0] == 'aws'
@@ -0,0 +1,80 @@
+"""
+Text Preprocessing tests
+Line and bullet boundaries survive cleaning, through to section detection
+"""
+
+import io
+import zipfile
+
+from utils.ats_score import ATSScoreCalculator
+from utils.similarity import SimilarityCalculator
+from utils.text_preprocessing import TextPreprocessor
+
+
+W = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+RESUME_LINES = [
+    ("Jane Doe jane@example.com", False),
+    ("Experience", False),
+    ("Software Engineer, Acme Jan 2018 - Dec 2023", False),
+    ("Built REST APIs in Python and SQL for billing", True),
+    ("Ran Docker workloads on Kubernetes in production", True),
+    ("Education", False),
+    ("B.S. Computer Science, State University 2014 - 2018", False),
+    ("Skills", False),
+    ("Python, SQL, Docker, Kubernetes", False),
+]
+
+
+def resume_docx() -> bytes:
+    list_props = '<w:pPr><w:numPr><w:ilvl w:val="0"/><w:numId w:val="1"/></w:numPr></w:pPr>'
+    body = ''.join(
+        f'<w:p>{list_props if is_list else ""}<w:r><w:t>{text}</w:t></w:r></w:p>'
+        for text, is_list in RESUME_LINES
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('word/document.xml', f'<w:document xmlns:w="{W}"><w:body>{body}</w:body></w:document>')
+    return buffer.getvalue()
+
+
+def test_clean_text_keeps_lines_and_bullets():
+    text = "  Jane  Doe \r\n\n  Skills:\t\n• Python,  SQL ★ \n\n- Docker  "
+    assert TextPreprocessor.clean_text(text) == "Jane Doe\nSkills\n• Python, SQL\n- Docker"
+
+
+def test_bullet_terms_end_at_the_line():
+    terms = TextPreprocessor.extract_bullet_terms("• Python services\nSummary without markers")
+    assert terms == {'python', 'services'}
+
+
+def test_bullet_lines_are_highlight_candidates():
+    text = "• Built REST APIs in Python and SQL\n• Ran Docker workloads on Kubernetes"
+    assert SimilarityCalculator.split_sentences(text) == [
+        "Built REST APIs in Python and SQL",
+        "Ran Docker workloads on Kubernetes"
+    ]
+
+
+def test_cleaned_text_keeps_sections():
+    text = TextPreprocessor.clean_text("\n".join(line for line, _ in RESUME_LINES))
+    sections = ATSScoreCalculator.identify_sections(text)
+    assert "Python, SQL" in sections['skills']
+    assert "Computer Science" in sections['education']
+
+
+def test_docx_upload_sections_are_detected(app_client):
+    response = app_client.post(
+        '/analyze',
+        data={
+            'resume': (io.BytesIO(resume_docx()), 'cv.docx'),
+            'job_description': (io.BytesIO(b"Backend engineer with Python, SQL and Docker experience."), 'jd.txt')
+        },
+        content_type='multipart/form-data'
+    )
+    assert response.status_code == 200
+    results = response.get_json()
+
+    # Experience, education and skills all found
+    assert results["features"]["section_completeness"] == 1.0
+    assert "Built REST APIs in Python and SQL for billing" in results["relevant_experience_highlights"]
@@ -0,0 +1,50 @@
+"""
+Thread Budget tests
+Per-analysis thread counts never oversubscribe the cores
+"""
+
+import os
+
+import pytest
+
+from services.thread_budget import THREAD_ENV_VARS, ThreadBudget, available_cores
+from instance.config import Config
+
+
+@pytest.mark.parametrize("cores, workers, request_threads, torch_threads", [
+    (16, 2, 4, 2),
+    (16, 1, 4, 4),
+    (8, 1, 1, 8),
+    (4, 2, 4, 1),  # more analyses than cores: one thread each
+    (6, 1, 4, 1)
+])
+def test_threads_split_the_cores(cores, workers, request_threads, torch_threads):
+    budget = ThreadBudget(cores=cores, workers=workers, request_threads=request_threads)
+    assert budget.torch_threads == torch_threads
+    assert budget.blas_threads == torch_threads
+    if workers * request_threads <= cores:
+        assert budget.summary()["total_threads"] <= cores
+
+
+def test_explicit_thread_counts_win():
+    budget = ThreadBudget(cores=16, workers=2, request_threads=4, torch_threads=3, blas_threads=1)
+    assert (budget.torch_threads, budget.blas_threads) == (3, 1)
+
+
+def test_from_config_with_overrides(monkeypatch):
+    monkeypatch.setattr(Config, 'CPU_CORES', 12)
+    monkeypatch.setattr(Config, 'REQUEST_THREADS', 3)
+    monkeypatch.setattr(Config, 'STAGE_WORKERS', None)
+    budget = ThreadBudget.from_config(workers=2)
+    assert budget.torch_threads == 2
+    assert budget.stage_workers == 3
+
+
+def test_apply_sets_child_environment(monkeypatch):
+    for name in THREAD_ENV_VARS:
+        monkeypatch.setenv(name, 'unset')
+    monkeypatch.setattr(ThreadBudget, '_applied', None)
+
+    budget = ThreadBudget(cores=available_cores(), workers=1, request_threads=1).apply()
+    assert ThreadBudget.current() is budget
+    assert {os.environ[name] for name in THREAD_ENV_VARS} == {str(budget.blas_threads)}
@@ -0,0 +1,177 @@
+"""
+Thread Budget Autotune
+Sweep worker / request-thread / torch-thread layouts on this machine
+
+Usage:
+    python tools/autotune_threads.py
+    python tools/autotune_threads.py --resume r.pdf --jd job.txt --requests 48 --max-p95-ms 2000
+
+Each layout runs real analyses (result cache off, every request unique)
+in fresh processes, then the best throughput/latency layout is printed
+as Config settings.
+"""
+
+import argparse
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import numpy as np
+
+from utils.file_utils import FileUtils
+from services.thread_budget import available_cores
+from instance.config import Config
+
+
+def powers_of_two(limit: int) -> List[int]:
+    values, n = [], 1
+    while n <= limit:
+        values.append(n)
+        n *= 2
+    return values
+
+
+def layouts(cores: int, max_workers: int, max_threads: int) -> List[Dict]:
+    """Candidate layouts, skipping heavily oversubscribed ones"""
+    candidates = []
+    for workers in powers_of_two(min(cores, max_workers)):
+        for request_threads in powers_of_two(max_threads):
+            for torch_threads in powers_of_two(cores):
+                if workers * request_threads * torch_threads > 2 * cores:
+                    continue
+                candidates.append({
+                    "workers": workers,
+                    "request_threads": request_threads,
+                    "torch_threads": torch_threads
+                })
+    return candidates
+
+
+def run_worker(layout: Dict, cores: int, resume_text: str, jd_text: str, requests: List[int], barrier, results):
+    """One simulated web worker: apply the layout, warm up, then serve its share"""
+    Config.RESULT_CACHE_BACKEND = None
+
+    from services.thread_budget import ThreadBudget
+    from services.matcher_service import MatcherService
+
+    ThreadBudget(
+        cores=cores,
+        workers=layout["workers"],
+        request_threads=layout["request_threads"],
+        torch_threads=layout["torch_threads"],
+        blas_threads=layout["torch_threads"]
+    ).apply()
+    matcher = MatcherService()
+    matcher.analyze(resume_text, jd_text)
+
+    def one(i: int) -> float:
+        start = time.perf_counter()
+        # Unique text so nothing is cached or coalesced
+        matcher.analyze(f"{resume_text} request {i}", jd_text)
+        return (time.perf_counter() - start) * 1000
+
+    barrier.wait()
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=layout["request_threads"]) as pool:
+        latencies = list(pool.map(one, requests))
+    results.put((started, time.time(), latencies))
+
+
+def measure(layout: Dict, cores: int, resume_text: str, jd_text: str, n_requests: int) -> Dict:
+    ctx = multiprocessing.get_context('spawn')
+    workers = layout["workers"]
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+
+    processes = [
+        ctx.Process(
+            target=run_worker,
+            args=(layout, cores, resume_text, jd_text, list(range(w, n_requests, workers)), barrier, results)
+        )
+        for w in range(workers)
+    ]
+    for p in processes:
+        p.start()
+    outcomes = [results.get() for _ in processes]
+    for p in processes:
+        p.join()
+
+    wall = max(o[1] for o in outcomes) - min(o[0] for o in outcomes)
+    latencies = np.array([l for o in outcomes for l in o[2]])
+    return dict(
+        layout,
+        throughput=round(len(latencies) / wall, 2),
+        p50_ms=round(float(np.percentile(latencies, 50)), 1),
+        p95_ms=round(float(np.percentile(latencies, 95)), 1)
+    )
+
+
+def load_texts(args):
+    if args.resume and args.jd:
+        return FileUtils.read_file(args.resume), FileUtils.read_file(args.jd)
+
+    assets_dir = Path(Config.ASSETS_DIR)
+    resume_path = FileUtils.find_resume_in_assets(assets_dir)
+    jd_path = assets_dir / "job.txt"
+    if not resume_path or not jd_path.exists():
+        return None, None
+    return FileUtils.read_file(str(resume_path)), FileUtils.read_file(str(jd_path))
+
+
+def recommend(rows: List[Dict], max_p95_ms: Optional[float]) -> Dict:
+    """Highest throughput whose p95 stays within the latency budget"""
+    budget = max_p95_ms or 1.5 * min(r["p95_ms"] for r in rows)
+    eligible = [r for r in rows if r["p95_ms"] <= budget] or rows
+    return max(eligible, key=lambda r: r["throughput"])
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Recommend a CPU thread budget")
+    parser.add_argument('--resume', help="Resume file (default: assets/)")
+    parser.add_argument('--jd', help="Job description file (default: assets/job.txt)")
+    parser.add_argument('--requests', type=int, default=24, help="Analyses per layout")
+    parser.add_argument('--max-workers', type=int, default=8)
+    parser.add_argument('--max-threads', type=int, default=8, help="Max request threads per worker")
+    parser.add_argument('--max-p95-ms', type=float, help="Latency budget (default: 1.5x best p95)")
+    args = parser.parse_args(argv)
+
+    resume_text, jd_text = load_texts(args)
+    if not resume_text or not jd_text:
+        print("Could not read resume / job description (pass --resume and --jd)")
+        return 1
+
+    cores = available_cores()
+    candidates = layouts(cores, args.max_workers, args.max_threads)
+    print(f"{cores} cores, {len(candidates)} layouts, {args.requests} analyses each")
+    print(f"{'workers':>8} {'req_thr':>8} {'torch':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8}")
+
+    rows = []
+    for layout in candidates:
+        row = measure(layout, cores, resume_text, jd_text, args.requests)
+        rows.append(row)
+        print(f"{row['workers']:>8} {row['request_threads']:>8} {row['torch_threads']:>6} "
+              f"{row['throughput']:>8} {row['p50_ms']:>8} {row['p95_ms']:>8}")
+
+    best = recommend(rows, args.max_p95_ms)
+    fastest = min(rows, key=lambda r: r["p95_ms"])
+    print("=" * 60)
+    print(f"Lowest latency:  {fastest['workers']}w x {fastest['request_threads']}t x "
+          f"{fastest['torch_threads']} torch (p95 {fastest['p95_ms']} ms)")
+    print(f"Recommended:     {best['workers']}w x {best['request_threads']}t x "
+          f"{best['torch_threads']} torch ({best['throughput']} req/s, p95 {best['p95_ms']} ms)")
+    print("\nConfig:")
+    print(f"    WEB_WORKERS = {best['workers']}")
+    print(f"    REQUEST_THREADS = {best['request_threads']}")
+    print(f"    TORCH_THREADS = {best['torch_threads']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Extraction Benchmark
+Compare text extraction cost of the PDF and DOCX paths
+
+Usage:
+    python tools/benchmark_extraction.py
+    python tools/benchmark_extraction.py resume.pdf resume.docx --repeat 20
+    python tools/benchmark_extraction.py --paragraphs 100 1000 10000
+
+With no files, assets/resume.pdf is compared against a DOCX holding the
+same text. --paragraphs adds synthetic DOCX files of growing size to
+show latency and peak memory scaling.
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from utils.file_utils import FileUtils
+from instance.config import Config
+
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+
+RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+
+def write_docx(lines: List[str], path: Path):
+    """Minimal .docx with one paragraph per line ("• " lines become list items)"""
+    paragraphs = []
+    for line in lines:
+        if line.startswith('• '):
+            paragraphs.append(
+                '<w:p><w:pPr><w:numPr><w:ilvl w:val="0"/><w:numId w:val="1"/></w:numPr></w:pPr>'
+                f'<w:r><w:t xml:space="preserve">{escape(line[2:])}</w:t></w:r></w:p>'
+            )
+        else:
+            paragraphs.append(f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>')
+
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{"".join(paragraphs)}</w:body></w:document>'
+    )
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', CONTENT_TYPES)
+        archive.writestr('_rels/.rels', RELS)
+        archive.writestr('word/document.xml', document)
+
+
+def synthetic_lines(paragraphs: int) -> List[str]:
+    lines = []
+    for i in range(paragraphs):
+        if i % 10 == 0:
+            lines.append(f"Software Engineer {i // 10}  Jan 2019 - Present")
+        else:
+            lines.append(f"• Built and maintained Python services with Docker and SQL, item {i}")
+    return lines
+
+
+def measure(path: Path, repeat: int) -> Dict:
+    """Median latency over repeat runs, plus peak Python memory of one run"""
+    timings = []
+    text = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = FileUtils.read_file(str(path))
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    FileUtils.read_file(str(path))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    size = path.stat().st_size
+    median = statistics.median(timings)
+    return {
+        "file": path.name,
+        "bytes": size,
+        "chars": len(text or ''),
+        "median_ms": round(median, 2),
+        "mb_per_s": round(size / 1e6 / (median / 1000), 2) if median else None,
+        "peak_kb": round(peak / 1024, 1)
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark PDF vs DOCX text extraction")
+    parser.add_argument('files', nargs='*', help="Files to extract (.pdf, .docx, .txt)")
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--paragraphs', type=int, nargs='*', default=[],
+                        help="Also benchmark synthetic DOCX files of these sizes")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [Path(f) for f in args.files]
+        if not paths:
+            pdf_path = Path(Config.ASSETS_DIR) / "resume.pdf"
+            if pdf_path.exists():
+                # Same content through both extractors
+                text = FileUtils.read_file(str(pdf_path)) or ''
+                docx_path = Path(tmp) / "resume_from_pdf.docx"
+                write_docx(text.splitlines(), docx_path)
+                paths = [pdf_path, docx_path]
+
+        for n in args.paragraphs:
+            path = Path(tmp) / f"synthetic_{n}.docx"
+            write_docx(synthetic_lines(n), path)
+            paths.append(path)
+
+        if not paths:
+            print("Nothing to benchmark (pass files or --paragraphs)")
+            return 1
+
+        print(f"{'file':<28} {'bytes':>10} {'chars':>9} {'median ms':>10} {'MB/s':>8} {'peak KB':>9}")
+        for path in paths:
+            row = measure(path, args.repeat)
+            print(f"{row['file']:<28} {row['bytes']:>10} {row['chars']:>9} "
+                  f"{row['median_ms']:>10} {row['mb_per_s']!s:>8} {row['peak_kb']:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
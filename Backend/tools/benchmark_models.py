@@ -0,0 +1,254 @@
+"""
+Model Benchmark
+Latency / accuracy trade-off of per-stage encoder combinations
+
+Usage:
+    python tools/benchmark_models.py --candidates sentence-transformers/paraphrase-MiniLM-L3-v2
+    python tools/benchmark_models.py --candidates MODEL_A MODEL_B --stages keywords highlights --corpus golden/
+    python tools/benchmark_models.py --golden golden.json --combination keywords=MODEL_A,sections=MODEL_B
+    python tools/benchmark_models.py --candidates stub:dim=128 --tolerance score_delta=2 --output models.json
+
+Every combination assigns one candidate (or the configured model) to each
+varied stage ('keywords', 'highlights', 'sections', 'document'); stages
+not varied keep their STAGE_MODELS / SENTENCE_MODEL model. Each runs the
+reference analysis over the corpus (see tools/score_equivalence.py for
+--corpus and --golden) and is compared with the configured models' results
+(or the golden ones): worst score delta, keyword Jaccard, highlight
+overlap and section agreement. Latency is the mean analysis time per case
+after a warm-up, with the time spent in each model's stages.
+
+Rows on the latency / score-delta Pareto front are marked '*'.
+"""
+
+import argparse
+import itertools
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from services.stage_graph import trace_stages
+from services.stage_models import MODEL_STAGES, stage_models
+from utils.model_loader import load_sentence_model
+from instance.config import Config
+
+# Corpus loading and comparison are shared with the equivalence harness
+from score_equivalence import evaluate, load_corpus, parse_tolerances
+
+
+# Graph stages whose time is charged to each model stage
+GRAPH_STAGES = {
+    'keywords': ('jd_term_embeddings', 'resume_term_embeddings', 'keywords'),
+    'highlights': ('jd_highlights_embedding', 'relevant_experience_highlights'),
+    'sections': ('jd_sections_embedding', 'section_match_analysis'),
+    'document': ('jd_embedding', 'semantic_similarity')
+}
+
+# --combination items split only at commas starting a new STAGE=, so
+# model names may hold commas ("stub:dim=128,cost_ms=1")
+COMBINATION_SPLIT = re.compile(r',(?=(?:' + '|'.join(MODEL_STAGES) + r')=)')
+
+WARMUP_RESUME = "Software engineer with 5 years of Python and SQL experience building APIs."
+WARMUP_JD = "We are hiring a backend engineer with 3+ years of Python experience."
+
+# Encoder micro-benchmark inputs: short terms and sentences
+PROBE_TERMS = ["python", "docker", "kubernetes", "machine learning", "rest apis", "sql", "ci/cd", "react"] * 8
+PROBE_SENTENCES = [
+    "Led a team of five engineers building data pipelines on AWS.",
+    "Designed REST APIs serving two million requests per day.",
+    "Improved model inference latency by 40 percent with batching.",
+    "Mentored junior developers and ran weekly code reviews."
+] * 4
+
+
+def profile_models(names: List[str]) -> Dict[str, Dict]:
+    """Load each model once; load time, dimension and encode latency"""
+    profiles = {}
+    for name in dict.fromkeys(names):
+        start = time.perf_counter()
+        model = load_sentence_model(name)
+        load_ms = (time.perf_counter() - start) * 1000
+        model.encode(PROBE_TERMS[:2])  # first-call overhead
+
+        timings = {}
+        for label, texts in (("terms", PROBE_TERMS), ("sentences", PROBE_SENTENCES)):
+            start = time.perf_counter()
+            model.encode(texts)
+            timings[f"{label}_ms_per_text"] = round((time.perf_counter() - start) * 1000 / len(texts), 3)
+
+        profiles[name] = dict(
+            load_ms=round(load_ms, 1),
+            dim=model.get_sentence_embedding_dimension(),
+            **timings
+        )
+    return profiles
+
+
+def combinations(candidates: List[str], stages: List[str], explicit: List[str], limit: int) -> List[Dict[str, str]]:
+    """Stage -> model assignments to benchmark (the configured one first)"""
+    configured = stage_models()
+    combos = [configured]
+    for spec in explicit or []:
+        combo = dict(configured)
+        for item in filter(None, COMBINATION_SPLIT.split(spec)):
+            stage, _, model = item.partition('=')
+            if stage not in MODEL_STAGES:
+                raise SystemExit(f"Unknown stage in '{spec}': {stage} (choose from {', '.join(MODEL_STAGES)})")
+            combo[stage] = model
+        combos.append(combo)
+
+    if candidates:
+        options = [list(dict.fromkeys([configured[stage]] + candidates)) for stage in stages]
+        for choice in itertools.product(*options):
+            combos.append(dict(configured, **dict(zip(stages, choice))))
+
+    unique = list({json.dumps(c, sort_keys=True): c for c in combos}.values())
+    if len(unique) > limit:
+        raise SystemExit(f"{len(unique)} combinations exceed --max-combinations {limit}; "
+                         f"vary fewer --stages or pass --combination")
+    return unique
+
+
+def run_combination(models: Dict[str, str], cases: List[Dict]) -> Dict:
+    """Analyze every case with one stage -> model assignment"""
+    from services.matcher_service import MatcherService
+
+    saved = Config.STAGE_MODELS
+    Config.STAGE_MODELS = models
+    try:
+        matcher = MatcherService()
+        matcher.analyze(WARMUP_RESUME, WARMUP_JD)
+
+        results = {}
+        with trace_stages() as stages:
+            start = time.perf_counter()
+            for case in cases:
+                results[case["id"]] = matcher.analyze(case["resume_text"], case["jd_text"]).to_dict()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        matcher.stage_executor.shutdown(wait=False)
+    finally:
+        Config.STAGE_MODELS = saved
+
+    stage_ms = {
+        stage: round(sum(
+            entry.get("elapsed_ms") or 0.0 for entry in stages if entry["stage"] in names
+        ) / len(cases), 2)
+        for stage, names in GRAPH_STAGES.items()
+    }
+    return {
+        "results": results,
+        "ms_per_case": round(elapsed_ms / len(cases), 2),
+        "stage_ms_per_case": stage_ms
+    }
+
+
+def pareto(rows: List[Dict]) -> None:
+    """Mark rows no other row beats on both latency and score delta"""
+    for row in rows:
+        row["pareto"] = not any(
+            other is not row
+            and other["ms_per_case"] <= row["ms_per_case"]
+            and other["score_delta"] <= row["score_delta"]
+            and (other["ms_per_case"] < row["ms_per_case"] or other["score_delta"] < row["score_delta"])
+            for other in rows
+        )
+
+
+def short_name(model: str) -> str:
+    return model.rsplit('/', 1)[-1]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark per-stage encoder combinations")
+    parser.add_argument('--candidates', nargs='+', default=[], help="Model names to try on the varied stages")
+    parser.add_argument('--stages', nargs='+', default=list(MODEL_STAGES), choices=MODEL_STAGES,
+                        help="Stages to vary (default: all)")
+    parser.add_argument('--combination', action='append', metavar='STAGE=MODEL,...',
+                        help="An explicit combination (repeatable)")
+    parser.add_argument('--corpus', help="Directory with resumes/ and jds/ (default: assets/)")
+    parser.add_argument('--golden', help="Golden file from score_equivalence.py --record")
+    parser.add_argument('--tolerance', action='append', metavar='NAME=VALUE', help="Override a tolerance (repeatable)")
+    parser.add_argument('--max-combinations', type=int, default=64, help="Refuse larger sweeps")
+    parser.add_argument('--output', help="Write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    tolerances = parse_tolerances(args.tolerance)
+    # Every combination must compute, never hit another one's cached result
+    Config.RESULT_CACHE_BACKEND = None
+
+    # 1. Corpus and combinations
+    if args.golden:
+        with open(args.golden, encoding='utf-8') as f:
+            golden = json.load(f)
+        cases = golden["cases"]
+        reference = {case["id"]: case["result"] for case in cases}
+        print(f"Golden: {len(cases)} cases (scoring v{golden.get('scoring_version')}, "
+              f"{golden.get('stage_models') or golden.get('model')})")
+    else:
+        cases = load_corpus(args.corpus)
+        reference = None
+    if not cases:
+        print("No resume / JD pairs found (pass --corpus or --golden)")
+        return 1
+
+    combos = combinations(args.candidates, args.stages, args.combination, args.max_combinations)
+    print(f"{len(cases)} cases, {len(combos)} combinations, tolerances {tolerances}")
+
+    # 2. Each model loaded once, with its raw encode cost
+    models = profile_models([model for combo in combos for model in combo.values()])
+    print(f"\n{'model':<48} {'load ms':>9} {'dim':>5} {'ms/term':>8} {'ms/sent':>8}")
+    for name, p in models.items():
+        print(f"{name:<48} {p['load_ms']:>9.0f} {p['dim']:>5} "
+              f"{p['terms_ms_per_text']:>8.3f} {p['sentences_ms_per_text']:>8.3f}")
+
+    # 3. Analyze the corpus with every combination
+    rows = []
+    for combo in combos:
+        run = run_combination(combo, cases)
+        if reference is None:
+            # The configured models (first combination) are the reference
+            reference = run["results"]
+        outcome = evaluate(reference, run["results"], tolerances)
+        rows.append({
+            "models": combo,
+            "ms_per_case": run["ms_per_case"],
+            "stage_ms_per_case": run["stage_ms_per_case"],
+            "score_delta": outcome["worst"].get("score_delta", 0.0),
+            "worst": outcome["worst"],
+            "passed": outcome["passed"],
+            "failures": outcome["failures"]
+        })
+
+    pareto(rows)
+    baseline = rows[0]["ms_per_case"]
+
+    # 4. Report, fastest first
+    width = max(len(stage) for stage in MODEL_STAGES)
+    print(f"\n{'':2}{'ms/case':>9} {'speedup':>8} {'score Δ':>8} {'kw J':>6} {'hl ov':>6} {'sect':>6}  result  models")
+    for row in sorted(rows, key=lambda r: r["ms_per_case"]):
+        w = row["worst"]
+        assignment = ', '.join(f"{stage}={short_name(model)}" for stage, model in row["models"].items())
+        print(f"{'*' if row['pareto'] else ' ':2}{row['ms_per_case']:>9.1f} "
+              f"{baseline / row['ms_per_case'] if row['ms_per_case'] else 0:>7.2f}x "
+              f"{row['score_delta']:>8.2f} {w.get('keyword_jaccard', 1):>6.2f} "
+              f"{w.get('highlight_overlap', 1):>6.2f} {w.get('section_agreement', 1):>6.2f}  "
+              f"{'PASS' if row['passed'] else 'FAIL':<6}  {assignment}")
+        print(f"{'':2}{'':>9} " + ' '.join(
+            f"{stage:>{width}} {ms:.1f}ms" for stage, ms in row["stage_ms_per_case"].items()
+        ))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"tolerances": tolerances, "models": models, "combinations": rows}, f, indent=2, default=str)
+        print(f"\nReport written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
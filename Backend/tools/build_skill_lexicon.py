@@ -0,0 +1,44 @@
+"""
+Build Skill Lexicon Embeddings
+Encode every canonical skill once and store the memory-mapped table
+
+Usage:
+    python tools/build_skill_lexicon.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from services.stage_models import stage_model
+from utils.model_loader import load_sentence_model
+from utils.skill_lexicon import SkillLexicon
+from instance.config import Config
+
+
+def main():
+    lexicon = SkillLexicon.load(Config.SKILL_LEXICON_PATH)
+    if lexicon is None:
+        print(f"Lexicon not found: {Config.SKILL_LEXICON_PATH}")
+        return 1
+
+    # Skills are matched against terms, so they use the keyword encoder
+    model_name = stage_model('keywords')
+    print(f"Encoding {len(lexicon.skills)} skills with {model_name}...")
+    model = load_sentence_model(model_name)
+    embeddings = lexicon.build_embeddings(
+        model,
+        Config.SKILL_EMBEDDINGS_PATH,
+        model_name
+    )
+
+    print(f"Saved {embeddings.shape[0]} x {embeddings.shape[1]} table to {Config.SKILL_EMBEDDINGS_PATH}")
+    print(f"Aliases indexed: {len(lexicon.alias_index)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
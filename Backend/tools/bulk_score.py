@@ -0,0 +1,253 @@
+"""
+Bulk Scoring
+Score a directory of resumes against one job description offline
+
+Usage:
+    python tools/bulk_score.py --jd jd.txt --resumes ./resumes --output scores.csv
+    python tools/bulk_score.py --jd jd.txt --resumes "./batch/*.pdf" --output scores.parquet --workers 4
+    python tools/bulk_score.py --jd jd.txt --resumes ./resumes --output scores.msgpack
+
+Progress is checkpointed to <output>.checkpoint.jsonl, so re-running the
+same command after an interruption only scores the remaining files.
+Files that failed are tried again on every re-run.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import pandas as pd
+
+from utils.file_utils import FileUtils
+from utils.serialization import msgpack, packb
+from services.result_cache import config_fingerprint, text_digest
+
+
+RESUME_SUFFIXES = {'.pdf', '.docx', '.txt'}
+
+# Per-worker state, set once by init_worker
+_matcher = None
+_profile = None
+
+
+def init_worker(jd_text: str, workers: int):
+    """
+    Build one MatcherService per worker process
+    The components share a single model instance (utils/model_loader.py)
+    and the JD is compiled once, so each task only embeds resume terms.
+    Workers split the cores evenly (one analysis at a time each).
+    """
+    global _matcher, _profile
+    from services.matcher_service import MatcherService
+    from services.thread_budget import ThreadBudget
+
+    ThreadBudget(workers=workers, request_threads=1).apply()
+    _matcher = MatcherService()
+    _profile = _matcher.compile_job_profile(_matcher.preprocessor.clean_text(jd_text))
+
+
+def score_file(path: str) -> Dict:
+    """Extract one resume and analyze it against the worker's JD profile"""
+    start = time.perf_counter()
+    record = {"file": path, "result": None, "error": None}
+    try:
+        text = FileUtils.read_file(path)
+        if not text:
+            record["error"] = "No text extracted"
+        else:
+            record["result"] = _matcher.analyze(text, _profile).to_dict()
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+
+    record["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return record
+
+
+def collect_files(source: str) -> List[str]:
+    """Resume files from a directory (recursive) or a glob pattern"""
+    path = Path(source)
+    if path.is_dir():
+        candidates = (str(p) for p in path.rglob('*'))
+    else:
+        candidates = glob.glob(source, recursive=True)
+
+    return sorted(
+        str(Path(p).resolve()) for p in candidates
+        if Path(p).is_file() and Path(p).suffix.lower() in RESUME_SUFFIXES
+    )
+
+
+class Checkpoint:
+    """
+    Append-only JSONL log of scored files
+    Records made for another JD or scoring config are ignored on resume
+    """
+
+    def __init__(self, path: Path, run_key: str):
+        self.path = path
+        self.run_key = run_key
+        self.records: Dict[str, Dict] = {}
+
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Partial last line from an interrupted run
+                        continue
+                    if record.get("run_key") == self.run_key:
+                        self.records[record["file"]] = record
+
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def done(self) -> Set[str]:
+        """Files scored successfully; failed ones are queued again"""
+        return {f for f, record in self.records.items() if not record.get("error")}
+
+    def failed(self) -> Set[str]:
+        return set(self.records) - self.done()
+
+    def add(self, record: Dict):
+        record["run_key"] = self.run_key
+        self.records[record["file"]] = record
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def to_frame(records: List[Dict]) -> pd.DataFrame:
+    """Flatten analysis results into one row per resume"""
+    rows = []
+    for record in records:
+        row = {"file": record["file"], "error": record.get("error")}
+        if record.get("result"):
+            row.update(record["result"])
+        rows.append(row)
+
+    frame = pd.json_normalize(rows, sep='.')
+
+    # Lists and dicts (keywords, highlights, ...) are stored as JSON strings
+    for column in frame.columns:
+        if frame[column].map(lambda v: isinstance(v, (list, dict))).any():
+            frame[column] = frame[column].map(
+                lambda v: json.dumps(v) if isinstance(v, (list, dict)) else v
+            )
+
+    if "overall_match_percent" in frame.columns:
+        frame = frame.sort_values("overall_match_percent", ascending=False, na_position='last')
+    return frame.reset_index(drop=True)
+
+
+def write_output(records: List[Dict], output: Path):
+    suffix = output.suffix.lower()
+    if suffix == '.msgpack':
+        # Nested records as-is (needs msgpack installed)
+        output.write_bytes(packb(records))
+    elif suffix == '.parquet':
+        # Needs pyarrow or fastparquet installed
+        to_frame(records).to_parquet(output, index=False)
+    else:
+        to_frame(records).to_csv(output, index=False)
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Score resumes against a job description")
+    parser.add_argument('--jd', required=True, help="Job description file (.txt or .pdf)")
+    parser.add_argument('--resumes', required=True, help="Directory or glob of resumes")
+    parser.add_argument('--output', required=True, help="Output file (.csv, .parquet or .msgpack)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument('--checkpoint', help="Checkpoint file (default: <output>.checkpoint.jsonl)")
+    parser.add_argument('--restart', action='store_true', help="Ignore an existing checkpoint")
+    args = parser.parse_args(argv)
+
+    # Fail before hours of scoring, not when writing the output
+    if Path(args.output).suffix.lower() == '.msgpack' and msgpack is None:
+        parser.error("--output .msgpack requires 'pip install msgpack'")
+    return args
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    output = Path(args.output)
+    checkpoint_path = Path(args.checkpoint or f"{output}.checkpoint.jsonl")
+
+    # 1. Load inputs
+    jd_text = FileUtils.read_file(args.jd)
+    if not jd_text:
+        print(f"Could not read job description: {args.jd}")
+        return 1
+
+    files = collect_files(args.resumes)
+    if not files:
+        print(f"No .pdf, .docx or .txt resumes found in {args.resumes}")
+        return 1
+
+    # 2. Resume from checkpoint
+    if args.restart and checkpoint_path.exists():
+        checkpoint_path.unlink()
+    run_key = f"{text_digest(jd_text)}:{config_fingerprint()}"
+    checkpoint = Checkpoint(checkpoint_path, run_key)
+    done = checkpoint.done()
+    pending = [f for f in files if f not in done]
+    retried = len(checkpoint.failed().intersection(pending))
+    print(f"{len(files)} resumes, {len(files) - len(pending)} already scored, {len(pending)} to go"
+          + (f" ({retried} failed before, retrying)" if retried else ''))
+
+    # 3. Score in a process pool
+    start = time.perf_counter()
+    scored = failed = 0
+    try:
+        if pending:
+            workers = max(1, min(args.workers, len(pending)))
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=init_worker,
+                initargs=(jd_text, workers)
+            ) as pool:
+                futures = [pool.submit(score_file, f) for f in pending]
+                for future in as_completed(futures):
+                    record = future.result()
+                    checkpoint.add(record)
+                    if record["error"]:
+                        failed += 1
+                        print(f"  failed: {record['file']} ({record['error']})")
+                    else:
+                        scored += 1
+                    if (scored + failed) % 50 == 0:
+                        print(f"  {scored + failed}/{len(pending)}")
+    finally:
+        checkpoint.close()
+    elapsed = time.perf_counter() - start
+
+    # 4. Write every scored file, including earlier runs
+    records = [checkpoint.records[f] for f in files if f in checkpoint.records]
+    write_output(records, output)
+
+    # 5. Throughput summary
+    processed = scored + failed
+    print("=" * 60)
+    print(f"Scored:     {scored}")
+    print(f"Failed:     {failed}")
+    print(f"Resumed:    {len(files) - len(pending)}")
+    print(f"Elapsed:    {elapsed:.1f}s")
+    if processed:
+        print(f"Throughput: {processed / elapsed:.2f} resumes/s ({elapsed / processed * 1000:.0f} ms each)")
+    print(f"Output:     {output} ({len(records)} rows)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,501 @@
+"""
+Load Test
+Drive the API under concurrency and report throughput, latency and errors
+
+Usage:
+    python tools/load_test.py --stub-embedder 20
+    python tools/load_test.py --targets inprocess gunicorn:1x4 gunicorn:2x2 --concurrency 8 --requests 200
+    python tools/load_test.py --mix analyze=6,stream=2,documents=1,health=1 --set RESULT_CACHE_BACKEND=null
+    python tools/load_test.py --targets http://localhost:5000 --duration 60
+
+Targets:
+    inprocess      app.py through Flask's test client (no HTTP server)
+    gunicorn:WxT   a local gunicorn (gunicorn.conf.py) with W workers x T threads
+    http://...     a server that is already running
+
+--stub-embedder COST_MS replaces SentenceTransformer with a deterministic
+stub costing COST_MS per encode() call (utils/model_loader.StubEmbedder),
+so serving overhead - Flask/gunicorn, locks, queueing - can be told apart
+from model time: compare a cost-0 run with the real model, or targets
+against each other at a fixed stub cost. Every analysis request carries a
+unique resume line, so nothing is served from the result cache (except
+'quick', which analyzes the assets/ files).
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import numpy as np
+
+from utils.file_utils import FileUtils
+from instance.config import Config
+
+
+# Overrides applied before any target starts (--set wins): one load-test
+# client would otherwise be throttled by the per-client rate limit, and
+# each virtual user is its own client via a header trusted from loopback
+CLIENT_HEADER = 'X-Client-Id'
+DEFAULT_OVERRIDES = {
+    'CLIENT_RATE_PER_MINUTE': 0,
+    'ADMISSION_CLIENT_HEADER': CLIENT_HEADER,
+    'ADMISSION_TRUSTED_PROXIES': ['127.0.0.0/8', '::1']
+}
+
+SCENARIOS = ('analyze', 'stream', 'quick', 'documents', 'health')
+
+
+# ----------------------------------------------------------------------
+# Configuration
+# ----------------------------------------------------------------------
+
+def parse_overrides(items: List[str]) -> Dict:
+    """KEY=VALUE pairs; values are JSON when they parse (null, 0, true, [..])"""
+    overrides = dict(DEFAULT_OVERRIDES)
+    for item in items or []:
+        key, _, value = item.partition('=')
+        if not hasattr(Config, key):
+            raise SystemExit(f"Unknown Config setting: {key}")
+        try:
+            overrides[key] = json.loads(value)
+        except json.JSONDecodeError:
+            overrides[key] = value
+    return overrides
+
+
+def stub_model_name(cost_ms: float, per_text_ms: float, mode: str) -> str:
+    return f"stub:cost_ms={cost_ms},per_text_ms={per_text_ms},mode={mode}"
+
+
+def apply_overrides(overrides: Dict):
+    for key, value in overrides.items():
+        setattr(Config, key, value)
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for item in spec.split(','):
+        name, _, weight = item.partition('=')
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario '{name}' (choose from {', '.join(SCENARIOS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def load_texts(args) -> Tuple[Optional[str], Optional[str]]:
+    if args.resume and args.jd:
+        return FileUtils.read_file(args.resume), FileUtils.read_file(args.jd)
+
+    assets_dir = Path(Config.ASSETS_DIR)
+    resume_path = FileUtils.find_resume_in_assets(assets_dir)
+    jd_path = assets_dir / "job.txt"
+    if not resume_path or not jd_path.exists():
+        return None, None
+    return FileUtils.read_file(str(resume_path)), FileUtils.read_file(str(jd_path))
+
+
+# ----------------------------------------------------------------------
+# Requests
+# ----------------------------------------------------------------------
+
+def multipart(files: Dict[str, Tuple[str, str]]) -> Tuple[bytes, str]:
+    """Encode {field: (filename, text)} as multipart/form-data"""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for field, (filename, text) in files.items():
+        parts.append(
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f'Content-Type: text/plain\r\n\r\n{text}\r\n'
+        )
+    parts.append(f'--{boundary}--\r\n')
+    return ''.join(parts).encode('utf-8'), f'multipart/form-data; boundary={boundary}'
+
+
+def build_request(scenario: str, n: int, resume_text: str, jd_text: str) -> Tuple[str, str, Optional[bytes], Dict]:
+    """(method, path, body, headers) of request number n"""
+    # Unique per request: no cache hits, no upload filename clashes
+    nonce = f"load-test request {n} {uuid.uuid4().hex[:8]}"
+    if scenario in ('analyze', 'stream'):
+        body, content_type = multipart({
+            'resume': (f"load_resume_{n}.txt", f"{resume_text}\n{nonce}"),
+            'job_description': (f"load_jd_{n}.txt", jd_text)
+        })
+        path = '/analyze' if scenario == 'analyze' else '/analyze/stream'
+        return 'POST', path, body, {'Content-Type': content_type}
+    if scenario == 'documents':
+        body = json.dumps({"text": f"{resume_text}\n{nonce}", "filename": f"load_{n}.txt"}).encode('utf-8')
+        return 'POST', '/documents', body, {'Content-Type': 'application/json'}
+    if scenario == 'quick':
+        return 'POST', '/analyze/quick', b'', {}
+    return 'GET', '/health', None, {}
+
+
+class InProcessClient:
+    """app.py through Flask's test client (one client per thread)"""
+
+    def __init__(self):
+        import app
+        self.app = app.app
+        self._local = threading.local()
+
+    def request(self, method: str, path: str, body: Optional[bytes], headers: Dict) -> int:
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, data=body, headers=headers)
+        response.get_data()  # drain streamed bodies
+        response.close()
+        return response.status_code
+
+
+class HttpClient:
+    """Keep-alive HTTP connection per thread"""
+
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self._local = threading.local()
+
+    def request(self, method: str, path: str, body: Optional[bytes], headers: Dict) -> int:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=300)
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.getheader('Connection', '').lower() == 'close':
+                conn.close()
+            return response.status
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            self._local.conn = None
+            raise
+
+
+# ----------------------------------------------------------------------
+# Local gunicorn
+# ----------------------------------------------------------------------
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def serve_gunicorn(port: int, workers: int, threads: int, overrides: Dict):
+    """
+    Child process: apply overrides, then run gunicorn on app:app
+    Config is patched before gunicorn forks, so every worker inherits it
+    """
+    import runpy
+    from gunicorn.app.base import BaseApplication
+
+    apply_overrides(overrides)
+    Config.WEB_WORKERS = workers
+    Config.REQUEST_THREADS = threads
+
+    class LoadTestServer(BaseApplication):
+        def load_config(self):
+            # The repo's gunicorn.conf.py, then this run's layout
+            settings = runpy.run_path(str(backend_dir / "gunicorn.conf.py"))
+            for key, value in settings.items():
+                if key in self.cfg.settings:
+                    self.cfg.set(key, value)
+            self.cfg.set('bind', f"127.0.0.1:{port}")
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            self.cfg.set('worker_class', 'gthread' if threads > 1 else 'sync')
+            self.cfg.set('timeout', 300)
+            self.cfg.set('accesslog', None)
+
+        def load(self):
+            from app import app
+            return app
+
+    os.chdir(backend_dir)
+    LoadTestServer().run()
+
+
+class GunicornServer:
+    """A gunicorn started by this tool, torn down after its run"""
+
+    def __init__(self, workers: int, threads: int, overrides: Dict, startup_timeout: float):
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.process = subprocess.Popen([
+            sys.executable, str(Path(__file__).resolve()),
+            '--serve-gunicorn', json.dumps({
+                "port": self.port,
+                "workers": workers,
+                "threads": threads,
+                "overrides": overrides
+            })
+        ])
+
+        # Ready once every worker could have loaded the model
+        client = HttpClient(self.url)
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"gunicorn exited with code {self.process.returncode}")
+            try:
+                if client.request('GET', '/health', None, {}) == 200:
+                    break
+            except OSError:
+                pass
+            if time.monotonic() > deadline:
+                self.close()
+                raise RuntimeError(f"gunicorn not ready after {startup_timeout}s")
+            time.sleep(0.2)
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.send_signal(signal.SIGTERM)
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+
+# ----------------------------------------------------------------------
+# Run
+# ----------------------------------------------------------------------
+
+def run_load(client, args, mix: Dict[str, float], resume_text: str, jd_text: str) -> Dict:
+    """Closed loop: --concurrency users, each sending its next request as soon as one finishes"""
+    names = list(mix)
+    rng = random.Random(args.seed)
+    plan = rng.choices(names, weights=[mix[n] for n in names], k=args.requests)
+
+    # Warm up every connection / worker before measuring
+    for i in range(args.warmup):
+        method, path, body, headers = build_request(names[i % len(names)], -i - 1, resume_text, jd_text)
+        try:
+            client.request(method, path, body, headers)
+        except Exception:
+            pass
+
+    lock = threading.Lock()
+    counter = [0]
+    samples: List[Tuple[str, float, Optional[int], Optional[str]]] = []
+    stop_at = time.perf_counter() + args.duration if args.duration else None
+
+    def user(user_id: int):
+        while True:
+            with lock:
+                n = counter[0]
+                counter[0] += 1
+            if stop_at is None and n >= len(plan):
+                return
+            if stop_at is not None and time.perf_counter() >= stop_at:
+                return
+            scenario = plan[n % len(plan)]
+            method, path, body, headers = build_request(scenario, n, resume_text, jd_text)
+            headers = dict(headers, **{CLIENT_HEADER: f"load-{user_id}"})
+
+            start = time.perf_counter()
+            try:
+                status, error = client.request(method, path, body, headers), None
+            except Exception as e:
+                status, error = None, f"{type(e).__name__}: {e}"
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                samples.append((scenario, elapsed, status, error))
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=user, args=(u,)) for u in range(args.concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+    return summarize(samples, wall)
+
+
+def latency_summary(latencies: np.ndarray) -> Dict:
+    if not len(latencies):
+        return {"mean_ms": None, "p50_ms": None, "p90_ms": None, "p99_ms": None, "max_ms": None}
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    return {
+        "mean_ms": round(float(latencies.mean()), 1),
+        "p50_ms": round(float(p50), 1),
+        "p90_ms": round(float(p90), 1),
+        "p99_ms": round(float(p99), 1),
+        "max_ms": round(float(latencies.max()), 1)
+    }
+
+
+def summarize(samples: List[Tuple], wall: float) -> Dict:
+    def block(rows: List[Tuple]) -> Dict:
+        latencies = np.array([r[1] for r in rows], dtype=np.float64)
+        errors = [r for r in rows if r[2] is None or r[2] >= 400]
+        statuses: Dict[str, int] = {}
+        for r in rows:
+            key = str(r[2]) if r[2] is not None else 'exception'
+            statuses[key] = statuses.get(key, 0) + 1
+        return dict(
+            requests=len(rows),
+            throughput=round(len(rows) / wall, 2) if wall else None,
+            error_rate=round(len(errors) / len(rows), 4) if rows else 0.0,
+            statuses=statuses,
+            **latency_summary(latencies)
+        )
+
+    result = block(samples)
+    result["wall_s"] = round(wall, 2)
+    result["scenarios"] = {
+        name: block([s for s in samples if s[0] == name])
+        for name in sorted({s[0] for s in samples})
+    }
+    exceptions = [s[3] for s in samples if s[3]]
+    if exceptions:
+        result["first_error"] = exceptions[0]
+    return result
+
+
+def embedding_share(result: Dict, before: Dict, after: Dict) -> Optional[Dict]:
+    """In-process stub counters: model time per request vs. mean latency"""
+    requests = result["requests"]
+    if not requests or not result["mean_ms"]:
+        return None
+    model_ms = (after["cost_ms"] - before["cost_ms"]) / requests
+    return {
+        "encode_calls_per_request": round((after["calls"] - before["calls"]) / requests, 2),
+        "model_ms_per_request": round(model_ms, 1),
+        "model_share": round(model_ms / result["mean_ms"], 3)
+    }
+
+
+def run_target(target: str, args, overrides: Dict, mix: Dict[str, float], resume_text: str, jd_text: str) -> Dict:
+    if target == 'inprocess':
+        apply_overrides(overrides)
+        client = InProcessClient()
+        stub = stub_model()
+        before = stub.stats() if stub else None
+        result = run_load(client, args, mix, resume_text, jd_text)
+        if stub:
+            result["embedding"] = embedding_share(result, before, stub.stats())
+        return result
+
+    if target.startswith('gunicorn:'):
+        workers, _, threads = target.split(':', 1)[1].partition('x')
+        server = GunicornServer(int(workers), int(threads or 1), overrides, args.startup_timeout)
+        try:
+            return run_load(HttpClient(server.url), args, mix, resume_text, jd_text)
+        finally:
+            server.close()
+
+    return run_load(HttpClient(target), args, mix, resume_text, jd_text)
+
+
+def stub_model():
+    """The in-process stub embedder, if that is what is loaded"""
+    from utils.model_loader import StubEmbedder, loaded_models
+    stubs = [m for m in loaded_models().values() if isinstance(m, StubEmbedder)]
+    return stubs[0] if stubs else None
+
+
+def print_result(target: str, result: Dict):
+    def row(label: str, r: Dict):
+        print(f"{label:<24} {r['requests']:>6} {r['throughput']!s:>8} {r['p50_ms']!s:>8} "
+              f"{r['p90_ms']!s:>8} {r['p99_ms']!s:>8} {r['max_ms']!s:>8} {r['error_rate'] * 100:>6.1f}%")
+
+    row(target, result)
+    for name, scenario in result["scenarios"].items():
+        row(f"  {name}", scenario)
+    failed = {k: v for k, v in result["statuses"].items() if k == 'exception' or int(k) >= 400}
+    if failed:
+        print(f"  errors: {failed}" + (f" - {result['first_error']}" if result.get('first_error') else ''))
+    if result.get("embedding"):
+        e = result["embedding"]
+        print(f"  model: {e['encode_calls_per_request']} encode calls, {e['model_ms_per_request']} ms "
+              f"per request ({e['model_share'] * 100:.0f}% of mean latency)")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Load test the resume matcher API")
+    parser.add_argument('--targets', nargs='+', default=['inprocess'],
+                        help="inprocess, gunicorn:WxT or a server URL")
+    parser.add_argument('--concurrency', type=int, default=4, help="Simultaneous clients")
+    parser.add_argument('--requests', type=int, default=100, help="Requests per target")
+    parser.add_argument('--duration', type=float, help="Run each target this many seconds instead")
+    parser.add_argument('--warmup', type=int, default=4, help="Unmeasured requests first")
+    parser.add_argument('--mix', default='analyze=1', help="Weighted scenarios, e.g. analyze=6,stream=2,health=1")
+    parser.add_argument('--stub-embedder', type=float, metavar='COST_MS',
+                        help="Replace the sentence model with a stub costing COST_MS per encode() call")
+    parser.add_argument('--stub-per-text-ms', type=float, default=0.0)
+    parser.add_argument('--stub-mode', choices=['sleep', 'spin'], default='sleep',
+                        help="sleep releases the GIL (like torch), spin holds it")
+    parser.add_argument('--set', action='append', metavar='KEY=VALUE', help="Config override (repeatable)")
+    parser.add_argument('--resume', help="Resume file (default: assets/)")
+    parser.add_argument('--jd', help="Job description file (default: assets/job.txt)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--startup-timeout', type=float, default=300)
+    parser.add_argument('--output', help="Write results as JSON")
+    parser.add_argument('--serve-gunicorn', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve_gunicorn:
+        spec = json.loads(args.serve_gunicorn)
+        serve_gunicorn(spec["port"], spec["workers"], spec["threads"], spec["overrides"])
+        return 0
+
+    overrides = parse_overrides(args.set)
+    if args.stub_embedder is not None:
+        overrides['SENTENCE_MODEL'] = stub_model_name(args.stub_embedder, args.stub_per_text_ms, args.stub_mode)
+    mix = parse_mix(args.mix)
+
+    resume_text, jd_text = load_texts(args)
+    if not resume_text or not jd_text:
+        print("Could not read resume / job description (pass --resume and --jd)")
+        return 1
+
+    amount = f"{args.duration}s" if args.duration else f"{args.requests} requests"
+    print(f"{amount} per target, {args.concurrency} concurrent, mix {mix}")
+    print(f"overrides: {overrides}")
+    print(f"{'target':<24} {'reqs':>6} {'req/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7}")
+
+    results = {}
+    for target in args.targets:
+        try:
+            result = run_target(target, args, overrides, mix, resume_text, jd_text)
+        except Exception as e:
+            print(f"{target:<24} failed: {type(e).__name__}: {e}")
+            continue
+        if result["requests"] and result["error_rate"] == 1.0:
+            # Latencies of failed requests measure nothing; stop here
+            detail = f" - {result['first_error']}" if result.get('first_error') else ''
+            print(f"{target:<24} aborted: every request failed {result['statuses']}{detail}")
+            return 1
+        results[target] = result
+        print_result(target, result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"overrides": overrides, "mix": mix, "results": results}, f, indent=2, default=str)
+        print(f"Results written to {args.output}")
+    return 0 if results else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Parse Worker
+Extract document text inside a resource-limited child process
+
+Started by services/parser_pool.py, not by hand:
+    python tools/parse_worker.py --fd 5 --memory-mb 2048 --cpu-seconds 20
+
+Requests arrive on the inherited connection (--fd) as JSON frames
+holding either "path" or "has_data" + "suffix", plus an optional
+"max_pages"; with has_data the document bytes follow as a raw frame.
+Each gets one JSON reply: {"ok": True, "text", "pages"} or
+{"ok": False, "reason", "error"}, with the worker's RSS after the task.
+Nothing on the connection is pickled.
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Dict, Optional
+
+# file_utils is imported on its own, not through the utils package, so
+# a worker never loads the NLP models the package pulls in
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir / "utils"))
+
+from file_utils import DocumentTooLarge, FileUtils, pdfplumber
+
+try:
+    import resource
+except ImportError:  # not POSIX: no limits
+    resource = None
+
+
+def apply_memory_limit(memory_mb: int):
+    """Cap the address space; allocations past it raise MemoryError"""
+    if resource is not None and memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def apply_cpu_limit(cpu_seconds: int):
+    """
+    CPU budget for the next task only
+    RLIMIT_CPU counts the whole process lifetime, so the soft limit is
+    moved to (CPU used so far + budget); past it the kernel sends SIGXCPU
+    """
+    if resource is None or not cpu_seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime) + cpu_seconds
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def rss_mb() -> Optional[float]:
+    """Current resident set size (Linux), None elsewhere"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return round(pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024), 1)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def parse(request: Dict) -> Dict:
+    """Extract one document (exceptions are reported by the caller)"""
+    if request.get('data') is not None:
+        source = io.BytesIO(request['data'])
+        suffix = request.get('suffix', '')
+    else:
+        source = request['path']
+        suffix = Path(source).suffix.lower()
+
+    if suffix == '.pdf':
+        max_pages = request.get('max_pages')
+        with pdfplumber.open(source) as pdf:
+            pages = len(pdf.pages)
+            # Refuse before extracting anything
+            if max_pages and pages > max_pages:
+                return {
+                    "ok": False,
+                    "reason": "too_large",
+                    "error": f"PDF has {pages} pages (limit {max_pages})"
+                }
+            return {"ok": True, "text": FileUtils.pdf_text(pdf), "pages": pages}
+
+    if suffix == '.docx':
+        # docx_text raises, so a corrupt file is invalid_document and a
+        # MemoryError reaches main() (extract_text_from_docx swallows both)
+        try:
+            return {"ok": True, "text": FileUtils.docx_text(source), "pages": None}
+        except DocumentTooLarge as e:
+            return {"ok": False, "reason": "too_large", "error": str(e)}
+
+    return {"ok": False, "reason": "unsupported", "error": f"Cannot parse '{suffix}' files"}
+
+
+def receive(conn: Connection) -> Dict:
+    """One request: its JSON frame plus the document bytes, if any"""
+    request = json.loads(conn.recv_bytes().decode('utf-8'))
+    if request.pop('has_data', False):
+        request['data'] = conn.recv_bytes()
+    return request
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sandboxed document parser")
+    parser.add_argument('--fd', type=int, required=True, help="Inherited connection handle")
+    parser.add_argument('--memory-mb', type=int, default=0)
+    parser.add_argument('--cpu-seconds', type=int, default=0)
+    args = parser.parse_args()
+
+    conn = Connection(args.fd)
+    apply_memory_limit(args.memory_mb)
+
+    while True:
+        try:
+            request = receive(conn)
+        except (EOFError, OSError, ValueError):
+            break  # pool closed the connection (or broke the protocol)
+
+        start = time.perf_counter()
+        apply_cpu_limit(args.cpu_seconds)
+        try:
+            response = parse(request)
+        except MemoryError:
+            response = {"ok": False, "reason": "memory_limit", "error": "Document exceeded the parser memory limit"}
+        except Exception as e:
+            response = {"ok": False, "reason": "invalid_document", "error": f"{type(e).__name__}: {e}"}
+        response["rss_mb"] = rss_mb()
+        response["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+        try:
+            conn.send_bytes(json.dumps(response).encode('utf-8'))
+        except (MemoryError, OSError):
+            break
+        if response.get("reason") == "memory_limit":
+            break  # heap state unknown; the pool starts a fresh process
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""
+Replay Captures
+Re-run captured slow requests through MatcherService under the profiler
+
+Usage:
+    python tools/replay_captures.py
+    python tools/replay_captures.py instance/captures/20260101T120000000000-ab12.json --repeat 3
+    python tools/replay_captures.py --last 5 --deadline --top 30 --sort tottime
+    python tools/replay_captures.py --profile-dir /tmp/prof --json replay.json
+
+Captures are written by services/request_capture.py (CAPTURE_SLOW_REQUESTS).
+Each is analyzed from its extracted texts with the result cache off and
+the stage memo cleared, so every repeat computes. Stages run serially on
+the profiled thread unless --parallel is given (cProfile only sees the
+thread that enabled it; --parallel keeps production timings but the
+profile then misses the stage pool). Model loading is warmed up first.
+
+Per capture: captured vs replayed wall time, per-stage timings side by
+side, a config fingerprint check (captured under other settings, the
+replay measures different work) and the top functions of the profile.
+"""
+
+import argparse
+import cProfile
+import io
+import json
+import pstats
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from services.deadline import Deadline
+from services.request_capture import RequestCapture
+from services.result_cache import config_fingerprint, config_settings
+from services.stage_graph import trace_stages
+from instance.config import Config
+
+
+WARMUP_RESUME = "Software engineer with 5 years of Python and SQL experience building APIs."
+WARMUP_JD = "We are hiring a backend engineer with 3+ years of Python experience."
+
+
+def find_captures(paths: List[str], last: Optional[int]) -> List[Path]:
+    """Capture files from explicit files and spool directories, oldest first"""
+    found = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            found.extend(RequestCapture.paths(path))
+        elif path.exists():
+            found.append(path)
+        else:
+            print(f"Not found: {path}")
+    return found[-last:] if last else found
+
+
+def stage_totals(stages: List[Dict]) -> Dict[str, Dict]:
+    """Summed time and modes per stage over a trace"""
+    totals = defaultdict(lambda: {"elapsed_ms": 0.0, "modes": set()})
+    for entry in stages or []:
+        total = totals[entry["stage"]]
+        total["elapsed_ms"] += entry.get("elapsed_ms") or 0.0
+        total["modes"].add(entry["mode"])
+    return totals
+
+
+def config_differences(captured: Dict) -> Dict[str, Dict]:
+    """Settings that differ between the capture and this process"""
+    current = json.loads(json.dumps(config_settings(), default=str))
+    return {
+        key: {"captured": captured.get(key), "current": current.get(key)}
+        for key in sorted(set(captured) | set(current))
+        if captured.get(key) != current.get(key)
+    }
+
+
+class Replayer:
+    """Runs captures on one MatcherService"""
+
+    def __init__(self, parallel: bool = False):
+        from services.matcher_service import MatcherService
+
+        # Every replay must compute, never hit a cached result
+        Config.RESULT_CACHE_BACKEND = None
+        self.matcher = MatcherService()
+        if not parallel:
+            self.matcher.stage_graph.executor = None
+
+        # Model loading is not what the captured request paid for
+        start = time.perf_counter()
+        self.matcher.analyze(WARMUP_RESUME, WARMUP_JD)
+        print(f"Warm-up: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    def replay(self, capture: Dict, use_deadline: bool, profiler: cProfile.Profile) -> Dict:
+        """One profiled analysis of a capture; returns elapsed time and stages"""
+        self.matcher.stage_graph.clear()
+        deadline_ms = capture.get("params", {}).get("deadline_ms")
+        deadline = Deadline(deadline_ms) if use_deadline and deadline_ms else None
+
+        with trace_stages() as stages:
+            start = time.perf_counter()
+            profiler.enable()
+            try:
+                results = self.matcher.analyze(capture["resume_text"], capture["jd_text"], deadline)
+            finally:
+                profiler.disable()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+        return {
+            "elapsed_ms": round(elapsed_ms, 2),
+            "degraded": results.degraded,
+            "stages": list(stages)
+        }
+
+
+def print_stages(captured: List[Dict], replayed: List[Dict]):
+    before, after = stage_totals(captured), stage_totals(replayed)
+    print(f"    {'stage':<34} {'captured ms':>12} {'replayed ms':>12}  modes")
+    for name in list(dict.fromkeys(list(before) + list(after))):
+        b, a = before.get(name), after.get(name)
+        modes = sorted((b["modes"] if b else set()) | (a["modes"] if a else set()))
+        cells = [f"{t['elapsed_ms']:.1f}" if t else '-' for t in (b, a)]
+        print(f"    {name:<34} {cells[0]:>12} {cells[1]:>12}  {','.join(modes)}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Replay captured slow requests under the profiler")
+    parser.add_argument('paths', nargs='*', help=f"Capture files or spool directories (default: {Config.CAPTURE_DIR})")
+    parser.add_argument('--last', type=int, help="Only the newest N captures")
+    parser.add_argument('--repeat', type=int, default=1, help="Replays per capture (profile covers all)")
+    parser.add_argument('--deadline', action='store_true', help="Replay under the captured X-Deadline-Ms budget")
+    parser.add_argument('--parallel', action='store_true', help="Keep the stage pool (profile misses pool threads)")
+    parser.add_argument('--top', type=int, default=20, help="Profile functions to print per capture")
+    parser.add_argument('--sort', default='cumulative', help="pstats sort key (cumulative, tottime, calls, ...)")
+    parser.add_argument('--profile-dir', help="Write one .prof file per capture (snakeviz, pstats)")
+    parser.add_argument('--json', help="Write the replay report as JSON")
+    args = parser.parse_args(argv)
+
+    # 1. Captures to replay
+    paths = find_captures(args.paths or [str(Config.CAPTURE_DIR)], args.last)
+    if not paths:
+        print("No captures found (enable CAPTURE_SLOW_REQUESTS or pass capture files)")
+        return 1
+
+    replayer = Replayer(parallel=args.parallel)
+    fingerprint = config_fingerprint()
+    if args.profile_dir:
+        Path(args.profile_dir).mkdir(parents=True, exist_ok=True)
+
+    # 2. Replay each under the profiler
+    report = []
+    for path in paths:
+        capture = RequestCapture.load(path)
+        label = f"{capture.get('id', path.stem)[:12]} {capture.get('endpoint')} ({capture.get('reason')})"
+        if not capture.get("resume_text") or not capture.get("jd_text"):
+            print(f"\n{label}: no extracted texts captured, skipped")
+            continue
+
+        print(f"\n{label} captured {capture.get('captured_at')}")
+        differences = {}
+        if capture.get("config_fingerprint") != fingerprint:
+            differences = config_differences(capture.get("config") or {})
+            print(f"    Warning: captured under config {capture.get('config_fingerprint')}, "
+                  f"replaying under {fingerprint}")
+            for key, values in differences.items():
+                print(f"      {key}: {values['captured']} -> {values['current']}")
+        if capture.get("redacted"):
+            print("    Note: texts were redacted at capture; scores may differ")
+        if capture.get("error"):
+            error = capture["error"]
+            print(f"    Captured error: {error.get('type')}: {error.get('message')}")
+
+        profiler = cProfile.Profile()
+        runs = []
+        for _ in range(max(1, args.repeat)):
+            try:
+                runs.append(replayer.replay(capture, args.deadline, profiler))
+            except Exception as e:
+                print(f"    Replay failed: {type(e).__name__}: {e}")
+                runs.append({"error": f"{type(e).__name__}: {e}"})
+                break
+
+        timed = [run for run in runs if "elapsed_ms" in run]
+        captured_ms = capture.get("elapsed_ms") or 0.0
+        if timed:
+            best = min(run["elapsed_ms"] for run in timed)
+            ratio = best / captured_ms if captured_ms else float('nan')
+            replayed = ', '.join(f"{run['elapsed_ms']:.1f}" for run in timed)
+            print(f"    elapsed: captured {captured_ms:.1f} ms, replayed {replayed} ms (best x{ratio:.2f})")
+            print_stages(capture.get("stages"), timed[0]["stages"])
+
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).strip_dirs().sort_stats(args.sort).print_stats(args.top)
+            print('\n'.join('    ' + line for line in stream.getvalue().strip().splitlines()))
+            if args.profile_dir:
+                profiler.dump_stats(str(Path(args.profile_dir) / f"{path.stem}.prof"))
+
+        report.append({
+            "capture": str(path),
+            "id": capture.get("id"),
+            "endpoint": capture.get("endpoint"),
+            "reason": capture.get("reason"),
+            "captured_ms": captured_ms,
+            "config_differences": differences,
+            "runs": runs
+        })
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"fingerprint": fingerprint, "model": Config.SENTENCE_MODEL, "captures": report}, f, indent=2)
+        print(f"\nReport written to {args.json}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
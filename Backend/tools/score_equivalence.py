@@ -0,0 +1,390 @@
+"""
+Score Equivalence
+Gate alternative analysis paths against the reference pipeline
+
+Usage:
+    python tools/score_equivalence.py
+    python tools/score_equivalence.py --corpus golden/ --record golden.json
+    python tools/score_equivalence.py --golden golden.json --mode reference
+    python tools/score_equivalence.py --golden golden.json --mode reference:USE_SKILL_LEXICON=false
+    python tools/score_equivalence.py --mode stream profile deadline:50 --tolerance score_delta=1 --verbose
+
+Corpus: every resume in <corpus>/resumes against every JD in <corpus>/jds
+(.pdf, .docx, .txt), or the assets/ pair when no corpus is given.
+--record stores the texts and reference results as a golden file, so
+later runs (other code, other settings) are compared with the scores
+customers already saw.
+
+Modes are analysis paths, optionally under Config overrides:
+    reference     MatcherService.analyze
+    stream        final event of analyze_stream
+    incremental   IncrementalAnalyzer, session warmed with an earlier draft
+    profile       analyze against a compiled JobProfile
+    documents     analyze_documents on DocumentStore documents
+    deadline:MS   analyze under an MS millisecond budget (approximations)
+    PATH:KEY=VALUE,KEY=VALUE   any path with Config overrides (JSON values)
+
+Exit code 1 when any mode is outside the tolerances.
+"""
+
+import argparse
+import json
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from utils.file_utils import FileUtils
+from services.stage_models import stage_models
+from instance.config import Config
+
+
+DOCUMENT_SUFFIXES = {'.pdf', '.docx', '.txt'}
+
+# Worst case allowed over the corpus
+DEFAULT_TOLERANCES = {
+    'score_delta': 0.5,          # max |delta| of any percent score
+    'keyword_jaccard': 0.95,     # min Jaccard of matched / missing / top keywords
+    'highlight_overlap': 0.8,    # min rank-weighted overlap of highlights
+    'section_agreement': 1.0,    # min share of sections with the same verdict
+    'exact_agreement': 1.0       # ATS label and experience years
+}
+
+SCORE_FIELDS = (
+    ('skill_match_score_percent',),
+    ('experience_match_score_percent',),
+    ('ats', 'score_percent'),
+    ('overall_match_percent',)
+)
+
+KEYWORD_FIELDS = (
+    ('keywords', 'matched'),
+    ('keywords', 'missing'),
+    ('top_resume_keywords',)
+)
+
+EXACT_FIELDS = (
+    ('ats', 'label'),
+    ('experience', 'required_years'),
+    ('experience', 'candidate_years')
+)
+
+# Overrides are split at commas that start a new UPPER_CASE key
+OVERRIDE_SPLIT = re.compile(r',(?=[A-Z][A-Z0-9_]*=)')
+
+
+# ----------------------------------------------------------------------
+# Corpus
+# ----------------------------------------------------------------------
+
+def load_corpus(corpus: Optional[str]) -> List[Dict]:
+    """Cases {id, resume_text, jd_text} from a corpus directory or assets/"""
+    if corpus:
+        root = Path(corpus)
+        resumes = sorted(p for p in (root / "resumes").iterdir() if p.suffix.lower() in DOCUMENT_SUFFIXES)
+        jds = sorted(p for p in (root / "jds").iterdir() if p.suffix.lower() in DOCUMENT_SUFFIXES)
+    else:
+        assets_dir = Path(Config.ASSETS_DIR)
+        resume_path = FileUtils.find_resume_in_assets(assets_dir)
+        resumes = [resume_path] if resume_path else []
+        jds = [assets_dir / "job.txt"] if (assets_dir / "job.txt").exists() else []
+
+    texts = {path: FileUtils.read_file(str(path)) for path in resumes + jds}
+    return [
+        {
+            "id": f"{resume.name}|{jd.name}",
+            "resume_text": texts[resume],
+            "jd_text": texts[jd]
+        }
+        for resume in resumes
+        for jd in jds
+        if texts[resume] and texts[jd]
+    ]
+
+
+def golden_metadata() -> Dict:
+    return {
+        "created": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "scoring_version": Config.SCORING_VERSION,
+        "model": Config.SENTENCE_MODEL,
+        "stage_models": stage_models()
+    }
+
+
+# ----------------------------------------------------------------------
+# Modes
+# ----------------------------------------------------------------------
+
+def parse_mode(spec: str) -> Tuple[str, Optional[str], Dict]:
+    """'path[:arg][:KEY=VALUE,...]' -> (path, arg, overrides)"""
+    parts = spec.split(':', 2)
+    path, arg, rest = parts[0], None, parts[1:]
+    if path == 'deadline':
+        if not rest:
+            raise SystemExit("deadline mode needs a budget: deadline:MS")
+        arg, rest = rest[0], rest[1:]
+
+    overrides = {}
+    for item in OVERRIDE_SPLIT.split(':'.join(rest)) if rest else []:
+        key, _, value = item.partition('=')
+        if not hasattr(Config, key):
+            raise SystemExit(f"Unknown Config setting in mode '{spec}': {key}")
+        try:
+            overrides[key] = json.loads(value)
+        except json.JSONDecodeError:
+            overrides[key] = value
+    if path not in ('reference', 'stream', 'incremental', 'profile', 'documents', 'deadline'):
+        raise SystemExit(f"Unknown mode: {spec}")
+    return path, arg, overrides
+
+
+class ModeRunner:
+    """One analysis path on a MatcherService built under its overrides"""
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        self.path, self.arg, self.overrides = parse_mode(spec)
+
+    def run(self, cases: List[Dict]) -> Dict[str, Dict]:
+        from services.matcher_service import MatcherService
+
+        saved = {key: getattr(Config, key) for key in self.overrides}
+        for key, value in self.overrides.items():
+            setattr(Config, key, value)
+        try:
+            self.matcher = MatcherService()
+            with tempfile.TemporaryDirectory() as tmp:
+                self.tmp = Path(tmp)
+                return {case["id"]: self.analyze(case) for case in cases}
+        finally:
+            for key, value in saved.items():
+                setattr(Config, key, value)
+
+    def analyze(self, case: Dict) -> Dict:
+        m = self.matcher
+        resume_text, jd_text = case["resume_text"], case["jd_text"]
+
+        if self.path == 'stream':
+            results = None
+            for stage, payload in m.analyze_stream(resume_text, jd_text):
+                if stage == 'result':
+                    results = payload
+        elif self.path == 'incremental':
+            from services.incremental_analyzer import IncrementalAnalyzer
+            analyzer = IncrementalAnalyzer(m)
+            # Warm the session with an earlier draft (last sentence missing)
+            segments = [s for s in analyzer.SEGMENT_PATTERN.split(resume_text) if s]
+            draft = ' '.join(segments[:-1]) if len(segments) > 1 else resume_text
+            session_id = analyzer.get_session().session_id
+            analyzer.analyze(draft, jd_text, session_id)
+            results = analyzer.analyze(resume_text, jd_text, session_id)
+        elif self.path == 'profile':
+            profile = m.compile_job_profile(m.preprocessor.clean_text(jd_text))
+            results = m.analyze(resume_text, profile)
+        elif self.path == 'documents':
+            from services.document_store import DocumentStore
+            store = DocumentStore(m, root=self.tmp / "documents")
+            resume_doc, _ = store.put_text(resume_text)
+            jd_doc, _ = store.put_text(jd_text)
+            results = m.analyze_documents(resume_doc, jd_doc)
+        elif self.path == 'deadline':
+            from services.deadline import Deadline
+            results = m.analyze(resume_text, jd_text, deadline=Deadline(float(self.arg)))
+        else:
+            results = m.analyze(resume_text, jd_text)
+
+        return results.to_dict() if hasattr(results, 'to_dict') else results
+
+
+# ----------------------------------------------------------------------
+# Comparison
+# ----------------------------------------------------------------------
+
+def field(results: Dict, path: Tuple[str, ...]):
+    for key in path:
+        results = (results or {}).get(key)
+    return results
+
+
+def jaccard(a: List[str], b: List[str]) -> float:
+    a, b = set(a or []), set(b or [])
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def rank_overlap(a: List[str], b: List[str]) -> float:
+    """
+    Average overlap: mean over depths d of |a[:d] & b[:d]| / d
+    1.0 for identical lists; reordering near the top costs the most
+    """
+    a, b = list(a or []), list(b or [])
+    depth = max(len(a), len(b))
+    if not depth:
+        return 1.0
+    return sum(len(set(a[:d]) & set(b[:d])) / d for d in range(1, depth + 1)) / depth
+
+
+def compare(reference: Dict, candidate: Dict) -> Dict:
+    """Per-field differences of one case"""
+    deltas = {
+        '.'.join(path): round(abs(float(field(candidate, path) or 0) - float(field(reference, path) or 0)), 4)
+        for path in SCORE_FIELDS
+    }
+    keywords = {'.'.join(path): round(jaccard(field(reference, path), field(candidate, path)), 4) for path in KEYWORD_FIELDS}
+    exact = {'.'.join(path): field(reference, path) == field(candidate, path) for path in EXACT_FIELDS}
+
+    ref_sections = reference.get("section_match_analysis") or {}
+    cand_sections = candidate.get("section_match_analysis") or {}
+    sections = set(ref_sections) | set(cand_sections)
+    section_agreement = (
+        sum(ref_sections.get(s) == cand_sections.get(s) for s in sections) / len(sections)
+        if sections else 1.0
+    )
+
+    highlights = rank_overlap(
+        reference.get("relevant_experience_highlights"),
+        candidate.get("relevant_experience_highlights")
+    )
+
+    return {
+        "score_deltas": deltas,
+        "keyword_jaccard": keywords,
+        "exact": exact,
+        "metrics": {
+            "score_delta": max(deltas.values()),
+            "keyword_jaccard": min(keywords.values()),
+            "highlight_overlap": round(highlights, 4),
+            "section_agreement": round(section_agreement, 4),
+            "exact_agreement": sum(exact.values()) / len(exact)
+        }
+    }
+
+
+def within(metric: str, value: float, tolerances: Dict[str, float]) -> bool:
+    limit = tolerances[metric]
+    return value <= limit if metric == 'score_delta' else value >= limit
+
+
+def evaluate(reference: Dict[str, Dict], candidate: Dict[str, Dict], tolerances: Dict[str, float]) -> Dict:
+    """Worst case per metric over the corpus, and the cases outside tolerance"""
+    cases = {case_id: compare(reference[case_id], candidate[case_id]) for case_id in reference if case_id in candidate}
+    worst = {}
+    for metric in tolerances:
+        values = [c["metrics"][metric] for c in cases.values()]
+        if values:
+            worst[metric] = max(values) if metric == 'score_delta' else min(values)
+
+    failures = {
+        case_id: {m: v for m, v in c["metrics"].items() if not within(m, v, tolerances)}
+        for case_id, c in cases.items()
+    }
+    failures = {case_id: f for case_id, f in failures.items() if f}
+    return {
+        "cases": len(cases),
+        "worst": worst,
+        "passed": not failures and len(cases) == len(reference),
+        "failures": failures,
+        "details": cases
+    }
+
+
+def parse_tolerances(items: List[str]) -> Dict[str, float]:
+    tolerances = dict(DEFAULT_TOLERANCES)
+    for item in items or []:
+        key, _, value = item.partition('=')
+        if key not in tolerances:
+            raise SystemExit(f"Unknown tolerance: {key} (choose from {', '.join(tolerances)})")
+        tolerances[key] = float(value)
+    return tolerances
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Compare analysis paths against the reference pipeline")
+    parser.add_argument('--corpus', help="Directory with resumes/ and jds/ (default: assets/)")
+    parser.add_argument('--golden', help="Golden file from --record (reference results and texts)")
+    parser.add_argument('--record', help="Run the reference pipeline and write a golden file")
+    parser.add_argument('--mode', nargs='+', help="Paths to check (default: all fast paths, or reference with --golden)")
+    parser.add_argument('--tolerance', action='append', metavar='NAME=VALUE', help="Override a tolerance (repeatable)")
+    parser.add_argument('--output', help="Write the full report as JSON")
+    parser.add_argument('--verbose', action='store_true', help="Print per-field differences of failing cases")
+    args = parser.parse_args(argv)
+
+    tolerances = parse_tolerances(args.tolerance)
+    # Every mode must compute, never hit another mode's cached result
+    Config.RESULT_CACHE_BACKEND = None
+
+    # 1. Corpus and reference results
+    if args.golden:
+        with open(args.golden, encoding='utf-8') as f:
+            golden = json.load(f)
+        cases = golden["cases"]
+        reference = {case["id"]: case["result"] for case in cases}
+        print(f"Golden: {len(cases)} cases from {golden.get('created')} "
+              f"(scoring v{golden.get('scoring_version')}, {golden.get('model')})")
+        if golden.get('model') != Config.SENTENCE_MODEL:
+            print(f"Warning: golden model differs from Config.SENTENCE_MODEL ({Config.SENTENCE_MODEL})")
+    else:
+        cases = load_corpus(args.corpus)
+        if not cases:
+            print("No resume / JD pairs found (pass --corpus or --golden)")
+            return 1
+        start = time.perf_counter()
+        reference = ModeRunner('reference').run(cases)
+        print(f"Reference: {len(cases)} cases in {time.perf_counter() - start:.1f}s")
+
+    if args.record:
+        golden = dict(golden_metadata(), cases=[dict(case, result=reference[case["id"]]) for case in cases])
+        with open(args.record, 'w', encoding='utf-8') as f:
+            json.dump(golden, f, indent=2)
+        print(f"Golden file written to {args.record}")
+        if not args.mode:
+            return 0
+
+    # 2. Each mode against the reference
+    modes = args.mode or (['reference'] if args.golden else ['stream', 'incremental', 'profile', 'documents'])
+    print(f"Tolerances: {tolerances}")
+    print(f"{'mode':<40} {'cases':>6} {'score Δ':>8} {'kw J':>6} {'hl ov':>6} {'sect':>6} {'exact':>6}  result")
+
+    report, passed = {}, True
+    for spec in modes:
+        start = time.perf_counter()
+        candidate = ModeRunner(spec).run(cases)
+        outcome = evaluate(reference, candidate, tolerances)
+        outcome["elapsed_s"] = round(time.perf_counter() - start, 2)
+        report[spec] = outcome
+        passed = passed and outcome["passed"]
+
+        w = outcome["worst"]
+        print(f"{spec:<40} {outcome['cases']:>6} {w.get('score_delta', 0):>8.2f} {w.get('keyword_jaccard', 1):>6.2f} "
+              f"{w.get('highlight_overlap', 1):>6.2f} {w.get('section_agreement', 1):>6.2f} "
+              f"{w.get('exact_agreement', 1):>6.2f}  {'PASS' if outcome['passed'] else 'FAIL'}")
+
+        if args.verbose:
+            for case_id, failed in outcome["failures"].items():
+                detail = outcome["details"][case_id]
+                print(f"    {case_id}: {failed}")
+                print(f"        score deltas {detail['score_deltas']}")
+                print(f"        keyword jaccard {detail['keyword_jaccard']}")
+                mismatched = [k for k, same in detail['exact'].items() if not same]
+                if mismatched:
+                    print(f"        differs: {mismatched}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"tolerances": tolerances, "modes": report}, f, indent=2, default=str)
+        print(f"Report written to {args.output}")
+
+    print("=" * 60)
+    print("All modes within tolerance" if passed else "Some modes are outside tolerance")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
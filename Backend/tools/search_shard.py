@@ -0,0 +1,60 @@
+"""
+Search Shard Server
+Serve one partition of the talent pool index for scatter-gather search
+
+Usage:
+    SEARCH_SHARD_AUTHKEY=... python tools/search_shard.py --port 6001
+    SEARCH_SHARD_AUTHKEY=... python tools/search_shard.py --host 10.0.0.5 --port 6001 --index-dir /data/talent_pool
+
+List remote shards in Config.SEARCH_SHARD_ADDRESSES ("host:port"). Local
+shards (Config.SEARCH_SHARDS) are started by the coordinator itself.
+
+The shard key comes from the SEARCH_SHARD_AUTHKEY environment variable
+and must match the coordinator's. The server refuses to start without
+a key or with the old public default. It also refuses non-loopback
+addresses unless the key is at least 16 bytes. Bind to a private
+interface, not 0.0.0.0.
+"""
+
+import argparse
+import sys
+from multiprocessing.connection import Listener
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from services.sharded_search import check_authkey, serve
+from instance.config import Config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Talent pool search shard")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=6001, help="0 picks a free port")
+    parser.add_argument('--index-dir', help="Talent pool directory on this node (default: coordinator's path)")
+    args = parser.parse_args()
+
+    try:
+        authkey = check_authkey(Config.SEARCH_SHARD_AUTHKEY, args.host)
+    except ValueError as e:
+        print(f"Refusing to start: {e}", file=sys.stderr)
+        return 2
+
+    # Keys are checked per connection by serve(), not in accept()
+    listener = Listener((args.host, args.port))
+
+    # First stdout line is the bound port (read by local coordinators)
+    print(listener.address[1], flush=True)
+    try:
+        serve(listener, authkey, args.index_dir)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
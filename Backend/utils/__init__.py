@@ -9,6 +9,7 @@ from .experience_parser import ExperienceParser
 from .similarity import SimilarityCalculator
 from .ats_score import ATSScoreCalculator
 from .section_matcher import SectionMatcher
+from .skill_lexicon import SkillLexicon
 
 __all__ = [
     'FileUtils',
@@ -17,5 +18,6 @@ __all__ = [
     'ExperienceParser',
     'SimilarityCalculator',
     'ATSScoreCalculator',
-    'SectionMatcher'
+    'SectionMatcher',
+    'SkillLexicon'
 ]
\ No newline at end of file
@@ -4,7 +4,7 @@ Calculate overall ATS compatibility score
 """
 
 import re
-from typing import Tuple, List, Dict
+from typing import Tuple, List, Dict, Optional
 
 
 class ATSScoreCalculator:
@@ -114,10 +114,20 @@ class ATSScoreCalculator:
         return score
     
     @staticmethod
-    def calculate_contextual_score(resume_text: str, jd_text: str) -> float:
+    def extract_jd_phrases(jd_text: str) -> List[str]:
+        """Important phrases from JD used for contextual matching"""
+        return re.findall(r'\b\w+\s+\w+\s+\w+\b', jd_text.lower())[:15]
+    
+    @staticmethod
+    def calculate_contextual_score(
+        resume_text: str, 
+        jd_text: str, 
+        jd_phrases: Optional[List[str]] = None
+    ) -> float:
         """Calculate contextual matching score"""
-        # Extract important phrases from JD
-        jd_phrases = re.findall(r'\b\w+\s+\w+\s+\w+\b', jd_text.lower())[:15]
+        # Extract important phrases from JD (unless precomputed)
+        if jd_phrases is None:
+            jd_phrases = ATSScoreCalculator.extract_jd_phrases(jd_text)
         resume_lower = resume_text.lower()
         
         # Count phrase matches
@@ -135,7 +145,8 @@ class ATSScoreCalculator:
         jd_text: str,
         matched_keywords: List[str],
         jd_keywords: List[str],
-        semantic_similarity: float
+        semantic_similarity: float,
+        jd_phrases: Optional[List[str]] = None
     ) -> Tuple[float, str]:
         """
         Calculate comprehensive ATS score
@@ -161,7 +172,7 @@ class ATSScoreCalculator:
         score += ATSScoreCalculator.calculate_formatting_score(resume_text)
         
         # 6. Contextual Matching (5 points)
-        score += ATSScoreCalculator.calculate_contextual_score(resume_text, jd_text)
+        score += ATSScoreCalculator.calculate_contextual_score(resume_text, jd_text, jd_phrases)
         
         # Determine label
         if score >= ATSScoreCalculator.THRESHOLDS['excellent']:
@@ -4,69 +4,195 @@ Extract years of experience from text
 """
 
 import re
-from typing import Optional
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+_MONTH = r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sept?(?:ember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?'
+_DATE = rf'(?:(?P<{{p}}_month>{_MONTH})\s*|(?P<{{p}}_mm>0?[1-9]|1[0-2])\s*/\s*)?(?P<{{p}}_year>(?:19|20)\d{{{{2}}}})'
+
+# One scanner for everything: dated ranges ("Jan 2020 - Mar 2023",
+# "03/2019 to present", "2018 – 2020") and explicit "5+ years" mentions
+SCANNER = re.compile(
+    r'(?P<range>\b' + _DATE.format(p='start') +
+    r'\s*(?:-|–|—|to|until|till)\s*' +
+    r'(?:(?P<present>present|current|now|date|today)|' + _DATE.format(p='end') + r'))' +
+    r'|(?P<explicit>\b(?P<count>\d{1,2})\+?\s*(?:years?|yrs?)\b)',
+    re.IGNORECASE
+)
+
+# Section headings, as written in resumes (Title Case or CAPS, not followed
+# by a lowercase word, so "led projects for" or "Projects in flight" in a
+# sentence are not headings). Works on cleaned text, which has no newlines.
+# Dated ranges under education / project / certification headings are not
+# roles; an experience heading switches back.
+_HEADING_WORDS = {
+    'education': ('Education', 'Academic Background', 'Academics', 'Qualifications'),
+    'projects': ('Projects', 'Personal Projects', 'Academic Projects'),
+    'certifications': ('Certifications', 'Certification', 'Certificates', 'Courses'),
+    'experience': (
+        'Experience', 'Work Experience', 'Professional Experience',
+        'Employment', 'Employment History', 'Work History', 'Career History'
+    )
+}
+NON_ROLE_SECTIONS = {'education', 'projects', 'certifications'}
+SECTION_HEADING = re.compile(
+    r'\b(?:' + '|'.join(
+        f"(?P<{section}>" + '|'.join(
+            alternative
+            for word in sorted(words, key=len, reverse=True)
+            for alternative in (re.escape(word), re.escape(word.upper()))
+        ) + ')'
+        for section, words in _HEADING_WORDS.items()
+    ) + r')\b(?!\s*[a-z])'
+)
+
+
+def month_index(year: int, month: int) -> int:
+    """Months since year 0 (January = 0)"""
+    return year * 12 + month - 1
+
+
+def month_label(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+class ExperienceTimeline:
+    """
+    Dated roles found in a resume, at month granularity
+    Roles are half-open [start, end) month intervals; overlapping or
+    adjacent roles are merged so parallel jobs are not double counted
+    """
+    
+    def __init__(self, roles: List[Tuple[int, int, bool]], explicit_years: List[int]):
+        self.roles = sorted(roles)
+        self.explicit_years = explicit_years
+        self.merged = self.merge(self.roles)
+        self.total_months = sum(end - start for start, end in self.merged)
+    
+    @staticmethod
+    def merge(roles: List[Tuple[int, int, bool]]) -> List[Tuple[int, int]]:
+        """Union of sorted intervals, O(n) after the O(n log n) sort"""
+        merged: List[List[int]] = []
+        for start, end, _ in roles:
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        return [(start, end) for start, end in merged]
+    
+    @property
+    def timeline_years(self) -> int:
+        return self.total_months // 12
+    
+    @property
+    def years(self) -> int:
+        """An explicit "N years" statement wins; else the merged timeline"""
+        if self.explicit_years:
+            return max(self.explicit_years)
+        return self.timeline_years
+    
+    def to_dict(self) -> Dict:
+        return {
+            "total_months": self.total_months,
+            "timeline_years": self.timeline_years,
+            "explicit_years": max(self.explicit_years) if self.explicit_years else None,
+            "longest_role_months": max((end - start for start, end, _ in self.roles), default=0),
+            "current_role": any(current for _, _, current in self.roles),
+            "roles": [
+                {
+                    "start": month_label(start),
+                    "end": month_label(end - 1),
+                    "months": end - start,
+                    "current": current
+                }
+                for start, end, current in self.roles
+            ],
+            "periods": [
+                {"start": month_label(start), "end": month_label(end - 1)}
+                for start, end in self.merged
+            ]
+        }
 
 
 class ExperienceParser:
     """Parse and extract years of experience"""
     
+    EARLIEST_YEAR = 1970
+    
     @staticmethod
-    def extract_experience_years(text: str) -> int:
+    def parse(text: str, today: Optional[date] = None) -> ExperienceTimeline:
         """
-        Extract years of experience from text
-        Handles multiple formats and date ranges
+        Single pass over the text collecting dated roles and explicit
+        year counts; "present" resolves against the real clock.
+        Ranges under education / project headings are not roles.
         """
-        years = []
-        
-        # Pattern 1: Explicit years mentioned
-        patterns = [
-            r'(\d+)\+?\s*(?:years?|yrs?)\s*(?:of)?\s*(?:experience|exp)',
-            r'experience[:\s]+(\d+)\+?\s*(?:years?|yrs?)',
-            r'(\d+)\+?\s*(?:years?|yrs?)',
-        ]
+        text = text or ''
+        today = today or date.today()
+        now = month_index(today.year, today.month) + 1  # current month counts
+        earliest = month_index(ExperienceParser.EARLIEST_YEAR, 1)
         
-        for pattern in patterns:
-            matches = re.findall(pattern, text.lower())
-            years.extend([int(m) for m in matches])
+        headings = [(h.start(), h.lastgroup) for h in SECTION_HEADING.finditer(text)]
+        next_heading, section = 0, None
         
-        if years:
-            return max(years)
-        
-        # Pattern 2: Calculate from date ranges
-        total_exp = ExperienceParser._calculate_from_date_ranges(text)
-        if total_exp > 0:
-            return total_exp
+        roles, explicit = [], []
+        for match in SCANNER.finditer(text):
+            if match.group('explicit'):
+                explicit.append(int(match.group('count')))
+                continue
+            
+            while next_heading < len(headings) and headings[next_heading][0] < match.start():
+                section = headings[next_heading][1]
+                next_heading += 1
+            if section in NON_ROLE_SECTIONS:
+                continue
+            
+            start = ExperienceParser._month(match, 'start', end=False)
+            if match.group('present'):
+                end, current = now, True
+            else:
+                # A bare end year after a dated start runs through December
+                whole_year = bool(match.group('start_month') or match.group('start_mm'))
+                end, current = ExperienceParser._month(match, 'end', end=True, whole_year=whole_year), False
+            
+            # Drop impossible ranges; clamp future end dates to today
+            end = min(end, now)
+            if earliest <= start < end:
+                roles.append((start, end, current))
         
-        return 0
+        return ExperienceTimeline(roles, explicit)
     
     @staticmethod
-    def _calculate_from_date_ranges(text: str) -> int:
+    def _month(match, prefix: str, end: bool, whole_year: bool = False) -> int:
         """
-        Calculate experience from date ranges like:
-        - 2020 - 2023
-        - Jan 2020 - Present
+        Month index of one side of a range
+        A named/numbered end month is inclusive; a bare year keeps the
+        old whole-year arithmetic ("2020 - 2023" is 3 years) unless
+        whole_year makes it inclusive ("Mar 2020 - 2021" ends Dec 2021)
         """
-        # Find date ranges (YYYY - YYYY or YYYY - Present)
-        date_ranges = re.findall(
-            r'(\d{4})\s*[-–—]\s*(?:(\d{4})|present|current)', 
-            text.lower()
-        )
-        
-        if not date_ranges:
-            return 0
-        
-        total_exp = 0
-        current_year = 2025  # Update as needed
-        
-        for start, end in date_ranges:
-            start_year = int(start)
-            end_year = int(end) if end else current_year
-            
-            # Validate reasonable range
-            if 1980 <= start_year <= current_year and start_year <= end_year <= current_year:
-                total_exp += (end_year - start_year)
-        
-        return max(total_exp, 0)
+        year = int(match.group(f'{prefix}_year'))
+        name = match.group(f'{prefix}_month')
+        number = match.group(f'{prefix}_mm')
+        if name:
+            month = MONTHS[name[:3].lower()]
+        elif number:
+            month = int(number)
+        else:
+            return month_index(year + 1 if end and whole_year else year, 1)
+        return month_index(year, month) + (1 if end else 0)
+    
+    @staticmethod
+    def extract_experience_years(text: str) -> int:
+        """
+        Extract years of experience from text
+        Explicit statements first, else the merged role timeline
+        """
+        return ExperienceParser.parse(text).years
     
     @staticmethod
     def calculate_experience_match(
@@ -4,8 +4,12 @@ Handles reading PDF and text files
 """
 
 import os
+import re
+import tempfile
+import zipfile
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
+from xml.etree import ElementTree
 
 try:
     import pdfplumber
@@ -14,6 +18,19 @@ except ImportError:
     import pdfplumber
 
 
+# WordprocessingML namespace and the parts read from a .docx
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+DOCX_PART = re.compile(r'^word/(header\d*|document|footer\d*)\.xml$')
+DOCX_CONTAINERS = {W_NS + 'body', W_NS + 'hdr', W_NS + 'ftr'}
+
+# Uncompressed XML read from one .docx (zip bomb guard)
+MAX_DOCX_XML_BYTES = 64 * 1024 * 1024
+
+
+class DocumentTooLarge(ValueError):
+    """A document over an extraction size limit"""
+
+
 class FileUtils:
     """Utility class for file operations"""
     
@@ -21,29 +38,122 @@ class FileUtils:
     def read_file(file_path: str) -> Optional[str]:
         """
         Read file based on extension
-        Supports .pdf and .txt files
+        Supports .pdf, .docx and .txt files
         """
         path = Path(file_path)
         
         if not path.exists():
             return None
         
-        if path.suffix.lower() == '.pdf':
+        suffix = path.suffix.lower()
+        if suffix == '.pdf':
             return FileUtils.extract_text_from_pdf(str(path))
+        elif suffix == '.docx':
+            return FileUtils.extract_text_from_docx(str(path))
         else:
             return FileUtils.read_text_file(str(path))
     
     @staticmethod
     def extract_text_from_pdf(pdf_path: str) -> Optional[str]:
         """Extract text from PDF file using pdfplumber"""
-        text = ""
         try:
             with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            return text.strip() if text else None
+                return FileUtils.pdf_text(pdf)
+        except Exception as e:
+            print(f"Error reading PDF: {e}")
+            return None
+    
+    @staticmethod
+    def pdf_text(pdf) -> Optional[str]:
+        """Text of an open pdfplumber document (raises on malformed pages)"""
+        text = ""
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + "\n"
+        return text.strip() if text else None
+    
+    @staticmethod
+    def extract_text_from_docx(docx_path) -> Optional[str]:
+        """Extract text from a DOCX file (path or file object)"""
+        try:
+            return FileUtils.docx_text(docx_path)
+        except Exception as e:
+            print(f"Error reading DOCX: {e}")
+            return None
+    
+    @staticmethod
+    def docx_text(docx_path) -> Optional[str]:
+        """
+        Text of a DOCX file (raises on malformed or oversized documents)
+        Streams each XML part out of the zip with an incremental parser;
+        one line per paragraph, list items prefixed with a bullet
+        """
+        with zipfile.ZipFile(docx_path) as archive:
+            parts = sorted(
+                (name for name in archive.namelist() if DOCX_PART.match(name)),
+                # Headers (contact details) first, then body, then footers
+                key=lambda name: ('header' not in name, 'footer' in name, name)
+            )
+            if 'word/document.xml' not in parts:
+                raise ValueError("no word/document.xml")
+            
+            budget = MAX_DOCX_XML_BYTES
+            lines = []
+            for name in parts:
+                budget -= archive.getinfo(name).file_size
+                if budget < 0:
+                    raise DocumentTooLarge(f"DOCX expands past {MAX_DOCX_XML_BYTES // (1024 * 1024)} MB of XML")
+                with archive.open(name) as stream:
+                    lines.extend(FileUtils._docx_paragraphs(stream))
+        
+        text = "\n".join(lines)
+        return text.strip() if text.strip() else None
+    
+    @staticmethod
+    def _docx_paragraphs(stream) -> Iterator[str]:
+        """
+        Paragraph texts of one WordprocessingML part
+        Finished top-level blocks are cleared, so memory stays bounded
+        by the largest paragraph or table rather than the document
+        """
+        parents = []
+        paragraphs = []  # [texts, is_list]; text boxes nest paragraphs
+        
+        for event, elem in ElementTree.iterparse(stream, events=('start', 'end')):
+            if event == 'start':
+                parents.append(elem)
+                if elem.tag == W_NS + 'p':
+                    paragraphs.append([[], False])
+                continue
+            
+            parents.pop()
+            tag = elem.tag
+            if tag == W_NS + 'p':
+                texts, is_list = paragraphs.pop()
+                line = ''.join(texts).strip()
+                if line:
+                    yield f"• {line}" if is_list else line
+            elif paragraphs:
+                if tag == W_NS + 't':
+                    paragraphs[-1][0].append(elem.text or '')
+                elif tag == W_NS + 'tab':
+                    paragraphs[-1][0].append('\t')
+                elif tag in (W_NS + 'br', W_NS + 'cr'):
+                    paragraphs[-1][0].append('\n')
+                elif tag == W_NS + 'numPr':
+                    paragraphs[-1][1] = True
+            
+            # A finished block directly under the body/header/footer
+            if parents and parents[-1].tag in DOCX_CONTAINERS:
+                parents[-1].clear()
+    
+    @staticmethod
+    def count_pdf_pages(source) -> Optional[int]:
+        """Page count of a PDF (path or file object) without extracting text"""
+        try:
+            with pdfplumber.open(source) as pdf:
+                return len(pdf.pages)
         except Exception as e:
             print(f"Error reading PDF: {e}")
             return None
@@ -59,6 +169,21 @@ class FileUtils:
             print(f"Error reading text file: {e}")
             return None
     
+    @staticmethod
+    def read_bytes(data: bytes, filename: Optional[str] = None) -> Optional[str]:
+        """
+        Read an uploaded file's bytes (format chosen by filename suffix)
+        Parses from a private temp file, so nothing is shared between requests
+        """
+        suffix = Path(filename or '').suffix.lower() or '.txt'
+        fd, tmp_path = tempfile.mkstemp(suffix=suffix)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            return FileUtils.read_file(tmp_path)
+        finally:
+            os.unlink(tmp_path)
+    
     @staticmethod
     def find_resume_in_assets(assets_dir: Path) -> Optional[Path]:
         """Find resume file in assets directory"""
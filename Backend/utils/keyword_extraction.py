@@ -5,35 +5,43 @@ Extract and compare keywords between resume and JD
 
 import re
 from collections import Counter
-from typing import List, Tuple, Set
+from typing import Dict, List, Tuple, Set, Optional
 import numpy as np
 
 try:
-    from sentence_transformers import SentenceTransformer
     from sklearn.metrics.pairwise import cosine_similarity
 except ImportError:
     import os
-    os.system('pip install sentence-transformers scikit-learn')
-    from sentence_transformers import SentenceTransformer
+    os.system('pip install scikit-learn')
     from sklearn.metrics.pairwise import cosine_similarity
 
+from .model_loader import load_sentence_model
 from .text_preprocessing import TextPreprocessor
+from .skill_lexicon import SkillLexicon
+from .term_canonicalizer import TermCanonicalizer
 
 
 class KeywordExtractor:
     """Extract and match keywords using NLP"""
     
-    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
-        self.model = SentenceTransformer(model_name)
+    def __init__(
+        self, 
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        lexicon: Optional[SkillLexicon] = None,
+        canonicalizer: Optional[TermCanonicalizer] = None
+    ):
+        self.model = load_sentence_model(model_name)
         self.preprocessor = TextPreprocessor()
+        self.lexicon = lexicon
+        self.canonicalizer = canonicalizer
     
-    def extract_dynamic_keywords(self, text: str, top_n: int = 100) -> List[str]:
-        """
-        Extract keywords dynamically using frequency analysis
-        No predefined keyword list - works for any domain
-        """
-        # Extract words and n-grams
-        words = re.findall(r'\b[a-z]{3,}\b', text.lower())
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Split text into lowercase words used for keyword counting"""
+        return re.findall(r'\b[a-z]{3,}\b', text.lower())
+    
+    def count_terms(self, words: List[str]) -> Counter:
+        """Count words, 2-grams and 3-grams after stop word filtering"""
         two_grams = [f"{words[i]} {words[i+1]}" for i in range(len(words)-1)]
         three_grams = [f"{words[i]} {words[i+1]} {words[i+2]}" for i in range(len(words)-2)]
         
@@ -44,8 +52,15 @@ class KeywordExtractor:
         filtered_terms = self.preprocessor.filter_stop_words(all_terms)
         filtered_terms = [term for term in filtered_terms if len(term) > 2]
         
-        # Get frequency
-        term_freq = Counter(filtered_terms)
+        return Counter(filtered_terms)
+    
+    def extract_dynamic_keywords(self, text: str, top_n: int = 100) -> List[str]:
+        """
+        Extract keywords dynamically using frequency analysis
+        No predefined keyword list - works for any domain
+        """
+        # Get frequency of words and n-grams
+        term_freq = self.count_terms(self.tokenize(text))
         
         # Return top keywords
         return [term for term, _ in term_freq.most_common(top_n)]
@@ -53,6 +68,7 @@ class KeywordExtractor:
     def extract_all_terms(self, text: str, top_n: int = 100) -> Set[str]:
         """
         Combine dynamic keywords and technical terms
+        Near-duplicates are collapsed when a canonicalizer is set
         """
         # Get frequency-based keywords
         keywords = self.extract_dynamic_keywords(text, top_n)
@@ -60,9 +76,60 @@ class KeywordExtractor:
         # Get technical terms
         technical_terms = self.preprocessor.extract_technical_terms(text)
         
-        # Combine and return
+        # Combine, collapse and return
         all_terms = set(keywords) | technical_terms
-        return all_terms
+        return self.canonicalize(all_terms, text)
+    
+    def canonicalize(self, terms: Set[str], text: str) -> Set[str]:
+        """Collapse near-duplicate terms extracted from text"""
+        if self.canonicalizer is None:
+            return set(terms)
+        return self.canonicalizer.canonicalize(terms, text)
+    
+    def encode_terms(
+        self, 
+        terms: List[str], 
+        cache: Optional[Dict[str, np.ndarray]] = None
+    ) -> np.ndarray:
+        """
+        Embed keyword terms
+        Known skills and their aliases resolve to the precomputed lexicon
+        table; only unknown terms are encoded by the model.
+        An optional cache dict keeps term embeddings between calls.
+        """
+        if cache is not None:
+            new_terms = list(dict.fromkeys(t for t in terms if t not in cache))
+            if new_terms:
+                cache.update(zip(new_terms, self.encode_terms(new_terms)))
+            return np.asarray([cache[t] for t in terms], dtype=np.float32)
+        
+        if self.lexicon is None:
+            return self.model.encode(terms)
+        
+        # Resolve every term to a table row or a string to encode
+        rows = {}
+        to_encode = {}
+        for term in terms:
+            idx = self.lexicon.lookup(term)
+            if idx is not None and self.lexicon.embeddings is not None:
+                rows[term] = ('table', idx)
+                continue
+            # Aliases without a table still share one canonical encoding
+            text = self.lexicon.skills[idx] if idx is not None else term
+            position = to_encode.setdefault(text, len(to_encode))
+            rows[term] = ('encoded', position)
+        
+        encoded = self.model.encode(list(to_encode)) if to_encode else None
+        
+        embeddings = []
+        for term in terms:
+            source, idx = rows[term]
+            if source == 'table':
+                embeddings.append(self.lexicon.embeddings[idx])
+            else:
+                embeddings.append(encoded[idx])
+        
+        return np.asarray(embeddings, dtype=np.float32)
     
     def semantic_keyword_matching(
         self, 
@@ -78,17 +145,37 @@ class KeywordExtractor:
             return [], jd_keywords
         
         # Get embeddings for all keywords
-        resume_embeddings = self.model.encode(resume_keywords)
-        jd_embeddings = self.model.encode(jd_keywords)
+        resume_embeddings = self.encode_terms(resume_keywords)
+        jd_embeddings = self.encode_terms(jd_keywords)
+        
+        return self.match_embeddings(
+            jd_keywords, 
+            jd_embeddings, 
+            resume_embeddings, 
+            threshold
+        )
+    
+    @staticmethod
+    def match_embeddings(
+        jd_keywords: List[str],
+        jd_embeddings: np.ndarray,
+        resume_embeddings: np.ndarray,
+        threshold: float = 0.7
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Split JD keywords by their best similarity to any resume keyword
+        Returns: (matched_keywords, missing_keywords)
+        """
+        if len(resume_embeddings) == 0 or len(jd_embeddings) == 0:
+            return [], list(jd_keywords)
         
         matched = []
         missing = []
         
-        for i, jd_kw in enumerate(jd_keywords):
-            # Calculate similarity with all resume keywords
-            similarities = cosine_similarity([jd_embeddings[i]], resume_embeddings)[0]
-            max_similarity = np.max(similarities)
-            
+        # Best resume match for every JD keyword in one pass
+        max_similarities = cosine_similarity(jd_embeddings, resume_embeddings).max(axis=1)
+        
+        for jd_kw, max_similarity in zip(jd_keywords, max_similarities):
             if max_similarity >= threshold:
                 matched.append(jd_kw)
             else:
@@ -105,14 +192,22 @@ class KeywordExtractor:
         """
         Prioritize keywords by frequency in text
         """
-        keyword_freq = []
         text_lower = text.lower()
+        counts = {kw: text_lower.count(kw.lower()) for kw in keywords}
         
-        for kw in keywords:
-            count = text_lower.count(kw.lower())
-            keyword_freq.append((kw, count))
+        return self.prioritize_by_counts(keywords, counts, top_n)
+    
+    @staticmethod
+    def prioritize_by_counts(
+        keywords: List[str], 
+        counts: Dict[str, int], 
+        top_n: int = 7
+    ) -> List[str]:
+        """Prioritize keywords by precomputed frequencies"""
+        keyword_freq = [(kw, counts.get(kw, 0)) for kw in keywords]
         
-        # Sort by frequency
-        keyword_freq.sort(key=lambda x: x[1], reverse=True)
+        # Sort by frequency; ties alphabetically, since term sets have no
+        # stable order across processes
+        keyword_freq.sort(key=lambda x: (-x[1], x[0]))
         
         return [kw for kw, _ in keyword_freq[:top_n]]
\ No newline at end of file
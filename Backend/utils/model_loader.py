@@ -0,0 +1,151 @@
+"""
+Model Loader
+Load each sentence-transformer model once per process
+"""
+
+import hashlib
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Union
+
+import numpy as np
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    import os
+    os.system('pip install sentence-transformers')
+    from sentence_transformers import SentenceTransformer
+
+
+_models: Dict[str, SentenceTransformer] = {}
+_lock = threading.Lock()
+
+# Model names starting with this select the stub embedder
+STUB_MODEL = 'stub'
+
+_WORD = re.compile(r'\w+')
+
+
+@lru_cache(maxsize=65536)
+def _trigram_slot(gram: str, dim: int):
+    """Stable (index, sign) of a character trigram, same in every process"""
+    h = int.from_bytes(hashlib.blake2b(gram.encode('utf-8'), digest_size=8).digest(), 'little')
+    return h % dim, 1.0 if (h >> 32) & 1 else -1.0
+
+
+class StubEmbedder:
+    """
+    Deterministic stand-in for SentenceTransformer, for load tests
+    Chosen by model name: "stub" or "stub:dim=384,cost_ms=20,per_text_ms=0.5,mode=sleep".
+    Vectors are hashed character trigrams (shared words stay similar);
+    each encode() call costs cost_ms plus per_text_ms per text, slept
+    (GIL released, like torch kernels) or spun (GIL held) per mode
+    """
+    
+    def __init__(self, dim: int = 384, cost_ms: float = 0.0, per_text_ms: float = 0.0, mode: str = 'sleep'):
+        if mode not in ('sleep', 'spin'):
+            raise ValueError(f"Unknown stub mode: {mode}")
+        self.dim = dim
+        self.cost_ms = cost_ms
+        self.per_text_ms = per_text_ms
+        self.mode = mode
+        self.calls = 0
+        self.texts = 0
+        self.cost_seconds = 0.0
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_name(cls, model_name: str) -> 'StubEmbedder':
+        """Parse "stub[:key=value,...]" """
+        _, _, spec = model_name.partition(':')
+        options = {}
+        for item in filter(None, spec.split(',')):
+            key, _, value = item.partition('=')
+            key = key.strip()
+            if key == 'dim':
+                options[key] = int(value)
+            elif key in ('cost_ms', 'per_text_ms'):
+                options[key] = float(value)
+            elif key == 'mode':
+                options[key] = value.strip()
+            else:
+                raise ValueError(f"Unknown stub option: {key}")
+        return cls(**options)
+    
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+    
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        show_progress_bar: bool = None,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+        **kwargs
+    ) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        
+        embeddings = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in _WORD.findall(text.lower()):
+                padded = f" {word} "
+                for i in range(len(padded) - 2):
+                    index, sign = _trigram_slot(padded[i:i + 3], self.dim)
+                    embeddings[row, index] += sign
+        # Unit length, like all-MiniLM-L6-v2's output
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings /= np.where(norms == 0, 1.0, norms)
+        
+        cost = (self.cost_ms + self.per_text_ms * len(texts)) / 1000
+        self._spend(cost)
+        with self._lock:
+            self.calls += 1
+            self.texts += len(texts)
+            self.cost_seconds += cost
+        return embeddings[0] if single else embeddings
+    
+    def _spend(self, seconds: float):
+        if seconds <= 0:
+            return
+        if self.mode == 'sleep':
+            time.sleep(seconds)
+            return
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "texts": self.texts,
+                "cost_ms": round(self.cost_seconds * 1000, 1)
+            }
+
+
+def load_sentence_model(model_name: str) -> SentenceTransformer:
+    """
+    Return the shared model instance for model_name
+    Every component asking for the same model gets the same object,
+    so a process (or pool worker) holds one copy of the weights
+    """
+    with _lock:
+        model = _models.get(model_name)
+        if model is None:
+            if model_name.split(':', 1)[0] == STUB_MODEL:
+                model = StubEmbedder.from_name(model_name)
+            else:
+                model = SentenceTransformer(model_name)
+            _models[model_name] = model
+        return model
+
+
+def loaded_models() -> Dict[str, SentenceTransformer]:
+    """Models loaded so far in this process"""
+    with _lock:
+        return dict(_models)
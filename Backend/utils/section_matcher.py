@@ -4,24 +4,33 @@ Analyze how well each resume section matches the JD
 """
 
 from typing import Dict, List
+import numpy as np
 
 try:
-    from sentence_transformers import SentenceTransformer
     from sklearn.metrics.pairwise import cosine_similarity
 except ImportError:
     import os
-    os.system('pip install sentence-transformers scikit-learn')
-    from sentence_transformers import SentenceTransformer
+    os.system('pip install scikit-learn')
     from sklearn.metrics.pairwise import cosine_similarity
 
+from .model_loader import load_sentence_model
 from .ats_score import ATSScoreCalculator
 
 
 class SectionMatcher:
     """Analyze section-level matching between resume and JD"""
     
+    KEY_SECTIONS = ['education', 'certifications', 'skills', 'experience']
+    
+    SOFT_SKILLS = [
+        'leadership', 'teamwork', 'communication', 'problem-solving',
+        'collaboration', 'management', 'organized', 'creative',
+        'analytical', 'detail-oriented', 'motivated', 'reliable',
+        'adaptable', 'innovative', 'strategic', 'efficient'
+    ]
+    
     def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
-        self.model = SentenceTransformer(model_name)
+        self.model = load_sentence_model(model_name)
     
     def calculate_semantic_similarity(self, text1: str, text2: str) -> float:
         """Calculate semantic similarity between two text sections"""
@@ -42,25 +51,31 @@ class SectionMatcher:
         Analyze soft skills match
         Universal across all domains
         """
-        soft_skills_keywords = [
-            'leadership', 'teamwork', 'communication', 'problem-solving',
-            'collaboration', 'management', 'organized', 'creative',
-            'analytical', 'detail-oriented', 'motivated', 'reliable',
-            'adaptable', 'innovative', 'strategic', 'efficient'
-        ]
-        
-        resume_lower = ' '.join(resume_sections.values()).lower()
+        return self.soft_skill_label(
+            resume_sections, 
+            self.required_soft_skills(jd_text)
+        )
+    
+    @staticmethod
+    def required_soft_skills(jd_text: str) -> List[str]:
+        """Soft skills the JD asks for"""
         jd_lower = jd_text.lower()
-        
-        # Check which soft skills are required
-        required_soft_skills = [
-            skill for skill in soft_skills_keywords 
+        return [
+            skill for skill in SectionMatcher.SOFT_SKILLS 
             if skill in jd_lower
         ]
-        
+    
+    @staticmethod
+    def soft_skill_label(
+        resume_sections: Dict[str, str], 
+        required_soft_skills: List[str]
+    ) -> str:
+        """Label how many of the required soft skills the resume shows"""
         if not required_soft_skills:
             return "Not Required"
         
+        resume_lower = ' '.join(resume_sections.values()).lower()
+        
         # Check which are found in resume
         found_soft_skills = [
             skill for skill in required_soft_skills 
@@ -89,19 +104,81 @@ class SectionMatcher:
         # Identify sections
         resume_sections = ATSScoreCalculator.identify_sections(resume_text)
         
+        # Calculate similarity for each present section
+        similarities = {
+            section_name: self.calculate_semantic_similarity(section_text, jd_text)
+            for section_name, section_text in self.present_sections(resume_sections).items()
+        }
+        
+        return self.label_sections(
+            resume_sections, 
+            similarities, 
+            self.required_soft_skills(jd_text)
+        )
+    
+    def analyze_section_match_embedding(
+        self,
+        resume_text: str,
+        jd_embedding: np.ndarray,
+        required_soft_skills: List[str]
+    ) -> Dict[str, str]:
+        """
+        Section analysis against a precomputed JD embedding
+        Only resume sections are encoded
+        """
+        resume_sections = ATSScoreCalculator.identify_sections(resume_text)
+        present = self.present_sections(resume_sections)
+        
+        similarities = {}
+        if present:
+            embeddings = self.model.encode(list(present.values()))
+            scores = cosine_similarity(embeddings, [jd_embedding])[:, 0]
+            similarities = {name: float(score) for name, score in zip(present, scores)}
+        
+        return self.label_sections(resume_sections, similarities, required_soft_skills)
+    
+    def approximate_section_match(
+        self,
+        resume_text: str,
+        document_similarity: float,
+        required_soft_skills: List[str]
+    ) -> Dict[str, str]:
+        """
+        Cheap section analysis (no encoding)
+        Every present section is scored with the whole-document similarity
+        """
+        resume_sections = ATSScoreCalculator.identify_sections(resume_text)
+        similarities = {name: document_similarity for name in self.present_sections(resume_sections)}
+        return self.label_sections(resume_sections, similarities, required_soft_skills)
+    
+    @staticmethod
+    def present_sections(resume_sections: Dict[str, str]) -> Dict[str, str]:
+        """Key sections with enough content to compare against the JD"""
+        return {
+            section_name: resume_sections.get(section_name, '')
+            for section_name in SectionMatcher.KEY_SECTIONS
+            if len(resume_sections.get(section_name, '')) >= 10
+        }
+    
+    def label_sections(
+        self,
+        resume_sections: Dict[str, str],
+        similarities: Dict[str, float],
+        required_soft_skills: List[str]
+    ) -> Dict[str, str]:
+        """
+        Turn section similarities into match labels
+        Sections without a similarity are treated as missing
+        """
         section_analysis = {}
-        key_sections = ['education', 'certifications', 'skills', 'experience']
         
-        for section_name in key_sections:
-            section_text = resume_sections.get(section_name, '')
-            
+        for section_name in self.KEY_SECTIONS:
             # Check if section exists
-            if not section_text or len(section_text) < 10:
+            if section_name not in similarities:
                 section_analysis[section_name] = "Not Matched"
                 continue
             
-            # Calculate similarity
-            similarity = self.calculate_semantic_similarity(section_text, jd_text)
+            similarity = similarities[section_name]
             
             # Determine match level
             if similarity > 0.5:
@@ -112,9 +189,9 @@ class SectionMatcher:
                 section_analysis[section_name] = "Not Matched"
         
         # Analyze soft skills separately
-        section_analysis['soft_skills'] = self.analyze_soft_skills(
+        section_analysis['soft_skills'] = self.soft_skill_label(
             resume_sections, 
-            jd_text
+            required_soft_skills
         )
         
-        return section_analysis
\ No newline at end of file
+        return section_analysis
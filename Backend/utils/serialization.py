@@ -0,0 +1,65 @@
+"""
+Serialization
+Fast JSON (orjson when installed) and optional MessagePack, numpy-aware
+"""
+
+import json
+from typing import Any
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def to_builtin(obj: Any) -> Any:
+    """
+    Fallback for values the encoders do not handle natively:
+    numpy scalars/arrays and result objects (anything with to_dict)
+    """
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=to_builtin,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(obj, default=to_builtin, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def loads(data) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def packb(obj: Any) -> bytes:
+    """MessagePack encoding (batch output, worker-to-worker payloads)"""
+    if msgpack is None:
+        raise ImportError("MessagePack encoding requires 'pip install msgpack'")
+    return msgpack.packb(obj, default=to_builtin, use_bin_type=True)
+
+
+def unpackb(data: bytes) -> Any:
+    if msgpack is None:
+        raise ImportError("MessagePack decoding requires 'pip install msgpack'")
+    return msgpack.unpackb(data, raw=False)
@@ -8,20 +8,20 @@ from typing import List
 import numpy as np
 
 try:
-    from sentence_transformers import SentenceTransformer
     from sklearn.metrics.pairwise import cosine_similarity
 except ImportError:
     import os
-    os.system('pip install sentence-transformers scikit-learn')
-    from sentence_transformers import SentenceTransformer
+    os.system('pip install scikit-learn')
     from sklearn.metrics.pairwise import cosine_similarity
 
+from .model_loader import load_sentence_model
+
 
 class SimilarityCalculator:
     """Calculate semantic similarity using embeddings"""
     
     def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
-        self.model = SentenceTransformer(model_name)
+        self.model = load_sentence_model(model_name)
     
     def calculate_semantic_similarity(self, text1: str, text2: str) -> float:
         """
@@ -39,6 +39,16 @@ class SimilarityCalculator:
         
         return float(similarity)
     
+    def similarity_to_embedding(self, text: str, embedding: np.ndarray) -> float:
+        """Semantic similarity between a text and a precomputed embedding"""
+        if not text or embedding is None:
+            return 0.0
+        
+        text_embedding = self.model.encode([text])[0]
+        similarity = cosine_similarity([text_embedding], [embedding])[0][0]
+        
+        return float(similarity)
+    
     def extract_relevant_highlights(
         self, 
         resume_text: str, 
@@ -50,8 +60,7 @@ class SimilarityCalculator:
         Uses semantic similarity + heuristics
         """
         # Split into sentences
-        sentences = re.split(r'[.!?]+', resume_text)
-        sentences = [s.strip() for s in sentences if len(s.strip()) > 20]
+        sentences = self.split_sentences(resume_text)
         
         if not sentences:
             return []
@@ -59,13 +68,80 @@ class SimilarityCalculator:
         # Get JD embedding
         jd_embedding = self.model.encode([jd_text])[0]
         
-        # Calculate similarity for each sentence
-        sentence_scores = []
+        return self.highlights_for_embedding(resume_text, jd_embedding, top_n, sentences)
+    
+    def highlights_for_embedding(
+        self,
+        resume_text: str,
+        jd_embedding: np.ndarray,
+        top_n: int = 5,
+        sentences: List[str] = None
+    ) -> List[str]:
+        """Highlights against a precomputed JD embedding"""
+        if sentences is None:
+            sentences = self.split_sentences(resume_text)
+        
+        if not sentences:
+            return []
+        
+        # Embed each sentence
+        sentence_embeddings = [self.model.encode([sentence])[0] for sentence in sentences]
+        
+        return self.rank_highlights(sentences, sentence_embeddings, jd_embedding, top_n)
+    
+    @staticmethod
+    def split_sentences(text: str) -> List[str]:
+        """Split text into candidate highlight sentences (or bullet lines)"""
+        sentences = [s.strip(' •') for s in re.split(r'[.!?]+|\n', text)]
+        return [s for s in sentences if len(s) > 20]
+    
+    @staticmethod
+    def rank_highlights(
+        sentences: List[str],
+        sentence_embeddings: List[np.ndarray],
+        jd_embedding: np.ndarray,
+        top_n: int = 5
+    ) -> List[str]:
+        """
+        Rank sentences by similarity to the JD embedding
+        Boosts metrics and action verbs
+        """
+        if not sentences:
+            return []
+        
+        similarities = cosine_similarity(np.asarray(sentence_embeddings), [jd_embedding])[:, 0]
+        
+        return SimilarityCalculator.top_boosted(sentences, similarities, top_n)
+    
+    @staticmethod
+    def rank_highlights_lexical(
+        sentences: List[str],
+        jd_terms: List[str],
+        top_n: int = 5
+    ) -> List[str]:
+        """
+        Cheap approximation of rank_highlights (no embeddings)
+        Scores sentences by the share of their words found in JD terms
+        """
+        if not sentences:
+            return []
         
+        jd_words = set(w for term in jd_terms for w in re.findall(r'\w+', term.lower()))
+        similarities = []
         for sentence in sentences:
-            sent_embedding = self.model.encode([sentence])[0]
-            similarity = cosine_similarity([sent_embedding], [jd_embedding])[0][0]
-            
+            words = re.findall(r'\w+', sentence.lower())
+            overlap = sum(1 for w in words if w in jd_words)
+            similarities.append(overlap / len(words) if words else 0.0)
+        
+        return SimilarityCalculator.top_boosted(sentences, similarities, top_n)
+    
+    @staticmethod
+    def top_boosted(sentences: List[str], similarities, top_n: int = 5) -> List[str]:
+        """Apply metric / action-verb boosts and return the top sentences"""
+        # Calculate score for each sentence
+        sentence_scores = []
+        
+        for sentence, similarity in zip(sentences, similarities):
             # Apply boosting heuristics
             
             # Boost if contains numbers (achievements/metrics)
@@ -0,0 +1,117 @@
+"""
+Skill Lexicon
+Canonical skill list with aliases and precomputed embeddings
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class SkillLexicon:
+    """
+    Canonical skills with alias lookup
+    Embeddings are computed offline and memory-mapped at load time
+    """
+
+    def __init__(self, skills: List[str], aliases: Dict[str, int]):
+        self.skills = skills
+        self.alias_index = aliases
+        self.embeddings: Optional[np.ndarray] = None
+
+    @staticmethod
+    def normalize(term: str) -> str:
+        """Normalize a term for exact/alias lookup"""
+        term = term.lower().strip()
+        term = re.sub(r'\s+', ' ', term)
+        return term.strip('.,;:()')
+
+    @classmethod
+    def load(
+        cls,
+        lexicon_path: Path,
+        embeddings_path: Optional[Path] = None,
+        model_name: Optional[str] = None
+    ) -> Optional['SkillLexicon']:
+        """
+        Load lexicon JSON and, if present, the precomputed embedding table
+        The table is only used when it was built with the same model
+        """
+        lexicon_path = Path(lexicon_path)
+        if not lexicon_path.exists():
+            return None
+
+        with open(lexicon_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        skills = []
+        aliases = {}
+        for entry in data.get('skills', []):
+            idx = len(skills)
+            name = cls.normalize(entry['name'])
+            skills.append(name)
+            aliases[name] = idx
+            for alias in entry.get('aliases', []):
+                aliases.setdefault(cls.normalize(alias), idx)
+
+        lexicon = cls(skills, aliases)
+        if embeddings_path is not None:
+            lexicon.attach_embeddings(Path(embeddings_path), model_name)
+        return lexicon
+
+    @staticmethod
+    def metadata_path(embeddings_path: Path) -> Path:
+        """Sidecar file describing how the embedding table was built"""
+        return embeddings_path.with_suffix('.json')
+
+    def attach_embeddings(self, embeddings_path: Path, model_name: Optional[str] = None) -> bool:
+        """Memory-map the embedding table if it matches this lexicon and model"""
+        meta_path = self.metadata_path(embeddings_path)
+        if not embeddings_path.exists() or not meta_path.exists():
+            return False
+
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        if model_name and meta.get('model') != model_name:
+            print(f"Skill embeddings built with {meta.get('model')}, expected {model_name} - ignoring")
+            return False
+        if meta.get('skills') != self.skills:
+            print("Skill embeddings are out of date with the lexicon - ignoring")
+            return False
+
+        self.embeddings = np.load(embeddings_path, mmap_mode='r')
+        return True
+
+    def lookup(self, term: str) -> Optional[int]:
+        """Return the canonical skill index for a term, or None if unknown"""
+        return self.alias_index.get(self.normalize(term))
+
+    def canonical(self, term: str) -> Optional[str]:
+        """Return the canonical skill name for a term, or None if unknown"""
+        idx = self.lookup(term)
+        return self.skills[idx] if idx is not None else None
+
+    def build_embeddings(self, model, embeddings_path: Path, model_name: str) -> np.ndarray:
+        """
+        Encode every canonical skill and save the table next to its metadata
+        Run offline (see tools/build_skill_lexicon.py)
+        """
+        embeddings = np.asarray(model.encode(self.skills), dtype=np.float32)
+
+        embeddings_path = Path(embeddings_path)
+        embeddings_path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(embeddings_path, embeddings)
+
+        with open(self.metadata_path(embeddings_path), 'w', encoding='utf-8') as f:
+            json.dump({
+                'model': model_name,
+                'dimension': int(embeddings.shape[1]),
+                'skills': self.skills
+            }, f, indent=2)
+
+        self.embeddings = np.load(embeddings_path, mmap_mode='r')
+        return self.embeddings
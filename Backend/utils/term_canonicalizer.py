@@ -0,0 +1,215 @@
+"""
+Term Canonicalizer
+Collapse near-duplicate keyword terms before they are encoded
+"""
+
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .skill_lexicon import SkillLexicon
+
+
+class TermCanonicalizer:
+    """
+    Reduce an extracted term set to one term per concept
+    - variants that normalize and stem to the same words merge
+      ("api" / "apis", "deployed models" / "deploying model")
+    - a term is dropped when every occurrence in the text sits inside a
+      longer term of the set ("learning" inside "machine learning")
+    - an n-gram made only of known skills collapses into those skills
+      ("python tensorflow pytorch")
+    - aliases of one lexicon skill merge ("k8s" / "kubernetes")
+    Known skills are never dropped. Surface forms are kept as written
+    (minus bullet markers and list punctuation around them), so term
+    counts and highlighted keywords still match the text.
+    """
+
+    # Same words KeywordExtractor.tokenize counts n-grams over
+    WORD_PATTERN = re.compile(r'\b[a-z]{3,}\b')
+    OPAQUE_PATTERN = re.compile(r'[a-z0-9+#]')
+
+    # Bullet markers and list punctuation around a term ("- experience
+    # with tensorflow"); "c++", "c#" and ".net" keep their symbols
+    EDGE_PATTERN = re.compile(r'^[\s•*\-,;:]+|[\s•*\-,;:]+$')
+
+    def __init__(self, lexicon: Optional[SkillLexicon] = None):
+        self.lexicon = lexicon
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.terms_in = 0
+        self.terms_out = 0
+
+    @staticmethod
+    def stem(word: str) -> str:
+        """Light suffix stripping; stems are only compared, never shown"""
+        if len(word) > 4 and word.endswith(('ies', 'ied')):
+            return word[:-3] + 'y'
+        for suffix in ('ing', 'ed'):
+            if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+                word = word[:-len(suffix)]
+                break
+        else:
+            plural = word.endswith('s') and not word.endswith(('ss', 'us'))
+            if len(word) > 3 and plural and not (len(word) > 4 and word.endswith('is')):
+                word = word[:-1]
+        if len(word) > 4 and word.endswith('e'):
+            word = word[:-1]
+        return word
+
+    def key(self, term: str) -> Tuple[str, ...]:
+        """
+        Comparison key of a term: its stemmed words
+        Terms with digits, symbols or short tokens ("c++", "node.js",
+        "ci/cd") only ever merge with an identical term
+        """
+        normalized = SkillLexicon.normalize(term)
+        words = self.WORD_PATTERN.findall(normalized)
+        if not words or self.OPAQUE_PATTERN.search(self.WORD_PATTERN.sub(' ', normalized)):
+            return (normalized,)
+        return tuple(self.stem(w) for w in words)
+
+    def canonicalize(self, terms: Iterable[str], text: str) -> Set[str]:
+        """Collapse a term set extracted from text"""
+        terms = set(terms)
+        text_lower = text.lower()
+
+        # 1. Strip bullet markers and list punctuation from surface forms
+        surfaces = {self.EDGE_PATTERN.sub('', term) for term in terms}
+        surfaces.discard('')
+
+        # 2. Group variants by normalized, stemmed key
+        groups: Dict[Tuple[str, ...], List[str]] = defaultdict(list)
+        for term in sorted(surfaces):
+            groups[self.key(term)].append(term)
+
+        # 3. Where every key occurs in the stemmed word stream
+        stream = [self.stem(w) for w in self.WORD_PATTERN.findall(text_lower)]
+        starts = self._occurrences(stream, groups)
+
+        # Longest term occurrence starting at each word
+        max_end: Dict[int, int] = {}
+        for key, positions in starts.items():
+            for start in positions:
+                max_end[start] = max(max_end.get(start, 0), start + len(key))
+        longest = max((len(key) for key in starts), default=0)
+
+        # Words inside an occurrence of a known skill
+        known = {key: self._known(variants) for key, variants in groups.items()}
+        skill_words = {
+            i
+            for key, positions in starts.items() if known[key]
+            for start in positions
+            for i in range(start, start + len(key))
+        }
+
+        # 4. One representative per group, minus subsumed groups
+        kept = []
+        for key, variants in groups.items():
+            if not known[key]:
+                positions = starts.get(key)
+                if self._subsumed(positions, len(key), max_end, longest):
+                    continue
+                if len(key) > 1 and self._skills_only(positions, len(key), skill_words):
+                    continue
+            kept.append(self._representative(known[key] or variants, text_lower))
+
+        # 5. Aliases of one lexicon skill keep a single surface form
+        result = self._merge_aliases(kept, text_lower)
+
+        with self._lock:
+            self.calls += 1
+            self.terms_in += len(terms)
+            self.terms_out += len(result)
+        return result
+
+    @staticmethod
+    def _occurrences(
+        stream: List[str],
+        groups: Dict[Tuple[str, ...], List[str]]
+    ) -> Dict[Tuple[str, ...], List[int]]:
+        """Start positions of each key in the word stream"""
+        wanted = defaultdict(set)
+        for key in groups:
+            wanted[len(key)].add(key)
+
+        starts = defaultdict(list)
+        for n, keys in wanted.items():
+            for i in range(len(stream) - n + 1):
+                ngram = tuple(stream[i:i + n])
+                if ngram in keys:
+                    starts[ngram].append(i)
+        return starts
+
+    @staticmethod
+    def _subsumed(
+        positions: Optional[List[int]],
+        length: int,
+        max_end: Dict[int, int],
+        longest: int
+    ) -> bool:
+        """True when every occurrence lies inside a longer term's occurrence"""
+        if not positions:
+            return False  # no evidence in the text; keep it
+        for start in positions:
+            end = start + length
+            if max_end.get(start, 0) > end:
+                continue
+            if not any(max_end.get(s, 0) >= end for s in range(max(0, start - longest + 1), start)):
+                return False
+        return True
+
+    @staticmethod
+    def _skills_only(positions: Optional[List[int]], length: int, skill_words: Set[int]) -> bool:
+        """True when every word of every occurrence belongs to a known skill"""
+        if not positions:
+            return False
+        return all(i in skill_words for start in positions for i in range(start, start + length))
+
+    def _known(self, variants: List[str]) -> List[str]:
+        """Variants the skill lexicon recognizes"""
+        if self.lexicon is None:
+            return []
+        return [v for v in variants if self.lexicon.lookup(v) is not None]
+
+    @staticmethod
+    def _representative(variants: List[str], text_lower: str) -> str:
+        """Most frequent whole-word form in the text, then shortest"""
+        if len(variants) == 1:
+            return variants[0]
+
+        def frequency(term: str) -> int:
+            pattern = r'(?<![a-z0-9])' + re.escape(term.lower()) + r'(?![a-z0-9])'
+            return len(re.findall(pattern, text_lower))
+
+        return min(variants, key=lambda v: (-frequency(v), len(v), v))
+
+    def _merge_aliases(self, terms: List[str], text_lower: str) -> Set[str]:
+        if self.lexicon is None:
+            return set(terms)
+
+        by_skill = defaultdict(list)
+        result = set()
+        for term in terms:
+            idx = self.lexicon.lookup(term)
+            if idx is None:
+                result.add(term)
+            else:
+                by_skill[idx].append(term)
+
+        for idx, variants in by_skill.items():
+            # The canonical name itself wins over its aliases
+            name = self.lexicon.skills[idx]
+            exact = [v for v in variants if SkillLexicon.normalize(v) == name]
+            result.add(self._representative(exact or variants, text_lower))
+        return result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "terms_in": self.terms_in,
+                "terms_out": self.terms_out,
+                "reduction_ratio": round(1 - self.terms_out / self.terms_in, 4) if self.terms_in else 0.0
+            }
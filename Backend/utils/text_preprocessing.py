@@ -29,13 +29,14 @@ class TextPreprocessor:
     def clean_text(text: str) -> str:
         """
         Basic text cleaning
-        - Remove extra whitespace
-        - Keep important punctuation
+        - Remove extra whitespace, keeping line breaks (section headers)
+        - Keep important punctuation and bullet markers
         """
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
         # Remove special characters but keep important ones
-        text = re.sub(r'[^\w\s\-\+\#\.\,\(\)/]', ' ', text)
+        text = re.sub(r'[^\w\s\-\+\#\.\,\(\)/•]', ' ', text)
+        # Remove extra whitespace and blank lines
+        text = re.sub(r'[^\S\n]+', ' ', text)
+        text = re.sub(r' ?\n\s*', '\n', text)
         return text.strip()
     
     @staticmethod
@@ -43,8 +44,9 @@ class TextPreprocessor:
         """Extract potential skill phrases using linguistic patterns"""
         phrases = []
         
+        # Phrases stay within a line ("Skills" headers are their own line)
         # Pattern 1: Capitalized multi-word terms
-        capitalized = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+\b', text)
+        capitalized = re.findall(r'\b[A-Z][a-z]+(?:[^\S\n]+[A-Z][a-z]+)+\b', text)
         phrases.extend(capitalized)
         
         # Pattern 2: Technical acronyms
@@ -57,8 +59,8 @@ class TextPreprocessor:
         
         # Pattern 4: Common skill patterns
         skill_patterns = [
-            r'\b\w+(?:\s+\w+){0,2}\s+(?:skills?|experience|knowledge|proficiency)\b',
-            r'\b(?:expert|proficient|experienced)\s+(?:in|with)\s+\w+(?:\s+\w+){0,2}\b',
+            r'\b\w+(?:[^\S\n]+\w+){0,2}[^\S\n]+(?:skills?|experience|knowledge|proficiency)\b',
+            r'\b(?:expert|proficient|experienced)[^\S\n]+(?:in|with)[^\S\n]+\w+(?:[^\S\n]+\w+){0,2}\b',
         ]
         
         for pattern in skill_patterns:
@@ -70,6 +72,17 @@ class TextPreprocessor:
     @staticmethod
     def extract_technical_terms(text: str) -> Set[str]:
         """Extract technical terms using multiple strategies"""
+        terms = TextPreprocessor.extract_phrase_terms(text)
+        terms.update(TextPreprocessor.extract_bullet_terms(text))
+        return terms
+    
+    @staticmethod
+    def extract_phrase_terms(text: str) -> Set[str]:
+        """
+        Technical terms from noun phrases and skill indicators
+        Matches never cross sentence punctuation, so results can be
+        computed per sentence and combined
+        """
         terms = set()
         
         # Strategy 1: Noun phrases and acronyms
@@ -86,22 +99,33 @@ class TextPreprocessor:
         for pattern in skill_indicators:
             matches = re.findall(pattern, text, re.IGNORECASE)
             for match in matches:
-                # Split by common separators
-                items = re.split(r'[,;/&]|\sand\s|\sor\s', match)
+                # Split by common separators (including a spaced dash)
+                items = re.split(r'[,;/&]|\sand\s|\sor\s|\s[-•*]\s', match)
                 terms.update([item.strip().lower() for item in items if len(item.strip()) > 2])
         
-        # Strategy 3: Bullet points often contain skills
-        bullet_lines = re.findall(r'[•\-\*]\s*(.+)', text)
+        return terms
+    
+    @staticmethod
+    def extract_bullet_terms(text: str) -> Set[str]:
+        """Strategy 3: Bullet points often contain skills"""
+        terms = set()
+        bullet_lines = re.findall(r'[•\-\*][^\S\n]*(.+)', text)
         for line in bullet_lines:
-            words = re.findall(r'\b[A-Za-z][\w\-\.]+\b', line)
-            terms.update([w.lower() for w in words if len(w) > 3])
+            terms.update(TextPreprocessor.bullet_words(line))
         
         return terms
     
+    @staticmethod
+    def bullet_words(line: str) -> List[str]:
+        """Candidate skill words from a bullet line"""
+        words = re.findall(r'\b[A-Za-z][\w\-\.]+\b', line)
+        return [w.lower() for w in words if len(w) > 3]
+    
     @staticmethod
     def filter_stop_words(terms: List[str]) -> List[str]:
         """Remove stop words from list of terms"""
+        stop_words = TextPreprocessor.STOP_WORDS
         return [
             term for term in terms 
-            if not any(stop in term.lower().split() for stop in TextPreprocessor.STOP_WORDS)
+            if stop_words.isdisjoint(term.lower().split())
         ]
\ No newline at end of file
@@ -1,7 +1,6 @@
 import { NextRequest, NextResponse } from "next/server"
-import { writeFile, mkdir, readdir, unlink } from "fs/promises"
-import { existsSync } from "fs"
-import path from "path"
+
+const BACKEND_URL = process.env.BACKEND_URL ?? "http://127.0.0.1:5000"
 
 export async function POST(request: NextRequest) {
   try {
@@ -16,38 +15,36 @@ export async function POST(request: NextRequest) {
       )
     }
 
-    // Get the project root directory (3 levels up from app/api/upload)
-    const projectRoot = path.join(process.cwd(), "..")
-    const assetsDir = path.join(projectRoot, "backend", "assets")
-
-    // Create assets directory if it doesn't exist
-    if (!existsSync(assetsDir)) {
-      await mkdir(assetsDir, { recursive: true })
-    }
-
-    // Clean the assets directory (delete all existing files)
-    const existingFiles = await readdir(assetsDir)
-    for (const file of existingFiles) {
-      await unlink(path.join(assetsDir, file))
+    // Store the resume in the backend document store (content-addressed)
+    const resumeForm = new FormData()
+    resumeForm.append("file", resumeFile, resumeFile.name)
+    const resumeResponse = await fetch(`${BACKEND_URL}/documents`, {
+      method: "POST",
+      body: resumeForm,
+    })
+
+    // Store the job description text the same way
+    const jobDescResponse = await fetch(`${BACKEND_URL}/documents`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ text: jobDescription, filename: "job.txt" }),
+    })
+
+    if (!resumeResponse.ok || !jobDescResponse.ok) {
+      return NextResponse.json(
+        { error: "Failed to store documents" },
+        { status: 502 }
+      )
     }
 
-    // Save the resume file with the format resume.{extension}
-    const resumeBuffer = Buffer.from(await resumeFile.arrayBuffer())
-    const fileExtension = path.extname(resumeFile.name)
-    const resumeFileName = `resume${fileExtension}`
-    const resumePath = path.join(assetsDir, resumeFileName)
-    await writeFile(resumePath, resumeBuffer)
-
-    // Save the job description as job.txt
-    const jobDescFileName = `job.txt`
-    const jobDescPath = path.join(assetsDir, jobDescFileName)
-    await writeFile(jobDescPath, jobDescription, "utf-8")
+    const resumeDoc = await resumeResponse.json()
+    const jobDescDoc = await jobDescResponse.json()
 
     return NextResponse.json(
       {
         message: "Files uploaded successfully",
-        resumeFile: resumeFileName,
-        jobDescFile: jobDescFileName,
+        resumeId: resumeDoc.id,
+        jdId: jobDescDoc.id,
       },
       { status: 200 }
     )
@@ -58,4 +55,4 @@ export async function POST(request: NextRequest) {
       { status: 500 }
     )
   }
-}
\ No newline at end of file
+}
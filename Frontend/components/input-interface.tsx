@@ -112,13 +112,15 @@ export default function InputInterface({
         throw new Error("Failed to upload files");
       }
 
-      // Now call Flask backend for analysis
+      const { resumeId, jdId } = await uploadResponse.json();
+
+      // Now call Flask backend for analysis of the stored documents
       const flaskResponse = await fetch("http://127.0.0.1:5000/analyze", {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
         },
-        body: JSON.stringify({ use_assets: true }), // ← ADD THIS LINE
+        body: JSON.stringify({ resume_id: resumeId, jd_id: jdId }),
       });
 
       if (!flaskResponse.ok) {